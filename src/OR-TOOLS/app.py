@@ -3,6 +3,7 @@ Main application entry point for schedule optimization
 """
 import sys
 import os
+import argparse
 import logging
 from pathlib import Path
 
@@ -20,6 +21,7 @@ from config_manager import ModelConfig
 from optimizer import ScheduleOptimizer
 from exporter import export_planning, export_statistics
 from loaders import DataLoadError
+from events import LogSink
 
 def resolve_data_path():
     """Resolve data directory path for both normal and PyInstaller frozen mode"""
@@ -31,8 +33,15 @@ def resolve_data_path():
         base_dir = Path(__file__).parent.parent.parent
     return base_dir / "data"
 
-def main():
-    """Main execution function"""
+def main(warm_start: str = None, resume: bool = False, events: str = None):
+    """
+    Main execution function
+    
+    Args:
+        warm_start: Planning CSV utilisé comme point de départ (hints CP-SAT), optionnel
+        resume: Reprend la résolution interrompue depuis son dernier checkpoint
+        events: Fichier JSONL des événements de progression (défaut: resultat/events.jsonl)
+    """
     try:
         logger.info("=" * 80)
         logger.info("OPTIMISATION DU PLANNING - DÉMARRAGE")
@@ -44,6 +53,10 @@ def main():
         
         # Utilise les valeurs par défaut de SolverParams (3h, 6 workers)
         config = ModelConfig.from_csv_directory(data_dir)
+        if warm_start:
+            config.solver_params.warm_start_path = warm_start
+        config.solver_params.resume = resume
+        config.solver_params.events_path = str(events or config.output_dir / "events.jsonl")
         
         # Validate configuration
         is_valid, errors = config.validate()
@@ -60,12 +73,10 @@ def main():
         
         # Create optimizer
         optimizer = ScheduleOptimizer(config)
+        optimizer.events.subscribe(LogSink(logger))
         
-        # Prepare data
-        optimizer.prepare_data()
-        
-        # Build model
-        optimizer.build_model()
+        # Prepare data + build model (ou rechargement depuis le cache disque)
+        optimizer.prepare_and_build()
         
         # Solve
         result = optimizer.solve()
@@ -77,12 +88,14 @@ def main():
             logger.info("=" * 80)
             
             # Export planning
-            export_planning(
+            if not export_planning(
                 result,
                 config.output_dir / "planning_solution.csv",
                 config,
                 optimizer
-            )
+            ):
+                logger.error("✗ Échec de l'export du planning")
+                return False
             
             # Export statistics
             export_statistics(
@@ -113,5 +126,24 @@ def main():
         return False
 
 if __name__ == "__main__":
-    success = main()
+    parser = argparse.ArgumentParser(description="Optimisation du planning des vacations.")
+    parser.add_argument(
+        "--warm-start",
+        nargs="?",
+        const=str(resolve_data_path().parent / "resultat" / "planning_solution.csv"),
+        default=None,
+        help="Démarre depuis un planning CSV (par défaut: dernier resultat/planning_solution.csv)."
+    )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Reprend depuis le dernier checkpoint (resultat/checkpoints/incumbent.npz) avec le temps restant."
+    )
+    parser.add_argument(
+        "--events",
+        default=None,
+        help="Fichier JSONL des événements de progression (par défaut: resultat/events.jsonl)."
+    )
+    args = parser.parse_args()
+    success = main(warm_start=args.warm_start, resume=args.resume, events=args.events)
     sys.exit(0 if success else 1)
\ No newline at end of file
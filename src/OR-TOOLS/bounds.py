@@ -0,0 +1,285 @@
+"""
+BOUNDS - Borne supérieure de l'objectif par relaxation linéaire (GLOP)
+
+max_theoretical_score suppose que chaque élève obtient son quota, toutes les
+paires de jours sur 52 semaines, etc.: le score normalisé qui en découle est
+très pessimiste. La relaxation linéaire du modèle donne une borne supérieure
+valide et bien plus serrée:
+ - x ∈ [0, 1] par variable de décision (une seule pour un binôme)
+ - contraintes dures reprises telles quelles: capacité, unicité, max par
+   semaine, remplissage, mixité "un par niveau", semestre, continuité;
+   fréquence via des indicateurs de semaine (au plus une semaine par fenêtre)
+ - contraintes à indicateurs (mixité par niveaux présents, remplacement de
+   niveau) omises: relâcher ne fait qu'augmenter la borne
+ - objectif: quotas (sat + excess = n, q·succès <= sat), préférences et
+   priorités, paires de jours (p <= chaque jour), et bonus "même jour"
+   majoré linéairement: C(n, 2) <= (q-1)/2·sat + (q + (E-1)/2)·excess,
+   où E borne le dépassement possible
+
+Le modèle linéaire est construit depuis le registre des variables (store), donc
+aussi pour un modèle rechargé du cache. Seule une résolution GLOP optimale
+fournit une borne.
+"""
+import collections
+import logging
+import math
+import time
+from dataclasses import dataclass
+from typing import Optional
+
+import numpy as np
+from ortools.linear_solver import pywraplp
+
+from scoring import N_WEEKS, W_EXCESS, W_FILL, W_PAIR, W_PREFERENCE, W_PRIORITY, W_SAME_DAY, W_SUCCESS, capacity_of, quota_of
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class BoundReport:
+    """Bilan du calcul de borne"""
+    method: str
+    status: str
+    bound: Optional[float] = None
+    seconds: float = 0.0
+    variables: int = 0
+    constraints: int = 0
+
+    def to_dict(self) -> dict:
+        return {
+            'method': self.method,
+            'status': self.status,
+            'bound': self.bound,
+            'seconds': round(self.seconds, 2),
+            'variables': self.variables,
+            'constraints': self.constraints,
+        }
+
+
+def _max_count(disc, rows_by_week: dict, limit: int) -> int:
+    """Nombre maximum d'affectations d'un élève dans une discipline (pour la majoration du bonus même jour)"""
+    per_week = {w: min(n, limit) if limit > 0 else n for w, n in rows_by_week.items()}
+    best = sum(per_week.values())
+
+    f = disc.frequence_vacations
+    if f > 1:  # Semaines retenues espacées d'au moins f
+        weeks, last = 0, None
+        for w in sorted(per_week):
+            if last is None or w - last >= f:
+                weeks, last = weeks + 1, w
+        best = min(best, weeks * max(per_week.values()))
+
+    cont = disc.repetition_continuite
+    if isinstance(cont, (list, tuple)) and cont[0] > 0 and cont[1] > 0:
+        best = min(best, cont[0] * math.ceil(N_WEEKS / cont[1]))
+
+    sem = disc.repartition_semestrielle
+    if sem and any(w <= 26 for w in per_week) and any(w > 26 for w in per_week):
+        best = min(best, sem[0] + sem[1])
+    return best
+
+
+class _LinearRelaxation:
+    """Construction incrémentale du programme linéaire (GLOP)"""
+
+    def __init__(self, optimizer):
+        if optimizer.vac_slot is None:  # Modèle rechargé du cache
+            optimizer.prepare_data()
+        self.optimizer = optimizer
+        self.config = optimizer.config
+        self.store = optimizer.store
+        self.solver = pywraplp.Solver.CreateSolver('GLOP')
+        self.objective = collections.defaultdict(float)  # variable LP -> poids
+
+        var_ids = np.unique(self.store.var_index)
+        self.position = np.full(int(var_ids.max()) + 1, -1, dtype=np.int64)
+        self.position[var_ids] = np.arange(len(var_ids))
+        self.x = [self.solver.NumVar(0.0, 1.0, '') for _ in range(len(var_ids))]
+
+    def xs(self, rows):
+        """Variables LP des lignes (une variable partagée apparaît une fois par ligne)"""
+        return [self.x[i] for i in self.position[self.store.var_index[rows]].tolist()]
+
+    def add(self, terms, lb: float = -pywraplp.Solver.infinity(), ub: float = pywraplp.Solver.infinity()):
+        constraint = self.solver.Constraint(lb, ub)
+        coefficients = collections.Counter()
+        for var, coeff in terms:
+            coefficients[var] += coeff
+        for var, coeff in coefficients.items():
+            constraint.SetCoefficient(var, coeff)
+
+    def build(self):
+        store, config = self.store, self.config
+        disciplines = config.disciplines
+        vac_slot = self.optimizer.vac_slot
+
+        # Capacité et remplissage
+        for (d_pos, v_idx), rows in store.group_by('discipline', 'vacation'):
+            disc = disciplines[d_pos]
+            slot = int(vac_slot[v_idx])
+            cap = capacity_of(disc, slot)
+            if cap <= 0:
+                continue
+            fill = disc.be_filled and len(disc.presence) > slot and disc.presence[slot]
+            self.add([(x, 1) for x in self.xs(rows)], lb=cap if fill else -pywraplp.Solver.infinity(), ub=cap)
+
+        # Unicité (élève, vacation)
+        for _, rows in store.group_by('student', 'vacation'):
+            if len(rows) > 1:
+                self.add([(x, 1) for x in self.xs(rows)], ub=1)
+
+        # Mixité "exactement un élève de chaque niveau"
+        for (d_pos, _, _), rows in store.group_by('discipline', 'vacation', 'niveau'):
+            if disciplines[d_pos].mixite_groupes == 1:
+                self.add([(x, 1) for x in self.xs(rows)], lb=1, ub=1)
+
+        by_week = store.group_by('student', 'discipline', 'semaine')
+        weeks_of = collections.defaultdict(dict)
+        for (s_pos, d_pos, week), rows in by_week:
+            weeks_of[(s_pos, d_pos)][week] = rows
+            limit = disciplines[d_pos].nb_vacations_par_semaine
+            if limit > 0 and len(rows) > limit:
+                self.add([(x, 1) for x in self.xs(rows)], ub=limit)
+
+        for (s_pos, d_pos), weeks in weeks_of.items():
+            self._add_window_constraints(disciplines[d_pos], weeks)
+
+        self._set_objective(weeks_of)
+
+    def _add_window_constraints(self, disc, weeks: dict):
+        """Fréquence, semestre et continuité d'un (élève, discipline)"""
+        f = disc.frequence_vacations
+        if f > 1 and len(weeks) > 1:
+            indicator = {}
+            for week, rows in weeks.items():
+                indicator[week] = self.solver.NumVar(0.0, 1.0, '')
+                self.add([(x, 1) for x in self.xs(rows)] + [(indicator[week], -len(rows))], ub=0)
+            for start in sorted(weeks):
+                window = [indicator[w] for w in range(start, start + f) if w in indicator]
+                if len(window) > 1:
+                    self.add([(y, 1) for y in window], ub=1)
+
+        sem = disc.repartition_semestrielle
+        if sem:
+            first = [r for w, rows in weeks.items() if w <= 26 for r in rows.tolist()]
+            second = [r for w, rows in weeks.items() if w > 26 for r in rows.tolist()]
+            if first and second:
+                self.add([(x, 1) for x in self.xs(first)], ub=sem[0])
+                self.add([(x, 1) for x in self.xs(second)], ub=sem[1])
+
+        cont = disc.repetition_continuite
+        if isinstance(cont, (list, tuple)) and cont[0] > 0 and cont[1] > 0:
+            limit, distance = cont[0], cont[1]
+            for start in range(1, N_WEEKS + 1):
+                window = [r for w in range(start, min(start + distance - 1, N_WEEKS) + 1) if w in weeks
+                          for r in weeks[w].tolist()]
+                if len(window) > limit:
+                    self.add([(x, 1) for x in self.xs(window)], ub=limit)
+
+    def _set_objective(self, weeks_of: dict):
+        store, config = self.store, self.config
+        disciplines = config.disciplines
+        solver = self.solver
+
+        # Préférences (Polyclinique) et priorités de niveau: poids par ligne
+        preferred_day = np.array([el.jour_preference.value - 1 for el in config.eleves])
+        for d_pos, disc in enumerate(disciplines):
+            rows_d = store.discipline == d_pos
+            if disc.id_discipline == 1 and disc.take_jour_pref:
+                for x in self.xs(np.flatnonzero(rows_d & (store.jour == preferred_day[store.student]))):
+                    self.objective[x] += W_PREFERENCE
+            for priority_idx, niv_val in enumerate(disc.priorite_niveau or []):
+                if priority_idx < len(W_PRIORITY):
+                    for x in self.xs(np.flatnonzero(rows_d & (store.niveau == niv_val))):
+                        self.objective[x] += W_PRIORITY[priority_idx]
+
+        for (s_pos, d_pos), weeks in weeks_of.items():
+            disc = disciplines[d_pos]
+            rows = np.concatenate(list(weeks.values()))
+            count = [(x, 1) for x in self.xs(rows)]
+            quota = quota_of(disc, config.eleves[s_pos].annee.value)
+
+            # Quotas: n = sat + excess, sat <= q, q·succès <= sat
+            sat = excess = None
+            if quota > 0:
+                sat = solver.NumVar(0.0, quota, '')
+                excess = solver.NumVar(0.0, len(rows), '')
+                success = solver.NumVar(0.0, 1.0, '')
+                self.add(count + [(sat, -1), (excess, -1)], lb=0, ub=0)
+                self.add([(success, quota), (sat, -1)], ub=0)
+                self.objective[sat] += W_FILL
+                self.objective[excess] += W_EXCESS
+                self.objective[success] += W_SUCCESS
+
+            # Paires de jours: p <= affectations de chaque jour de la paire, dans la semaine
+            for week, week_rows in (weeks.items() if disc.paire_jours else ()):
+                days = store.jour[week_rows]
+                for day1, day2 in disc.paire_jours:
+                    rows1, rows2 = week_rows[days == day1], week_rows[days == day2]
+                    if len(rows1) and len(rows2):
+                        pair = solver.NumVar(0.0, 1.0, '')
+                        self.add([(x, 1) for x in self.xs(rows1)] + [(pair, -1)], lb=0)
+                        self.add([(x, 1) for x in self.xs(rows2)] + [(pair, -1)], lb=0)
+                        self.objective[pair] += W_PAIR
+
+            # Même jour: au plus C(n, 2) paires, majoré linéairement
+            if disc.meme_jour and len(rows) >= 2:
+                n_max = _max_count(disc, {w: len(r) for w, r in weeks.items()}, disc.nb_vacations_par_semaine)
+                same_day = solver.NumVar(0.0, solver.infinity(), '')
+                if quota > 0:
+                    extra = max(0, n_max - quota)
+                    self.add([(same_day, 1), (sat, -(quota - 1) / 2), (excess, -(quota + (extra - 1) / 2))], ub=0)
+                else:
+                    self.add([(same_day, 1)] + [(x, -(n_max - 1) / 2) for x, _ in count], ub=0)
+                self.objective[same_day] += W_SAME_DAY
+
+        objective = solver.Objective()
+        for var, weight in self.objective.items():
+            objective.SetCoefficient(var, weight)
+        objective.SetMaximization()
+
+
+def lp_upper_bound(optimizer, time_limit: float = 120.0) -> BoundReport:
+    """
+    Borne supérieure de l'objectif par relaxation linéaire (GLOP)
+
+    Args:
+        optimizer: ScheduleOptimizer dont le modèle est construit (store)
+        time_limit: Temps maximum de la résolution GLOP
+
+    Returns:
+        BoundReport: bound est None si GLOP n'a pas prouvé l'optimum
+    """
+    if optimizer.store is None:
+        raise RuntimeError("Modèle non construit: appeler prepare_and_build() avant lp_upper_bound()")
+    start = time.perf_counter()
+    relaxation = _LinearRelaxation(optimizer)
+    relaxation.build()
+    solver = relaxation.solver
+    solver.SetTimeLimit(int(time_limit * 1000))
+    build_seconds = time.perf_counter() - start
+
+    status = solver.Solve()
+    status_name = {
+        pywraplp.Solver.OPTIMAL: 'OPTIMAL',
+        pywraplp.Solver.FEASIBLE: 'FEASIBLE',
+        pywraplp.Solver.INFEASIBLE: 'INFEASIBLE',
+        pywraplp.Solver.UNBOUNDED: 'UNBOUNDED',
+        pywraplp.Solver.NOT_SOLVED: 'NOT_SOLVED',
+    }.get(status, 'ABNORMAL')
+    report = BoundReport(
+        method='lp',
+        status=status_name,
+        bound=solver.Objective().Value() if status == pywraplp.Solver.OPTIMAL else None,
+        seconds=time.perf_counter() - start,
+        variables=solver.NumVariables(),
+        constraints=solver.NumConstraints(),
+    )
+    if report.bound is not None:
+        logger.info(
+            f"✓ Borne LP: {report.bound:,.0f} ({report.variables:,} variables, {report.constraints:,} contraintes, "
+            f"construction {build_seconds:.1f}s, total {report.seconds:.1f}s)"
+        )
+    else:
+        logger.warning(f"Borne LP indisponible: GLOP {status_name} après {report.seconds:.1f}s")
+    return report
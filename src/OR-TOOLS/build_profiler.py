@@ -0,0 +1,201 @@
+"""
+BUILD PROFILER - Instrumentation de la construction et de la résolution du modèle
+
+Pour chaque famille de contraintes (_add_*), enregistre:
+ - le temps mur
+ - la hausse du pic de mémoire du processus (RSS, inclut le modèle C++ CP-SAT)
+ - optionnellement le pic de mémoire Python (tracemalloc) atteint pendant la phase:
+   tracemalloc ralentit la construction d'un facteur ~5, il est donc désactivé
+   par défaut (SolverParams.profile_memory)
+ - le nombre de variables et de contraintes créées, et de termes linéaires ajoutés
+   (contraintes linéaires + objectif)
+
+Après la résolution, collecte les statistiques de la réponse CP-SAT (temps de
+presolve, conflits, branches, meilleure borne...).
+
+Sans tracemalloc, le coût est de quelques lectures de tailles du proto par
+phase plus un parcours des contraintes ajoutées: négligeable devant la
+construction elle-même.
+"""
+import logging
+import time
+import tracemalloc
+from contextlib import contextmanager
+from typing import Dict, List, Optional
+
+try:
+    import resource  # Indisponible sous Windows
+except ImportError:
+    resource = None
+
+logger = logging.getLogger(__name__)
+
+
+class BuildProfiler:
+    """
+    Mesures par phase de construction du modèle CP-SAT
+
+    Usage:
+        profiler = BuildProfiler()
+        with profiler.phase("capacite", model):
+            ...
+        profiler.stop()
+        profiler.report()  # {'phases': [...], 'total': {...}}
+    """
+
+    def __init__(self, trace_memory: bool = False):
+        self.trace_memory = trace_memory
+        self.phases: List[Dict] = []
+        self._owns_tracing = False
+
+    @contextmanager
+    def phase(self, name: str, model):
+        """Mesure le bloc exécuté comme une phase nommée"""
+        proto = model.Proto()
+        n_vars = len(proto.variables)
+        n_cons = len(proto.constraints)
+        n_obj = len(proto.objective.vars)
+
+        mem_start = 0
+        if self.trace_memory:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+                self._owns_tracing = True
+            tracemalloc.reset_peak()
+            mem_start = tracemalloc.get_traced_memory()[0]
+
+        rss_start = _max_rss_kb()
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            seconds = time.perf_counter() - start
+            peak_kb = None
+            if self.trace_memory:
+                peak_kb = round((tracemalloc.get_traced_memory()[1] - mem_start) / 1024, 1)
+            rss_end = _max_rss_kb()
+
+            proto = model.Proto()
+            constraints = proto.constraints
+            new_cons = len(constraints)
+            linear_terms = len(proto.objective.vars) - n_obj
+            for i in range(n_cons, new_cons):
+                c = constraints[i]
+                if c.has_linear():
+                    linear_terms += len(c.linear.vars)
+
+            self.phases.append({
+                'name': name,
+                'seconds': round(seconds, 4),
+                'memory_peak_kb': peak_kb,
+                'rss_peak_delta_kb': rss_end - rss_start if rss_end is not None else None,
+                'variables': len(proto.variables) - n_vars,
+                'constraints': new_cons - n_cons,
+                'linear_terms': linear_terms,
+            })
+
+    def record(self, name: str, seconds: float, model):
+        """Ajoute une phase mesurée à l'extérieur, créant tout le modèle (ex: rechargement depuis le cache)"""
+        proto = model.Proto()
+        constraints = proto.constraints
+        linear_terms = len(proto.objective.vars)
+        for i in range(len(constraints)):
+            c = constraints[i]
+            if c.has_linear():
+                linear_terms += len(c.linear.vars)
+        self.phases.append({
+            'name': name,
+            'seconds': round(seconds, 4),
+            'memory_peak_kb': None,
+            'rss_peak_delta_kb': None,
+            'variables': len(proto.variables),
+            'constraints': len(constraints),
+            'linear_terms': linear_terms,
+        })
+
+    def stop(self):
+        """Arrête tracemalloc s'il a été démarré par le profiler"""
+        if self._owns_tracing:
+            tracemalloc.stop()
+            self._owns_tracing = False
+
+    def report(self) -> Dict:
+        """Phases et totaux, sérialisables en JSON"""
+        total = {
+            'seconds': round(sum(p['seconds'] for p in self.phases), 4),
+            'variables': sum(p['variables'] for p in self.phases),
+            'constraints': sum(p['constraints'] for p in self.phases),
+            'linear_terms': sum(p['linear_terms'] for p in self.phases),
+        }
+        rss = [p['rss_peak_delta_kb'] for p in self.phases if p['rss_peak_delta_kb'] is not None]
+        if rss:
+            total['rss_peak_delta_kb'] = sum(rss)
+        if self.trace_memory and self.phases:
+            total['memory_peak_kb'] = max(p['memory_peak_kb'] for p in self.phases)
+        return {'phases': list(self.phases), 'total': total}
+
+    def log_summary(self):
+        """Affiche les phases les plus coûteuses"""
+        for p in sorted(self.phases, key=lambda p: p['seconds'], reverse=True):
+            logger.info(
+                f"  {p['name']:<28} {p['seconds']:>7.3f}s  "
+                f"vars={p['variables']:>7}  cons={p['constraints']:>7}  termes={p['linear_terms']:>8}"
+            )
+
+
+def _max_rss_kb() -> Optional[int]:
+    """Pic de mémoire résidente du processus en Ko (None si indisponible)"""
+    if resource is None:
+        return None
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+class PresolveTimer:
+    """
+    Callback de log CP-SAT qui relève la fin du presolve
+
+    Les lignes 'Starting search at <t>s' et '#Model <t>s ...' sont émises lorsque
+    le modèle presolvé est chargé par les workers: t est la durée du presolve
+    depuis le début de la résolution. Reste None si la résolution s'arrête
+    avant la fin du presolve.
+    """
+
+    def __init__(self):
+        self.presolve_seconds: Optional[float] = None
+
+    def __call__(self, line: str):
+        if self.presolve_seconds is not None:
+            return
+        if line.startswith('Starting search at '):
+            token = line[len('Starting search at '):].split()[0]
+        elif line.startswith('#Model'):
+            token = line.split()[1] if len(line.split()) > 1 else ''
+        else:
+            return
+        try:
+            self.presolve_seconds = float(token.rstrip('s'))
+        except ValueError:
+            pass
+
+
+def solver_statistics(solver, presolve_seconds: Optional[float] = None) -> Dict:
+    """Statistiques de la réponse CP-SAT, sérialisables en JSON"""
+    response = solver.ResponseProto()
+    return {
+        'presolve_seconds': presolve_seconds,
+        'wall_time': response.wall_time,
+        'user_time': response.user_time,
+        'deterministic_time': response.deterministic_time,
+        'num_conflicts': response.num_conflicts,
+        'num_branches': response.num_branches,
+        'num_booleans': response.num_booleans,
+        'num_integers': response.num_integers,
+        'num_restarts': response.num_restarts,
+        'num_lp_iterations': response.num_lp_iterations,
+        'num_binary_propagations': response.num_binary_propagations,
+        'num_integer_propagations': response.num_integer_propagations,
+        'objective_value': response.objective_value,
+        'best_objective_bound': response.best_objective_bound,
+        'gap_integral': response.gap_integral,
+        'solution_info': response.solution_info,
+    }
@@ -0,0 +1,141 @@
+"""
+CHECKPOINT - Sauvegarde périodique de la meilleure solution pendant la résolution
+
+Le callback de solution écrit au plus toutes les `interval` secondes la solution
+courante dans un fichier .npz compact:
+ - assignments: tableau int32 [n, 3] des affectations (id_eleve, id_discipline, v_idx)
+ - metadata: JSON (objectif, borne, temps écoulé cumulé, nombre de solutions, clé du modèle)
+
+L'écriture passe par un fichier temporaire renommé (os.replace): un arrêt brutal
+laisse toujours le checkpoint précédent intact. Les affectations étant stockées
+par identifiants (et non par index de variable), un checkpoint reste utilisable
+comme hint après reconstruction du modèle (cf. warm_start).
+"""
+import io
+import json
+import logging
+import os
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class Checkpoint:
+    """Solution sauvegardée"""
+    assignments: np.ndarray  # [n, 3] (id_eleve, id_discipline, v_idx)
+    objective: float
+    elapsed: float  # Temps de résolution cumulé (reprises incluses)
+    best_bound: Optional[float] = None
+    solution_count: int = 0
+    model_key: Optional[str] = None
+    created: str = ""
+
+    def keys(self):
+        """Affectations sous forme de tuples (id_eleve, id_discipline, v_idx)"""
+        return [tuple(row) for row in self.assignments.tolist()]
+
+
+def write_checkpoint(path: Path, checkpoint: Checkpoint):
+    """Écrit un checkpoint de façon atomique"""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    metadata = {
+        'objective': checkpoint.objective,
+        'elapsed': checkpoint.elapsed,
+        'best_bound': checkpoint.best_bound,
+        'solution_count': checkpoint.solution_count,
+        'model_key': checkpoint.model_key,
+        'created': checkpoint.created or time.strftime("%Y-%m-%d %H:%M:%S"),
+    }
+    buffer = io.BytesIO()
+    np.savez_compressed(
+        buffer,
+        assignments=np.asarray(checkpoint.assignments, dtype=np.int32).reshape(-1, 3),
+        metadata=np.array(json.dumps(metadata)),
+    )
+    tmp = path.with_name(path.name + f".tmp{os.getpid()}")
+    with open(tmp, "wb") as f:
+        f.write(buffer.getvalue())
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+
+def load_checkpoint(path: Path) -> Optional[Checkpoint]:
+    """Charge un checkpoint (None si absent ou illisible)"""
+    path = Path(path)
+    if not path.exists():
+        return None
+    try:
+        with np.load(path) as npz:
+            assignments = npz["assignments"]
+            metadata = json.loads(str(npz["metadata"]))
+        if assignments.ndim != 2 or assignments.shape[1] != 3:
+            raise ValueError(f"affectations de forme {assignments.shape} (attendu [n, 3])")
+        # Métadonnées obligatoires lues ici: un checkpoint incomplet est rejeté comme illisible
+        return Checkpoint(
+            assignments=assignments,
+            objective=float(metadata['objective']),
+            elapsed=float(metadata['elapsed']),
+            best_bound=metadata.get('best_bound'),
+            solution_count=metadata.get('solution_count', 0),
+            model_key=metadata.get('model_key'),
+            created=metadata.get('created', ""),
+        )
+    except Exception as e:
+        logger.warning(f"Checkpoint illisible ({path}): {e}")
+        return None
+
+
+class Checkpointer:
+    """
+    Sauvegarde limitée en fréquence des solutions d'une résolution
+
+    Usage (depuis le callback de solution):
+        if checkpointer.due():
+            checkpointer.save(values, objective, best_bound, wall_time, solution_count)
+    """
+
+    def __init__(self, path: Path, interval: float, optimizer, elapsed_offset: float = 0.0, model_key: Optional[str] = None):
+        self.path = Path(path)
+        self.interval = interval
+        self.elapsed_offset = elapsed_offset
+        self.model_key = model_key
+        self.last: Optional[Checkpoint] = None
+        self._last_write = None
+
+        # Correspondance lignes du registre -> identifiants
+        store = optimizer.store
+        self._var_index = store.var_index
+        self._keys = np.stack([
+            np.asarray(optimizer.student_ids, dtype=np.int32)[store.student],
+            np.asarray(optimizer.discipline_ids, dtype=np.int32)[store.discipline],
+            store.vacation.astype(np.int32),
+        ], axis=1)
+
+    def due(self) -> bool:
+        return self._last_write is None or time.monotonic() - self._last_write >= self.interval
+
+    def save(self, values, objective: float, best_bound: Optional[float], wall_time: float, solution_count: int):
+        """Sauvegarde la solution (valeurs de toutes les variables du modèle)"""
+        values = np.asarray(values, dtype=np.int64)
+        chosen = values[self._var_index] == 1
+        self.last = Checkpoint(
+            assignments=self._keys[chosen],
+            objective=objective,
+            elapsed=self.elapsed_offset + wall_time,
+            best_bound=best_bound,
+            solution_count=solution_count,
+            model_key=self.model_key,
+        )
+        self._last_write = time.monotonic()
+        try:
+            write_checkpoint(self.path, self.last)
+        except OSError as e:
+            logger.warning(f"Checkpoint non écrit ({self.path}): {e}")
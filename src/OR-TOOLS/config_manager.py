@@ -9,6 +9,9 @@ import logging
 
 logger = logging.getLogger(__name__)
 
+SOLVER_STRATEGIES = ("cpsat", "lns", "lexicographic", "greedy", "rolling_horizon", "lagrangian", "portfolio")
+ROLLING_HORIZON_UNITS = ("periode", "semestre")
+
 @dataclass
 class SolverParams:
     """Solver configuration parameters"""
@@ -16,14 +19,115 @@ class SolverParams:
     num_workers: int = 6
     log_progress: bool = True
     solution_limit: int = 1
+    symmetry_breaking: bool = False  # Ordonne les élèves/binômes interchangeables
+    pair_days_formulation: str = "indicateurs"  # Bonus paires de jours: "indicateurs" (indicateurs de jour partagés) ou "motifs" (au plus un motif de jours par élève et semaine)
+    window_formulation: str = "fenetres"  # Fréquence et continuité: "fenetres" (une somme par fenêtre maximale) ou "prefixes" (sommes cumulées par semaine)
+    profiling: bool = True  # Profil par phase de construction + statistiques CP-SAT
+    profile_memory: bool = False  # Ajoute tracemalloc au profil (construction ~5x plus lente)
+    model_cache: bool = True  # Cache disque des modèles construits (output_dir/model_cache)
+    model_cache_max_mb: int = 512
+    build_processes: int = 1  # Processus de construction du modèle (1 = séquentiel, 0 = tous les cœurs)
+    warm_start_path: Optional[str] = None  # Planning CSV servant de hint (export_planning / batch)
+    warm_start_repair: bool = True  # Répare le hint s'il n'est plus faisable
+    warm_start_time_limit: float = 120.0  # Temps max des résolutions de complétion/réparation
+    checkpoint_interval_seconds: float = 60.0  # Sauvegarde de la solution courante (0 = désactivée)
+    resume: bool = False  # Reprend depuis le dernier checkpoint (output_dir/checkpoints)
+    strategy: str = "cpsat"  # "cpsat" (résolution unique), "lns" (grand voisinage), "lexicographic", "greedy" (heuristique seule), "rolling_horizon", "lagrangian" ou "portfolio"
+    lns_time_slice: float = 20.0  # Temps max de chaque sous-problème LNS
+    lns_initial_time: float = 60.0  # Résolution initiale LNS (sans démarrage à chaud)
+    lns_seed: int = 0
+    lexicographic_quota_seconds: float = 14400.0  # Étape 1: remplissage et succès des quotas (réduit au prorata de max_time_seconds)
+    lexicographic_preference_seconds: float = 3600.0  # Étape 2: préférences, paires, même jour (réduit au prorata de max_time_seconds)
+    lexicographic_tolerance: float = 0.0  # Perte relative admise sur le niveau des quotas à l'étape 2
+    greedy_hint: bool = False  # Planning glouton comme hint CP-SAT (sans démarrage à chaud ni reprise)
+    greedy_fallback: bool = True  # Planning glouton retourné si CP-SAT ne trouve aucune solution
+    greedy_seed: int = 0
+    rolling_unit: str = "periode"  # Étapes de l'horizon glissant: "periode" (periodes.csv) ou "semestre"
+    rolling_pacing: bool = True  # Borne l'avancement des quotas au prorata des semaines disponibles
+    rolling_polish_fraction: float = 0.2  # Part du temps laissée au polissage sur le modèle complet (0 = aucun)
+    lagrangian_processes: int = 0  # Processus résolvant les sous-problèmes par élève (0 = tous les cœurs)
+    lagrangian_subproblem_seconds: float = 5.0  # Temps max de chaque sous-problème
+    lagrangian_iterations: int = 200  # Itérations max du sous-gradient
+    lagrangian_repair_seconds: float = 300.0  # Réparation du planning final sur le modèle complet (inclus dans max_time_seconds)
+    lp_bound: bool = False  # Borne supérieure par relaxation linéaire (GLOP) avant la résolution (temps pris sur max_time_seconds)
+    lp_bound_time_limit: float = 120.0  # Temps max de la relaxation, au plus la moitié du budget (sans borne au-delà)
+    stop_gap: float = 0.0  # Arrêt à cet écart relatif à la meilleure borne (0.05 = 5%, 0 = désactivé)
+    stop_plateau_percent: float = 0.0  # Arrêt si l'objectif progresse de moins de X% ... (0 = désactivé)
+    stop_plateau_minutes: float = 30.0  # ... sur les N dernières minutes
+    stop_target_score: float = 0.0  # Arrêt à ce score normalisé /100 (0 = désactivé)
+    portfolio_size: int = 4  # Processus CP-SAT concurrents (réduit au nombre de cœurs)
+    portfolio_cores: int = 0  # Workers CP-SAT au total, tous processus confondus (0 = tous les cœurs)
+    portfolio_round_seconds: float = 600.0  # Durée d'un tour: la meilleure solution est ensuite partagée en hint
+    portfolio_seed: int = 0
+    portfolio_profiles: Tuple[str, ...] = ()  # Profils de recherche (portfolio.PROFILES, vide = tous dans l'ordre)
+    cpsat_parameters: Dict = field(default_factory=dict)  # Paramètres CP-SAT supplémentaires (profil de réglage, cf. load_profile)
+    events_path: Optional[str] = None  # Fichier JSONL des événements de progression (None = pas d'écriture)
     
     def to_dict(self) -> dict:
         return {
             'max_time_seconds': self.max_time_seconds,
             'num_workers': self.num_workers,
             'log_progress': self.log_progress,
-            'solution_limit': self.solution_limit
+            'solution_limit': self.solution_limit,
+            'symmetry_breaking': self.symmetry_breaking,
+            'pair_days_formulation': self.pair_days_formulation,
+            'window_formulation': self.window_formulation,
+            'profiling': self.profiling,
+            'profile_memory': self.profile_memory,
+            'model_cache': self.model_cache,
+            'model_cache_max_mb': self.model_cache_max_mb,
+            'build_processes': self.build_processes,
+            'warm_start_path': self.warm_start_path,
+            'warm_start_repair': self.warm_start_repair,
+            'warm_start_time_limit': self.warm_start_time_limit,
+            'checkpoint_interval_seconds': self.checkpoint_interval_seconds,
+            'resume': self.resume,
+            'strategy': self.strategy,
+            'lns_time_slice': self.lns_time_slice,
+            'lns_initial_time': self.lns_initial_time,
+            'lns_seed': self.lns_seed,
+            'lexicographic_quota_seconds': self.lexicographic_quota_seconds,
+            'lexicographic_preference_seconds': self.lexicographic_preference_seconds,
+            'lexicographic_tolerance': self.lexicographic_tolerance,
+            'greedy_hint': self.greedy_hint,
+            'greedy_fallback': self.greedy_fallback,
+            'greedy_seed': self.greedy_seed,
+            'rolling_unit': self.rolling_unit,
+            'rolling_pacing': self.rolling_pacing,
+            'rolling_polish_fraction': self.rolling_polish_fraction,
+            'lagrangian_processes': self.lagrangian_processes,
+            'lagrangian_subproblem_seconds': self.lagrangian_subproblem_seconds,
+            'lagrangian_iterations': self.lagrangian_iterations,
+            'lagrangian_repair_seconds': self.lagrangian_repair_seconds,
+            'lp_bound': self.lp_bound,
+            'lp_bound_time_limit': self.lp_bound_time_limit,
+            'stop_gap': self.stop_gap,
+            'stop_plateau_percent': self.stop_plateau_percent,
+            'stop_plateau_minutes': self.stop_plateau_minutes,
+            'stop_target_score': self.stop_target_score,
+            'portfolio_size': self.portfolio_size,
+            'portfolio_cores': self.portfolio_cores,
+            'portfolio_round_seconds': self.portfolio_round_seconds,
+            'portfolio_seed': self.portfolio_seed,
+            'portfolio_profiles': list(self.portfolio_profiles),
+            'cpsat_parameters': dict(self.cpsat_parameters),
+            'events_path': self.events_path
         }
+    
+    def load_profile(self, path: Path) -> dict:
+        """
+        Charge un profil de paramètres CP-SAT (écrit par scripts/tune_solver.py)
+        
+        Returns:
+            dict: Métadonnées du réglage ('tuning')
+        """
+        with open(path, 'r', encoding='utf-8') as f:
+            profile = json.load(f)
+        if profile.get('num_workers'):
+            self.num_workers = int(profile['num_workers'])
+        self.cpsat_parameters = dict(profile.get('cpsat_parameters', {}))
+        logger.info(f"Profil CP-SAT chargé ({path}): {self.cpsat_parameters}")
+        return profile.get('tuning', {})
 
 @dataclass
 class ModelConfig:
@@ -34,6 +138,7 @@ class ModelConfig:
     calendar_unavailability: Dict = field(default_factory=dict)
     periodes: List = field(default_factory=list)
     output_dir: Path = None
+    data_dir: Path = None
     solver_params: SolverParams = field(default_factory=SolverParams)
     
     def validate(self) -> Tuple[bool, List[str]]:
@@ -68,6 +173,23 @@ class ModelConfig:
         if self.output_dir is None:
             errors.append("Répertoire de sortie non défini")
         
+        # Check solver strategy
+        if self.solver_params.strategy not in SOLVER_STRATEGIES:
+            errors.append(f"Stratégie de résolution inconnue: {self.solver_params.strategy} (attendu: {', '.join(SOLVER_STRATEGIES)})")
+        if self.solver_params.rolling_unit not in ROLLING_HORIZON_UNITS:
+            errors.append(f"Découpage de l'horizon glissant inconnu: {self.solver_params.rolling_unit} (attendu: {', '.join(ROLLING_HORIZON_UNITS)})")
+        if not 0.0 <= self.solver_params.rolling_polish_fraction < 1.0:
+            errors.append("rolling_polish_fraction doit être dans [0, 1)")
+        if not 0.0 <= self.solver_params.stop_gap < 1.0:
+            errors.append("stop_gap doit être dans [0, 1)")
+        if self.solver_params.stop_plateau_percent > 0 and self.solver_params.stop_plateau_minutes <= 0:
+            errors.append("stop_plateau_minutes doit être positif")
+        
+        # Check objective weights (bonus même jour écrit W_SAME_DAY/2 · (n² - n))
+        from scoring import W_SAME_DAY
+        if W_SAME_DAY % 2:
+            errors.append(f"W_SAME_DAY doit être pair (valeur: {W_SAME_DAY})")
+        
         # Check quotas coherence
         for disc in self.disciplines:
             total_quota = sum(disc.quota)
@@ -138,6 +260,7 @@ class ModelConfig:
             calendar_unavailability=load_calendars(data_dir),
             periodes=load_periodes(data_dir / "periodes.csv"),
             output_dir=data_dir.parent / "resultat",
+            data_dir=data_dir,
             solver_params=solver_cfg
         )
         
@@ -0,0 +1,147 @@
+"""
+EMISSION - Écriture directe des contraintes linéaires dans le proto CP-SAT
+
+model.Add(sum(vars) <= cap) construit en Python un arbre d'expression
+temporaire (un nœud par terme) avant de le linéariser. Les familles de
+contraintes disposent déjà des indices proto des variables (colonne var_index
+du VariableStore): LinearEmitter écrit directement les champs du proto à
+partir de tableaux d'indices et de coefficients.
+
+Forme canonique identique à celle de model.Add / model.Maximize (variables
+triées par indice, doublons fusionnés, coefficients nuls retirés, domaine
+[lb, ub] avec INT_MIN / INT_MAX pour une borne absente): le modèle écrit est
+le même, à l'octet près.
+
+Littéraux: indice de la variable, ou -indice-1 pour sa négation (var.Not().Index()).
+
+ObjectiveAccumulator cumule les termes de l'objectif par indice de variable
+(une même affectation reçoit plusieurs bonus: préférence, priorité de
+niveau...) et réduit les coefficients par leur PGCD avant l'écriture.
+"""
+import math
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+from ortools.sat.python import cp_model
+
+
+def canonical_terms(var_indices, coeffs=None):
+    """(indices triés et distincts, coefficients fusionnés non nuls), en listes"""
+    idx = np.asarray(var_indices, dtype=np.int64)
+    if coeffs is None:
+        # Cas courant (sum(vars), variables distinctes): tri Python, plus rapide que np.unique sur les petits groupes
+        values = idx.tolist()
+        if len(set(values)) == len(values):
+            return sorted(values), [1] * len(values)
+        vars_, merged = np.unique(idx, return_counts=True)
+    else:
+        vars_, inverse = np.unique(idx, return_inverse=True)
+        merged = np.zeros(len(vars_), dtype=np.int64)
+        np.add.at(merged, inverse, np.asarray(coeffs, dtype=np.int64))
+        nonzero = merged != 0
+        vars_, merged = vars_[nonzero], merged[nonzero]
+    return vars_.tolist(), merged.tolist()
+
+
+class ObjectiveAccumulator:
+    """
+    Objectif linéaire creux: coefficients cumulés par indice de variable
+
+    Usage:
+        objective = ObjectiveAccumulator()
+        objective.add(store.var_index[rows], bonus)  # même poids pour toutes les variables
+        objective.add([sat.Index(), excess.Index()], [w_fill, w_excess])
+        emit.maximize(*objective.consolidate())
+    """
+
+    def __init__(self):
+        self._vars: List[np.ndarray] = []
+        self._coeffs: List[np.ndarray] = []
+        self.report: Dict = {}
+
+    def __len__(self) -> int:
+        """Nombre de termes ajoutés (avant consolidation)"""
+        return sum(len(chunk) for chunk in self._vars)
+
+    def add(self, var_indices, coeffs):
+        """Ajoute coeffs * vars (coeffs: scalaire ou un coefficient par variable)"""
+        idx = np.asarray(var_indices, dtype=np.int64).ravel()
+        self._vars.append(idx)
+        self._coeffs.append(np.broadcast_to(np.asarray(coeffs, dtype=np.int64), idx.shape))
+
+    def raw_terms(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Termes tels qu'ajoutés (doublons inclus)"""
+        if not self._vars:
+            return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+        return np.concatenate(self._vars), np.concatenate(self._coeffs)
+
+    def consolidate(self) -> Tuple[List[int], List[int], int]:
+        """(indices distincts, coefficients fusionnés divisés par leur PGCD, PGCD)"""
+        var_indices, coeffs = self.raw_terms()
+        vars_, merged = canonical_terms(var_indices, coeffs)
+        scale = math.gcd(*merged) if merged else 1
+        self.report = {'terms': len(var_indices), 'distinct_vars': len(vars_), 'scale': scale}
+        return vars_, [c // scale for c in merged], scale
+
+
+class LinearEmitter:
+    """
+    Contraintes linéaires et objectif écrits depuis des tableaux d'indices
+
+    Usage:
+        emit = LinearEmitter(model)
+        emit.linear(store.var_index[rows], ub=cap)  # sum(vars) <= cap
+        index = emit.linear(indices, lb=1, ub=1, enforcement=[lit])  # indice proto de la contrainte
+        emit.maximize(indices, weights)
+    """
+
+    def __init__(self, model: cp_model.CpModel):
+        self.model = model
+        self.proto = model.Proto()
+
+    def linear(self, var_indices, lb: int = cp_model.INT_MIN, ub: int = cp_model.INT_MAX,
+               coeffs=None, enforcement: Optional[Sequence[int]] = None) -> int:
+        """lb <= sum(coeffs * vars) <= ub (coeffs absents: 1); retourne l'indice de la contrainte"""
+        vars_, merged = canonical_terms(var_indices, coeffs)
+        constraint = self.proto.constraints.add()
+        if enforcement:
+            constraint.enforcement_literal.extend(enforcement)
+        constraint.linear.vars.extend(vars_)
+        constraint.linear.coeffs.extend(merged)
+        constraint.linear.domain.extend([lb, ub])
+        return len(self.proto.constraints) - 1
+
+    def only_enforce_if(self, index: int, literals: Sequence[int]):
+        """Ajoute des littéraux d'activation à une contrainte existante (cf. Constraint.OnlyEnforceIf)"""
+        self.proto.constraints[index].enforcement_literal.extend(literals)
+
+    def bool_or(self, literals: Sequence[int]) -> int:
+        constraint = self.proto.constraints.add()
+        constraint.bool_or.literals.extend(literals)
+        return len(self.proto.constraints) - 1
+
+    def at_most_one(self, literals: Sequence[int]) -> int:
+        constraint = self.proto.constraints.add()
+        constraint.at_most_one.literals.extend(literals)
+        return len(self.proto.constraints) - 1
+
+    def bool_and(self, literals: Sequence[int], enforcement: Optional[Sequence[int]] = None) -> int:
+        constraint = self.proto.constraints.add()
+        if enforcement:
+            constraint.enforcement_literal.extend(enforcement)
+        constraint.bool_and.literals.extend(literals)
+        return len(self.proto.constraints) - 1
+
+    def maximize(self, var_indices, coeffs, scale: int = 1):
+        """
+        Objectif max scale * sum(coeffs * vars), stocké comme model.Maximize (minimisation de l'opposé)
+
+        scale passe dans scaling_factor: ObjectiveValue() et les bornes restent
+        exprimées dans l'unité des poids d'origine.
+        """
+        vars_, merged = canonical_terms(var_indices, coeffs)
+        self.proto.clear_objective()
+        objective = self.proto.objective
+        objective.vars.extend(vars_)
+        objective.coeffs.extend([-c for c in merged])
+        objective.scaling_factor = -scale
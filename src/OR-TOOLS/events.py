@@ -0,0 +1,160 @@
+"""
+EVENTS - Flux d'événements de progression typés
+
+Remplace les lignes "PROGRESS|..." imprimées sur stdout (et le thread qui les
+émettait chaque seconde). ScheduleOptimizer publie sur son EventBus:
+ - PHASE_STARTED / PHASE_FINISHED: construction, borne, résolution...
+ - PROGRESS: étape de préparation avec pourcentage (ancien _notify_progress)
+ - INCUMBENT: nouvelle meilleure solution (objectif, borne, écart)
+ - BOUND: amélioration de la borne CP-SAT (best_bound_callback)
+ - HEARTBEAT: signe de vie pendant la recherche (callback de log CP-SAT)
+ - FINISHED: statut final, objectif, borne, écart, raison d'arrêt
+
+Abonnés: fonctions appelées dans le thread de publication (subscribe), files
+thread-safe consommées ailleurs (subscribe_queue / iter_events: interface
+Streamlit), fichier JSONL (JsonlSink) et logs (LogSink).
+"""
+import json
+import logging
+import queue
+import threading
+import time
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Optional
+
+logger = logging.getLogger(__name__)
+
+PHASE_STARTED = 'phase_started'
+PHASE_FINISHED = 'phase_finished'
+PROGRESS = 'progress'
+INCUMBENT = 'incumbent'
+BOUND = 'bound'
+HEARTBEAT = 'heartbeat'
+FINISHED = 'finished'
+
+
+@dataclass
+class ProgressEvent:
+    """Événement de progression (champs non pertinents à None)"""
+    kind: str
+    phase: Optional[str] = None
+    message: Optional[str] = None
+    percent: Optional[int] = None
+    elapsed: Optional[float] = None  # Secondes depuis le début de la phase de résolution
+    remaining: Optional[float] = None
+    objective: Optional[float] = None
+    bound: Optional[float] = None
+    gap: Optional[float] = None
+    data: Dict = field(default_factory=dict)
+    timestamp: float = field(default_factory=time.time)
+
+    def to_dict(self) -> dict:
+        return {key: value for key, value in asdict(self).items() if value is not None and value != {}}
+
+
+class EventBus:
+    """
+    Diffusion thread-safe des événements aux abonnés
+
+    Usage:
+        bus = EventBus()
+        bus.subscribe(JsonlSink(path))
+        events = bus.subscribe_queue()
+        bus.publish(ProgressEvent(INCUMBENT, objective=...))
+        event = events.get()
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._subscribers: List[Callable[[ProgressEvent], None]] = []
+
+    def subscribe(self, callback: Callable[[ProgressEvent], None]) -> Callable[[ProgressEvent], None]:
+        with self._lock:
+            self._subscribers.append(callback)
+        return callback
+
+    def unsubscribe(self, callback: Callable[[ProgressEvent], None]):
+        with self._lock:
+            if callback in self._subscribers:
+                self._subscribers.remove(callback)
+
+    def subscribe_queue(self, maxsize: int = 0) -> "queue.Queue[ProgressEvent]":
+        """File recevant chaque événement (à consommer depuis un autre thread)"""
+        events = queue.Queue(maxsize)
+
+        def enqueue(event: ProgressEvent):
+            try:
+                events.put_nowait(event)
+            except queue.Full:  # Consommateur trop lent: l'événement est perdu pour lui seul
+                pass
+
+        self.subscribe(enqueue)
+        return events
+
+    def publish(self, event: ProgressEvent):
+        with self._lock:
+            subscribers = list(self._subscribers)
+        for callback in subscribers:
+            try:
+                callback(event)
+            except Exception as e:  # Un abonné défaillant n'interrompt pas la résolution
+                logger.warning(f"Abonné aux événements en échec ({event.kind}): {e}")
+
+    def emit(self, kind: str, **fields) -> ProgressEvent:
+        event = ProgressEvent(kind, **fields)
+        self.publish(event)
+        return event
+
+
+def iter_events(events: "queue.Queue[ProgressEvent]", until: Callable[[], bool], timeout: float = 0.5) -> Iterator[ProgressEvent]:
+    """
+    Itère sur une file d'événements jusqu'à ce que until() soit vrai et la file vide
+
+    Ex: for event in iter_events(events, lambda: not worker.is_alive()): ...
+    """
+    while True:
+        try:
+            yield events.get(timeout=timeout)
+        except queue.Empty:
+            if until():
+                return
+
+
+class JsonlSink:
+    """Abonné écrivant chaque événement sur une ligne JSON"""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._file = open(self.path, "a", encoding="utf-8")
+
+    def __call__(self, event: ProgressEvent):
+        line = json.dumps(event.to_dict(), ensure_ascii=False, default=str)
+        with self._lock:
+            self._file.write(line + "\n")
+            self._file.flush()
+
+    def close(self):
+        with self._lock:
+            self._file.close()
+
+
+class LogSink:
+    """Abonné journalisant les événements de résolution (les étapes sont déjà journalisées)"""
+
+    def __init__(self, log: logging.Logger = logger, heartbeat_interval: float = 60.0):
+        self.log = log
+        self.heartbeat_interval = heartbeat_interval
+        self._last_heartbeat = 0.0
+
+    def __call__(self, event: ProgressEvent):
+        if event.kind == INCUMBENT:
+            gap = f", écart {100 * event.gap:.2f}%" if event.gap is not None else ""
+            self.log.info(f"Solution {event.data.get('solution', '')}: {event.objective:,.0f} à {event.elapsed:.0f}s{gap}")
+        elif event.kind == HEARTBEAT and event.timestamp - self._last_heartbeat >= self.heartbeat_interval:
+            self._last_heartbeat = event.timestamp
+            self.log.info(f"Recherche en cours: {event.elapsed:.0f}s écoulées, {event.remaining:.0f}s restantes")
+        elif event.kind in (PHASE_STARTED, PHASE_FINISHED):
+            self.log.info(f"{'Début' if event.kind == PHASE_STARTED else 'Fin'} de phase: {event.phase}")
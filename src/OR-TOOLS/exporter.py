@@ -8,7 +8,7 @@ from typing import Dict
 
 logger = logging.getLogger(__name__)
 
-def export_planning(result, output_path: Path, config, optimizer):
+def export_planning(result, output_path: Path, config, optimizer, allow_heuristic: bool = False):
     """
     Export planning solution to CSV
     
@@ -17,9 +17,13 @@ def export_planning(result, output_path: Path, config, optimizer):
         output_path: Path to output CSV file
         config: ModelConfig instance
         optimizer: ScheduleOptimizer instance (for accessing vacations, eleve_dict, etc.)
+        allow_heuristic: exporte aussi un aperçu glouton incomplet (statut 'HEURISTIC')
+    
+    Returns:
+        True si le fichier a été écrit, False sinon
     """
-    if not result.is_success():
-        logger.error("Cannot export: optimization was not successful")
+    if not (result.is_success() or (allow_heuristic and result.status == 'HEURISTIC')):
+        logger.error(f"Cannot export: optimization was not successful ({result.status})")
         return False
     
     try:
@@ -0,0 +1,359 @@
+"""
+GREEDY - Construction gloutonne rapide d'un planning (NumPy, sans CP-SAT)
+
+Produit un planning en quelques secondes à partir des mêmes données que
+ScheduleOptimizer (prepare_data): aperçu rapide, hint de départ pour CP-SAT ou
+solution de repli si la résolution n'aboutit pas.
+
+1. Couverture: vacations à remplir (be_filled), mixité des niveaux et
+   remplacement de niveau, servies en premier tant que les élèves sont libres.
+2. Quotas, semaine par semaine: chaque unité (élève seul ou binôme) avance vers
+   son quota au prorata de ses semaines disponibles; les unités les plus en
+   retard sont servies en premier. Le créneau retenu dans la semaine est le
+   moins chargé, en favorisant jour préféré, même jour et paires de jours.
+3. Rattrapage: les quotas non atteints sont complétés sur toute l'année.
+4. Couverture à nouveau pour les vacations encore incomplètes. Les élèves sous
+   leur quota sont toujours choisis en priorité.
+
+Toute affectation respecte capacité, unicité, binômes, limite hebdomadaire,
+fréquence, répartition semestrielle, continuité et mixité "même niveau". Les
+contraintes de couverture peuvent rester violées: elles sont comptées
+(PlanningScorer.violations) et le statut est alors 'HEURISTIC'.
+"""
+import logging
+import math
+import random
+import time
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from scoring import N_WEEKS, SLOTS_PER_WEEK, PlanningScorer
+
+logger = logging.getLogger(__name__)
+
+
+class GreedyScheduler:
+    """
+    Heuristique constructive sur les données préparées d'un ScheduleOptimizer
+
+    Usage:
+        greedy = GreedyScheduler(optimizer)
+        result = greedy.solve()           # OptimizationResult
+        keys = greedy.assignment_keys()   # hint pour CP-SAT (cf. warm_start.apply_hint_keys)
+    """
+
+    def __init__(self, optimizer, seed: int = 0):
+        self.optimizer = optimizer
+        self.scorer = PlanningScorer(optimizer)  # Exécute prepare_data() si nécessaire
+        self.rng = random.Random(seed)
+        self.X: Optional[np.ndarray] = None
+
+        sc = self.scorer
+        self.disciplines = sc.disciplines
+        self.A = sc.availability
+        self.partner = sc.partner
+        self.quota = sc.quota
+        self.cap = sc.capacity
+        self.vac_jour = sc.vac_jour.astype(np.int64)
+        self.level_pos = {lv: i for i, lv in enumerate(sc.levels)}
+        self.student_level = np.array([self.level_pos[lv] for lv in sc.level.tolist()], dtype=np.int64)
+        self.preferred_day = [el.jour_preference.value - 1 for el in sc.eleves]
+
+        n_s, n_d, n_v = self.A.shape
+        self.wk_limit = [disc.nb_vacations_par_semaine for disc in self.disciplines]
+        self.freq = [disc.frequence_vacations for disc in self.disciplines]
+        self.sem = [tuple(disc.repartition_semestrielle[:2]) if disc.repartition_semestrielle else None
+                    for disc in self.disciplines]
+        self.cont = [
+            tuple(disc.repetition_continuite[:2])
+            if isinstance(disc.repetition_continuite, (list, tuple))
+            and disc.repetition_continuite[0] > 0 and disc.repetition_continuite[1] > 0 else None
+            for disc in self.disciplines
+        ]
+        weekly_avail = sc.weekly(self.A)
+        self.sem_both = (weekly_avail[:, :, :26].sum(axis=2) > 0) & (weekly_avail[:, :, 26:].sum(axis=2) > 0)
+        self.avail_weeks = weekly_avail > 0  # [élève, discipline, semaine]
+
+        # État courant
+        self.X = np.zeros(self.A.shape, dtype=bool)
+        self.load = np.zeros((n_d, n_v), dtype=np.int64)
+        self.busy = np.zeros((n_s, n_v), dtype=bool)
+        self.week_count = np.zeros((n_s, n_d, N_WEEKS), dtype=np.int64)
+        self.total = np.zeros((n_s, n_d), dtype=np.int64)
+        self.sem_count = np.zeros((n_s, n_d, 2), dtype=np.int64)
+        self.day_count = np.zeros((n_s, n_d, 5), dtype=np.int64)
+        self.level_count = np.zeros((n_d, n_v, len(self.level_pos)), dtype=np.int64)
+
+    # Unités
+
+    def _members(self, s_pos: int, d_pos: int) -> Tuple[int, ...]:
+        p = int(self.partner[s_pos, d_pos])
+        return (s_pos,) if p < 0 else tuple(sorted((s_pos, p)))
+
+    def _units(self, d_pos: int) -> List[Tuple[int, ...]]:
+        """Unités ayant au moins une disponibilité dans la discipline"""
+        units = set()
+        for s_pos in np.flatnonzero(self.A[:, d_pos, :].any(axis=1)).tolist():
+            units.add(self._members(s_pos, d_pos))
+        return sorted(units)
+
+    def _remaining(self, members, d_pos: int) -> int:
+        return min(int(self.quota[m, d_pos] - self.total[m, d_pos]) for m in members)
+
+    # Faisabilité incrémentale
+
+    def _feasible(self, members, d_pos: int, v_idx: int) -> bool:
+        cap = self.cap[d_pos, v_idx]
+        if cap > 0 and self.load[d_pos, v_idx] + len(members) > cap:
+            return False
+        w = v_idx // SLOTS_PER_WEEK
+        for m in members:
+            if not self.A[m, d_pos, v_idx] or self.busy[m, v_idx]:
+                return False
+            counts = self.week_count[m, d_pos]
+            limit = self.wk_limit[d_pos]
+            if limit > 0 and counts[w] >= limit:
+                return False
+            f = self.freq[d_pos]
+            if f > 1 and counts[max(0, w - f + 1):min(N_WEEKS, w + f)].sum() - counts[w] > 0:
+                return False
+            sem = self.sem[d_pos]
+            if sem is not None and self.sem_both[m, d_pos]:
+                half = 0 if w < 26 else 1
+                if self.sem_count[m, d_pos, half] >= sem[half]:
+                    return False
+            cont = self.cont[d_pos]
+            if cont is not None:
+                limit, distance = cont
+                for start in range(max(0, w - distance + 1), w + 1):
+                    if counts[start:min(start + distance, N_WEEKS)].sum() + 1 > limit:
+                        return False
+
+        mix = self.disciplines[d_pos].mixite_groupes
+        if mix in (1, 3):
+            present = self.level_count[d_pos, v_idx]
+            levels = [int(self.student_level[m]) for m in members]
+            if mix == 3:
+                others = set(np.flatnonzero(present).tolist()) | set(levels)
+                if len(others) > 1:
+                    return False
+            else:
+                for lv in set(levels):
+                    if present[lv] + levels.count(lv) > 1:
+                        return False
+        return True
+
+    def _assign(self, members, d_pos: int, v_idx: int):
+        w = v_idx // SLOTS_PER_WEEK
+        for m in members:
+            self.X[m, d_pos, v_idx] = True
+            self.busy[m, v_idx] = True
+            self.week_count[m, d_pos, w] += 1
+            self.total[m, d_pos] += 1
+            self.sem_count[m, d_pos, 0 if w < 26 else 1] += 1
+            self.day_count[m, d_pos, self.vac_jour[v_idx]] += 1
+            self.level_count[d_pos, v_idx, self.student_level[m]] += 1
+        self.load[d_pos, v_idx] += len(members)
+
+    def _best_vacation(self, members, d_pos: int, vacations) -> Optional[int]:
+        """Créneau faisable le moins chargé, en favorisant les bonus de l'objectif"""
+        disc = self.disciplines[d_pos]
+        leader = members[0]
+        best, best_key = None, None
+        for v_idx in vacations:
+            if not self._feasible(members, d_pos, v_idx):
+                continue
+            day = int(self.vac_jour[v_idx])
+            bonus = 0
+            if disc.id_discipline == 1 and disc.take_jour_pref and day == self.preferred_day[leader]:
+                bonus += 2
+            if disc.meme_jour:
+                days = self.day_count[leader, d_pos]
+                bonus += int(days[day] > 0 or (day > 0 and days[day - 1] > 0) or (day < 4 and days[day + 1] > 0))
+            if disc.paire_jours:
+                week = v_idx // SLOTS_PER_WEEK
+                assigned = self.X[leader, d_pos, week * SLOTS_PER_WEEK:(week + 1) * SLOTS_PER_WEEK]
+                days_this_week = set((np.flatnonzero(assigned) // 2).tolist())
+                bonus += sum(1 for d1, d2 in disc.paire_jours
+                             if (day == d1 and d2 in days_this_week) or (day == d2 and d1 in days_this_week))
+            cap = self.cap[d_pos, v_idx]
+            ratio = self.load[d_pos, v_idx] / cap if cap > 0 else 0.0
+            key = (-bonus, ratio, self.rng.random())
+            if best_key is None or key < best_key:
+                best, best_key = v_idx, key
+        return best
+
+    # Phases
+
+    def _fill_quotas(self):
+        """Phase 2: progression au prorata des semaines disponibles, semaine par semaine"""
+        units = [(members, d_pos) for d_pos in range(len(self.disciplines)) for members in self._units(d_pos)
+                 if self._remaining(members, d_pos) > 0]
+        cum_weeks = {}
+        for members, d_pos in units:
+            weeks = self.avail_weeks[members[0], d_pos]
+            cum_weeks[(members, d_pos)] = np.cumsum(weeks)
+
+        for w in range(N_WEEKS):
+            week_vacations = range(w * SLOTS_PER_WEEK, (w + 1) * SLOTS_PER_WEEK)
+            candidates = []
+            for unit in units:
+                members, d_pos = unit
+                remaining = self._remaining(members, d_pos)
+                if remaining <= 0 or not self.avail_weeks[members[0], d_pos, w]:
+                    continue
+                cum = cum_weeks[unit]
+                quota = min(int(self.quota[m, d_pos]) for m in members)
+                target = math.ceil(quota * cum[w] / cum[-1])
+                need = target - int(self.total[members[0], d_pos])
+                if need > 0:
+                    weeks_left = int(cum[-1] - cum[w]) + 1
+                    candidates.append((-remaining / weeks_left, self.rng.random(), need, unit))
+            candidates.sort()
+
+            for _, _, need, (members, d_pos) in candidates:
+                for _ in range(need):
+                    v_idx = self._best_vacation(members, d_pos, week_vacations)
+                    if v_idx is None:
+                        break
+                    self._assign(members, d_pos, v_idx)
+
+    def _catch_up(self):
+        """Phase 3: quotas non atteints complétés sur toute l'année"""
+        for d_pos in range(len(self.disciplines)):
+            for members in self._units(d_pos):
+                remaining = self._remaining(members, d_pos)
+                if remaining <= 0:
+                    continue
+                vacations = np.flatnonzero(self.A[members[0], d_pos]).tolist()
+                self.rng.shuffle(vacations)
+                for _ in range(remaining):
+                    v_idx = self._best_vacation(members, d_pos, vacations)
+                    if v_idx is None:
+                        break
+                    self._assign(members, d_pos, v_idx)
+
+    def _add_one(self, d_pos: int, v_idx: int, level: Optional[int] = None, max_size: Optional[int] = None) -> bool:
+        """
+        Ajoute une unité sur (discipline, vacation), de préférence sous son quota
+
+        Ordre de préférence: quota restant (gain), quota nul (neutre), puis le
+        plus faible dépassement (pénalité).
+        """
+        candidates = []
+        seen = set()
+        for s_pos in np.flatnonzero(self.A[:, d_pos, v_idx] & ~self.busy[:, v_idx]).tolist():
+            members = self._members(s_pos, d_pos)
+            if members in seen:
+                continue
+            seen.add(members)
+            if max_size is not None and len(members) > max_size:
+                continue
+            if level is not None and level not in [int(self.student_level[m]) for m in members]:
+                continue
+            remaining = self._remaining(members, d_pos)
+            quota = min(int(self.quota[m, d_pos]) for m in members)
+            rank = 0 if remaining > 0 else (1 if quota == 0 else 2)
+            candidates.append((rank, -remaining, self.rng.random(), members))
+        candidates.sort()
+        for _, _, _, members in candidates:
+            if self._feasible(members, d_pos, v_idx):
+                self._assign(members, d_pos, v_idx)
+                return True
+        return False
+
+    def _cover(self):
+        """Phases 1 et 4: vacations à remplir, mixité et remplacement de niveau"""
+        n_levels = len(self.level_pos)
+        for d_pos, disc in enumerate(self.disciplines):
+            A = self.A[:, d_pos, :]
+            has_rows = A.any(axis=0)
+            level_avail = np.stack([A[self.student_level == lv].any(axis=0) for lv in range(n_levels)])
+
+            for v_idx in np.flatnonzero(has_rows).tolist():
+                present = self.level_count[d_pos, v_idx]
+                avail = np.flatnonzero(level_avail[:, v_idx]).tolist()
+
+                if disc.mixite_groupes == 1:
+                    for lv in avail:
+                        if present[lv] == 0:
+                            self._add_one(d_pos, v_idx, level=lv)
+                elif disc.mixite_groupes == 2 and len(avail) >= 2:
+                    for lv in self.rng.sample(avail, len(avail)):
+                        if np.count_nonzero(present) >= 2:
+                            break
+                        if present[lv] == 0:
+                            self._add_one(d_pos, v_idx, level=lv)
+
+                cap = int(self.cap[d_pos, v_idx])
+                for niv_from, niv_to, percentage in disc.remplacement_niveau or []:
+                    if niv_from not in self.level_pos or niv_to not in self.level_pos:
+                        continue
+                    lv_from, lv_to = self.level_pos[niv_from], self.level_pos[niv_to]
+                    required = int((percentage / 100.0) * cap)
+                    if required <= 0 or not level_avail[lv_to, v_idx] or present[lv_from] > 0:
+                        continue
+                    if level_avail[lv_from, v_idx] and self._add_one(d_pos, v_idx, level=lv_from):
+                        continue
+                    while present[lv_to] < required and self._add_one(d_pos, v_idx, level=lv_to):
+                        pass
+
+                slot = int(self.optimizer.vac_slot[v_idx])
+                presence = len(disc.presence) > slot and disc.presence[slot]
+                if disc.be_filled and presence and cap > 0:
+                    while self.load[d_pos, v_idx] < cap:
+                        if not self._add_one(d_pos, v_idx, max_size=cap - int(self.load[d_pos, v_idx])):
+                            break
+
+    # Résolution
+
+    def run(self) -> Dict:
+        """Construit le planning; retourne score, violations et durées"""
+        start = time.perf_counter()
+        self._cover()
+        t_cover = time.perf_counter()
+        self._fill_quotas()
+        t_quotas = time.perf_counter()
+        self._catch_up()
+        t_catch_up = time.perf_counter()
+        self._cover()
+        end = time.perf_counter()
+
+        below = (self.total < self.quota) & self.A.any(axis=2) & (self.quota > 0)
+        report = {
+            'seconds': round(end - start, 3),
+            'phases': {
+                'couverture': round((t_cover - start) + (end - t_catch_up), 3),
+                'quotas': round(t_quotas - t_cover, 3),
+                'rattrapage': round(t_catch_up - t_quotas, 3),
+            },
+            'score': self.scorer.score(self.X),
+            'violations': self.scorer.violations(self.X),
+            'quotas_non_atteints': int(below.sum()),
+        }
+        logger.info(
+            f"✓ Planning glouton construit en {report['seconds']:.1f}s: score {report['score']['total']:,.0f}, "
+            f"{report['quotas_non_atteints']} quotas non atteints"
+        )
+        violated = {name: n for name, n in report['violations'].items() if n}
+        if violated:
+            logger.warning(f"  Contraintes non satisfaites: {violated}")
+        return report
+
+    def solve(self):
+        """Construit le planning et retourne un OptimizationResult (statut 'FEASIBLE' ou 'HEURISTIC')"""
+        start = time.time()
+        report = self.run()
+        if not self.optimizer.max_theoretical_score:
+            self.optimizer.max_theoretical_score = self.scorer.max_theoretical_score()
+        status = 'HEURISTIC' if any(report['violations'].values()) else 'FEASIBLE'
+        result = self.optimizer._solution_result(
+            status, report['score']['total'], self.scorer.assignments_from_tensor(self.X), time.time() - start
+        )
+        result.statistics['greedy'] = report
+        return result
+
+    def assignment_keys(self) -> List[Tuple[int, int, int]]:
+        """Affectations (id_eleve, id_discipline, v_idx) du planning construit"""
+        return list(self.scorer.assignments_from_tensor(self.X))
@@ -0,0 +1,421 @@
+"""
+LAGRANGIAN - Décomposition lagrangienne par élève (expérimental)
+
+Hors binômes, les élèves ne sont couplés que par les contraintes par vacation:
+capacité, remplissage, mixité et remplacement de niveau. Le moteur découpe le
+proto du modèle construit en sous-problèmes indépendants, un par unité (élève,
+ou élèves reliés par une variable de binôme):
+ - variables et contraintes propres à l'unité (unicité, max par semaine,
+   fréquence, semestre, continuité, quotas, bonus) recopiées telles quelles
+ - contraintes couplantes linéaires sur les seules variables de décision
+   (capacité, remplissage, mixité "un par niveau") dualisées: multiplicateurs
+   par contrainte, mis à jour par sous-gradient (pas de Polyak)
+ - autres contraintes couplantes (mixité par indicateurs de niveau, remplacement
+   conditionnel) relâchées
+
+Pour des multiplicateurs positifs, la somme des bornes des sous-problèmes plus
+le terme des multiplicateurs majore l'objectif du modèle complet: c'est une
+borne supérieure valide (cf. max_theoretical_score, beaucoup plus lâche). Les
+sous-problèmes d'une itération sont résolus en parallèle dans un pool de
+processus. Les élèves d'un même groupe de calendrier ont des sous-problèmes
+identiques (mêmes vacations, donc mêmes multiplicateurs): chaque sous-problème
+distinct n'est résolu qu'une fois par itération. Les affectations de la dernière
+itération servent ensuite de hint au modèle complet, réparé au plus proche
+planning faisable (warm_start.apply_hint_keys).
+"""
+import logging
+import multiprocessing
+import os
+import tempfile
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import numpy as np
+from google.protobuf import text_format
+from ortools.sat import cp_model_pb2
+from ortools.sat.python import cp_model
+
+from warm_start import apply_hint_keys
+
+logger = logging.getLogger(__name__)
+
+# Champs du proto qui référencent des variables (indice, ou -indice-1 pour la négation)
+REF_FIELDS = ('vars', 'literals', 'enforcement_literal')
+
+
+def _ref_lists(message):
+    """Listes répétées de références à des variables contenues dans un message du proto"""
+    for descriptor, value in message.ListFields():
+        if descriptor.type == descriptor.TYPE_MESSAGE:
+            children = value if descriptor.label == descriptor.LABEL_REPEATED else [value]
+            for child in children:
+                yield from _ref_lists(child)
+        elif descriptor.name in REF_FIELDS:
+            yield value
+
+
+def _var_of(ref: int) -> int:
+    return ref if ref >= 0 else -ref - 1
+
+
+def _remap(message, local: Dict[int, int]):
+    """Renumérote les références d'un message (copie) selon local: indice global -> local"""
+    for refs in _ref_lists(message):
+        renumbered = [local[r] if r >= 0 else -local[-r - 1] - 1 for r in refs]
+        del refs[:]
+        refs.extend(renumbered)
+
+
+# Processus du pool: sous-problèmes distincts chargés une fois par processus
+
+_UNIT_MODELS: List[cp_model.CpModel] = []
+
+
+def _init_worker(class_protos: List[bytes]):
+    global _UNIT_MODELS
+    _UNIT_MODELS = []
+    for data in class_protos:
+        proto = cp_model_pb2.CpModelProto()
+        proto.ParseFromString(data)
+        model = cp_model.CpModel()
+        model.Proto().parse_text_format(text_format.MessageToString(proto))
+        _UNIT_MODELS.append(model)
+
+
+def _solve_unit(task):
+    """Résout un sous-problème (objectif réel: poids de l'objectif moins pénalités)"""
+    key, unit_class, obj_vars, obj_coeffs, decision_vars, time_limit = task
+    model = _UNIT_MODELS[unit_class]
+    proto = model.Proto()
+    proto.clear_floating_point_objective()
+    objective = proto.floating_point_objective
+    objective.vars.extend(obj_vars)
+    objective.coeffs.extend(obj_coeffs)
+    objective.maximize = True
+
+    solver = cp_model.CpSolver()
+    solver.parameters.max_time_in_seconds = time_limit
+    solver.parameters.num_workers = 1
+    status = solver.Solve(model)
+    if status not in (cp_model.OPTIMAL, cp_model.FEASIBLE):
+        return key, status.name, None, None, None
+    solution = solver.ResponseProto().solution
+    values = np.fromiter((solution[i] for i in decision_vars), dtype=np.int8, count=len(decision_vars))
+    return key, status.name, solver.ObjectiveValue(), solver.BestObjectiveBound(), values
+
+
+@dataclass
+class LagrangianResult:
+    """Résultat de la décomposition lagrangienne"""
+    status: str
+    upper_bound: Optional[float] = None  # Meilleure borne supérieure (valide) de l'objectif
+    objective: Optional[float] = None  # Score du planning réparé
+    values: Optional[np.ndarray] = field(default=None, repr=False)  # Solution complète faisable
+    history: List[Dict] = field(default_factory=list)
+    decomposition: Dict = field(default_factory=dict)
+
+    @property
+    def gap(self) -> Optional[float]:
+        if self.upper_bound is None or self.objective is None or self.upper_bound <= 0:
+            return None
+        return max(0.0, (self.upper_bound - self.objective) / self.upper_bound)
+
+    def to_dict(self) -> dict:
+        return {
+            'status': self.status,
+            'upper_bound': self.upper_bound,
+            'objective': self.objective,
+            'gap': self.gap,
+            'iterations': len(self.history),
+            'decomposition': self.decomposition,
+            'history': self.history,
+        }
+
+
+class LagrangianDecomposition:
+    """
+    Borne supérieure et planning par relaxation lagrangienne des couplages entre élèves
+
+    Usage:
+        lagrangian = LagrangianDecomposition(optimizer, processes=8)
+        result = lagrangian.run(time_limit=1800, target=greedy_score)
+    """
+
+    def __init__(self, optimizer, processes: int = 0, subproblem_seconds: float = 5.0):
+        if optimizer.model is None:
+            raise RuntimeError("Modèle non construit: appeler prepare_and_build() avant la décomposition")
+        self.optimizer = optimizer
+        self.processes = processes or os.cpu_count() or 1
+        self.subproblem_seconds = subproblem_seconds
+        self._decompose()
+
+    # Découpage
+
+    def _full_proto(self) -> cp_model_pb2.CpModelProto:
+        """Copie du proto du modèle (format binaire via fichier: rapide, même avec le wrapper C++)"""
+        proto = cp_model_pb2.CpModelProto()
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "model.pb"
+            self.optimizer.model.ExportToFile(str(path))
+            proto.ParseFromString(path.read_bytes())
+        return proto
+
+    def _units(self, n_vars: int) -> np.ndarray:
+        """Unité de chaque variable de décision (-1 ailleurs): élèves reliés par une variable partagée"""
+        store = self.optimizer.store
+        var_index = store.var_index
+        parent = list(range(len(self.optimizer.student_ids)))
+
+        def find(a):
+            while parent[a] != a:
+                parent[a] = parent[parent[a]]
+                a = parent[a]
+            return a
+
+        order = np.argsort(var_index, kind='stable')
+        sorted_vars = var_index[order]
+        shared = np.flatnonzero(sorted_vars[1:] == sorted_vars[:-1])
+        for a, b in zip(store.student[order[shared]].tolist(), store.student[order[shared + 1]].tolist()):
+            parent[find(a)] = find(b)
+
+        roots = sorted({find(s_pos) for s_pos in range(len(parent))})
+        unit_of_student = np.array([roots.index(find(s_pos)) for s_pos in range(len(parent))], dtype=np.int64)
+        unit_of_var = np.full(n_vars, -1, dtype=np.int64)
+        unit_of_var[var_index] = unit_of_student[store.student]
+        return unit_of_var
+
+    def _decompose(self):
+        start = time.perf_counter()
+        proto = self._full_proto()
+        n_vars = len(proto.variables)
+        unit_of_var = self._units(n_vars)
+        is_decision = unit_of_var >= 0
+        self.n_units = int(unit_of_var.max()) + 1
+
+        refs = [sorted({_var_of(r) for refs in _ref_lists(c) for r in refs}) for c in proto.constraints]
+
+        # Propagation aux variables auxiliaires: une contrainte ne touchant qu'une unité
+        # lui rattache ses variables encore libres (quotas, indicateurs, bonus)
+        changed = True
+        while changed:
+            changed = False
+            for constraint_vars in refs:
+                units = {int(unit_of_var[v]) for v in constraint_vars if unit_of_var[v] >= 0}
+                if len(units) == 1:
+                    unit = units.pop()
+                    for v in constraint_vars:
+                        if unit_of_var[v] < 0:
+                            unit_of_var[v] = unit
+                            changed = True
+
+        unit_constraints = [[] for _ in range(self.n_units)]
+        dualized, dropped = [], 0
+        for c_idx, (constraint, constraint_vars) in enumerate(zip(proto.constraints, refs)):
+            units = {int(unit_of_var[v]) for v in constraint_vars}
+            if len(units) == 1 and -1 not in units:
+                unit_constraints[units.pop()].append(c_idx)
+            elif (constraint.WhichOneof('constraint') == 'linear' and not constraint.enforcement_literal
+                    and all(is_decision[v] for v in constraint_vars)):
+                dualized.append(c_idx)
+            else:
+                dropped += 1
+
+        self._build_duals(proto, dualized)
+        self._build_objective(proto, unit_of_var)
+
+        # Sous-problèmes renumérotés
+        self.unit_vars = [np.flatnonzero(unit_of_var == u) for u in range(self.n_units)]
+        unit_protos = []
+        self.unit_decision = []  # Positions locales des variables de décision
+        for u, global_vars in enumerate(self.unit_vars):
+            local = {int(g): i for i, g in enumerate(global_vars.tolist())}
+            sub = cp_model_pb2.CpModelProto()
+            for g in global_vars.tolist():
+                sub.variables.add().domain.extend(proto.variables[g].domain)  # Sans nom: unités identiques comparables
+            for c_idx in unit_constraints[u]:
+                constraint = sub.constraints.add()
+                constraint.CopyFrom(proto.constraints[c_idx])
+                constraint.ClearField('name')
+                _remap(constraint, local)
+            unit_protos.append(sub.SerializeToString())
+            self.unit_decision.append(np.flatnonzero(is_decision[global_vars]))
+
+        # Sous-problèmes distincts (élèves aux disponibilités identiques)
+        self.class_protos = sorted(set(unit_protos))
+        class_index = {data: i for i, data in enumerate(self.class_protos)}
+        self.unit_class = [class_index[data] for data in unit_protos]
+
+        self.decomposition = {
+            'units': self.n_units,
+            'distinct_subproblems': len(self.class_protos),
+            'unit_constraints': sum(len(c) for c in unit_constraints),
+            'dualized_constraints': len(dualized),
+            'dropped_constraints': dropped,
+            'free_objective_terms': int(self.free_terms),
+            'seconds': round(time.perf_counter() - start, 2),
+        }
+        logger.info(
+            f"✓ Décomposition: {self.n_units} unités ({len(self.class_protos)} distinctes), {len(dualized)} contraintes dualisées, "
+            f"{dropped} relâchées ({self.decomposition['seconds']}s)"
+        )
+
+    def _build_duals(self, proto, dualized: List[int]):
+        """Matrice creuse des contraintes dualisées et côtés bornés (<= hi: lambda, >= lo: nu)"""
+        rows, cols, coeffs = [], [], []
+        lo, hi = [], []
+        for row, c_idx in enumerate(dualized):
+            linear = proto.constraints[c_idx].linear
+            rows.extend([row] * len(linear.vars))
+            cols.extend(linear.vars)
+            coeffs.extend(linear.coeffs)
+            lo.append(linear.domain[0])
+            hi.append(linear.domain[-1])
+        self.dual_rows = np.asarray(rows, dtype=np.int64)
+        self.dual_cols = np.asarray(cols, dtype=np.int64)
+        self.dual_coeffs = np.asarray(coeffs, dtype=np.float64)
+        n = len(dualized)
+        low = np.bincount(self.dual_rows, weights=np.minimum(self.dual_coeffs, 0), minlength=n)
+        high = np.bincount(self.dual_rows, weights=np.maximum(self.dual_coeffs, 0), minlength=n)
+        self.dual_lo = np.asarray(lo, dtype=np.float64)
+        self.dual_hi = np.asarray(hi, dtype=np.float64)
+        self.has_hi = self.dual_hi < high  # Côté <= effectif
+        self.has_lo = self.dual_lo > low  # Côté >= effectif
+        self.dual_hi = np.where(self.has_hi, self.dual_hi, 0.0)
+        self.dual_lo = np.where(self.has_lo, self.dual_lo, 0.0)
+
+    def _build_objective(self, proto, unit_of_var: np.ndarray):
+        """Poids (à maximiser) de chaque variable; termes hors unité bornés par leur domaine"""
+        objective = proto.objective
+        scaling = objective.scaling_factor or 1
+        self.weights = np.zeros(len(proto.variables), dtype=np.float64)
+        np.add.at(self.weights, np.asarray(objective.vars, dtype=np.int64),
+                  np.asarray(objective.coeffs, dtype=np.float64) * scaling)
+        self.objective_offset = objective.offset * scaling
+
+        free = np.flatnonzero((self.weights != 0) & (unit_of_var < 0))
+        self.free_terms = len(free)
+        self.free_bound = 0.0
+        for g in free.tolist():
+            domain = proto.variables[g].domain
+            self.free_bound += max(self.weights[g] * domain[0], self.weights[g] * domain[-1])
+
+    # Itérations
+
+    def _tasks(self, penalty: np.ndarray):
+        """Sous-problèmes distincts de l'itération {clé: tâche} et clé de chaque unité"""
+        tasks, unit_keys = {}, []
+        for u, global_vars in enumerate(self.unit_vars):
+            coeffs = self.weights[global_vars] - penalty[global_vars]
+            key = (self.unit_class[u], coeffs.tobytes())
+            unit_keys.append(key)
+            if key not in tasks:
+                nonzero = np.flatnonzero(coeffs)
+                tasks[key] = (key, self.unit_class[u], nonzero.tolist(), coeffs[nonzero].tolist(),
+                              self.unit_decision[u].tolist(), self.subproblem_seconds)
+        return tasks, unit_keys
+
+    def run(self, time_limit: float, target: Optional[float] = None, max_iterations: int = 200,
+            repair_seconds: float = 120.0, tolerance: float = 1e-3, theta: float = 0.05) -> LagrangianResult:
+        """
+        Sous-gradient sur les multiplicateurs, puis réparation du dernier planning
+
+        Args:
+            time_limit: Temps des itérations (réparation non comprise)
+            target: Score d'un planning connu (ex: glouton) pour le pas de Polyak
+            max_iterations: Nombre maximum d'itérations
+            repair_seconds: Temps maximum de la réparation sur le modèle complet
+            tolerance: Arrêt si l'écart relatif entre borne et cible passe sous ce seuil
+            theta: Facteur initial du pas de Polyak (divisé par 2 après 5 itérations sans progrès)
+        """
+        start = time.perf_counter()
+        result = LagrangianResult(status='UNKNOWN', decomposition=self.decomposition)
+        n_duals = len(self.dual_lo)
+        lam = np.zeros(n_duals)  # Côté <=
+        nu = np.zeros(n_duals)  # Côté >=
+        stall = 0
+        n_vars = len(self.weights)
+        x = np.zeros(n_vars, dtype=np.int64)
+
+        context = multiprocessing.get_context("spawn")
+        logger.info(f"Décomposition lagrangienne: {self.processes} processus, {n_duals} multiplicateurs")
+        with context.Pool(self.processes, initializer=_init_worker, initargs=(self.class_protos,)) as pool:
+            for iteration in range(max_iterations):
+                if time.perf_counter() - start >= time_limit:
+                    break
+                # Pénalité de chaque variable de décision: somme des multiplicateurs pondérés
+                multipliers = lam - nu
+                penalty = np.zeros(n_vars)
+                np.add.at(penalty, self.dual_cols, self.dual_coeffs * multipliers[self.dual_rows])
+
+                bound = float(self.objective_offset + self.free_bound
+                              + np.dot(lam, self.dual_hi) - np.dot(nu, self.dual_lo))
+                tasks, unit_keys = self._tasks(penalty)
+                solutions = {key: (status, unit_bound, values)
+                             for key, status, _, unit_bound, values in pool.imap_unordered(_solve_unit, tasks.values())}
+                failed = [status for status, _, values in solutions.values() if values is None]
+                if failed:
+                    logger.warning(f"{len(failed)} sous-problèmes sans solution ({', '.join(sorted(set(failed)))})")
+                    result.status = 'ERROR'
+                    break
+                for u, key in enumerate(unit_keys):
+                    _, unit_bound, values = solutions[key]
+                    bound += unit_bound
+                    x[self.unit_vars[u][self.unit_decision[u]]] = values
+
+                if result.upper_bound is None or bound < result.upper_bound - 1e-6:
+                    result.upper_bound, stall = bound, 0
+                else:
+                    stall += 1
+                    if stall >= 5:
+                        theta, stall = theta / 2, 0
+
+                # Sous-gradient (projeté sur les multiplicateurs positifs)
+                activity = np.bincount(self.dual_rows, weights=self.dual_coeffs * x[self.dual_cols], minlength=n_duals)
+                g_hi = np.where(self.has_hi, activity - self.dual_hi, 0.0)
+                g_lo = np.where(self.has_lo, self.dual_lo - activity, 0.0)
+                g_hi[(lam <= 0) & (g_hi < 0)] = 0.0
+                g_lo[(nu <= 0) & (g_lo < 0)] = 0.0
+                norm = float(np.dot(g_hi, g_hi) + np.dot(g_lo, g_lo))
+                violated = int(np.count_nonzero(g_hi > 0) + np.count_nonzero(g_lo > 0))
+
+                result.history.append({
+                    'iteration': iteration,
+                    'elapsed': round(time.perf_counter() - start, 2),
+                    'bound': bound,
+                    'best_bound': result.upper_bound,
+                    'violated': violated,
+                    'subproblems': len(tasks),
+                    'theta': theta,
+                })
+                logger.info(f"  Itération {iteration}: borne {bound:,.0f} (meilleure {result.upper_bound:,.0f}), "
+                            f"{violated} contraintes violées")
+
+                reference = target if target is not None else 0.0
+                if norm == 0 or (target is not None and result.upper_bound - target <= tolerance * abs(result.upper_bound)):
+                    break  # Solution relâchée réalisable pour les contraintes dualisées, ou écart atteint
+                step = theta * max(bound - reference, 1.0) / norm
+                lam = np.maximum(0.0, lam + step * g_hi)
+                nu = np.maximum(0.0, nu + step * g_lo)
+                if theta < 1e-4:
+                    break
+
+        if result.upper_bound is None:
+            result.status = 'ERROR' if result.status == 'ERROR' else 'TIMEOUT'
+            return result
+
+        # Réparation: plus proche planning faisable des affectations de la dernière itération
+        keys = list(self.optimizer._assignments_from_values(x))
+        report = apply_hint_keys(self.optimizer, keys, "lagrangien", repair=True, time_limit=repair_seconds)
+        if report.solution is not None:
+            result.status = 'FEASIBLE'
+            result.values = report.solution
+            result.objective = report.hint_objective
+        elif result.status != 'ERROR':
+            result.status = 'BOUND_ONLY'
+        logger.info(
+            f"✓ Borne supérieure lagrangienne {result.upper_bound:,.0f}"
+            + (f", planning réparé {result.objective:,.0f} (écart {100 * result.gap:.1f}%)" if result.objective is not None else "")
+        )
+        return result
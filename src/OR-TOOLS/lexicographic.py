@@ -0,0 +1,133 @@
+"""
+LEXICOGRAPHIC - Résolution en deux étapes de l'objectif pondéré
+
+L'objectif V5_03_C mêle des poids de 5 à 30000: la borne de CP-SAT progresse
+lentement et la recherche arbitre sans cesse des bonus de préférence contre des
+quotas. La résolution lexicographique sépare les deux niveaux:
+ 1. quotas: maximise remplissage, dépassement et succès (termes sat/excess/success)
+ 2. préférences: le niveau de l'étape 1 est figé par une contrainte
+    (quotas >= valeur * (1 - tolérance)) et l'on maximise les termes restants
+    (préférences jour, priorités de niveau, paires de jours, même jour),
+    avec la solution de l'étape 1 en hint
+
+Chaque étape travaille sur une copie (Clone) du modèle: l'objectif du modèle de
+l'optimizer reste inchangé. Le score final est l'objectif complet du modèle
+évalué sur la solution retenue.
+"""
+import logging
+import math
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+import numpy as np
+from ortools.sat.python import cp_model
+
+from warm_start import objective_value
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class StagedSolution:
+    """Résultat de la résolution par étapes"""
+    status: str
+    values: Optional[np.ndarray] = field(default=None, repr=False)
+    objective: Optional[float] = None  # Objectif complet du modèle
+    stages: List[Dict] = field(default_factory=list)
+
+
+def split_objective(model: cp_model.CpModel, primary_vars) -> Dict[str, tuple]:
+    """
+    Sépare l'objectif (à maximiser) du modèle en deux parties
+
+    Returns:
+        {'quotas': (indices, poids), 'preferences': (indices, poids)}
+    """
+    objective = model.Proto().objective
+    scaling = objective.scaling_factor or 1
+    indices = np.asarray(objective.vars, dtype=np.int64)
+    weights = np.asarray(objective.coeffs, dtype=np.int64) * int(scaling)
+    primary = np.isin(indices, np.asarray(list(primary_vars), dtype=np.int64))
+    return {
+        'quotas': (indices[primary], weights[primary]),
+        'preferences': (indices[~primary], weights[~primary]),
+    }
+
+
+def _expression(model: cp_model.CpModel, part: tuple):
+    indices, weights = part
+    variables = [model.GetIntVarFromProtoIndex(i) for i in indices.tolist()]
+    return cp_model.LinearExpr.weighted_sum(variables, weights.tolist())
+
+
+def _set_hint(model: cp_model.CpModel, values: np.ndarray):
+    model.ClearHints()
+    hint = model.Proto().solution_hint
+    hint.vars.extend(range(len(values)))
+    hint.values.extend(values.tolist())
+
+
+def solve_lexicographic(optimizer, budgets: List[float], tolerance: float = 0.0,
+                        callback_factory=None) -> StagedSolution:
+    """
+    Résout le modèle de l'optimizer en deux étapes (quotas puis préférences)
+
+    Args:
+        optimizer: ScheduleOptimizer dont le modèle est construit
+        budgets: Temps maximum de chaque étape [quotas, préférences]
+        tolerance: Perte relative admise sur le niveau des quotas à l'étape 2
+        callback_factory: Fonction (time_limit) -> CpSolverSolutionCallback (suivi de progression)
+    """
+    params = optimizer.config.solver_params
+    parts = split_objective(optimizer.model, optimizer.quota_objective_vars)
+    if len(parts['quotas'][0]) == 0:
+        raise RuntimeError("Termes de quotas de l'objectif inconnus: reconstruire le modèle")
+
+    result = StagedSolution(status='UNKNOWN')
+    values = None
+    level = None
+
+    for stage, (name, time_limit) in enumerate(zip(('quotas', 'preferences'), budgets), start=1):
+        model = optimizer.model.Clone()
+        model.Maximize(_expression(model, parts[name]))
+        floor = None
+        if level is not None:
+            floor = math.floor(level - tolerance * abs(level))
+            model.Add(_expression(model, parts['quotas']) >= floor)
+            _set_hint(model, values)
+
+        solver = cp_model.CpSolver()
+        solver.parameters.max_time_in_seconds = time_limit
+        solver.parameters.num_workers = params.num_workers
+        logger.info(f"Étape {stage} ({name}): {time_limit:.0f}s")
+        start = time.perf_counter()
+        callback = callback_factory(time_limit) if callback_factory is not None else None
+        status = solver.Solve(model, callback) if callback is not None else solver.Solve(model)
+        seconds = time.perf_counter() - start
+
+        found = status in (cp_model.OPTIMAL, cp_model.FEASIBLE)
+        result.stages.append({
+            'stage': name,
+            'status': status.name,
+            'objective': solver.ObjectiveValue() if found else None,
+            'best_bound': solver.BestObjectiveBound() if found else None,
+            'floor': floor,
+            'seconds': round(seconds, 2),
+        })
+
+        if not found:
+            logger.warning(f"Étape {stage} ({name}): aucune solution ({status.name})")
+            if values is None:
+                result.status = 'TIMEOUT' if status == cp_model.UNKNOWN else status.name
+                return result
+            break  # On conserve la solution de l'étape précédente
+
+        values = np.asarray(solver.ResponseProto().solution, dtype=np.int64)
+        level = solver.ObjectiveValue() if name == 'quotas' else level
+        logger.info(f"✓ Étape {stage} ({name}): {status.name}, {solver.ObjectiveValue():,.0f} en {seconds:.1f}s")
+
+    result.status = 'FEASIBLE'
+    result.values = values
+    result.objective = objective_value(optimizer.model, values)
+    return result
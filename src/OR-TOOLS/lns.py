@@ -0,0 +1,349 @@
+"""
+LNS - Recherche à grand voisinage (Large Neighborhood Search) autour de CP-SAT
+
+Une résolution monolithique du modèle V5_03_C plafonne bien avant la limite de
+temps. Le moteur LNS part d'une solution (incumbent) et répète:
+ 1. choix d'un voisinage: une ou plusieurs disciplines, une fenêtre de semaines,
+    un niveau (sur une fenêtre de semaines), ou un groupe de binômes du même niveau
+ 2. copie du modèle (Clone) où toutes les variables de décision hors voisinage
+    sont fixées à leur valeur courante (domaine réduit), hint complet de l'incumbent
+ 3. résolution courte (time slice); la sous-solution est acceptée si son score
+    est au moins celui de l'incumbent
+
+Le type de voisinage est tiré proportionnellement au gain observé par seconde
+(moyenne mobile), et la taille de chaque type s'adapte: agrandie quand le
+sous-problème est résolu à l'optimum sans gain, réduite quand il n'aboutit pas
+dans le temps imparti. L'historique des itérations est conservé pour comparer
+LNS et résolution simple à temps égal (scripts/compare_lns.py).
+"""
+import json
+import logging
+import random
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import numpy as np
+from ortools.sat.python import cp_model
+
+logger = logging.getLogger(__name__)
+
+NEIGHBORHOODS = ("discipline", "semaines", "niveau", "binomes")
+
+# Taille initiale et bornes de chaque type de voisinage
+# (disciplines, semaines, semaines, binômes)
+SIZE_LIMITS = {
+    "discipline": (1, 1, 4),
+    "semaines": (2, 1, 8),
+    "niveau": (4, 1, 12),
+    "binomes": (6, 2, 40),
+}
+
+# Tirages consécutifs de voisinages vides avant l'arrêt de la recherche
+MAX_EMPTY_DRAWS = 100
+
+
+@dataclass
+class NeighborhoodStats:
+    """Statistiques adaptatives d'un type de voisinage"""
+    size: int
+    min_size: int
+    max_size: int
+    weight: float = 1.0  # Moyenne mobile du gain par seconde (normalisée)
+    tries: int = 0
+    improvements: int = 0
+    gain: float = 0.0
+    seconds: float = 0.0
+
+    def to_dict(self) -> dict:
+        return {
+            'size': self.size,
+            'weight': round(self.weight, 4),
+            'tries': self.tries,
+            'improvements': self.improvements,
+            'gain': self.gain,
+            'seconds': round(self.seconds, 2),
+        }
+
+
+@dataclass
+class LNSResult:
+    """Meilleure solution trouvée et historique de la recherche"""
+    status: str
+    objective: Optional[float] = None
+    values: Optional[np.ndarray] = field(default=None, repr=False)
+    history: List[Dict] = field(default_factory=list)
+    neighborhoods: Dict[str, Dict] = field(default_factory=dict)
+
+    def to_dict(self) -> dict:
+        return {
+            'status': self.status,
+            'objective': self.objective,
+            'iterations': len(self.history) - 1 if self.history else 0,
+            'neighborhoods': self.neighborhoods,
+            'history': self.history,
+        }
+
+
+class LNSDriver:
+    """
+    Moteur LNS sur le modèle construit d'un ScheduleOptimizer
+
+    Usage:
+        driver = LNSDriver(optimizer, time_slice=20.0)
+        result = driver.run(time_limit=3600, initial=values)  # initial optionnel
+        driver.save_history(output_dir / "lns_history.json")
+    """
+
+    def __init__(self, optimizer, time_slice: float = 20.0, initial_time: float = 60.0,
+                 seed: int = 0, decay: float = 0.7, on_improvement=None):
+        """
+        Args:
+            optimizer: ScheduleOptimizer dont le modèle est construit
+            time_slice: Temps maximum de chaque sous-problème (secondes)
+            initial_time: Temps de la résolution initiale si aucun incumbent n'est fourni
+            seed: Graine du tirage des voisinages
+            decay: Poids de l'historique dans la moyenne mobile des gains
+            on_improvement: Appelé avec (values, objective, elapsed) à chaque amélioration
+        """
+        self.optimizer = optimizer
+        self.model = optimizer.model
+        self.time_slice = time_slice
+        self.initial_time = initial_time
+        self.decay = decay
+        self.on_improvement = on_improvement
+        self.rng = random.Random(seed)
+        self.num_workers = optimizer.config.solver_params.num_workers
+        self.result: Optional[LNSResult] = None
+
+        self.stats = {
+            kind: NeighborhoodStats(size=size, min_size=lo, max_size=hi)
+            for kind, (size, lo, hi) in SIZE_LIMITS.items()
+        }
+        self._prepare_structures()
+
+    # Structures des voisinages
+
+    def _prepare_structures(self):
+        """Colonnes du registre par variable de décision, niveaux, unités (élève ou binôme)"""
+        store = self.optimizer.store
+        var_index = store.var_index
+
+        # Une ligne représentative par variable (les membres d'un binôme partagent la variable)
+        self.var_ids, first = np.unique(var_index, return_index=True)
+        self.var_discipline = store.discipline[first]
+        self.var_week = store.vacation[first] // 10
+        self.n_weeks = store.shape[2] // 10
+        self.n_disciplines = store.shape[1]
+
+        # Niveau de chaque élève, et ensemble des élèves de chaque variable
+        eleve_dict = self.optimizer.eleve_dict
+        student_level = np.array(
+            [eleve_dict[e_id].annee.value for e_id in self.optimizer.student_ids], dtype=np.int32
+        )
+        self.levels = sorted(set(student_level.tolist()))
+        self.var_levels = {}
+        for level in self.levels:
+            rows = student_level[store.student] == level
+            self.var_levels[level] = np.zeros(len(self.var_ids), dtype=bool)
+            self.var_levels[level][np.searchsorted(self.var_ids, var_index[rows])] = True
+
+        # Unités: élèves reliés par une variable partagée (union-find sur les binômes)
+        parent = list(range(len(self.optimizer.student_ids)))
+
+        def find(a):
+            while parent[a] != a:
+                parent[a] = parent[parent[a]]
+                a = parent[a]
+            return a
+
+        order = np.argsort(var_index, kind='stable')
+        sorted_vars = var_index[order]
+        shared = np.flatnonzero(sorted_vars[1:] == sorted_vars[:-1])
+        for a, b in zip(store.student[order[shared]].tolist(), store.student[order[shared + 1]].tolist()):
+            parent[find(a)] = find(b)
+
+        units = {}
+        for s_pos in range(len(parent)):
+            units.setdefault(find(s_pos), []).append(s_pos)
+        self.unit_of = np.array([find(s_pos) for s_pos in range(len(parent))], dtype=np.int32)
+        self.units_by_level = {}
+        for root, members in units.items():
+            self.units_by_level.setdefault(int(student_level[members[0]]), []).append(root)
+        self.var_unit_rows = (self.unit_of[store.student], np.searchsorted(self.var_ids, var_index))
+
+    def _neighborhood(self, kind: str) -> (np.ndarray, str):
+        """Masque des variables de décision libérées et description du voisinage"""
+        size = self.stats[kind].size
+
+        if kind == "discipline":
+            chosen = self.rng.sample(range(self.n_disciplines), min(size, self.n_disciplines))
+            ids = sorted(self.optimizer.discipline_ids[d] for d in chosen)
+            return np.isin(self.var_discipline, chosen), f"disciplines {ids}"
+
+        if kind == "semaines":
+            width = min(size, self.n_weeks)
+            start = self.rng.randrange(self.n_weeks - width + 1)
+            mask = (self.var_week >= start) & (self.var_week < start + width)
+            return mask, f"semaines {start + 1}-{start + width}"
+
+        if kind == "niveau":
+            level = self.rng.choice(self.levels)
+            width = min(size, self.n_weeks)
+            start = self.rng.randrange(self.n_weeks - width + 1)
+            mask = self.var_levels[level] & (self.var_week >= start) & (self.var_week < start + width)
+            return mask, f"niveau {level}, semaines {start + 1}-{start + width}"
+
+        # Groupe de binômes (ou élèves seuls) d'un même niveau
+        level = self.rng.choice(self.levels)
+        candidates = self.units_by_level[level]
+        chosen = self.rng.sample(candidates, min(size, len(candidates)))
+        row_units, row_vars = self.var_unit_rows
+        mask = np.zeros(len(self.var_ids), dtype=bool)
+        mask[row_vars[np.isin(row_units, chosen)]] = True
+        return mask, f"{len(chosen)} unités du niveau {level}"
+
+    def _choose_kind(self) -> str:
+        """Tirage proportionnel au gain par seconde observé (plancher pour continuer à explorer)"""
+        top = max(s.weight for s in self.stats.values())
+        floor = 0.1 * top if top > 0 else 1.0
+        kinds = list(self.stats)
+        return self.rng.choices(kinds, weights=[self.stats[k].weight + floor for k in kinds])[0]
+
+    # Résolutions
+
+    def _solve(self, model: cp_model.CpModel, time_limit: float):
+        solver = cp_model.CpSolver()
+        solver.parameters.max_time_in_seconds = time_limit
+        solver.parameters.num_workers = self.num_workers
+        status = solver.Solve(model)
+        if status in (cp_model.OPTIMAL, cp_model.FEASIBLE):
+            values = np.asarray(solver.ResponseProto().solution, dtype=np.int64)
+            return status, solver.ObjectiveValue(), values
+        return status, None, None
+
+    def _sub_model(self, values: np.ndarray, free: np.ndarray) -> cp_model.CpModel:
+        """Copie du modèle avec les variables hors voisinage fixées et l'incumbent en hint"""
+        sub = self.model.Clone()
+        proto = sub.Proto()
+        for idx, value in zip(self.var_ids[~free].tolist(), values[self.var_ids[~free]].tolist()):
+            domain = proto.variables[idx].domain
+            domain[0] = value
+            domain[1] = value
+
+        sub.ClearHints()
+        hint = proto.solution_hint
+        hint.vars.extend(range(len(values)))
+        hint.values.extend(values.tolist())
+        return sub
+
+    def run(self, time_limit: float, initial: Optional[np.ndarray] = None,
+            initial_objective: Optional[float] = None) -> LNSResult:
+        """
+        Lance la recherche pendant time_limit secondes
+
+        Args:
+            time_limit: Temps total (résolution initiale comprise)
+            initial: Valeurs de toutes les variables d'une solution faisable (ex: démarrage à chaud)
+            initial_objective: Score de cette solution
+        """
+        start = time.perf_counter()
+        deadline = start + time_limit
+        self.result = result = LNSResult(status='UNKNOWN')
+
+        values, objective = initial, initial_objective
+        if values is None:
+            logger.info(f"LNS: résolution initiale ({min(self.initial_time, time_limit):.0f}s)")
+            status, objective, values = self._solve(self.model, min(self.initial_time, time_limit))
+            remaining = deadline - time.perf_counter()
+            if values is None and status == cp_model.UNKNOWN and remaining >= 1.0:
+                logger.info(f"LNS: aucune solution initiale, nouvelle tentative ({remaining:.0f}s)")
+                status, objective, values = self._solve(self.model, remaining)
+            if values is None:
+                logger.warning("LNS: aucune solution initiale")
+                result.status = 'TIMEOUT' if status == cp_model.UNKNOWN else status.name
+                return result
+
+        result.status = 'FEASIBLE'
+        result.objective, result.values = objective, values
+        result.history.append({
+            'iteration': 0, 'neighborhood': 'initial', 'detail': '', 'free_variables': len(self.var_ids),
+            'status': 'FEASIBLE', 'objective': objective, 'best': objective,
+            'seconds': round(time.perf_counter() - start, 2), 'elapsed': round(time.perf_counter() - start, 2),
+            'accepted': True,
+        })
+        logger.info(f"LNS: incumbent initial {objective:,.0f}")
+
+        iteration = 0
+        empty_draws = 0
+        while True:
+            remaining = deadline - time.perf_counter()
+            if remaining < 1.0:
+                break
+            kind = self._choose_kind()
+            stats = self.stats[kind]
+            free, detail = self._neighborhood(kind)
+            if not free.any():
+                # Voisinage vide: tirage compté sans gain (poids réduit), voisinage agrandi
+                stats.tries += 1
+                stats.weight *= self.decay
+                stats.size = min(stats.max_size, stats.size + 1)
+                empty_draws += 1
+                if empty_draws >= MAX_EMPTY_DRAWS:
+                    logger.warning(f"LNS: {empty_draws} voisinages vides consécutifs, arrêt")
+                    break
+                continue
+            empty_draws = 0
+            iteration += 1
+
+            t0 = time.perf_counter()
+            sub = self._sub_model(values, free)
+            status, sub_objective, sub_values = self._solve(sub, min(self.time_slice, remaining))
+            seconds = time.perf_counter() - t0
+
+            gain = 0.0
+            accepted = sub_values is not None and sub_objective >= objective
+            if accepted:
+                gain = sub_objective - objective
+                values, objective = sub_values, sub_objective
+                result.objective, result.values = objective, values
+                if gain > 0:
+                    stats.improvements += 1
+                    if self.on_improvement is not None:
+                        self.on_improvement(values, objective, time.perf_counter() - start)
+
+            # Adaptation: poids (gain par seconde relatif) et taille du voisinage
+            reward = gain / max(abs(objective), 1.0) / max(seconds, 1e-3) * 1e4
+            stats.weight = self.decay * stats.weight + (1 - self.decay) * reward
+            stats.tries += 1
+            stats.gain += gain
+            stats.seconds += seconds
+            if status == cp_model.OPTIMAL and gain == 0:
+                stats.size = min(stats.max_size, stats.size + 1)
+            elif status == cp_model.UNKNOWN:
+                stats.size = max(stats.min_size, stats.size - 1)
+
+            result.history.append({
+                'iteration': iteration, 'neighborhood': kind, 'detail': detail,
+                'free_variables': int(free.sum()), 'status': status.name,
+                'objective': sub_objective, 'best': objective, 'seconds': round(seconds, 2),
+                'elapsed': round(time.perf_counter() - start, 2), 'accepted': accepted,
+            })
+            logger.info(
+                f"LNS #{iteration} {kind:<10} {detail:<34} libres={int(free.sum()):>6} "
+                f"{result.history[-1]['status']:<8} gain={gain:>10,.0f} meilleur={objective:,.0f} ({seconds:.1f}s)"
+            )
+
+        result.neighborhoods = {kind: s.to_dict() for kind, s in self.stats.items()}
+        logger.info(f"✓ LNS terminé: {iteration} itérations, score {objective:,.0f}")
+        return result
+
+    def save_history(self, path: Path):
+        """Enregistre l'historique de la dernière recherche en JSON"""
+        if self.result is None:
+            return
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.result.to_dict(), f, indent=2, ensure_ascii=False)
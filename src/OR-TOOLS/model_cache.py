@@ -0,0 +1,216 @@
+"""
+MODEL CACHE - Cache disque des modèles CP-SAT construits
+
+Clé d'une entrée: SHA-256 de
+ - la version du modèle (MODEL_VERSION) et de la version d'OR-Tools
+ - l'empreinte du code de construction (optimizer.py, variable_store.py, ...)
+ - le contenu normalisé des CSV d'entrée (fins de ligne, espaces en fin de
+   ligne et lignes vides ignorés)
+ - les options qui changent le modèle (ex: symmetry_breaking)
+
+Une entrée contient trois fichiers:
+ - <clé>.model.pb (OR-Tools < 9.12, proto binaire) ou <clé>.model.txt.gz
+   (proto au format texte compressé: seul format relisible depuis Python
+   avec le wrapper C++ des versions récentes)
+ - <clé>.columns.npz: colonnes du VariableStore (correspondance lignes -> variables)
+ - <clé>.json: métadonnées (score max théorique, ids élèves/disciplines, ...)
+
+L'invalidation est automatique (toute modification des données ou du code
+change la clé); clear() vide le cache. Après chaque écriture, les entrées les
+moins récemment utilisées sont supprimées tant que la taille totale dépasse
+max_bytes.
+"""
+import gzip
+import hashlib
+import json
+import logging
+import os
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+import ortools
+from ortools.sat.python import cp_model
+
+logger = logging.getLogger(__name__)
+
+# Fichiers d'entrée pris en compte dans la clé (relatifs au répertoire de données)
+DATA_FILES = (
+    "disciplines.csv",
+    "eleves_with_code.csv",
+    "stages.csv",
+    "calendrier_DFAS01.csv",
+    "calendrier_DFAS02.csv",
+    "calendrier_DFTCC.csv",
+    "periodes.csv",
+)
+
+
+@dataclass
+class CachedModel:
+    """Entrée de cache rechargée"""
+    model: cp_model.CpModel
+    columns: Dict[str, np.ndarray]
+    metadata: Dict
+
+
+def _normalized_bytes(path: Path) -> bytes:
+    """Contenu d'un CSV indépendant des fins de ligne, espaces finaux et lignes vides"""
+    text = path.read_bytes().decode("utf-8-sig", errors="replace")
+    lines = [line.rstrip() for line in text.splitlines()]
+    return "\n".join(line for line in lines if line).encode("utf-8")
+
+
+def _proto_supports_binary(proto) -> bool:
+    return hasattr(proto, "SerializeToString")
+
+
+def _write_atomic(path: Path, data: bytes):
+    """Écrit dans un fichier temporaire puis renomme (pas d'entrée à moitié écrite)"""
+    tmp = path.with_name(path.name + f".tmp{os.getpid()}")
+    with open(tmp, "wb") as f:
+        f.write(data)
+    os.replace(tmp, path)
+
+
+class ModelCache:
+    """
+    Cache disque des modèles construits
+
+    Usage:
+        cache = ModelCache(output_dir / "model_cache", max_bytes=512 * 2**20)
+        key = cache.key_for(data_dir, version="V5_03_C", code_files=[...], options={...})
+        entry = cache.load(key)
+        if entry is None:
+            ...  # construction
+            cache.save(key, model, columns, metadata)
+    """
+
+    def __init__(self, cache_dir: Path, max_bytes: int = 512 * 2**20):
+        self.cache_dir = Path(cache_dir)
+        self.max_bytes = max_bytes
+
+    # Clé
+
+    def key_for(self, data_dir: Path, version: str, code_files: Iterable[Path] = (), options: Optional[Dict] = None) -> str:
+        """Clé de cache des données de data_dir pour la version et les options données"""
+        digest = hashlib.sha256()
+        digest.update(f"version={version};ortools={ortools.__version__}\n".encode("utf-8"))
+
+        for path in code_files:
+            path = Path(path)
+            if path.exists():  # Absent en mode PyInstaller: seule la version compte
+                digest.update(f"code:{path.name}\n".encode("utf-8"))
+                digest.update(path.read_bytes())
+
+        data_dir = Path(data_dir)
+        for name in DATA_FILES:
+            path = data_dir / name
+            digest.update(f"\nfile:{name}\n".encode("utf-8"))
+            if path.exists():
+                digest.update(_normalized_bytes(path))
+
+        digest.update(json.dumps(options or {}, sort_keys=True).encode("utf-8"))
+        return digest.hexdigest()[:32]
+
+    # Lecture / écriture
+
+    def _paths(self, key: str) -> Dict[str, Path]:
+        return {
+            "binary": self.cache_dir / f"{key}.model.pb",
+            "text": self.cache_dir / f"{key}.model.txt.gz",
+            "columns": self.cache_dir / f"{key}.columns.npz",
+            "metadata": self.cache_dir / f"{key}.json",
+        }
+
+    def load(self, key: str) -> Optional[CachedModel]:
+        """Recharge l'entrée de clé donnée (None si absente ou illisible)"""
+        paths = self._paths(key)
+        if not paths["metadata"].exists() or not paths["columns"].exists():
+            return None
+
+        try:
+            with open(paths["metadata"], "r", encoding="utf-8") as f:
+                metadata = json.load(f)
+
+            model = cp_model.CpModel()
+            proto = model.Proto()
+            if metadata.get("format") == "binary" and _proto_supports_binary(proto):
+                proto.ParseFromString(paths["binary"].read_bytes())
+            elif metadata.get("format") == "text":
+                proto.parse_text_format(gzip.decompress(paths["text"].read_bytes()).decode("utf-8"))
+            else:
+                return None
+
+            with np.load(paths["columns"]) as npz:
+                columns = {name: npz[name] for name in npz.files}
+        except Exception as e:
+            logger.warning(f"Entrée de cache illisible ({key}): {e}")
+            self.invalidate(key)
+            return None
+
+        # LRU: la date de modification des métadonnées sert de date de dernier accès
+        os.utime(paths["metadata"])
+        return CachedModel(model=model, columns=columns, metadata=metadata)
+
+    def save(self, key: str, model: cp_model.CpModel, columns: Dict[str, np.ndarray], metadata: Dict):
+        """Enregistre un modèle construit puis applique la limite de taille"""
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        paths = self._paths(key)
+        proto = model.Proto()
+
+        metadata = dict(metadata)
+        if _proto_supports_binary(proto):
+            _write_atomic(paths["binary"], proto.SerializeToString())
+            metadata["format"] = "binary"
+        else:
+            _write_atomic(paths["text"], gzip.compress(str(proto).encode("utf-8"), compresslevel=1))
+            metadata["format"] = "text"
+
+        tmp = paths["columns"].with_name(f"{key}.tmp{os.getpid()}.npz")
+        np.savez(tmp, **columns)
+        os.replace(tmp, paths["columns"])
+
+        metadata["created"] = time.strftime("%Y-%m-%d %H:%M:%S")
+        # Métadonnées écrites en dernier: leur présence marque une entrée complète
+        _write_atomic(paths["metadata"], json.dumps(metadata, indent=2, ensure_ascii=False).encode("utf-8"))
+
+        self.evict()
+
+    # Invalidation / éviction
+
+    def entries(self) -> List[Dict]:
+        """Entrées présentes, de la plus récemment utilisée à la plus ancienne"""
+        if not self.cache_dir.exists():
+            return []
+        result = []
+        for meta in self.cache_dir.glob("*.json"):
+            key = meta.name[:-len(".json")]
+            size = sum(p.stat().st_size for p in self._paths(key).values() if p.exists())
+            result.append({"key": key, "bytes": size, "last_used": meta.stat().st_mtime})
+        return sorted(result, key=lambda e: e["last_used"], reverse=True)
+
+    def invalidate(self, key: str):
+        """Supprime une entrée"""
+        for path in self._paths(key).values():
+            if path.exists():
+                path.unlink()
+
+    def clear(self) -> int:
+        """Vide le cache, retourne le nombre d'entrées supprimées"""
+        entries = self.entries()
+        for entry in entries:
+            self.invalidate(entry["key"])
+        return len(entries)
+
+    def evict(self):
+        """Supprime les entrées les moins récemment utilisées au-delà de max_bytes"""
+        total = 0
+        for entry in self.entries():
+            if total + entry["bytes"] > self.max_bytes:
+                logger.info(f"Cache modèle: éviction de {entry['key']} ({entry['bytes'] / 1e6:.1f} Mo)")
+                self.invalidate(entry["key"])
+            else:
+                total += entry["bytes"]
@@ -6,12 +6,14 @@ import sys
 import os
 import logging
 import collections
+import contextlib
 import time
 import csv
 from typing import Optional, Callable, Dict, List, Tuple
 from dataclasses import dataclass
 from pathlib import Path
-import threading
+
+import numpy as np
 
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
@@ -20,9 +22,55 @@ from classes.vacation import vacation
 from classes.stage import stage
 from classes.enum.demijournee import DemiJournee
 from classes.enum.niveaux import niveau
+from variable_store import VariableStore
+from student_classes import StudentClasses
+from build_profiler import BuildProfiler, PresolveTimer, solver_statistics
+from model_cache import ModelCache
+from warm_start import WarmStartReport, apply_warm_start, apply_hint_keys
+from checkpoint import Checkpointer, load_checkpoint
+from lns import LNSDriver
+from lexicographic import solve_lexicographic
+from greedy import GreedyScheduler
+from rolling_horizon import RollingHorizon
+from lagrangian import LagrangianDecomposition
+from bounds import BoundReport, lp_upper_bound
+from stopping import StoppingRules
+from portfolio import Portfolio
+from tuning import apply_cpsat_parameters
+from parallel_build import build_parallel, fork_available
+from emission import LinearEmitter, ObjectiveAccumulator
+from events import EventBus, JsonlSink, PHASE_STARTED, PHASE_FINISHED, PROGRESS, INCUMBENT, BOUND, HEARTBEAT, FINISHED
+from scoring import W_FILL, W_EXCESS, W_SUCCESS, W_PREFERENCE, W_PRIORITY, W_PAIR, W_SAME_DAY
 
 logger = logging.getLogger(__name__)
 
+# Version du modèle: à incrémenter si la formulation change (invalide le cache disque)
+MODEL_VERSION = "V5_03_C.1"
+
+# Modules dont le code détermine le modèle construit (empreinte de la clé de cache)
+MODEL_CODE_FILES = [
+    Path(__file__).resolve().parent / name
+    for name in ("optimizer.py", "variable_store.py", "student_classes.py", "emission.py")
+]
+
+# Étapes de construction après les variables et index: (phase, méthode, message, progression)
+BUILD_STEPS = [
+    ("capacite", "_add_capacity_constraints", "Contraintes de capacité", 30),
+    ("unicite", "_add_uniqueness_constraints", "Contraintes d'unicité", 35),
+    ("max_par_semaine", "_add_max_vacations_per_week", "Contraintes hebdomadaires", 40),
+    ("paires_jours", "_add_pair_days_constraints", "Contraintes paires de jours", 42),
+    ("remplissage", "_add_fill_requirements", "Contraintes de remplissage", 45),
+    ("binomes", "_add_binome_constraints", "Contraintes de binômes", 48),
+    ("frequence", "_add_frequency_constraints", "Contraintes de fréquence", 50),
+    ("semestre", "_add_semester_distribution", "Répartition semestrielle", 52),
+    ("mixite", "_add_group_diversity", "Mixité des groupes", 55),
+    ("continuite", "_add_continuity_constraints", "Contraintes de continuité", 58),
+    ("remplacement_niveau", "_add_level_replacement", "Remplacement de niveau", 60),
+    ("meme_jour", "_add_same_day_constraints", "Contraintes même jour", 62),
+    ("symetrie", "_add_symmetry_breaking", "Bris de symétrie", 65),
+    ("objectif", "_set_objective", "Objectif configuré", 70),
+]
+
 
 # result & callback classes
 
@@ -38,40 +86,118 @@ class OptimizationResult:
     assignments: Optional[Dict] = None
     statistics: Optional[Dict] = None
     error_message: Optional[str] = None
+    stages: Optional[List[Dict]] = None  # Résolution par étapes: statut/objectif/borne de chaque étape
+    upper_bound: Optional[float] = None  # Borne supérieure prouvée de l'objectif (si calculée)
+    stop_reason: Optional[str] = None  # Fin de la résolution: 'optimal', 'time_limit', 'gap', 'plateau', 'target_score', 'fallback' (planning de repli)
     
     def __post_init__(self):
         if self.assignments is None:
             self.assignments = {}
         if self.statistics is None:
             self.statistics = {}
+        if self.stages is None:
+            self.stages = []
     
     def is_success(self) -> bool:
         """Vérifie si l'optimisation a réussi"""
         return self.status in ['OPTIMAL', 'FEASIBLE']
+    
+    @property
+    def gap(self) -> Optional[float]:
+        """Écart relatif d'optimalité (borne - score) / borne, None sans borne"""
+        if self.upper_bound is None or self.objective_value is None or self.upper_bound <= 0:
+            return None
+        return max(0.0, (self.upper_bound - self.objective_value) / self.upper_bound)
 
 class SolutionCallback(cp_model.CpSolverSolutionCallback):
-    """Callback pour suivre la progression de la résolution"""
+    """
+    Callback pour suivre la progression de la résolution
     
-    def __init__(self, max_time_seconds):
+    Publie les événements INCUMBENT (à chaque solution), BOUND (best_bound_callback)
+    et HEARTBEAT (callback de log CP-SAT, cf. on_log) sur le bus d'événements.
+    """
+    
+    def __init__(self, max_time_seconds, checkpointer: Optional[Checkpointer] = None,
+                 stopping: Optional[StoppingRules] = None, events: Optional[EventBus] = None,
+                 upper_bound: Optional[float] = None, phase: str = 'cpsat'):
         cp_model.CpSolverSolutionCallback.__init__(self)
         self.max_time = max_time_seconds
         self.start_time = time.time()
+        self.checkpointer = checkpointer
+        self.stopping = stopping if stopping is not None and stopping.active else None
+        self.stop_reason = None  # Règle d'arrêt anticipé déclenchée (cf. stopping.py)
+        self.events = events
+        self.upper_bound = upper_bound  # Borne calculée avant la résolution (relaxation linéaire)
+        self.phase = phase
         self._solution_count = 0
-        self._last_log_time = 0
+        self._last_heartbeat = 0.0
+        self._last_bound = 0.0
+    
+    def _timing(self) -> Dict:
+        elapsed = time.time() - self.start_time
+        return {'elapsed': round(elapsed, 2), 'remaining': round(max(0.0, self.max_time - elapsed), 2)}
+    
+    def _best_bound(self, cpsat_bound: float) -> float:
+        return cpsat_bound if self.upper_bound is None else min(cpsat_bound, self.upper_bound)
     
     def on_solution_callback(self):
         """Appelé à chaque nouvelle solution trouvée"""
         self._solution_count += 1
         current_time = time.time()
-        elapsed = int(current_time - self.start_time)
-        remaining = max(0, int(self.max_time - elapsed))
-        
-        # Log toutes les 2 secondes pour éviter le spam
-        if current_time - self._last_log_time >= 2:
-            # Format exact pour le parsing Streamlit
-            print(f"PROGRESS|Solution #{self._solution_count}|Elapsed: {elapsed}s|Remaining: {remaining}s|Objective: {self.ObjectiveValue()}")
-            sys.stdout.flush()  # Force l'affichage immédiat
-            self._last_log_time = current_time
+        
+        if self.events is not None:
+            objective = self.ObjectiveValue()
+            bound = self._best_bound(self.BestObjectiveBound())
+            self.events.emit(
+                INCUMBENT, phase=self.phase, objective=objective, bound=bound,
+                gap=max(0.0, (bound - objective) / bound) if bound > 0 else None,
+                data={'solution': self._solution_count}, **self._timing()
+            )
+        
+        # Checkpoint limité en fréquence (lecture groupée des valeurs, écriture atomique)
+        if self.checkpointer is not None and self.checkpointer.due():
+            self.checkpointer.save(
+                self.response_proto.solution,
+                self.ObjectiveValue(),
+                self.BestObjectiveBound(),
+                self.WallTime(),
+                self._solution_count
+            )
+        
+        if self.stopping is not None and self.stop_reason is None:
+            reason = self.stopping.on_solution(self.ObjectiveValue(), self.BestObjectiveBound(), current_time - self.start_time)
+            if reason is not None:
+                self._stop(reason)
+    
+    def poll(self):
+        """Contrôle périodique du plateau (sans nouvelle solution, le callback n'est pas appelé)"""
+        if self.stopping is not None and self.stop_reason is None and self._solution_count > 0:
+            reason = self.stopping.check_plateau(time.time() - self.start_time)
+            if reason is not None:
+                self._stop(reason)
+    
+    def on_log(self, line: str):
+        """Callback de log CP-SAT: signe de vie (au plus un par seconde) et contrôle du plateau"""
+        current_time = time.time()
+        if current_time - self._last_heartbeat < 1.0:
+            return
+        self._last_heartbeat = current_time
+        if self.events is not None:
+            self.events.emit(HEARTBEAT, phase=self.phase, data={'solutions': self._solution_count}, **self._timing())
+        self.poll()
+    
+    def on_bound(self, bound: float):
+        """best_bound_callback CP-SAT: amélioration de la borne (au plus un événement par seconde)"""
+        current_time = time.time()
+        if self.events is not None and current_time - self._last_bound >= 1.0:
+            self._last_bound = current_time
+            self.events.emit(BOUND, phase=self.phase, bound=self._best_bound(bound), **self._timing())
+        self.on_log('')
+    
+    def _stop(self, reason: str):
+        self.stop_reason = reason
+        logger.info(f"Arrêt anticipé ({reason}) après {time.time() - self.start_time:.0f}s: meilleure solution conservée")
+        self.StopSearch()
 
 
 # main optimizer class
@@ -102,30 +228,50 @@ class ScheduleOptimizer:
         self.config = config
         self.model = None
         self.solver = None
-        self.assignments = {}  # (eleve_id, disc_id, vac_idx) -> BoolVar
+        self.store = None  # VariableStore: registre colonnaire des x_{e,d,v}
         self.vacations = []
         self.eleve_dict = {}
         self.stages_eleves = {}
         self.calendar_unavailability = {}
         self.progress_callback = None
         
-        # Structures d'indexation pour accélération
-        self.vars_by_student_vac = collections.defaultdict(list)
-        self.vars_by_disc_vac = collections.defaultdict(list)
-        self.vars_by_student_disc_semaine = collections.defaultdict(list)
-        self.vars_by_disc_vac_niveau = collections.defaultdict(list)
-        self.vars_by_student_disc_all = collections.defaultdict(list)
+        # Tenseur de disponibilité [élève, discipline, vacation] (cf. _build_availability)
+        self.availability = None
+        self.student_ids = []
+        self.discipline_ids = []
+        self.vac_semaine = None  # np.ndarray: semaine de chaque vacation
+        self.vac_jour = None     # np.ndarray: jour (0-4) de chaque vacation
+        self.vac_slot = None     # np.ndarray: créneau (0-9) de chaque vacation
+        self.binome_partner = None  # np.ndarray [élève, discipline]: position du binôme (-1 si aucun)
+        self.student_classes = None  # StudentClasses: profils d'élèves et unités interchangeables
+        self.profiler = None  # BuildProfiler: mesures par phase de build_model()
+        self.parallel_build_report = None  # Durées de la construction parallèle (cf. parallel_build.py)
+        self.warm_start_report = None  # WarmStartReport du dernier démarrage à chaud
+        self.model_key = None  # Clé du cache modèle (si le cache est actif)
+        self.elapsed_offset = 0.0  # Temps de résolution déjà consommé (reprise sur checkpoint)
+        self.bound_report = None  # BoundReport de la relaxation linéaire
+        self.lp_bound_seconds = 0.0  # Durée de la borne LP (incluse dans solve_time)
+        self.bounds = {}  # Bornes supérieures prouvées de l'objectif par méthode ('lp', 'cpsat', 'lagrangian')
+        self.events = EventBus()  # Événements de progression (cf. events.py)
         
         # Variables pour l'objectif (V5_03_C logic)
-        self.obj_terms = []
-        self.weights = []
+        self.objective = ObjectiveAccumulator()  # Termes de l'objectif, cumulés par variable
+        self.objective_report = None  # Termes avant / après consolidation, PGCD des poids
         self.max_theoretical_score = 0  # Score max théorique réaliste
+        self.quota_objective_vars = []  # Indices proto des termes de quotas (sat/excess/success)
+        self.coverage_constraints = []  # [indice proto, semaine] des contraintes de couverture (remplissage, mixité, remplacement)
         
         # Variables de quota (sat_var, excess_var, is_success, all_success_var)
         self.sat_vars = {}  # (eleve_id, disc_id) -> IntVar (affectations dans quota)
         self.excess_vars = {}  # (eleve_id, disc_id) -> IntVar (affectations au-delà quota)
         self.success_vars = {}  # (eleve_id, disc_id) -> BoolVar (quota atteint?)
         self.all_success_vars = {}  # disc_id -> BoolVar (tous élèves quota atteint?)
+        
+        # Indicateurs "au moins une affectation" partagés entre familles de contraintes
+        # ('semaine', s_pos, d_pos, semaine) | ('jour', s_pos, d_pos, semaine, jour)
+        # | ('niveau', d_pos, v_idx, niveau) -> BoolVar
+        self.indicators = {}
+        self.indicator_requests = 0
     
     def set_progress_callback(self, callback: Callable[[str, int], None]):
         """
@@ -138,12 +284,33 @@ class ScheduleOptimizer:
     
     # data preparation
     
+    def prepare_and_build(self) -> bool:
+        """
+        prepare_data() + build_model(), ou rechargement du modèle depuis le cache disque
+        
+        Returns:
+            bool: True si le modèle provient du cache (prepare_data/build_model non exécutés)
+        """
+        with self._event_phase('build'):
+            cache = self._model_cache()
+            if cache is not None:
+                key = self._model_cache_key(cache)
+                self.model_key = key
+                if self._load_cached_model(cache, key):
+                    return True
+            
+            self.prepare_data()
+            self.build_model()
+            
+            if cache is not None:
+                self._save_model_to_cache(cache, key)
+            return False
+    
     def prepare_data(self):
         """Prépare les structures de données pour l'optimisation"""
         self._notify_progress("Préparation des données", 5)
         
-        # Create eleve dict
-        self.eleve_dict = {e.id_eleve: e for e in self.config.eleves}
+        self._prepare_lookups()
         logger.info(f"  {len(self.config.eleves)} élèves chargés.")
         
         # Prepare stages
@@ -166,15 +333,206 @@ class ScheduleOptimizer:
         # Calendar unavailability
         self.calendar_unavailability = self.config.calendar_unavailability
         
+        # Disponibilités pré-calculées (élève x discipline x vacation)
+        self._build_availability()
+        
+        logger.info(f"✓ Données préparées: {len(self.vacations)} créneaux")
+    
+    def _prepare_lookups(self):
+        """Dictionnaire des élèves et liste des vacations (nécessaires aussi sur un modèle en cache)"""
+        self.eleve_dict = {e.id_eleve: e for e in self.config.eleves}
+        
         # Générer vacations (semaines 1-52)
         self.vacations = []
         for s in range(1, 53):
             for j in range(5):  # Lundi à Vendredi
                 for p in DemiJournee:
                     self.vacations.append(vacation(s, j, p))
-        
-        logger.info(f"✓ Données préparées: {len(self.vacations)} créneaux")
     
+    # model cache
+    
+    def _model_cache(self) -> Optional[ModelCache]:
+        """Cache disque des modèles (None si désactivé ou si le répertoire de données est inconnu)"""
+        params = self.config.solver_params
+        if not params.model_cache or self.config.data_dir is None or self.config.output_dir is None:
+            return None
+        return ModelCache(Path(self.config.output_dir) / "model_cache", params.model_cache_max_mb * 2**20)
+    
+    def _model_cache_key(self, cache: ModelCache) -> str:
+        """Clé de cache: données, version et code du modèle, options modifiant le modèle"""
+        return cache.key_for(
+            self.config.data_dir,
+            version=MODEL_VERSION,
+            code_files=MODEL_CODE_FILES,
+            options={
+                'symmetry_breaking': self.config.solver_params.symmetry_breaking,
+                'pair_days_formulation': self.config.solver_params.pair_days_formulation,
+                'window_formulation': self.config.solver_params.window_formulation,
+            },
+        )
+    
+    def _load_cached_model(self, cache: ModelCache, key: str) -> bool:
+        """Recharge modèle, registre de variables et score max depuis le cache"""
+        start = time.perf_counter()
+        entry = cache.load(key)
+        if entry is None:
+            return False
+        
+        meta = entry.metadata
+        if (meta.get('student_ids') != [el.id_eleve for el in self.config.eleves]
+                or meta.get('discipline_ids') != [d.id_discipline for d in self.config.disciplines]):
+            logger.warning("Cache modèle incohérent avec la configuration: reconstruction")
+            cache.invalidate(key)
+            return False
+        
+        self._prepare_lookups()
+        self.model = entry.model
+        self.student_ids = meta['student_ids']
+        self.discipline_ids = meta['discipline_ids']
+        self.max_theoretical_score = meta['max_theoretical_score']
+        self.quota_objective_vars = meta.get('quota_objective_vars', [])
+        self.objective_report = meta.get('objective_report')
+        self.coverage_constraints = meta.get('coverage_constraints', [])
+        self.store = VariableStore.from_columns(
+            tuple(meta['shape']),
+            entry.columns,
+            [self.model.GetBoolVarFromProtoIndex(i) for i in entry.columns['var_index'].tolist()]
+        )
+        
+        self.profiler = None
+        if self.config.solver_params.profiling:
+            self.profiler = BuildProfiler()
+            self.profiler.record("cache", time.perf_counter() - start, self.model)
+        
+        logger.info(f"✓ Modèle rechargé depuis le cache ({key}) en {time.perf_counter() - start:.1f}s")
+        logger.info(f"  Variables: {len(self.store)}")
+        logger.info(f"  Score max théorique: {self.max_theoretical_score:,.0f}")
+        self._notify_progress("Modèle rechargé depuis le cache", 70)
+        return True
+    
+    def _save_model_to_cache(self, cache: ModelCache, key: str):
+        """Enregistre le modèle construit (un échec d'écriture n'interrompt pas l'optimisation)"""
+        try:
+            cache.save(key, self.model, self.store.export_columns(), {
+                'model_version': MODEL_VERSION,
+                'shape': list(self.store.shape),
+                'student_ids': list(self.student_ids),
+                'discipline_ids': list(self.discipline_ids),
+                'max_theoretical_score': self.max_theoretical_score,
+                'quota_objective_vars': list(self.quota_objective_vars),
+                'objective_report': self.objective_report,
+                'coverage_constraints': list(self.coverage_constraints),
+            })
+            logger.info(f"✓ Modèle enregistré dans le cache ({key})")
+        except OSError as e:
+            logger.warning(f"Impossible d'enregistrer le modèle dans le cache: {e}")
+    
+    def _build_availability(self):
+        """
+        Construit le tenseur booléen de disponibilité [élève, discipline, vacation]
+        
+        Combine en NumPy les quatre filtres de création des variables:
+            - Contrainte 2 (Éligibilité Niveau): el.annee dans disc.annee
+            - Contrainte 3 (Fermeture Discipline): disc.presence[slot_idx]
+            - Contrainte 4 (Indisponibilité Élève - Stage): semaine dans un stage
+            - Contrainte 5 (Indisponibilité Cours - Calendrier): (semaine, slot_idx)
+              présent dans calendar_unavailability[annee]
+        """
+        eleves = self.config.eleves
+        disciplines = self.config.disciplines
+        n_vac = len(self.vacations)
+        
+        self.student_ids = [el.id_eleve for el in eleves]
+        self.discipline_ids = [disc.id_discipline for disc in disciplines]
+        
+        vac_semaine = np.array([vac.semaine for vac in self.vacations], dtype=np.int16)
+        vac_slot = np.array(
+            [vac.jour * 2 + (0 if vac.period == DemiJournee.matin else 1) for vac in self.vacations],
+            dtype=np.int8
+        )
+        self.vac_semaine = vac_semaine
+        self.vac_jour = vac_slot // 2
+        self.vac_slot = vac_slot
+        
+        # Ouverture des disciplines par créneau: [discipline, vacation]
+        presence = np.zeros((len(disciplines), 10), dtype=bool)
+        for d_pos, disc in enumerate(disciplines):
+            n = min(len(disc.presence), 10)
+            presence[d_pos, :n] = [bool(p) for p in disc.presence[:n]]
+        disc_open = presence[:, vac_slot]
+        
+        # Données dérivées calculées une fois par profil d'élève puis diffusées
+        self.student_classes = StudentClasses(eleves, self.stages_eleves)
+        profile_of = self.student_classes.profile_of
+        representatives = [eleves[pos] for pos in self.student_classes.representatives.tolist()]
+        
+        # Éligibilité par niveau: [élève, discipline]
+        eligible = np.array(
+            [[el.annee.value in disc.annee for disc in disciplines] for el in representatives],
+            dtype=bool
+        ).reshape(len(representatives), len(disciplines))[profile_of]
+        
+        # Calendrier par niveau: [niveau, vacation]
+        niveaux = list(niveau)
+        vac_index = {(vac.semaine, int(vac_slot[v_idx])): v_idx for v_idx, vac in enumerate(self.vacations)}
+        calendar_mask = np.zeros((len(niveaux), n_vac), dtype=bool)
+        for niv_pos, niv in enumerate(niveaux):
+            for key in self.calendar_unavailability.get(niv, ()):
+                v_idx = vac_index.get(key)
+                if v_idx is not None:
+                    calendar_mask[niv_pos, v_idx] = True
+        
+        # Indisponibilités par élève (stages + calendrier de son niveau): [élève, vacation]
+        niveau_pos = {niv: i for i, niv in enumerate(niveaux)}
+        unavailable = calendar_mask[[niveau_pos[el.annee] for el in representatives]].reshape(len(representatives), n_vac)
+        for p_pos, el in enumerate(representatives):
+            for st in self.stages_eleves.get(el.id_eleve, []):
+                unavailable[p_pos] |= (vac_semaine >= st.debut_stage) & (vac_semaine <= st.fin_stage)
+        unavailable = unavailable[profile_of]
+        
+        self.availability = (
+            eligible[:, :, None]
+            & disc_open[None, :, :]
+            & ~unavailable[:, None, :]
+        )
+        
+        self._build_binome_partners(eligible)
+        self.student_classes.build_units(self.binome_partner, self.student_ids)
+        
+        logger.info(
+            f"✓ Disponibilités calculées: {int(self.availability.sum())} "
+            f"couples (élève, discipline, vacation) disponibles"
+        )
+    
+    
+    def _build_binome_partners(self, eligible: np.ndarray):
+        """
+        Associe chaque élève à son binôme pour les disciplines en binôme
+        
+        binome_partner[s, d] = position du binôme de s pour d (-1 si aucun).
+        Les deux membres ne sont disponibles que sur l'intersection de leurs
+        disponibilités: une vacation où un seul est libre est interdite aux deux.
+        """
+        self.binome_partner = np.full(eligible.shape, -1, dtype=np.int32)
+        
+        for d_pos, disc in enumerate(self.config.disciplines):
+            if not disc.en_binome:
+                continue
+            
+            binome_groups = collections.defaultdict(list)
+            for s_pos, e in enumerate(self.config.eleves):
+                if eligible[s_pos, d_pos]:
+                    binome_groups[e.id_binome].append(s_pos)
+            
+            for members in binome_groups.values():
+                if len(members) != 2:
+                    continue
+                p1, p2 = members
+                self.binome_partner[p1, d_pos] = p2
+                self.binome_partner[p2, d_pos] = p1
+                both = self.availability[p1, d_pos] & self.availability[p2, d_pos]
+                self.availability[p1, d_pos] = both
+                self.availability[p2, d_pos] = both
     
     # model construction
     
@@ -186,144 +544,127 @@ class ScheduleOptimizer:
         logger.info("=" * 80)
         
         self.model = cp_model.CpModel()
+        self.emit = LinearEmitter(self.model)
+        self.profiler = None
+        if self.config.solver_params.profiling:
+            self.profiler = BuildProfiler(trace_memory=self.config.solver_params.profile_memory)
         
         # Créer variables
-        self._create_variables()
+        with self._phase("variables"):
+            self._create_variables()
         self._notify_progress("Variables créées", 20)
         
         # Construire index
-        self._build_indexes()
+        with self._phase("index"):
+            self._build_indexes()
         self._notify_progress("Index construits", 25)
         
-        # Ajouter contraintes
-        self._add_capacity_constraints()
-        self._notify_progress("Contraintes de capacité", 30)
-        
-        self._add_uniqueness_constraints()
-        self._notify_progress("Contraintes d'unicité", 35)
-        
-        self._add_max_vacations_per_week()
-        self._notify_progress("Contraintes hebdomadaires", 40)
-        
-        self._add_pair_days_constraints()
-        self._notify_progress("Contraintes paires de jours", 42)
-        
-        self._add_fill_requirements()
-        self._notify_progress("Contraintes de remplissage", 45)
-        
-        self._add_binome_constraints()
-        self._notify_progress("Contraintes de binômes", 48)
-        
-        self._add_frequency_constraints()
-        self._notify_progress("Contraintes de fréquence", 50)
-        
-        self._add_semester_distribution()
-        self._notify_progress("Répartition semestrielle", 52)
-        
-        self._add_group_diversity()
-        self._notify_progress("Mixité des groupes", 55)
-        
-        self._add_continuity_constraints()
-        self._notify_progress("Contraintes de continuité", 58)
-        
-        self._add_level_replacement()
-        self._notify_progress("Remplacement de niveau", 60)
-        
-        self._add_same_day_constraints()
-        self._notify_progress("Contraintes même jour", 62)
-        
-        # Configurer objectif
-        self._set_objective()
-        self._notify_progress("Objectif configuré", 70)
+        # Ajouter contraintes et objectif (en parallèle: cf. parallel_build.py)
+        steps = self._build_steps()
+        processes = self.config.solver_params.build_processes or os.cpu_count() or 1
+        if processes > 1 and fork_available():
+            self.parallel_build_report = build_parallel(self, steps, processes)
+        else:
+            if processes > 1:
+                logger.warning("Construction parallèle indisponible (fork non supporté): construction séquentielle")
+            for name, method, message, percent in steps:
+                with self._phase(name):
+                    getattr(self, method)()
+                self._notify_progress(message, percent)
         
         logger.info("✓ Modèle construit avec succès")
-        logger.info(f"  Variables: {len(self.assignments)}")
+        logger.info(f"  Variables: {len(self.store)}")
+        logger.info(f"  Indicateurs partagés: {len(self.indicators)} ({self.indicator_requests} demandes)")
         logger.info(f"  Score max théorique: {self.max_theoretical_score:,.0f}")
+        
+        if self.profiler is not None:
+            self.profiler.stop()
+            logger.info("Profil de construction (par durée décroissante):")
+            self.profiler.log_summary()
+    
+    def _build_steps(self) -> List[Tuple[str, str, str, int]]:
+        """Familles de contraintes et objectif, dans l'ordre de construction (cf. BUILD_STEPS)"""
+        return [
+            step for step in BUILD_STEPS
+            if step[0] != "symetrie" or self.config.solver_params.symmetry_breaking
+        ]
+    
+    def _phase(self, name: str):
+        """Contexte de mesure d'une phase de construction (sans effet si le profilage est désactivé)"""
+        if self.profiler is None:
+            return contextlib.nullcontext()
+        return self.profiler.phase(name, self.model)
     
     
     # variable creation
     
     
     def _create_variables(self):
-        """Crée les variables de décision x_{e,d,v}"""
+        """Crée les variables de décision x_{e,d,v} sur les entrées vraies du tenseur de disponibilité"""
         logger.info("Création des variables de décision...")
         
-        count_vars = 0
-        for v_idx, vac in enumerate(self.vacations):
-            slot_idx = vac.jour * 2 + (0 if vac.period == DemiJournee.matin else 1)
-            
-            for disc in self.config.disciplines:
-                # Contrainte 3 (Fermeture Discipline): O_{d,v} = 0
-                if not (len(disc.presence) > slot_idx and disc.presence[slot_idx]):
-                    continue
-                
-                for el in self.config.eleves:
-                    # Contrainte 2 (Éligibilité Niveau): E_{e,d} = 0
-                    if el.annee.value not in disc.annee:
-                        continue
-                    
-                    # Contrainte 4 (Indisponibilité Élève - Stage): I_{e,v} = 1
-                    is_in_stage = False
-                    if el.id_eleve in self.stages_eleves:
-                        for st in self.stages_eleves[el.id_eleve]:
-                            if st.debut_stage <= vac.semaine <= st.fin_stage:
-                                is_in_stage = True
-                                break
-                    if is_in_stage:
-                        continue
-                    
-                    # Contrainte 5 (Indisponibilité Cours - Calendrier): C_{a,v} = 1
-                    if el.annee in self.calendar_unavailability:
-                        if vac in self.calendar_unavailability[el.annee]:
-                            continue
-                    
-                    # Créer variable
-                    var_name = f"x_e{el.id_eleve}_d{disc.id_discipline}_v{v_idx}"
-                    var = self.model.NewBoolVar(var_name)
-                    self.assignments[(el.id_eleve, disc.id_discipline, v_idx)] = var
-                    count_vars += 1
+        if self.availability is None:
+            self._build_availability()
+        
+        self.store = VariableStore(len(self.student_ids), len(self.discipline_ids), len(self.vacations))
+        niveau_by_student = [el.annee.value for el in self.config.eleves]
+        vac_semaine = self.vac_semaine.tolist()
+        vac_jour = self.vac_jour.tolist()
         
-        logger.info(f"✓ {count_vars} variables créées")
+        partner = self.binome_partner.tolist()
+        shared = {}
+        
+        # Parcours dans l'ordre (vacation, discipline, élève) pour conserver la numérotation
+        v_pos, d_pos, s_pos = np.nonzero(self.availability.transpose(2, 1, 0))
+        
+        for v_idx, d, s in zip(v_pos.tolist(), d_pos.tolist(), s_pos.tolist()):
+            p = partner[s][d]
+            if p < 0:
+                var_name = f"x_e{self.student_ids[s]}_d{self.discipline_ids[d]}_v{v_idx}"
+                var = self.model.NewBoolVar(var_name)
+            else:
+                # Binôme: une seule variable partagée par les deux membres
+                var = shared.pop((v_idx, d, p), None)
+                if var is None:
+                    e1, e2 = sorted((self.student_ids[s], self.student_ids[p]))
+                    var = self.model.NewBoolVar(f"x_e{e1}_e{e2}_d{self.discipline_ids[d]}_v{v_idx}")
+                    shared[(v_idx, d, s)] = var
+            self.store.add(var, s, d, v_idx, vac_semaine[v_idx], niveau_by_student[s], vac_jour[v_idx])
+        
+        logger.info(
+            f"✓ {self.store.n_distinct_vars()} variables créées "
+            f"({len(self.store)} couples élève/discipline/vacation)"
+        )
     
     def _build_indexes(self):
-        """Construit les structures d'indexation pour accélération"""
+        """Fige le registre de variables et pré-calcule les vues group-by utilisées par les contraintes"""
         logger.info("Construction des index...")
         
-        for (e_id, d_id, v_idx), var in self.assignments.items():
-            # Index par (élève, vacation)
-            self.vars_by_student_vac[(e_id, v_idx)].append(var)
-            
-            # Index par (discipline, vacation)
-            self.vars_by_disc_vac[(d_id, v_idx)].append(var)
-            
-            # Index par (élève, discipline) - toutes vacations
-            self.vars_by_student_disc_all[(e_id, d_id)].append(var)
-            
-            # Index par (élève, discipline, semaine)
-            semaine = self.vacations[v_idx].semaine
-            self.vars_by_student_disc_semaine[(e_id, d_id, semaine)].append((v_idx, var))
-            
-            # Index par (discipline, vacation, niveau)
-            el_annee = self.eleve_dict[e_id].annee
-            self.vars_by_disc_vac_niveau[(d_id, v_idx, el_annee)].append(var)
-        
-        logger.info("✓ Index construits")
+        self.store.freeze()
+        for columns in (
+            ('discipline', 'vacation'),
+            ('student', 'vacation'),
+            ('student', 'discipline'),
+            ('student', 'discipline', 'semaine'),
+            ('discipline', 'vacation', 'niveau'),
+        ):
+            self.store.group_by(*columns)
+        
+        logger.info(f"✓ Index construits ({self.store.memory_bytes() / 1e6:.1f} Mo)")
+    
     # CONSTRAINTS
     def _add_capacity_constraints(self):
         """Contrainte 1: Capacité des disciplines par créneau"""
         logger.info("Ajout contraintes: Capacité...")
         
         count = 0
-        for v_idx, vac in enumerate(self.vacations):
-            slot_idx = vac.jour * 2 + (0 if vac.period == DemiJournee.matin else 1)
-            
-            for disc in self.config.disciplines:
-                vars_in_disc_slot = self.vars_by_disc_vac.get((disc.id_discipline, v_idx), [])
-                if vars_in_disc_slot:
-                    cap = disc.nb_eleve[slot_idx] if len(disc.nb_eleve) > slot_idx else 0
-                    if cap > 0:
-                        self.model.Add(sum(vars_in_disc_slot) <= cap)
-                        count += 1
+        for (d_pos, v_idx), rows in self.store.group_by('discipline', 'vacation'):
+            disc = self.config.disciplines[d_pos]
+            slot_idx = int(self.vac_slot[v_idx])
+            cap = disc.nb_eleve[slot_idx] if len(disc.nb_eleve) > slot_idx else 0
+            if cap > 0:
+                self.emit.linear(self.store.var_index[rows], ub=cap)
+                count += 1
         
         logger.info(f"✓ {count} contraintes de capacité ajoutées")
     
@@ -331,13 +672,13 @@ class ScheduleOptimizer:
         """Contrainte 2: Un élève sur au plus une vacation par créneau"""
         logger.info("Ajout contraintes: Unicité...")
         
+        grouping = self.store.group_by('student', 'vacation')
+        
+        # Un groupe d'une seule variable booléenne est trivialement <= 1
         count = 0
-        for v_idx in range(len(self.vacations)):
-            for el in self.config.eleves:
-                vars_for_student = self.vars_by_student_vac.get((el.id_eleve, v_idx), [])
-                if vars_for_student:
-                    self.model.Add(sum(vars_for_student) <= 1)
-                    count += 1
+        for _, rows in grouping.iter(grouping.sizes() > 1):
+            self.emit.linear(self.store.var_index[rows], ub=1)
+            count += 1
         
         logger.info(f"✓ {count} contraintes d'unicité ajoutées")
     
@@ -345,21 +686,15 @@ class ScheduleOptimizer:
         """Contrainte: Maximum de vacations par semaine par discipline"""
         logger.info("Ajout contraintes: Max vacations/semaine...")
         
+        grouping = self.store.group_by('student', 'discipline', 'semaine')
+        limits = np.array([disc.nb_vacations_par_semaine for disc in self.config.disciplines])
+        group_limits = limits[grouping.keys[:, 1]] if len(grouping) else limits[:0]
+        
+        # Seuls les groupes plus grands que la limite peuvent la dépasser
         count = 0
-        for disc in self.config.disciplines:
-            if disc.nb_vacations_par_semaine <= 0:
-                continue
-            
-            for el in self.config.eleves:
-                if el.annee.value not in disc.annee:
-                    continue
-                
-                for s in range(1, 53):
-                    vars_semaine = self.vars_by_student_disc_semaine.get((el.id_eleve, disc.id_discipline, s), [])
-                    if vars_semaine:
-                        vars_only = [v for (_, v) in vars_semaine]
-                        self.model.Add(sum(vars_only) <= disc.nb_vacations_par_semaine)
-                        count += 1
+        for (_, d_pos, _), rows in grouping.iter((group_limits > 0) & (grouping.sizes() > group_limits)):
+            self.emit.linear(self.store.var_index[rows], ub=int(limits[d_pos]))
+            count += 1
         
         logger.info(f"✓ {count} contraintes max vacations/semaine ajoutées")
     
@@ -377,7 +712,7 @@ class ScheduleOptimizer:
                         pair_count += 1
                 
                 # Maximum: chaque élève obtient toutes les paires dans toutes les semaines
-                self.max_theoretical_score += pair_count * 52 * len(disc.paire_jours) * 50
+                self.max_theoretical_score += pair_count * 52 * len(disc.paire_jours) * W_PAIR
         
         logger.info("✓ Paires de jours configurées (soft)")
     
@@ -385,97 +720,67 @@ class ScheduleOptimizer:
         """Contrainte hard: Vacations doivent être remplies à capacité"""
         logger.info("Ajout contraintes: Remplissage obligatoire...")
         
+        grouping = self.store.group_by('discipline', 'vacation')
+        
         count = 0
-        for disc in self.config.disciplines:
-            if not disc.be_filled:
-                continue
+        for (d_pos, v_idx), rows in grouping.iter(self._disciplines_mask(grouping, 0, lambda d: d.be_filled)):
+            disc = self.config.disciplines[d_pos]
+            slot_idx = int(self.vac_slot[v_idx])
             
-            for v_idx, vac in enumerate(self.vacations):
-                slot_idx = vac.jour * 2 + (0 if vac.period == DemiJournee.matin else 1)
-                
-                if len(disc.nb_eleve) > slot_idx and disc.presence[slot_idx]:
-                    cap = disc.nb_eleve[slot_idx]
-                    vars_in_slot = self.vars_by_disc_vac.get((disc.id_discipline, v_idx), [])
-                    
-                    if cap > 0 and vars_in_slot:
-                        self.model.Add(sum(vars_in_slot) == cap)
-                        count += 1
+            if len(disc.nb_eleve) > slot_idx and disc.presence[slot_idx]:
+                cap = disc.nb_eleve[slot_idx]
+                if cap > 0:
+                    index = self.emit.linear(self.store.var_index[rows], lb=cap, ub=cap)
+                    self.coverage_constraints.append([index, int(self.vac_semaine[v_idx])])
+                    count += 1
         
         logger.info(f"✓ {count} contraintes de remplissage ajoutées")
     
     def _add_binome_constraints(self):
-        """Contrainte: Binômes doivent être affectés ensemble"""
-        logger.info("Ajout contraintes: Binômes...")
-        
-        count = 0
-        for disc in self.config.disciplines:
-            if not disc.en_binome:
-                continue
-            
-            # Créer paires de binômes à partir de id_binome
-            binome_groups = {}
-            for e in self.config.eleves:
-                if e.annee.value in disc.annee:
-                    if e.id_binome not in binome_groups:
-                        binome_groups[e.id_binome] = []
-                    binome_groups[e.id_binome].append(e.id_eleve)
-            
-            # Créer paires uniques (groupes de 2)
-            binome_pairs = set()
-            for binome_id, eleves_ids in binome_groups.items():
-                if len(eleves_ids) == 2:
-                    binome_id_1 = min(eleves_ids)
-                    binome_id_2 = max(eleves_ids)
-                    binome_pairs.add((binome_id_1, binome_id_2))
-            
-            # Pour chaque paire, forcer même affectations
-            for e1_id, e2_id in binome_pairs:
-                for v_idx in range(len(self.vacations)):
-                    var1 = self.assignments.get((e1_id, disc.id_discipline, v_idx))
-                    var2 = self.assignments.get((e2_id, disc.id_discipline, v_idx))
-                    
-                    if var1 is not None and var2 is not None:
-                        self.model.Add(var1 == var2)
-                        count += 1
+        """
+        Contrainte: Binômes doivent être affectés ensemble
         
-        logger.info(f"✓ {count} contraintes de binômes ajoutées")
+        Garantie par construction: les deux membres d'un binôme partagent la même
+        variable (cf. _create_variables), les sommes de capacité la comptent deux fois.
+        """
+        rows = np.flatnonzero(self.binome_partner[self.store.student, self.store.discipline] >= 0)
+        logger.info(f"✓ {len(rows) // 2} variables partagées par des binômes (aucune contrainte ajoutée)")
     
     def _add_frequency_constraints(self):
-        """Contrainte: Fréquence des vacations (toutes les X semaines)"""
+        """
+        Contrainte: Fréquence des vacations (toutes les X semaines)
+        
+        Au plus une semaine avec affectation par fenêtre de X semaines consécutives
+        (équivaut à un écart d'au moins X semaines entre deux semaines affectées).
+        Seules les fenêtres maximales contenant au moins deux semaines sont écrites
+        (cf. _maximal_windows), sur les indicateurs de semaine: une contrainte
+        at_most_one ("fenetres") ou une différence de sommes cumulées ("prefixes").
+        """
         logger.info("Ajout contraintes: Fréquence...")
+        prefixes = self.config.solver_params.window_formulation == 'prefixes'
         
         count = 0
-        for disc in self.config.disciplines:
-            if disc.frequence_vacations <= 1:
+        for (s_pos, d_pos), weeks in self._iter_student_disc_weeks(lambda d: d.frequence_vacations > 1):
+            disc = self.config.disciplines[d_pos]
+            week_numbers = [s for s, _ in weeks]
+            windows = self._maximal_windows(week_numbers, disc.frequence_vacations, [1] * len(weeks), 1)
+            if not windows:
                 continue
             
-            for el in self.config.eleves:
-                if el.annee.value not in disc.annee:
-                    continue
-                
-                # Vérifier qu'entre deux semaines consécutives avec affectation,
-                # il y a au moins frequence_vacations semaines d'écart
-                for s1 in range(1, 53):
-                    vars_s1 = self.vars_by_student_disc_semaine.get((el.id_eleve, disc.id_discipline, s1), [])
-                    if not vars_s1:
-                        continue
-                    
-                    # Si affectation en s1, pas d'affectation dans les (freq-1) semaines suivantes
-                    for offset in range(1, disc.frequence_vacations):
-                        s2 = s1 + offset
-                        if s2 > 52:
-                            break
-                        
-                        vars_s2 = self.vars_by_student_disc_semaine.get((el.id_eleve, disc.id_discipline, s2), [])
-                        if vars_s2:
-                            sum_s1 = sum(v for (_, v) in vars_s1)
-                            sum_s2 = sum(v for (_, v) in vars_s2)
-                            # Si sum_s1 > 0, alors sum_s2 == 0
-                            has_s1 = self.model.NewBoolVar(f"has_e{el.id_eleve}_d{disc.id_discipline}_s{s1}")
-                            self.model.Add(sum_s1 > 0).OnlyEnforceIf(has_s1)
-                            self.model.Add(sum_s1 == 0).OnlyEnforceIf(has_s1.Not())
-                            self.model.Add(sum_s2 == 0).OnlyEnforceIf(has_s1)
-                            count += 1
+            # Indicateurs des seules semaines couvertes par une fenêtre
+            covered = self._covered(windows)
+            has = [
+                [self.get_week_indicator(s_pos, d_pos, s, rows).Index()] if k in covered else []
+                for k, (s, rows) in enumerate(weeks[:max(covered) + 1])
+            ]
+            if prefixes:
+                cumul = self._prefix_sums(has, f"cumfreq_e{self.student_ids[s_pos]}_d{disc.id_discipline}", week_numbers)
+                for i, j in windows:
+                    self._add_window_difference(cumul, i, j, 1)
+            else:
+                for i, j in windows:
+                    self.emit.at_most_one([index for week in has[i:j + 1] for index in week])
+            count += len(windows)
         
         logger.info(f"✓ {count} contraintes de fréquence ajoutées")
     
@@ -483,34 +788,25 @@ class ScheduleOptimizer:
         """Contrainte: Répartition semestrielle des quotas"""
         logger.info("Ajout contraintes: Répartition semestrielle...")
         
+        grouping = self.store.group_by('student', 'discipline')
+        semaines = self.store.semaine
+        
         count = 0
-        for disc in self.config.disciplines:
-            if not disc.repartition_semestrielle:
-                continue
+        for (_, d_pos), rows in grouping.iter(self._disciplines_mask(grouping, 1, lambda d: d.repartition_semestrielle)):
+            disc = self.config.disciplines[d_pos]
             
-            for el in self.config.eleves:
-                if el.annee.value not in disc.annee:
-                    continue
-                
-                # Semestre 1: semaines 1-26, Semestre 2: semaines 27-52
-                vars_sem1 = []
-                vars_sem2 = []
-                
-                for s in range(1, 27):
-                    vars_s = self.vars_by_student_disc_semaine.get((el.id_eleve, disc.id_discipline, s), [])
-                    vars_sem1.extend([v for (_, v) in vars_s])
-                
-                for s in range(27, 53):
-                    vars_s = self.vars_by_student_disc_semaine.get((el.id_eleve, disc.id_discipline, s), [])
-                    vars_sem2.extend([v for (_, v) in vars_s])
+            # Semestre 1: semaines 1-26, Semestre 2: semaines 27-52
+            in_sem1 = semaines[rows] <= 26
+            rows_sem1 = rows[in_sem1]
+            rows_sem2 = rows[~in_sem1]
+            
+            if len(rows_sem1) and len(rows_sem2):
+                quota_sem1 = disc.repartition_semestrielle[0]
+                quota_sem2 = disc.repartition_semestrielle[1]
                 
-                if vars_sem1 and vars_sem2:
-                    quota_sem1 = disc.repartition_semestrielle[0]
-                    quota_sem2 = disc.repartition_semestrielle[1]
-                    
-                    self.model.Add(sum(vars_sem1) <= quota_sem1)
-                    self.model.Add(sum(vars_sem2) <= quota_sem2)
-                    count += 2
+                self.emit.linear(self.store.var_index[rows_sem1], ub=quota_sem1)
+                self.emit.linear(self.store.var_index[rows_sem2], ub=quota_sem2)
+                count += 2
         
         logger.info(f"✓ {count} contraintes de répartition semestrielle ajoutées")
     
@@ -518,57 +814,34 @@ class ScheduleOptimizer:
         """Contrainte: Mixité des groupes (niveaux)"""
         logger.info("Ajout contraintes: Mixité des groupes...")
         
+        grouping = self.store.group_by('discipline', 'vacation', 'niveau')
+        
         count = 0
-        for disc in self.config.disciplines:
-            if disc.mixite_groupes == 0:
-                continue
+        for (d_pos, v_idx), levels in grouping.iter_runs(2, self._disciplines_mask(grouping, 0, lambda d: d.mixite_groupes != 0)):
+            disc = self.config.disciplines[d_pos]
             
-            for v_idx, vac in enumerate(self.vacations):
-                slot_idx = vac.jour * 2 + (0 if vac.period == DemiJournee.matin else 1)
-                
-                if not (len(disc.presence) > slot_idx and disc.presence[slot_idx]):
-                    continue
-                
-                # Récupérer toutes les années éligibles
-                niveaux_eligibles = [niv for niv in niveau if niv.value in disc.annee]
-                
-                if disc.mixite_groupes == 1:
-                    # Exactement 1 élève de chaque niveau
-                    for niv in niveaux_eligibles:
-                        vars_niveau = self.vars_by_disc_vac_niveau.get((disc.id_discipline, v_idx, niv), [])
-                        if vars_niveau:
-                            self.model.Add(sum(vars_niveau) == 1)
-                            count += 1
+            if disc.mixite_groupes == 1:
+                # Exactement 1 élève de chaque niveau
+                for _, rows in levels:
+                    index = self.emit.linear(self.store.var_index[rows], lb=1, ub=1)
+                    self.coverage_constraints.append([index, int(self.vac_semaine[v_idx])])
+                    count += 1
+            
+            elif disc.mixite_groupes in (2, 3):
+                niveau_present = [
+                    self.get_level_indicator(d_pos, v_idx, niv_val, rows).Index()
+                    for niv_val, rows in levels
+                ]
                 
-                elif disc.mixite_groupes == 2:
+                if disc.mixite_groupes == 2 and len(niveau_present) >= 2:
                     # Au moins 2 niveaux différents
-                    niveau_present_vars = []
-                    for niv in niveaux_eligibles:
-                        vars_niveau = self.vars_by_disc_vac_niveau.get((disc.id_discipline, v_idx, niv), [])
-                        if vars_niveau:
-                            niv_present = self.model.NewBoolVar(f"niv{niv.value}_d{disc.id_discipline}_v{v_idx}")
-                            self.model.Add(sum(vars_niveau) > 0).OnlyEnforceIf(niv_present)
-                            self.model.Add(sum(vars_niveau) == 0).OnlyEnforceIf(niv_present.Not())
-                            niveau_present_vars.append(niv_present)
-                    
-                    if len(niveau_present_vars) >= 2:
-                        self.model.Add(sum(niveau_present_vars) >= 2)
-                        count += 1
-                
+                    index = self.emit.linear(niveau_present, lb=2)
+                    self.coverage_constraints.append([index, int(self.vac_semaine[v_idx])])
+                    count += 1
                 elif disc.mixite_groupes == 3:
                     # Tous du même niveau
-                    niveau_present_vars = []
-                    for niv in niveaux_eligibles:
-                        vars_niveau = self.vars_by_disc_vac_niveau.get((disc.id_discipline, v_idx, niv), [])
-                        if vars_niveau:
-                            niv_present = self.model.NewBoolVar(f"niv{niv.value}_d{disc.id_discipline}_v{v_idx}")
-                            self.model.Add(sum(vars_niveau) > 0).OnlyEnforceIf(niv_present)
-                            self.model.Add(sum(vars_niveau) == 0).OnlyEnforceIf(niv_present.Not())
-                            niveau_present_vars.append(niv_present)
-                    
-                    if niveau_present_vars:
-                        self.model.Add(sum(niveau_present_vars) <= 1)
-                        count += 1
+                    self.emit.linear(niveau_present, ub=1)
+                    count += 1
         
         logger.info(f"✓ {count} contraintes de mixité ajoutées")
     
@@ -576,33 +849,41 @@ class ScheduleOptimizer:
         """Contrainte: Pas plus de X vacations dans Y semaines"""
         logger.info("Ajout contraintes: Continuité...")
         
+        def has_continuity(disc):
+            return (
+                isinstance(disc.repetition_continuite, (list, tuple))
+                and disc.repetition_continuite[0] > 0
+                and disc.repetition_continuite[1] > 0
+            )
+        
+        prefixes = self.config.solver_params.window_formulation == 'prefixes'
+        
         count = 0
-        for disc in self.config.disciplines:
-            if not isinstance(disc.repetition_continuite, (list, tuple)):
-                continue
-            
+        for (s_pos, d_pos), weeks in self._iter_student_disc_weeks(has_continuity):
+            disc = self.config.disciplines[d_pos]
             limit = disc.repetition_continuite[0]
             distance = disc.repetition_continuite[1]
             
-            if limit <= 0 or distance <= 0:
+            # Fenêtres glissantes de 'distance' semaines: seules les fenêtres maximales
+            # pouvant dépasser la limite (cf. _maximal_windows)
+            windows = self._maximal_windows([s for s, _ in weeks], distance, [len(rows) for _, rows in weeks], limit)
+            if not windows:
                 continue
             
-            for el in self.config.eleves:
-                if el.annee.value not in disc.annee:
-                    continue
-                
-                # Fenêtre glissante de 'distance' semaines
-                for s_start in range(1, 53):
-                    s_end = min(s_start + distance - 1, 52)
-                    
-                    vars_window = []
-                    for s in range(s_start, s_end + 1):
-                        vars_s = self.vars_by_student_disc_semaine.get((el.id_eleve, disc.id_discipline, s), [])
-                        vars_window.extend([v for (_, v) in vars_s])
-                    
-                    if vars_window:
-                        self.model.Add(sum(vars_window) <= limit)
-                        count += 1
+            if prefixes:
+                # Somme sur la fenêtre = différence de deux sommes cumulées par semaine
+                covered = self._covered(windows)
+                cumul = self._prefix_sums(
+                    [self.store.var_index[rows].tolist() if k in covered else [] for k, (_, rows) in enumerate(weeks[:max(covered) + 1])],
+                    f"cumcont_e{self.student_ids[s_pos]}_d{disc.id_discipline}", [s for s, _ in weeks]
+                )
+                for i, j in windows:
+                    self._add_window_difference(cumul, i, j, limit)
+            else:
+                for i, j in windows:
+                    rows_window = np.concatenate([rows for _, rows in weeks[i:j + 1]])
+                    self.emit.linear(self.store.var_index[rows_window], ub=limit)
+            count += len(windows)
         
         logger.info(f"✓ {count} contraintes de continuité ajoutées")
     
@@ -610,53 +891,38 @@ class ScheduleOptimizer:
         """Contrainte: Remplacement de niveau (% de capacité)"""
         logger.info("Ajout contraintes: Remplacement de niveau...")
         
+        grouping = self.store.group_by('discipline', 'vacation', 'niveau')
+        niveau_values = {n.value for n in niveau}
+        
         count = 0
-        for disc in self.config.disciplines:
-            if not disc.remplacement_niveau:
-                continue
+        for (d_pos, v_idx), levels in grouping.iter_runs(2, self._disciplines_mask(grouping, 0, lambda d: d.remplacement_niveau)):
+            disc = self.config.disciplines[d_pos]
+            rows_by_niveau = dict(levels)
+            slot_idx = int(self.vac_slot[v_idx])
             
             for (niv_from_val, niv_to_val, percentage) in disc.remplacement_niveau:
-                # Trouver les objets niveau
-                niv_from = None
-                niv_to = None
-                for n in niveau:
-                    if n.value == niv_from_val:
-                        niv_from = n
-                    if n.value == niv_to_val:
-                        niv_to = n
-                
-                if not niv_from or not niv_to:
+                if niv_from_val not in niveau_values or niv_to_val not in niveau_values:
                     continue
                 
                 # Pour chaque vacation, si niveau FROM absent, niveau TO doit remplir X%
-                for v_idx, vac in enumerate(self.vacations):
-                    slot_idx = vac.jour * 2 + (0 if vac.period == DemiJournee.matin else 1)
-                    
-                    if not (len(disc.presence) > slot_idx and disc.presence[slot_idx]):
-                        continue
-                    
-                    vars_from = self.vars_by_disc_vac_niveau.get((disc.id_discipline, v_idx, niv_from), [])
-                    vars_to = self.vars_by_disc_vac_niveau.get((disc.id_discipline, v_idx, niv_to), [])
-                    
-                    if not vars_to:
-                        continue
-                    
-                    cap = disc.nb_eleve[slot_idx] if len(disc.nb_eleve) > slot_idx else 0
-                    required = int((percentage / 100.0) * cap)
+                rows_to = rows_by_niveau.get(niv_to_val)
+                if rows_to is None:
+                    continue
+                rows_from = rows_by_niveau.get(niv_from_val)
+                
+                cap = disc.nb_eleve[slot_idx] if len(disc.nb_eleve) > slot_idx else 0
+                required = int((percentage / 100.0) * cap)
+                
+                if required > 0:
+                    # Si aucun élève FROM présent, alors TO >= required
+                    index = self.emit.linear(self.store.var_index[rows_to], lb=required)
                     
-                    if required > 0:
-                        # Si aucun élève FROM présent, alors TO >= required
-                        from_absent = self.model.NewBoolVar(f"from_absent_d{disc.id_discipline}_v{v_idx}")
-                        
-                        if vars_from:
-                            self.model.Add(sum(vars_from) == 0).OnlyEnforceIf(from_absent)
-                            self.model.Add(sum(vars_from) > 0).OnlyEnforceIf(from_absent.Not())
-                        else:
-                            # Pas de variables FROM disponibles, donc toujours absent
-                            self.model.Add(from_absent == 1)
-                        
-                        self.model.Add(sum(vars_to) >= required).OnlyEnforceIf(from_absent)
-                        count += 1
+                    if rows_from is not None:
+                        from_present = self.get_level_indicator(d_pos, v_idx, niv_from_val, rows_from)
+                        self.emit.only_enforce_if(index, [from_present.Not().Index()])
+                    # Sinon: pas de variables FROM disponibles, donc toujours absent
+                    self.coverage_constraints.append([index, int(self.vac_semaine[v_idx])])
+                    count += 1
         
         logger.info(f"✓ {count} contraintes de remplacement ajoutées")
     
@@ -672,121 +938,280 @@ class ScheduleOptimizer:
                     if el.annee.value not in disc.annee:
                         continue
                     
-                    try:
-                        idx_annee = disc.annee.index(el.annee.value)
-                        quota = disc.quota[idx_annee] if len(disc.quota) > idx_annee else 0
-                    except (ValueError, IndexError):
-                        quota = 0
+                    quota = self._get_quota(disc, el.annee.value)
                     
                     if quota > 1:
-                        # Chaque paire d'affectations peut rapporter 30 points max
+                        # Chaque paire d'affectations peut rapporter W_SAME_DAY points max
                         max_pairs = quota * (quota - 1) // 2
-                        self.max_theoretical_score += max_pairs * 30
+                        self.max_theoretical_score += max_pairs * W_SAME_DAY
         
         logger.info("✓ Même jour configuré (soft)")
     
+    # indicator cache
+    
+    def get_week_indicator(self, s_pos: int, d_pos: int, semaine: int, rows=None):
+        """BoolVar vraie ssi l'élève a au moins une affectation dans la discipline cette semaine"""
+        key = ('semaine', s_pos, d_pos, semaine)
+        if rows is None and key not in self.indicators:
+            rows = self.store.group_by('student', 'discipline', 'semaine').rows((s_pos, d_pos, semaine))
+        return self._get_indicator(key, rows, f"has_e{self.student_ids[s_pos]}_d{self.discipline_ids[d_pos]}_s{semaine}")
+    
+    def get_day_indicator(self, s_pos: int, d_pos: int, semaine: int, jour: int, rows=None):
+        """BoolVar vraie ssi l'élève a au moins une affectation dans la discipline ce jour de la semaine"""
+        key = ('jour', s_pos, d_pos, semaine, jour)
+        if rows is None and key not in self.indicators:
+            rows = self.store.group_by('student', 'discipline', 'semaine', 'jour').rows((s_pos, d_pos, semaine, jour))
+        return self._get_indicator(key, rows, f"has_d{jour}_e{self.student_ids[s_pos]}_d{self.discipline_ids[d_pos]}_s{semaine}")
+    
+    def get_level_indicator(self, d_pos: int, v_idx: int, niv_val: int, rows=None):
+        """BoolVar vraie ssi au moins un élève du niveau est affecté à la discipline sur la vacation"""
+        key = ('niveau', d_pos, v_idx, niv_val)
+        if rows is None and key not in self.indicators:
+            rows = self.store.group_by('discipline', 'vacation', 'niveau').rows((d_pos, v_idx, niv_val))
+        return self._get_indicator(key, rows, f"niv{niv_val}_d{self.discipline_ids[d_pos]}_v{v_idx}")
+    
+    def _get_indicator(self, key: tuple, rows, name: str):
+        """
+        Retourne l'indicateur canonique b = OR(x_i) pour la clé donnée (mémoïsé)
+        
+        - une seule variable: l'indicateur est la variable elle-même (aucun ajout au modèle)
+        - sinon: b = max(x_i) via AddMaxEquality (une seule contrainte, équivalence complète)
+        """
+        self.indicator_requests += 1
+        indicator = self.indicators.get(key)
+        if indicator is not None:
+            return indicator
+        if rows is None or len(rows) == 0:
+            raise KeyError(f"Indicateur sans variable: {key}")
+        
+        # Dédoublonnage par index CP-SAT (une même variable peut apparaître plusieurs fois)
+        unique_vars = list({var.Index(): var for var in self.store.vars_of(rows)}.values())
+        if len(unique_vars) == 1:
+            indicator = unique_vars[0]
+        else:
+            indicator = self.model.NewBoolVar(name)
+            self.model.AddMaxEquality(indicator, unique_vars)
+        
+        self.indicators[key] = indicator
+        return indicator
+    
+    # index helpers
+    
+    def _disciplines_mask(self, grouping, disc_col: int, predicate) -> np.ndarray:
+        """Masque des groupes dont la discipline (colonne disc_col de la clé) vérifie predicate"""
+        selected = np.array([bool(predicate(disc)) for disc in self.config.disciplines], dtype=bool)
+        if not len(grouping):
+            return np.zeros(0, dtype=bool)
+        return selected[grouping.keys[:, disc_col]]
+    
+    def _iter_student_disc_weeks(self, predicate):
+        """
+        Itère sur ((s_pos, d_pos), [(semaine, lignes), ...]) pour les disciplines vérifiant predicate
+        
+        Seules les semaines ayant au moins une variable sont présentes, triées par semaine.
+        """
+        grouping = self.store.group_by('student', 'discipline', 'semaine')
+        return grouping.iter_runs(2, self._disciplines_mask(grouping, 1, predicate))
+    
+    @staticmethod
+    def _maximal_windows(weeks: List[int], length: int, sizes: List[int], limit: int) -> List[Tuple[int, int]]:
+        """
+        Fenêtres glissantes de length semaines à contraindre, en intervalles [i, j] d'indices de weeks
+        
+        weeks: semaines ayant au moins une variable (triées), sizes: nombre de
+        variables de chacune. Parmi les fenêtres [s, s + length - 1] (tronquées à la
+        semaine 52), ne restent que les fenêtres maximales: une fenêtre commençant
+        sur une semaine sans variable, ou dont les semaines sont toutes dans la
+        fenêtre précédente, est dominée. Les fenêtres de taille totale <= limit ne
+        peuvent être violées et sont omises.
+        """
+        cumul = np.concatenate([[0], np.cumsum(sizes)])
+        ends = np.searchsorted(weeks, np.asarray(weeks) + length, side='left') - 1
+        windows = []
+        previous_end = -1
+        for i, j in enumerate(ends.tolist()):
+            if j > previous_end and cumul[j + 1] - cumul[i] > limit:
+                windows.append((i, j))
+            previous_end = max(previous_end, j)
+        return windows
+    
+    @staticmethod
+    def _covered(windows: List[Tuple[int, int]]) -> set:
+        """Indices des semaines couvertes par au moins une fenêtre"""
+        return {k for i, j in windows for k in range(i, j + 1)}
+    
+    def _prefix_sums(self, groups: List[List[int]], name: str, weeks: List[int]) -> List:
+        """
+        Sommes cumulées C_k = C_{k-1} + sum(groups[k]) (indices proto de variables booléennes)
+        
+        Une IntVar par groupe (semaine), liée à la précédente par une égalité de
+        taille len(groups[k]) + 2.
+        """
+        cumul = []
+        total = 0
+        for k, indices in enumerate(groups):
+            total += len(indices)
+            c_k = self.model.NewIntVar(0, total, f"{name}_s{weeks[k]}")
+            if k == 0:
+                self.emit.linear(indices + [c_k.Index()], lb=0, ub=0, coeffs=[1] * len(indices) + [-1])
+            else:
+                self.emit.linear(
+                    indices + [c_k.Index(), cumul[-1].Index()], lb=0, ub=0,
+                    coeffs=[1] * len(indices) + [-1, 1]
+                )
+            cumul.append(c_k)
+        return cumul
+    
+    def _add_window_difference(self, cumul: List, i: int, j: int, limit: int):
+        """Somme des groupes i..j <= limit, soit C_j - C_{i-1} <= limit"""
+        if i == 0:
+            self.emit.linear([cumul[j].Index()], ub=limit)
+        else:
+            self.emit.linear([cumul[j].Index(), cumul[i - 1].Index()], ub=limit, coeffs=[1, -1])
+    
+    @staticmethod
+    def _get_quota(disc, annee_value: int) -> int:
+        """Quota de la discipline pour un niveau (0 si non défini)"""
+        try:
+            idx_annee = disc.annee.index(annee_value)
+            return disc.quota[idx_annee] if len(disc.quota) > idx_annee else 0
+        except (ValueError, IndexError):
+            return 0
+    
     # objective configuration
         
+    def _add_symmetry_breaking(self):
+        """
+        Bris de symétrie entre unités interchangeables (élève seul ou binôme)
+        
+        Dans chaque classe, les unités sont ordonnées par une clé linéaire: la somme
+        des (vacation + 1) affectées au premier membre, dans la discipline où il a
+        le plus de variables. Permuter les unités d'une classe ne change ni la
+        faisabilité ni l'objectif: toute solution peut être réordonnée pour
+        respecter la contrainte, aucune valeur optimale n'est perdue.
+        """
+        logger.info("Ajout contraintes: Bris de symétrie...")
+        
+        by_student_disc = self.store.group_by('student', 'discipline')
+        units = self.student_classes.units
+        count = 0
+        
+        for unit_ids in self.student_classes.unit_classes:
+            leaders = [units[u][0] for u in unit_ids]
+            per_disc = (self.store.row_lookup[leaders[0]] >= 0).sum(axis=1)
+            if per_disc.max() == 0:
+                continue
+            d_pos = int(per_disc.argmax())
+            
+            # Clé d'une unité: (indices des variables, coefficients vacation + 1)
+            keys = []
+            for s_pos in leaders:
+                rows = by_student_disc.rows((s_pos, d_pos))
+                keys.append((self.store.var_index[rows], self.store.vacation[rows] + 1))
+            for (vars_1, coeffs_1), (vars_2, coeffs_2) in zip(keys, keys[1:]):
+                # key_1 - key_2 <= 0
+                self.emit.linear(
+                    np.concatenate([vars_1, vars_2]), ub=0, coeffs=np.concatenate([coeffs_1, -coeffs_2])
+                )
+                count += 1
+        
+        logger.info(f"✓ {count} contraintes de bris de symétrie ajoutées")
+    
     def _set_objective(self):
         """Configure la fonction objectif (logique V5_03_C)"""
         logger.info("Configuration de l'objectif...")
         
-        # Poids configuration (identique à V5_03_C)
-        w_fill = 600         # Points par affectation dans le quota
-        w_excess = -900      # Pénalité par affectation au-delà du quota
-        w_success = 30000    # Bonus si élève atteint son quota pour une discipline
+        # Poids configuration (identique à V5_03_C, cf. scoring.py)
+        w_fill = W_FILL
+        w_excess = W_EXCESS
+        w_success = W_SUCCESS
         w_grand_slam = 5000000  # Super bonus si TOUS les élèves atteignent quota
         
-        w_preference = 50    # Bonus préférence jour
-        w_priority_1 = 30    # Bonus priorité niveau 1
-        w_priority_2 = 15    # Bonus priorité niveau 2
-        w_priority_3 = 5     # Bonus priorité niveau 3
+        w_preference = W_PREFERENCE
+        w_priority_1, w_priority_2, w_priority_3 = W_PRIORITY
+        
+        w_pair = W_PAIR
+        w_same_day = W_SAME_DAY
         
-        w_pair = 50          # Bonus paire de jours
-        w_same_day = 30      # Bonus même jour
+        by_student_disc = self.store.group_by('student', 'discipline')
         
         # A. MAXIMISER REMPLISSAGE JUSQU'AU QUOTA
         logger.info("  → Configuration quotas...")
         
-        for disc in self.config.disciplines:
-            discipline_success_vars = []
+        success_vars_by_disc = collections.defaultdict(list)
+        
+        for (s_pos, d_pos), rows in by_student_disc:
+            disc = self.config.disciplines[d_pos]
+            el = self.config.eleves[s_pos]
             
-            for el in self.config.eleves:
-                if el.annee.value not in disc.annee:
-                    continue
+            # Récupérer quota
+            quota = self._get_quota(disc, el.annee.value)
+            
+            if quota > 0:
+                # 1. Variable sat_var: affectations DANS le quota
+                sat_var = self.model.NewIntVar(0, quota, f"sat_e{el.id_eleve}_d{disc.id_discipline}")
+                self.sat_vars[(el.id_eleve, disc.id_discipline)] = sat_var
                 
-                vars_list = self.vars_by_student_disc_all.get((el.id_eleve, disc.id_discipline), [])
-                if not vars_list:
-                    continue
+                # 2. Variable excess_var: affectations AU-DELÀ du quota
+                max_possible = len(rows)
+                excess_var = self.model.NewIntVar(0, max_possible, f"excess_e{el.id_eleve}_d{disc.id_discipline}")
+                self.excess_vars[(el.id_eleve, disc.id_discipline)] = excess_var
                 
-                # Récupérer quota
-                try:
-                    idx_annee = disc.annee.index(el.annee.value)
-                    quota = disc.quota[idx_annee] if len(disc.quota) > idx_annee else 0
-                except (ValueError, IndexError):
-                    quota = 0
+                # 3. Relation: sum(vars) - sat_var - excess_var = 0
+                self.emit.linear(
+                    np.append(self.store.var_index[rows], [sat_var.Index(), excess_var.Index()]),
+                    lb=0, ub=0, coeffs=[1] * len(rows) + [-1, -1]
+                )
                 
-                if quota > 0:
-                    # 1. Variable sat_var: affectations DANS le quota
-                    sat_var = self.model.NewIntVar(0, quota, f"sat_e{el.id_eleve}_d{disc.id_discipline}")
-                    self.sat_vars[(el.id_eleve, disc.id_discipline)] = sat_var
-                    
-                    # 2. Variable excess_var: affectations AU-DELÀ du quota
-                    max_possible = len(vars_list)
-                    excess_var = self.model.NewIntVar(0, max_possible, f"excess_e{el.id_eleve}_d{disc.id_discipline}")
-                    self.excess_vars[(el.id_eleve, disc.id_discipline)] = excess_var
-                    
-                    # 3. Relation: sum(vars) = sat_var + excess_var
-                    self.model.Add(sum(vars_list) == sat_var + excess_var)
-                    
-                    # 4. Contrainte: sat_var <= quota
-                    self.model.Add(sat_var <= quota)
-                    
-                    # 5. Contribution objectif: w_fill * sat_var + w_excess * excess_var
-                    self.obj_terms.append(sat_var)
-                    self.weights.append(w_fill)
-                    self.obj_terms.append(excess_var)
-                    self.weights.append(w_excess)
-                    
-                    # Score max théorique: tous atteignent quota sans dépassement
-                    self.max_theoretical_score += w_fill * quota
-                    
-                    # 6. Variable is_success: True si quota atteint
-                    is_success = self.model.NewBoolVar(f"success_e{el.id_eleve}_d{disc.id_discipline}")
-                    self.success_vars[(el.id_eleve, disc.id_discipline)] = is_success
-                    
-                    self.model.Add(sat_var >= quota).OnlyEnforceIf(is_success)
-                    self.model.Add(sat_var < quota).OnlyEnforceIf(is_success.Not())
-                    
-                    # 7. Bonus si succès individuel
-                    self.obj_terms.append(is_success)
-                    self.weights.append(w_success)
-                    
-                    # Score max théorique: tous les élèves réussissent
-                    self.max_theoretical_score += w_success
-                    
-                    discipline_success_vars.append(is_success)
-            
-            # 8. SUPER BONUS: Tous les élèves de la discipline atteignent quota
-            if discipline_success_vars:
-                all_success_var = self.model.NewBoolVar(f"all_success_d{disc.id_discipline}")
-                self.all_success_vars[disc.id_discipline] = all_success_var
+                # 4. Contrainte: sat_var <= quota
+                self.emit.linear([sat_var.Index()], ub=quota)
+                
+                # 5. Contribution objectif: w_fill * sat_var + w_excess * excess_var
+                self.objective.add([sat_var.Index(), excess_var.Index()], [w_fill, w_excess])
+                
+                # Score max théorique: tous atteignent quota sans dépassement
+                self.max_theoretical_score += w_fill * quota
+                
+                # 6. Variable is_success: True si quota atteint
+                is_success = self.model.NewBoolVar(f"success_e{el.id_eleve}_d{disc.id_discipline}")
+                self.success_vars[(el.id_eleve, disc.id_discipline)] = is_success
                 
-                # all_success = min(discipline_success_vars)
-                self.model.AddMinEquality(all_success_var, discipline_success_vars)
+                self.emit.linear([sat_var.Index()], lb=quota, enforcement=[is_success.Index()])
+                self.emit.linear([sat_var.Index()], ub=quota - 1, enforcement=[is_success.Not().Index()])
                 
-                # Bonus si tous réussissent
-                # NOTE: On ne l'inclut PAS dans max_theoretical_score (logique V5_03_C)
-                # car trop difficile à atteindre avec toutes les contraintes
-                # self.obj_terms.append(all_success_var)
-                # self.weights.append(w_grand_slam)
+                # 7. Bonus si succès individuel
+                self.objective.add([is_success.Index()], w_success)
+                
+                # Score max théorique: tous les élèves réussissent
+                self.max_theoretical_score += w_success
+                
+                success_vars_by_disc[d_pos].append(is_success)
+        
+        # Termes de quotas: premier niveau de la résolution lexicographique
+        self.quota_objective_vars = self.objective.raw_terms()[0].tolist()
+        
+        # 8. SUPER BONUS: Tous les élèves de la discipline atteignent quota
+        for d_pos, discipline_success_vars in sorted(success_vars_by_disc.items()):
+            disc = self.config.disciplines[d_pos]
+            all_success_var = self.model.NewBoolVar(f"all_success_d{disc.id_discipline}")
+            self.all_success_vars[disc.id_discipline] = all_success_var
+            
+            # all_success = min(discipline_success_vars)
+            self.model.AddMinEquality(all_success_var, discipline_success_vars)
+            
+            # Bonus si tous réussissent
+            # NOTE: On ne l'inclut PAS dans max_theoretical_score (logique V5_03_C)
+            # car trop difficile à atteindre avec toutes les contraintes
+            # self.objective.add([all_success_var.Index()], w_grand_slam)
         
         # B. PRÉFÉRENCES JOURS
         logger.info("  → Préférences jours...")
         poly = None
-        for disc in self.config.disciplines:
+        poly_pos = None
+        for d_pos, disc in enumerate(self.config.disciplines):
             if disc.id_discipline == 1:  # Polyclinique
                 poly = disc
+                poly_pos = d_pos
                 break
         
         if poly and poly.take_jour_pref:
@@ -794,177 +1219,144 @@ class ScheduleOptimizer:
             pref_count = 0
             for el in self.config.eleves:
                 if el.annee.value in poly.annee:
-                    try:
-                        idx_annee = poly.annee.index(el.annee.value)
-                        quota = poly.quota[idx_annee] if len(poly.quota) > idx_annee else 0
-                        pref_count += quota
-                    except (ValueError, IndexError):
-                        pass
+                    pref_count += self._get_quota(poly, el.annee.value)
             
             self.max_theoretical_score += pref_count * w_preference
             
             # Ajouter bonus
-            for (e_id, d_id, v_idx), var in self.assignments.items():
-                if d_id == poly.id_discipline:
-                    el = self.eleve_dict[e_id]
-                    vac = self.vacations[v_idx]
-                    # jour_preference: lundi=1, mardi=2, ..., vendredi=5
-                    # Convert to jour index: 0-4
-                    preferred_jour = el.jour_preference.value - 1
-                    if vac.jour == preferred_jour:
-                        self.obj_terms.append(var)
-                        self.weights.append(w_preference)
+            # jour_preference: lundi=1, mardi=2, ..., vendredi=5
+            # Convert to jour index: 0-4
+            preferred_jour = np.array([el.jour_preference.value - 1 for el in self.config.eleves])
+            is_preferred = (
+                (self.store.discipline == poly_pos)
+                & (self.store.jour == preferred_jour[self.store.student])
+            )
+            self.objective.add(self.store.var_index[is_preferred], w_preference)
         
         # C. PRIORITÉ NIVEAU
         logger.info("  → Priorité niveau...")
-        for disc in self.config.disciplines:
+        priority_weights = [w_priority_1, w_priority_2, w_priority_3]
+        niveau_values = {n.value for n in niveau}
+        for d_pos, disc in enumerate(self.config.disciplines):
             if disc.priorite_niveau:
                 # Calcul max théorique
                 for priority_idx, niv_val in enumerate(disc.priorite_niveau):
-                    niv = None
-                    for n in niveau:
-                        if n.value == niv_val:
-                            niv = n
-                            break
+                    if niv_val not in niveau_values or priority_idx >= len(priority_weights):
+                        continue
                     
-                    if niv:
-                        # Compter élèves de ce niveau
-                        count_niv = sum(1 for el in self.config.eleves if el.annee == niv)
-                        
-                        try:
-                            idx_annee = disc.annee.index(niv_val)
-                            quota = disc.quota[idx_annee] if len(disc.quota) > idx_annee else 0
-                        except (ValueError, IndexError):
-                            quota = 0
-                        
-                        if priority_idx == 0:
-                            self.max_theoretical_score += count_niv * quota * w_priority_1
-                        elif priority_idx == 1:
-                            self.max_theoretical_score += count_niv * quota * w_priority_2
-                        elif priority_idx == 2:
-                            self.max_theoretical_score += count_niv * quota * w_priority_3
-                
-                # Ajouter bonus
-                for priority_idx, niv_val in enumerate(disc.priorite_niveau):
-                    niv = None
-                    for n in niveau:
-                        if n.value == niv_val:
-                            niv = n
-                            break
+                    # Compter élèves de ce niveau
+                    count_niv = sum(1 for el in self.config.eleves if el.annee.value == niv_val)
+                    quota = self._get_quota(disc, niv_val)
+                    bonus = priority_weights[priority_idx]
                     
-                    if not niv:
-                        continue
+                    self.max_theoretical_score += count_niv * quota * bonus
                     
-                    for el in self.config.eleves:
-                        if el.annee != niv:
-                            continue
-                        
-                        vars_list = self.vars_by_student_disc_all.get((el.id_eleve, disc.id_discipline), [])
-                        if not vars_list:
-                            continue
-                        
-                        bonus = 0
-                        if priority_idx == 0:
-                            bonus = w_priority_1
-                        elif priority_idx == 1:
-                            bonus = w_priority_2
-                        elif priority_idx == 2:
-                            bonus = w_priority_3
-                        
-                        if bonus > 0:
-                            for var in vars_list:
-                                self.obj_terms.append(var)
-                                self.weights.append(bonus)
+                    # Ajouter bonus
+                    rows = np.flatnonzero((self.store.discipline == d_pos) & (self.store.niveau == niv_val))
+                    self.objective.add(self.store.var_index[rows], bonus)
         
         # D. PAIRES DE JOURS (Soft)
-        logger.info("  → Paires de jours...")
-        for disc in self.config.disciplines:
-            if disc.paire_jours:
-                for el in self.config.eleves:
-                    if el.annee.value not in disc.annee:
-                        continue
-                    
-                    for s in range(1, 53):
-                        vars_semaine = self.vars_by_student_disc_semaine.get((el.id_eleve, disc.id_discipline, s), [])
-                        if not vars_semaine:
-                            continue
+        # "indicateurs": bonus => has_jour1 ET has_jour2 (indicateurs de jour partagés)
+        # "motifs": une variable par motif de jours, liée directement aux affectations
+        # (motif => au moins une affectation chaque jour du motif) et, si la semaine ne
+        # peut couvrir que deux jours (<= 2 vacations), au plus un motif par semaine
+        formulation = self.config.solver_params.pair_days_formulation
+        logger.info(f"  → Paires de jours ({formulation})...")
+        jours = self.store.jour
+        for (s_pos, d_pos), weeks in self._iter_student_disc_weeks(lambda d: d.paire_jours):
+            disc = self.config.disciplines[d_pos]
+            e_id = self.student_ids[s_pos]
+            two_days_max = 0 < disc.nb_vacations_par_semaine <= 2
+            
+            for s, rows in weeks:
+                # Grouper par jour
+                rows_by_day = collections.defaultdict(list)
+                for row, day in zip(rows.tolist(), jours[rows].tolist()):
+                    rows_by_day[day].append(row)
+                
+                if formulation == 'motifs':
+                    patterns = []
+                    for (day1, day2) in disc.paire_jours:
+                        if day1 in rows_by_day and day2 in rows_by_day:
+                            pattern = self.model.NewBoolVar(f"motif_e{e_id}_d{disc.id_discipline}_s{s}_d{day1}d{day2}")
+                            for day in (day1, day2):
+                                self.emit.bool_or([pattern.Not().Index()] + self.store.var_index[rows_by_day[day]].tolist())
+                            self.objective.add([pattern.Index()], w_pair)
+                            patterns.append(pattern.Index())
+                    if two_days_max and len(patterns) > 1:
+                        self.emit.at_most_one(patterns)
+                    continue
+                
+                # Vérifier paires
+                for (day1, day2) in disc.paire_jours:
+                    if day1 in rows_by_day and day2 in rows_by_day:
+                        # Bonus si les deux jours ont au moins une affectation
+                        pair_bonus = self.model.NewBoolVar(f"pair_e{e_id}_d{disc.id_discipline}_s{s}_d{day1}d{day2}")
                         
-                        # Grouper par jour
-                        vars_by_day = collections.defaultdict(list)
-                        for (v_idx, var) in vars_semaine:
-                            day = self.vacations[v_idx].jour
-                            vars_by_day[day].append(var)
+                        has_day1 = self.get_day_indicator(s_pos, d_pos, s, day1, rows_by_day[day1])
+                        has_day2 = self.get_day_indicator(s_pos, d_pos, s, day2, rows_by_day[day2])
                         
-                        # Vérifier paires
-                        for (day1, day2) in disc.paire_jours:
-                            if day1 in vars_by_day and day2 in vars_by_day:
-                                # Bonus si les deux jours ont au moins une affectation
-                                pair_bonus = self.model.NewBoolVar(f"pair_e{el.id_eleve}_d{disc.id_discipline}_s{s}_d{day1}d{day2}")
-                                
-                                has_day1 = self.model.NewBoolVar(f"has_d{day1}_e{el.id_eleve}_d{disc.id_discipline}_s{s}")
-                                has_day2 = self.model.NewBoolVar(f"has_d{day2}_e{el.id_eleve}_d{disc.id_discipline}_s{s}")
-                                
-                                self.model.Add(sum(vars_by_day[day1]) > 0).OnlyEnforceIf(has_day1)
-                                self.model.Add(sum(vars_by_day[day1]) == 0).OnlyEnforceIf(has_day1.Not())
-                                self.model.Add(sum(vars_by_day[day2]) > 0).OnlyEnforceIf(has_day2)
-                                self.model.Add(sum(vars_by_day[day2]) == 0).OnlyEnforceIf(has_day2.Not())
-                                
-                                # pair_bonus = has_day1 AND has_day2
-                                self.model.AddBoolAnd([has_day1, has_day2]).OnlyEnforceIf(pair_bonus)
-                                self.model.AddBoolOr([has_day1.Not(), has_day2.Not()]).OnlyEnforceIf(pair_bonus.Not())
-                                
-                                self.obj_terms.append(pair_bonus)
-                                self.weights.append(w_pair)
+                        # pair_bonus => has_day1 AND has_day2
+                        # (poids positif: le solveur active le bonus dès que la paire est présente)
+                        self.emit.bool_and([has_day1.Index(), has_day2.Index()], enforcement=[pair_bonus.Index()])
+                        
+                        self.objective.add([pair_bonus.Index()], w_pair)
         
         # E. MÊME JOUR (Soft)
+        # Bonus w_same_day pour chaque paire d'affectations (élève, discipline) dont les
+        # jours sont identiques ou adjacents. Avec n_j = nombre d'affectations le jour j:
+        #   nb_paires = sum_j n_j * (n_j - 1) / 2 + sum_j n_j * n_{j+1}
+        # Formulation de taille linéaire: 5 compteurs journaliers par (élève, discipline)
+        # au lieu d'une BoolVar par paire de variables.
         logger.info("  → Même jour...")
-        for disc in self.config.disciplines:
-            if disc.meme_jour:
-                for el in self.config.eleves:
-                    if el.annee.value not in disc.annee:
-                        continue
-                    
-                    # Pour chaque paire d'affectations de l'élève dans cette discipline
-                    vars_list = self.vars_by_student_disc_all.get((el.id_eleve, disc.id_discipline), [])
-                    if len(vars_list) < 2:
-                        continue
-                    
-                    # Récupérer v_idx pour chaque variable
-                    var_to_vidx = {}
-                    for (e_id, d_id, v_idx), var in self.assignments.items():
-                        if e_id == el.id_eleve and d_id == disc.id_discipline:
-                            var_to_vidx[id(var)] = v_idx
-                    
-                    # Pour chaque paire
-                    for i in range(len(vars_list)):
-                        for j in range(i + 1, len(vars_list)):
-                            var_i = vars_list[i]
-                            var_j = vars_list[j]
-                            
-                            v_idx_i = var_to_vidx.get(id(var_i))
-                            v_idx_j = var_to_vidx.get(id(var_j))
-                            
-                            if v_idx_i is None or v_idx_j is None:
-                                continue
-                            
-                            day_i = self.vacations[v_idx_i].jour
-                            day_j = self.vacations[v_idx_j].jour
-                            
-                            # Bonus si même jour ou jour adjacent
-                            if abs(day_i - day_j) <= 1:
-                                same_day_bonus = self.model.NewBoolVar(f"sameday_e{el.id_eleve}_d{disc.id_discipline}_v{v_idx_i}v{v_idx_j}")
-                                
-                                # bonus actif si les deux variables sont à 1
-                                self.model.AddBoolAnd([var_i, var_j]).OnlyEnforceIf(same_day_bonus)
-                                self.model.AddBoolOr([var_i.Not(), var_j.Not()]).OnlyEnforceIf(same_day_bonus.Not())
-                                
-                                self.obj_terms.append(same_day_bonus)
-                                self.weights.append(w_same_day)
-        
-        # Définir objectif
-        self.model.Maximize(sum(t * w for t, w in zip(self.obj_terms, self.weights)))
-        
-        logger.info(f"✓ Objectif configuré avec {len(self.obj_terms)} termes")
+        if w_same_day % 2:
+            raise ValueError(f"W_SAME_DAY doit être pair (valeur: {w_same_day}): le bonus n_j·(n_j - 1)/2 serait tronqué")
+        half_same_day = w_same_day // 2
+        for (s_pos, d_pos), rows in by_student_disc.iter(self._disciplines_mask(by_student_disc, 1, lambda d: d.meme_jour)):
+            if len(rows) < 2:
+                continue
+            
+            disc = self.config.disciplines[d_pos]
+            e_id = self.student_ids[s_pos]
+            
+            # Compteur d'affectations par jour de la semaine
+            rows_by_day = collections.defaultdict(list)
+            for row, day in zip(rows.tolist(), jours[rows].tolist()):
+                rows_by_day[day].append(row)
+            
+            count_by_day = {}
+            for day, day_rows in sorted(rows_by_day.items()):
+                n_day = self.model.NewIntVar(0, len(day_rows), f"nday_e{e_id}_d{disc.id_discipline}_j{day}")
+                self.emit.linear(
+                    np.append(self.store.var_index[day_rows], n_day.Index()),
+                    lb=0, ub=0, coeffs=[1] * len(day_rows) + [-1]
+                )
+                count_by_day[day] = (n_day, len(day_rows))
+                
+                # Paires sur le même jour: w * n(n-1)/2 = (w/2) * n² - (w/2) * n
+                if len(day_rows) >= 2:
+                    n_day_sq = self.model.NewIntVar(0, len(day_rows) ** 2, f"nday2_e{e_id}_d{disc.id_discipline}_j{day}")
+                    self.model.AddMultiplicationEquality(n_day_sq, [n_day, n_day])
+                    self.objective.add([n_day_sq.Index(), n_day.Index()], [half_same_day, -half_same_day])
+            
+            # Paires sur deux jours adjacents: w * n_j * n_{j+1}
+            for day, (n_day, size) in count_by_day.items():
+                if day + 1 not in count_by_day:
+                    continue
+                n_next, size_next = count_by_day[day + 1]
+                n_adjacent = self.model.NewIntVar(0, size * size_next, f"nadj_e{e_id}_d{disc.id_discipline}_j{day}")
+                self.model.AddMultiplicationEquality(n_adjacent, [n_day, n_next])
+                self.objective.add([n_adjacent.Index()], w_same_day)
+        
+        # Définir objectif: poids cumulés par variable (une affectation peut recevoir
+        # les bonus de préférence et de priorité), réduits par leur PGCD
+        self.emit.maximize(*self.objective.consolidate())
+        self.objective_report = self.objective.report
+        
+        logger.info(
+            f"✓ Objectif configuré avec {self.objective_report['distinct_vars']} variables "
+            f"({self.objective_report['terms']} termes avant consolidation, poids / {self.objective_report['scale']})"
+        )
         logger.info(f"  Score max théorique: {self.max_theoretical_score:,.0f}")
     
     # resolution
@@ -973,9 +1365,31 @@ class ScheduleOptimizer:
         """
         Résout le modèle et retourne les résultats
         
+        La progression est publiée sur self.events (cf. events.py), et écrite en
+        JSONL si solver_params.events_path est défini.
+        
         Returns:
             OptimizationResult: Résultat avec statut et données
         """
+        params = self.config.solver_params
+        sink = self.events.subscribe(JsonlSink(params.events_path)) if params.events_path else None
+        self.events.emit(PHASE_STARTED, phase='solve', data={'strategy': params.strategy, 'max_time': params.max_time_seconds})
+        try:
+            result = self._solve()
+            if self.lp_bound_seconds > 0:
+                result.statistics['lp_bound_seconds'] = round(self.lp_bound_seconds, 2)
+            self.events.emit(
+                FINISHED, phase='solve', elapsed=round(result.solve_time, 2), objective=result.objective_value,
+                bound=result.upper_bound, gap=result.gap,
+                data={'status': result.status, 'stop_reason': result.stop_reason, 'normalized_score': result.normalized_score}
+            )
+            return result
+        finally:
+            if sink is not None:
+                self.events.unsubscribe(sink)
+                sink.close()
+    
+    def _solve(self) -> OptimizationResult:
         logger.info("=" * 80)
         logger.info("RÉSOLUTION")
         logger.info("=" * 80)
@@ -984,61 +1398,131 @@ class ScheduleOptimizer:
         
         self._notify_progress("Résolution en cours...", 75)
         
+        params = self.config.solver_params
+        if params.strategy == 'greedy':
+            return self.solve_greedy()
+        
+        self.bounds.pop('cpsat', None)  # Borne de la résolution précédente
+        self.lp_bound_seconds = 0.0
+        if params.lp_bound and self.bound_report is None:
+            # Temps pris sur le budget de résolution, au plus la moitié
+            self._notify_progress("Borne supérieure (relaxation linéaire)...", 72)
+            budget = max(1.0, params.max_time_seconds - self.elapsed_offset)
+            with self._event_phase('lp_bound'):
+                self.compute_upper_bound(min(params.lp_bound_time_limit, budget / 2))
+            self.lp_bound_seconds = time.time() - start_time
+        
+        # Reprise sur checkpoint ou démarrage à chaud configurés (si pas déjà appliqués)
+        if params.resume and self.warm_start_report is None:
+            self._notify_progress("Reprise depuis le dernier checkpoint...", 72)
+            with self._event_phase('resume'):
+                self.resume_from_checkpoint()
+        if params.warm_start_path and self.warm_start_report is None:
+            self._notify_progress("Démarrage à chaud...", 72)
+            with self._event_phase('warm_start'):
+                self.apply_warm_start(params.warm_start_path, params.warm_start_repair, params.warm_start_time_limit)
+        if params.greedy_hint and self.warm_start_report is None:
+            self._notify_progress("Construction du planning glouton...", 72)
+            with self._event_phase('greedy_hint'):
+                greedy = GreedyScheduler(self, seed=params.greedy_seed)
+                greedy.run()
+                self.warm_start_report = apply_hint_keys(
+                    self, greedy.assignment_keys(), "glouton",
+                    repair=params.warm_start_repair, time_limit=params.warm_start_time_limit
+                )
+        
+        # Budget restant (une reprise déduit le temps déjà consommé, ainsi que la borne LP)
+        max_time = max(1.0, params.max_time_seconds - self.elapsed_offset - self.lp_bound_seconds)
+        
+        checkpointer = None
+        if params.checkpoint_interval_seconds > 0 and self.config.output_dir is not None:
+            checkpointer = Checkpointer(
+                self._checkpoint_path(),
+                params.checkpoint_interval_seconds,
+                self,
+                elapsed_offset=self.elapsed_offset,
+                model_key=self.model_key
+            )
+        
+        if params.strategy == 'lns':
+            return self._solve_lns(max_time, start_time, checkpointer)
+        if params.strategy == 'lexicographic':
+            return self._solve_lexicographic(max_time, start_time, checkpointer)
+        if params.strategy == 'rolling_horizon':
+            return self._solve_rolling_horizon(max_time, start_time, checkpointer)
+        if params.strategy == 'lagrangian':
+            return self._solve_lagrangian(max_time, start_time, checkpointer)
+        if params.strategy == 'portfolio':
+            return self._solve_portfolio(max_time, start_time, checkpointer)
+        
         # Configurer solver
         self.solver = cp_model.CpSolver()
-        self.solver.parameters.max_time_in_seconds = self.config.solver_params.max_time_seconds
+        self.solver.parameters.max_time_in_seconds = max_time
         self.solver.parameters.num_workers = self.config.solver_params.num_workers
-        self.solver.parameters.log_search_progress = self.config.solver_params.log_progress
-        
-        # Callback pour suivi progression
-        callback = SolutionCallback(self.config.solver_params.max_time_seconds)
-        
-        # Thread timer pour log périodique
-        stop_timer = threading.Event()
-        
-        def periodic_progress():
-            """Log progression périodique même sans nouvelle solution"""
-            last_log = time.time()
-            while not stop_timer.is_set():
-                time.sleep(1)
-                current = time.time()
-                if current - last_log >= 5:
-                    elapsed = int(current - start_time)
-                    remaining = max(0, int(self.config.solver_params.max_time_seconds - elapsed))
-                    # Format compatible avec le parsing Streamlit (sans objective car pas encore disponible)
-                    print(f"PROGRESS|Status check|Elapsed: {elapsed}s|Remaining: {remaining}s|Objective: 0")
-                    sys.stdout.flush()
-                    last_log = current
-        
-        timer_thread = threading.Thread(target=periodic_progress, daemon=True)
-        timer_thread.start()
+        apply_cpsat_parameters(self.solver.parameters, params.cpsat_parameters)
+        
+        # Callback pour suivi progression, checkpoints et arrêt anticipé
+        stopping = StoppingRules.from_params(params, self.max_theoretical_score, self.upper_bound)
+        callback = SolutionCallback(max_time, checkpointer, stopping, events=self.events, upper_bound=self.upper_bound)
+        
+        # Log CP-SAT toujours capté (affiché seulement si log_progress): signes de vie
+        # et contrôle du plateau, durée du presolve en profilage
+        presolve_timer = PresolveTimer() if self.config.solver_params.profiling else None
+        
+        def on_log(line: str):
+            if presolve_timer is not None:
+                presolve_timer(line)
+            callback.on_log(line)
+        
+        self.solver.parameters.log_search_progress = True
+        self.solver.parameters.log_to_stdout = self.config.solver_params.log_progress
+        self.solver.log_callback = on_log
+        self.solver.best_bound_callback = callback.on_bound
         
         # Résolution
         try:
-            logger.info(f"Temps maximum: {self.config.solver_params.max_time_seconds}s")
-            print(f"SOLVER_START|MaxTime: {self.config.solver_params.max_time_seconds}s")
-            sys.stdout.flush()
+            logger.info(f"Temps maximum: {max_time}s")
+            self._search_started(max_time)
             
             status = self.solver.Solve(self.model, callback)
             
-            # Arrêter timer
-            stop_timer.set()
-            timer_thread.join(timeout=1)
-            
             solve_time = time.time() - start_time
             
             self._notify_progress("Solution trouvée", 95)
             
-            return self._build_result(status, solve_time)
+            # Checkpoint final: la dernière solution peut être postérieure au dernier checkpoint
+            if checkpointer is not None and status in (cp_model.OPTIMAL, cp_model.FEASIBLE):
+                checkpointer.save(
+                    self.solver.ResponseProto().solution,
+                    self.solver.ObjectiveValue(),
+                    self.solver.BestObjectiveBound(),
+                    self.solver.WallTime(),
+                    callback._solution_count
+                )
+            
+            result = self._build_result(status, solve_time)
+            # (stop_reason 'fallback' déjà fixé si le planning vient d'un repli: CP-SAT n'a rien trouvé)
+            if result.stop_reason != 'fallback':
+                if callback.stop_reason is not None:
+                    result.stop_reason = callback.stop_reason
+                elif status == cp_model.OPTIMAL:
+                    result.stop_reason = 'optimal'
+                elif status in (cp_model.FEASIBLE, cp_model.UNKNOWN):
+                    result.stop_reason = 'time_limit'
+            self._attach_profiling(result, presolve_timer)
+            if self.warm_start_report is not None:
+                result.statistics['warm_start'] = self.warm_start_report.to_dict()
+            return result
         
         except KeyboardInterrupt:
-            stop_timer.set()
             logger.warning("Interruption utilisateur (Ctrl+C)")
             
-            # Tenter récupération solution partielle
-            if self.solver.ObjectiveValue() > 0:
-                solve_time = time.time() - start_time
-                return self._build_result(cp_model.FEASIBLE, solve_time)
+            # Récupération du dernier checkpoint: le solver interrompu n'a pas de réponse exploitable
+            last = checkpointer.last if checkpointer is not None else None
+            if last is not None:
+                logger.warning(f"Reprise de la dernière solution sauvegardée (score {last.objective:,.0f})")
+                assignments = {key: 1 for key in last.keys()}
+                return self._solution_result('FEASIBLE', last.objective, assignments, time.time() - start_time)
             else:
                 return OptimizationResult(
                     status='ERROR',
@@ -1047,7 +1531,6 @@ class ScheduleOptimizer:
                 )
         
         except Exception as e:
-            stop_timer.set()
             logger.exception("Erreur lors de la résolution")
             return OptimizationResult(
                 status='ERROR',
@@ -1055,6 +1538,386 @@ class ScheduleOptimizer:
                 error_message=str(e)
             )
     
+    def _solve_lns(self, max_time: float, start_time: float, checkpointer: Optional[Checkpointer]) -> OptimizationResult:
+        """Résolution par recherche à grand voisinage (cf. lns.py)"""
+        params = self.config.solver_params
+        
+        def on_improvement(values, objective, elapsed):
+            self._publish_incumbent('lns', objective, elapsed, max_time)
+            if checkpointer is not None and checkpointer.due():
+                checkpointer.save(values, objective, None, elapsed, 0)
+        
+        driver = LNSDriver(
+            self,
+            time_slice=params.lns_time_slice,
+            initial_time=params.lns_initial_time,
+            seed=params.lns_seed,
+            on_improvement=on_improvement
+        )
+        search_start = time.time()
+        if self.warm_start_report is None:
+            # Sans démarrage à chaud: incumbent initial glouton, la résolution
+            # initiale du modèle complet pouvant ne rien trouver à temps
+            self._notify_progress("Construction du planning glouton...", 72)
+            with self._event_phase('greedy_hint'):
+                greedy = GreedyScheduler(self, seed=params.greedy_seed)
+                greedy.run()
+                self.warm_start_report = apply_hint_keys(
+                    self, greedy.assignment_keys(), "glouton",
+                    repair=params.warm_start_repair, time_limit=min(params.warm_start_time_limit, max_time / 2)
+                )
+        initial, initial_objective = None, None
+        if self.warm_start_report.solution is not None:
+            initial, initial_objective = self.warm_start_report.solution, self.warm_start_report.hint_objective
+        
+        max_time = max(1.0, max_time - (time.time() - search_start))
+        logger.info(f"Recherche LNS: {max_time:.0f}s, sous-problèmes de {params.lns_time_slice}s")
+        self._search_started(max_time)
+        lns = driver.run(max_time, initial, initial_objective)
+        if self.config.output_dir is not None:
+            driver.save_history(Path(self.config.output_dir) / "lns_history.json")
+        
+        solve_time = time.time() - start_time
+        self._notify_progress("Solution trouvée", 95)
+        if lns.values is None and params.greedy_fallback:
+            logger.warning("Aucune solution LNS: repli sur le planning glouton")
+            result = self.solve_greedy()
+            result.solve_time += solve_time
+            result.statistics['fallback'] = lns.status
+            result.stop_reason = 'fallback'
+            return result
+        if lns.values is None:
+            logger.error(f"✗ Aucune solution trouvée: {lns.status}")
+            return OptimizationResult(
+                status=lns.status,
+                solve_time=solve_time,
+                error_message=f"LNS: aucune solution initiale ({lns.status})"
+            )
+        
+        if checkpointer is not None:
+            checkpointer.save(lns.values, lns.objective, None, solve_time, 0)
+        
+        result = self._solution_result('FEASIBLE', lns.objective, self._assignments_from_values(lns.values), solve_time)
+        summary = lns.to_dict()
+        summary.pop('history')
+        result.statistics['lns'] = summary
+        if self.warm_start_report is not None:
+            result.statistics['warm_start'] = self.warm_start_report.to_dict()
+        return result
+    
+    def _solve_lexicographic(self, max_time: float, start_time: float, checkpointer: Optional[Checkpointer]) -> OptimizationResult:
+        """Résolution en deux étapes: quotas puis préférences (cf. lexicographic.py)"""
+        params = self.config.solver_params
+        # Budgets des étapes réduits dans les mêmes proportions s'ils dépassent le temps restant
+        stage1, stage2 = params.lexicographic_quota_seconds, params.lexicographic_preference_seconds
+        scale = min(1.0, max_time / (stage1 + stage2))
+        stage1, stage2 = max(1.0, stage1 * scale), max(1.0, stage2 * scale)
+        
+        self._search_started(stage1 + stage2)
+        staged = solve_lexicographic(
+            self,
+            [stage1, stage2],
+            tolerance=params.lexicographic_tolerance,
+            callback_factory=lambda time_limit: SolutionCallback(time_limit, events=self.events, phase='lexicographic')
+        )
+        
+        solve_time = time.time() - start_time
+        self._notify_progress("Solution trouvée", 95)
+        if staged.values is None:
+            logger.error(f"✗ Aucune solution trouvée: {staged.status}")
+            return OptimizationResult(
+                status=staged.status,
+                solve_time=solve_time,
+                error_message=f"Solver status: {staged.status}",
+                stages=staged.stages
+            )
+        
+        if checkpointer is not None:
+            checkpointer.save(staged.values, staged.objective, None, solve_time, len(staged.stages))
+        
+        result = self._solution_result('FEASIBLE', staged.objective, self._assignments_from_values(staged.values), solve_time)
+        result.stages = staged.stages
+        result.statistics['stages'] = staged.stages
+        for stage in staged.stages:
+            logger.info(f"  Étape {stage['stage']:<12}: {stage['status']:<8} objectif={stage['objective']} ({stage['seconds']}s)")
+        if self.warm_start_report is not None:
+            result.statistics['warm_start'] = self.warm_start_report.to_dict()
+        return result
+    
+    def _solve_rolling_horizon(self, max_time: float, start_time: float, checkpointer: Optional[Checkpointer]) -> OptimizationResult:
+        """Résolution période par période, puis polissage sur le modèle complet (cf. rolling_horizon.py)"""
+        params = self.config.solver_params
+        horizon = RollingHorizon(
+            self,
+            unit=params.rolling_unit,
+            pacing=params.rolling_pacing,
+            callback_factory=lambda time_limit: SolutionCallback(time_limit, events=self.events, phase='rolling_horizon')
+        )
+        
+        self._search_started(max_time)
+        rolled = horizon.run(max_time * (1.0 - params.rolling_polish_fraction))
+        if rolled.values is None:
+            logger.error(f"✗ Aucune solution trouvée: {rolled.status}")
+            return OptimizationResult(
+                status=rolled.status,
+                solve_time=time.time() - start_time,
+                error_message=f"Horizon glissant: étape sans solution ({rolled.status})",
+                stages=rolled.steps
+            )
+        
+        status_str, values, objective = 'FEASIBLE', rolled.values, rolled.objective
+        horizon_seconds = time.time() - start_time
+        polish_time = max_time - horizon_seconds
+        if params.rolling_polish_fraction > 0 and polish_time >= 1.0:
+            # Polissage: modèle complet avec la solution assemblée en hint
+            logger.info(f"Polissage sur le modèle complet: {polish_time:.0f}s")
+            self.model.ClearHints()
+            hint = self.model.Proto().solution_hint
+            hint.vars.extend(range(len(values)))
+            hint.values.extend(values.tolist())
+            
+            self.solver = cp_model.CpSolver()
+            self.solver.parameters.max_time_in_seconds = polish_time
+            self.solver.parameters.num_workers = params.num_workers
+            polish_start = time.time()
+            status = self.solver.Solve(self.model, SolutionCallback(
+                polish_time, checkpointer, events=self.events, upper_bound=self.upper_bound, phase='polish'
+            ))
+            polished = status in (cp_model.OPTIMAL, cp_model.FEASIBLE)
+            if polished:
+                self.bounds['cpsat'] = self.solver.BestObjectiveBound()
+            if polished and self.solver.ObjectiveValue() >= objective:
+                status_str = 'OPTIMAL' if status == cp_model.OPTIMAL else 'FEASIBLE'
+                values = np.asarray(self.solver.ResponseProto().solution, dtype=np.int64)
+                objective = self.solver.ObjectiveValue()
+            rolled.steps.append({
+                'step': 'polissage',
+                'status': status.name,
+                'objective': self.solver.ObjectiveValue() if polished else None,
+                'best_bound': self.solver.BestObjectiveBound() if polished else None,
+                'seconds': round(time.time() - polish_start, 2),
+            })
+        
+        solve_time = time.time() - start_time
+        self._notify_progress("Solution trouvée", 95)
+        if checkpointer is not None:
+            checkpointer.save(values, objective, None, solve_time, len(rolled.steps))
+        
+        result = self._solution_result(status_str, objective, self._assignments_from_values(values), solve_time)
+        result.stages = rolled.steps
+        result.statistics['rolling_horizon'] = {
+            'unit': params.rolling_unit,
+            'horizon_objective': rolled.objective,
+            'horizon_seconds': round(horizon_seconds, 2),
+            'steps': rolled.steps,
+        }
+        for step in rolled.steps:
+            logger.info(f"  Étape {step['step']:<12}: {step['status']:<8} objectif={step['objective']} ({step['seconds']}s)")
+        if self.warm_start_report is not None:
+            result.statistics['warm_start'] = self.warm_start_report.to_dict()
+        return result
+    
+    def _solve_lagrangian(self, max_time: float, start_time: float, checkpointer: Optional[Checkpointer]) -> OptimizationResult:
+        """Décomposition lagrangienne par élève: borne supérieure et planning réparé (cf. lagrangian.py)"""
+        params = self.config.solver_params
+        
+        # Planning glouton: cible du pas de sous-gradient et solution de secours
+        greedy = GreedyScheduler(self, seed=params.greedy_seed)
+        greedy_report = greedy.run()
+        target = greedy_report['score']['total']
+        
+        lagrangian = LagrangianDecomposition(
+            self,
+            processes=params.lagrangian_processes,
+            subproblem_seconds=params.lagrangian_subproblem_seconds
+        )
+        repair_time = min(params.lagrangian_repair_seconds, max_time / 2)
+        
+        self._search_started(max_time)
+        relaxed = lagrangian.run(
+            max(1.0, max_time - repair_time - (time.time() - start_time - self.lp_bound_seconds)),
+            target=target,
+            max_iterations=params.lagrangian_iterations,
+            repair_seconds=repair_time
+        )
+        
+        solve_time = time.time() - start_time
+        self._notify_progress("Solution trouvée", 95)
+        if relaxed.values is not None and relaxed.objective >= target:
+            status_str, objective = 'FEASIBLE', relaxed.objective
+            assignments = self._assignments_from_values(relaxed.values)
+            if checkpointer is not None:
+                checkpointer.save(relaxed.values, objective, relaxed.upper_bound, solve_time, len(relaxed.history))
+        elif not any(greedy_report['violations'].values()):
+            logger.warning("Planning réparé moins bon que le planning glouton: ce dernier est retenu")
+            status_str, objective = 'FEASIBLE', target
+            assignments = greedy.scorer.assignments_from_tensor(greedy.X)
+        else:
+            logger.error(f"✗ Aucune solution trouvée: {relaxed.status}")
+            return OptimizationResult(
+                status='TIMEOUT' if relaxed.status == 'BOUND_ONLY' else relaxed.status,
+                solve_time=solve_time,
+                error_message=f"Décomposition lagrangienne: aucun planning faisable ({relaxed.status})",
+                upper_bound=relaxed.upper_bound
+            )
+        
+        if relaxed.upper_bound:
+            self.bounds['lagrangian'] = relaxed.upper_bound
+        result = self._solution_result(status_str, objective, assignments, solve_time)
+        result.statistics['lagrangian'] = relaxed.to_dict()
+        if relaxed.upper_bound:
+            gap = max(0.0, (relaxed.upper_bound - objective) / relaxed.upper_bound)
+            result.statistics['lagrangian']['gap'] = gap
+            logger.info(f"  Borne supérieure lagrangienne: {relaxed.upper_bound:,.0f} (écart {100 * gap:.1f}%)")
+        return result
+    
+    def _solve_portfolio(self, max_time: float, start_time: float, checkpointer: Optional[Checkpointer]) -> OptimizationResult:
+        """K résolutions CP-SAT concurrentes partageant la meilleure solution à chaque tour (cf. portfolio.py)"""
+        params = self.config.solver_params
+        
+        def on_improvement(values, objective, elapsed):
+            self._publish_incumbent('portfolio', objective, elapsed, max_time)
+            if checkpointer is not None:
+                checkpointer.save(values, objective, None, elapsed, 0)
+        
+        portfolio = Portfolio(
+            self,
+            size=params.portfolio_size,
+            cores=params.portfolio_cores,
+            seed=params.portfolio_seed,
+            profiles=list(params.portfolio_profiles) or None,
+            on_improvement=on_improvement
+        )
+        self._search_started(max_time)
+        outcome = portfolio.run(max(1.0, max_time - (time.time() - start_time - self.lp_bound_seconds)), params.portfolio_round_seconds)
+        
+        solve_time = time.time() - start_time
+        self._notify_progress("Solution trouvée", 95)
+        if outcome.values is None:
+            logger.error(f"✗ Aucune solution trouvée: {outcome.status}")
+            return OptimizationResult(
+                status='TIMEOUT' if outcome.status == 'UNKNOWN' else outcome.status,
+                solve_time=solve_time,
+                error_message=f"Portefeuille: aucune solution ({outcome.status})"
+            )
+        
+        if outcome.upper_bound is not None:
+            self.bounds['cpsat'] = outcome.upper_bound
+        values = outcome.values[:len(self.model.Proto().variables)]
+        result = self._solution_result(outcome.status, outcome.objective, self._assignments_from_values(values), solve_time)
+        result.stop_reason = 'optimal' if outcome.status == 'OPTIMAL' else 'time_limit'
+        result.statistics['portfolio'] = outcome.to_dict()
+        logger.info(f"  Profil gagnant: {outcome.winner}")
+        if self.warm_start_report is not None:
+            result.statistics['warm_start'] = self.warm_start_report.to_dict()
+        return result
+    
+    def _checkpoint_path(self) -> Path:
+        return Path(self.config.output_dir) / "checkpoints" / "incumbent.npz"
+    
+    def solve_greedy(self) -> OptimizationResult:
+        """
+        Planning glouton en quelques secondes, sans CP-SAT (cf. greedy.py)
+        
+        Ne nécessite que prepare_data(): le modèle n'a pas besoin d'être construit.
+        
+        Returns:
+            OptimizationResult: statut 'FEASIBLE', ou 'HEURISTIC' si des contraintes
+            de couverture (remplissage, mixité, remplacement) restent violées
+        """
+        greedy = GreedyScheduler(self, seed=self.config.solver_params.greedy_seed)
+        return greedy.solve()
+    
+    def resume_from_checkpoint(self, path=None) -> Optional[WarmStartReport]:
+        """
+        Reprend une résolution interrompue depuis son dernier checkpoint
+        
+        La solution sauvegardée devient un hint (comme un démarrage à chaud) et le
+        temps déjà consommé est déduit du budget de la prochaine résolution.
+        
+        Args:
+            path: Fichier checkpoint (par défaut output_dir/checkpoints/incumbent.npz)
+        
+        Returns:
+            WarmStartReport, ou None si aucun checkpoint n'est disponible
+        """
+        if self.model is None:
+            raise RuntimeError("Modèle non construit: appeler prepare_and_build() avant resume_from_checkpoint()")
+        
+        path = Path(path) if path is not None else self._checkpoint_path()
+        checkpoint = load_checkpoint(path)
+        if checkpoint is None:
+            logger.warning(f"Aucun checkpoint à reprendre ({path})")
+            return None
+        
+        if checkpoint.model_key and self.model_key and checkpoint.model_key != self.model_key:
+            logger.warning("Checkpoint issu d'un autre modèle (données ou code modifiés): utilisé comme simple hint")
+        
+        logger.info(
+            f"Reprise du checkpoint du {checkpoint.created}: score {checkpoint.objective:,.0f}, "
+            f"{checkpoint.elapsed:.0f}s déjà consommées"
+        )
+        params = self.config.solver_params
+        self.warm_start_report = apply_hint_keys(
+            self, checkpoint.keys(), str(path), repair=params.warm_start_repair, time_limit=params.warm_start_time_limit
+        )
+        self.elapsed_offset = checkpoint.elapsed
+        return self.warm_start_report
+    
+    def apply_warm_start(self, path, repair: bool = True, time_limit: float = 120.0) -> WarmStartReport:
+        """
+        Ajoute des hints CP-SAT à partir d'un planning CSV (export_planning ou sortie batch)
+        
+        Args:
+            path: Planning CSV
+            repair: Cherche le planning faisable le plus proche si le planning n'est plus faisable
+            time_limit: Temps maximum des résolutions auxiliaires (complétion, réparation)
+        
+        Returns:
+            WarmStartReport: Bilan (affectations reprises/rejetées, statut de complétion)
+        """
+        if self.model is None:
+            raise RuntimeError("Modèle non construit: appeler prepare_and_build() avant apply_warm_start()")
+        self.warm_start_report = apply_warm_start(self, Path(path), repair=repair, time_limit=time_limit)
+        return self.warm_start_report
+    
+    def compute_upper_bound(self, time_limit: float = 120.0) -> BoundReport:
+        """
+        Borne supérieure de l'objectif par relaxation linéaire (cf. bounds.py)
+        
+        Bien plus serrée que max_theoretical_score: reportée avec la borne CP-SAT
+        (BestObjectiveBound) dans result.upper_bound et result.statistics['bounds'].
+        
+        Args:
+            time_limit: Temps maximum de la résolution GLOP
+        
+        Returns:
+            BoundReport: Bilan (borne None si la relaxation n'est pas résolue à temps)
+        """
+        if self.store is None:
+            raise RuntimeError("Modèle non construit: appeler prepare_and_build() avant compute_upper_bound()")
+        self.bound_report = lp_upper_bound(self, time_limit)
+        if self.bound_report.bound is not None:
+            self.bounds['lp'] = self.bound_report.bound
+        return self.bound_report
+    
+    @property
+    def upper_bound(self) -> Optional[float]:
+        """Meilleure borne supérieure prouvée de l'objectif (None si aucune)"""
+        return min(self.bounds.values()) if self.bounds else None
+    
+    def _attach_profiling(self, result: OptimizationResult, presolve_timer: Optional[PresolveTimer]):
+        """Ajoute le profil de construction et les statistiques CP-SAT à result.statistics['profiling']"""
+        if self.profiler is None:
+            return
+        result.statistics['profiling'] = {
+            'build': self.profiler.report(),
+            'solver': solver_statistics(
+                self.solver,
+                presolve_timer.presolve_seconds if presolve_timer is not None else None
+            ),
+        }
+    
     def _build_result(self, status, solve_time: float) -> OptimizationResult:
         """Construit l'objet résultat depuis le statut du solver"""
         
@@ -1069,38 +1932,35 @@ class ScheduleOptimizer:
         
         status_str = status_map.get(status, 'UNKNOWN')
         
+        raw_score = None
+        values = None
         if status in (cp_model.OPTIMAL, cp_model.FEASIBLE):
             raw_score = self.solver.ObjectiveValue()
-            
-            # Normaliser score
-            normalized_score = 0.0
-            if self.max_theoretical_score > 0:
-                normalized_score = (raw_score / self.max_theoretical_score) * 100
-                normalized_score = min(100.0, max(0.0, normalized_score))
-            
-            logger.info(f"✓ Solution trouvée!")
-            logger.info(f"  Score brut: {raw_score:,.0f}")
-            logger.info(f"  Score max théorique: {self.max_theoretical_score:,.0f}")
-            logger.info(f"  Score normalisé: {normalized_score:.2f}/100")
-            
-            # Extraire affectations
-            solution_assignments = {}
-            for (e_id, d_id, v_idx), var in self.assignments.items():
-                if self.solver.Value(var) == 1:
-                    solution_assignments[(e_id, d_id, v_idx)] = 1
-            
-            # Calculer statistiques
-            stats = self._compute_statistics(solution_assignments)
-            
-            return OptimizationResult(
-                status=status_str,
-                objective_value=raw_score,
-                normalized_score=normalized_score,
-                max_theoretical_score=self.max_theoretical_score,
-                solve_time=solve_time,
-                assignments=solution_assignments,
-                statistics=stats
-            )
+            values = np.asarray(self.solver.ResponseProto().solution, dtype=np.int64)
+            self.bounds['cpsat'] = self.solver.BestObjectiveBound()
+        elif (status == cp_model.UNKNOWN and self.warm_start_report is not None
+                and self.warm_start_report.solution is not None):
+            # Temps écoulé avant toute solution (ex: pendant le presolve): le planning
+            # de démarrage à chaud, vérifié faisable, reste la meilleure solution connue
+            logger.warning("Aucune nouvelle solution: reprise du planning de démarrage à chaud")
+            status_str = 'FEASIBLE'
+            raw_score = self.warm_start_report.hint_objective
+            values = self.warm_start_report.solution
+        
+        if values is not None:
+            result = self._solution_result(status_str, raw_score, self._assignments_from_values(values), solve_time)
+            if status == cp_model.UNKNOWN:
+                result.statistics['fallback'] = 'TIMEOUT'
+                result.stop_reason = 'fallback'
+            return result
+        
+        elif status == cp_model.UNKNOWN and self.config.solver_params.greedy_fallback:
+            logger.warning("Aucune solution CP-SAT: repli sur le planning glouton")
+            result = self.solve_greedy()
+            result.solve_time += solve_time
+            result.statistics['fallback'] = status_str
+            result.stop_reason = 'fallback'
+            return result
         
         else:
             logger.error(f"✗ Aucune solution trouvée: {status_str}")
@@ -1110,6 +1970,60 @@ class ScheduleOptimizer:
                 error_message=f"Solver status: {status_str}"
             )
     
+    def _assignments_from_values(self, values: np.ndarray) -> Dict:
+        """Affectations {(id_eleve, id_discipline, v_idx): 1} depuis les valeurs de toutes les variables"""
+        # Lecture vectorisée de la réponse CP-SAT
+        chosen = np.flatnonzero(values[self.store.var_index] == 1)
+        solution_assignments = {}
+        for s_pos, d_pos, v_idx in zip(
+            self.store.student[chosen].tolist(),
+            self.store.discipline[chosen].tolist(),
+            self.store.vacation[chosen].tolist()
+        ):
+            solution_assignments[(self.student_ids[s_pos], self.discipline_ids[d_pos], v_idx)] = 1
+        return solution_assignments
+    
+    def _solution_result(self, status_str: str, raw_score: float, solution_assignments: Dict, solve_time: float) -> OptimizationResult:
+        """Résultat d'une solution: score normalisé, affectations et statistiques"""
+        # Normaliser score
+        normalized_score = 0.0
+        if self.max_theoretical_score > 0:
+            normalized_score = (raw_score / self.max_theoretical_score) * 100
+            normalized_score = min(100.0, max(0.0, normalized_score))
+        
+        logger.info(f"✓ Solution trouvée!")
+        logger.info(f"  Score brut: {raw_score:,.0f}")
+        logger.info(f"  Score max théorique: {self.max_theoretical_score:,.0f}")
+        logger.info(f"  Score normalisé: {normalized_score:.2f}/100")
+        
+        # Calculer statistiques
+        stats = self._compute_statistics(solution_assignments)
+        
+        result = OptimizationResult(
+            status=status_str,
+            objective_value=raw_score,
+            normalized_score=normalized_score,
+            max_theoretical_score=self.max_theoretical_score,
+            solve_time=solve_time,
+            assignments=solution_assignments,
+            statistics=stats,
+            upper_bound=self.upper_bound
+        )
+        
+        # Bornes supérieures: écart d'optimalité réel (et non par rapport au score max théorique)
+        if result.upper_bound is not None:
+            stats['bounds'] = {
+                **self.bounds,
+                'theoretical': self.max_theoretical_score,
+                'best': result.upper_bound,
+                'gap': result.gap,
+                'score_vs_bound': 100 * raw_score / result.upper_bound if result.upper_bound > 0 else None,
+            }
+            if self.bound_report is not None:
+                stats['bounds']['lp_report'] = self.bound_report.to_dict()
+            logger.info(f"  Borne supérieure: {result.upper_bound:,.0f} (écart d'optimalité {100 * result.gap:.2f}%)")
+        return result
+    
     def _compute_statistics(self, solution_assignments: Dict) -> Dict:
         """Calcule les statistiques de la solution"""
         stats = {
@@ -1122,8 +2036,11 @@ class ScheduleOptimizer:
             'grand_slam_disciplines': []
         }
         
+        count_by_student_disc = collections.Counter()
+        
         # Compter par discipline, élève, niveau
         for (e_id, d_id, v_idx) in solution_assignments:
+            count_by_student_disc[(e_id, d_id)] += 1
             stats['assignments_by_discipline'][d_id] += 1
             stats['assignments_by_student'][e_id] += 1
             
@@ -1148,15 +2065,10 @@ class ScheduleOptimizer:
                 total_count += 1
                 
                 # Compter affectations
-                count = sum(1 for (e_id, d_id, v_idx) in solution_assignments 
-                           if e_id == el.id_eleve and d_id == disc.id_discipline)
+                count = count_by_student_disc[(el.id_eleve, disc.id_discipline)]
                 
                 # Récupérer quota
-                try:
-                    idx_annee = disc.annee.index(el.annee.value)
-                    quota = disc.quota[idx_annee] if len(disc.quota) > idx_annee else 0
-                except (ValueError, IndexError):
-                    quota = 0
+                quota = self._get_quota(disc, el.annee.value)
                 
                 if count >= quota and quota > 0:
                     success_count += 1
@@ -1239,4 +2151,29 @@ class ScheduleOptimizer:
         """Notifie la progression si callback configuré"""
         if self.progress_callback:
             self.progress_callback(message, percent)
+        self.events.emit(PROGRESS, message=message, percent=percent)
         logger.info(f"[{percent}%] {message}")
+    
+    @contextlib.contextmanager
+    def _event_phase(self, name: str):
+        """Publie PHASE_STARTED / PHASE_FINISHED (durée en secondes) autour d'une étape"""
+        start = time.time()
+        self.events.emit(PHASE_STARTED, phase=name)
+        try:
+            yield
+        finally:
+            self.events.emit(PHASE_FINISHED, phase=name, elapsed=round(time.time() - start, 2))
+    
+    def _search_started(self, max_time: float):
+        """Événement de début de recherche"""
+        self.events.emit(PHASE_STARTED, phase='search', remaining=max_time,
+                         data={'strategy': self.config.solver_params.strategy})
+    
+    def _publish_incumbent(self, phase: str, objective: float, elapsed: float, max_time: float):
+        """Nouvelle meilleure solution hors SolutionCallback (LNS, portefeuille)"""
+        bound = self.upper_bound
+        self.events.emit(
+            INCUMBENT, phase=phase, objective=objective, bound=bound,
+            gap=max(0.0, (bound - objective) / bound) if bound else None,
+            elapsed=round(elapsed, 2), remaining=round(max(0.0, max_time - elapsed), 2)
+        )
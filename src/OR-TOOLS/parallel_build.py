@@ -0,0 +1,226 @@
+"""
+PARALLEL BUILD - Construction du modèle par familles de contraintes en parallèle
+
+build_model() enchaîne les familles de contraintes (BUILD_STEPS) dans un seul
+thread Python. En mode parallèle, les variables de décision et les index sont
+construits dans le processus principal, puis chaque famille est construite
+dans son propre processus fils (fork: registre de variables, index et modèle
+hérités sans copie) qui renvoie son fragment de CpModelProto (variables,
+contraintes et objectif ajoutés). Tous les fils sont créés avant la première
+fusion, sur le modèle intact; un sémaphore limite le nombre de constructions
+simultanées. Le processus principal fusionne les fragments dans l'ordre
+séquentiel, au fil de leur arrivée.
+
+Numérotation identique à la construction séquentielle:
+ - les contraintes ne référencent que des variables existantes: un fragment
+   ajouté en fin de modèle garde ses indices
+ - les familles créant des variables (indicateurs partagés, termes de
+   l'objectif: VARIABLE_STEPS) sont d'abord rejouées, sans être renvoyées,
+   dans chaque processus des familles suivantes: les nouvelles variables y
+   reçoivent leur indice définitif, et les indicateurs déjà créés sont réutilisés
+ - chaque fragment indique le nombre de variables du modèle avant lui, vérifié
+   à la fusion (une famille hors VARIABLE_STEPS créant des variables est détectée)
+
+Le modèle fusionné est identique au modèle séquentiel (cf. proto_hash et
+scripts/benchmark_model_build.py --processes). Le fragment transite au format
+texte, seule sérialisation du proto exposée par le wrapper Python d'OR-Tools:
+son écriture et sa relecture limitent le gain sur les petits modèles.
+"""
+import hashlib
+import logging
+import multiprocessing
+import time
+import traceback
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+from ortools.sat.python import cp_model
+
+logger = logging.getLogger(__name__)
+
+# Familles créant des variables: rejouées avant les familles suivantes
+VARIABLE_STEPS = ("frequence", "mixite", "continuite", "remplacement_niveau", "objectif")
+
+# Optimizer hérité par les processus fils (fork)
+_OPTIMIZER = None
+# Temps maximal d'attente d'un fragment (secondes)
+FRAGMENT_TIMEOUT = 3600
+
+
+@dataclass
+class Fragment:
+    """Ajouts d'une famille au modèle, indices relatifs au modèle avant la famille"""
+    step: str
+    text: str  # CpModelProto (format texte): nouvelles variables, contraintes et objectif
+    base_variables: int  # Variables du modèle avant la famille
+    variables: int
+    constraints: int
+    coverage: List[List[int]] = field(default_factory=list)  # [indice relatif, semaine]
+    indicators: Dict[Tuple, int] = field(default_factory=dict)  # clé -> indice de variable
+    indicator_requests: int = 0
+    score: float = 0.0  # Contribution au score max théorique
+    quota_objective_vars: List[int] = field(default_factory=list)
+    objective_report: Optional[Dict] = None
+    seconds: float = 0.0
+    profile: Optional[Dict] = None
+
+
+def fork_available() -> bool:
+    return "fork" in multiprocessing.get_all_start_methods()
+
+
+def proto_hash(model: cp_model.CpModel) -> str:
+    """Empreinte SHA-256 du modèle (format texte du proto)"""
+    return hashlib.sha256(str(model.Proto()).encode("utf-8")).hexdigest()
+
+
+def _build_fragment(task) -> Fragment:
+    """Processus fils: rejoue les familles créant des variables qui précèdent, puis construit la famille"""
+    step, method, replay = task
+    optimizer = _OPTIMIZER
+    optimizer_logger = logging.getLogger("optimizer")
+
+    optimizer_logger.disabled = True
+    try:
+        for replay_method in replay:
+            getattr(optimizer, replay_method)()
+    finally:
+        optimizer_logger.disabled = False
+
+    proto = optimizer.model.Proto()
+    n_vars, n_cons = len(proto.variables), len(proto.constraints)
+    n_coverage = len(optimizer.coverage_constraints)
+    known_indicators = set(optimizer.indicators)
+    requests = optimizer.indicator_requests
+    score = optimizer.max_theoretical_score
+
+    start = time.perf_counter()
+    profile = None
+    if optimizer.profiler is not None:
+        optimizer.profiler.phases = []
+        with optimizer.profiler.phase(step, optimizer.model):
+            getattr(optimizer, method)()
+        profile = optimizer.profiler.phases[-1]
+    else:
+        getattr(optimizer, method)()
+
+    fragment = cp_model.CpModel().Proto()
+    for i in range(n_vars, len(proto.variables)):
+        fragment.variables.append(proto.variables[i])
+    for i in range(n_cons, len(proto.constraints)):
+        fragment.constraints.append(proto.constraints[i])
+    if proto.has_objective():
+        fragment.objective.copy_from(proto.objective)
+
+    return Fragment(
+        step=step,
+        text=str(fragment),
+        base_variables=n_vars,
+        variables=len(proto.variables) - n_vars,
+        constraints=len(proto.constraints) - n_cons,
+        coverage=[[index - n_cons, week] for index, week in optimizer.coverage_constraints[n_coverage:]],
+        indicators={
+            key: var.Index() for key, var in optimizer.indicators.items() if key not in known_indicators
+        },
+        indicator_requests=optimizer.indicator_requests - requests,
+        score=optimizer.max_theoretical_score - score,
+        quota_objective_vars=list(optimizer.quota_objective_vars),
+        objective_report=optimizer.objective_report,
+        seconds=time.perf_counter() - start,
+        profile=profile,
+    )
+
+
+def _run_fragment(position, task, slots, results):
+    """Processus fils: attend un créneau, construit le fragment et le renvoie au processus principal"""
+    with slots:
+        try:
+            results.put((position, _build_fragment(task), None))
+        except Exception:
+            results.put((position, None, traceback.format_exc()))
+
+
+def build_parallel(optimizer, steps: List[Tuple[str, str, str, int]], processes: int) -> Dict:
+    """
+    Construit les familles de steps en parallèle et les fusionne dans optimizer.model
+
+    Les variables de décision et les index doivent être construits. Restaure,
+    comme le cache de modèles, le score max théorique, les contraintes de
+    couverture, les termes de quotas, le bilan de l'objectif et les indicateurs
+    partagés.
+
+    Args:
+        optimizer: ScheduleOptimizer (model, store et index construits)
+        steps: Étapes (phase, méthode, message, progression) dans l'ordre séquentiel
+        processes: Nombre maximal de familles construites simultanément
+
+    Returns:
+        dict: Durées de construction (par famille, dans les fils) et de fusion
+    """
+    global _OPTIMIZER
+    tasks = []
+    for i, (step, method, _, _) in enumerate(steps):
+        replay = [m for name, m, _, _ in steps[:i] if name in VARIABLE_STEPS]
+        tasks.append((step, method, replay))
+
+    logger.info(f"Construction parallèle: {len(tasks)} familles sur {processes} processus")
+    start = time.perf_counter()
+    merge_seconds = 0.0
+    timings = {}
+    proto = optimizer.model.Proto()
+
+    context = multiprocessing.get_context("fork")
+    slots = context.BoundedSemaphore(processes)
+    results = context.Queue()
+    workers = []
+    fragments = {}
+
+    _OPTIMIZER = optimizer
+    try:
+        # Un processus par famille, tous créés avant la première fusion (modèle hérité intact);
+        # la famille la plus longue (objectif) d'abord: fusion des autres pendant sa construction
+        for i in sorted(range(len(tasks)), key=lambda i: tasks[i][0] != "objectif"):
+            worker = context.Process(target=_run_fragment, args=(i, tasks[i], slots, results), daemon=True)
+            worker.start()
+            workers.append(worker)
+
+        for i, (step, _, message, percent) in enumerate(steps):
+            while i not in fragments:
+                position, fragment, error = results.get(timeout=FRAGMENT_TIMEOUT)
+                if error is not None:
+                    raise RuntimeError(f"Échec de la construction du fragment '{tasks[position][0]}':\n{error}")
+                fragments[position] = fragment
+            fragment = fragments.pop(i)
+            merge_start = time.perf_counter()
+            if fragment.base_variables != len(proto.variables):
+                raise RuntimeError(
+                    f"Fragment '{step}' construit sur {fragment.base_variables} variables au lieu de "
+                    f"{len(proto.variables)}: famille créant des variables absente de VARIABLE_STEPS"
+                )
+            n_cons = len(proto.constraints)
+            proto.merge_text_format(fragment.text)
+
+            optimizer.max_theoretical_score += fragment.score
+            optimizer.coverage_constraints.extend([index + n_cons, week] for index, week in fragment.coverage)
+            optimizer.indicator_requests += fragment.indicator_requests
+            for key, index in fragment.indicators.items():
+                optimizer.indicators[key] = optimizer.model.GetBoolVarFromProtoIndex(index)
+            if step == "objectif":
+                optimizer.quota_objective_vars = fragment.quota_objective_vars
+                optimizer.objective_report = fragment.objective_report
+            if optimizer.profiler is not None and fragment.profile is not None:
+                optimizer.profiler.phases.append(fragment.profile)
+
+            merge_seconds += time.perf_counter() - merge_start
+            timings[step] = round(fragment.seconds, 4)
+            optimizer._notify_progress(message, percent)
+    finally:
+        _OPTIMIZER = None
+        for worker in workers:
+            if worker.is_alive():
+                worker.terminate()
+            worker.join()
+
+    total = time.perf_counter() - start
+    logger.info(f"✓ Fragments fusionnés en {total:.2f}s (dont fusion {merge_seconds:.2f}s)")
+    return {'processes': processes, 'seconds': round(total, 4), 'merge_seconds': round(merge_seconds, 4), 'steps': timings}
@@ -0,0 +1,263 @@
+"""
+PORTFOLIO - Résolutions CP-SAT concurrentes à graines et paramètres différents
+
+Au lieu d'un seul CpSolver (ou de 10 exécutions séquentielles de la même
+configuration pour mesurer la variance), K processus résolvent le même modèle
+en parallèle, chacun avec sa graine (random_seed), son nombre de workers et son
+profil de paramètres de recherche (PROFILES).
+
+Le temps est découpé en tours. Pendant un tour, chaque membre publie ses
+améliorations sur une file partagée (canal local); à la fin du tour, la
+meilleure solution connue est renvoyée à tous comme hint du tour suivant
+(redémarrage). Les processus gardent le modèle chargé d'un tour à l'autre.
+Le nombre total de workers CP-SAT est borné par le nombre de cœurs alloués.
+"""
+import logging
+import math
+import multiprocessing
+import os
+import queue
+import tempfile
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import numpy as np
+from ortools.sat.python import cp_model
+
+from tuning import apply_cpsat_parameters
+
+logger = logging.getLogger(__name__)
+
+# Profils de recherche: paramètres CP-SAT appliqués en plus de la graine et des workers
+PROFILES: Dict[str, Dict] = {
+    'default': {},
+    'lns_only': {'use_lns_only': True},
+    'quick_restart': {'search_branching': 'PORTFOLIO_WITH_QUICK_RESTART_SEARCH'},
+    'linearization_2': {'linearization_level': 2},
+    'core': {'optimize_with_core': True},
+    'no_lp': {'linearization_level': 0},
+    'light_presolve': {'max_presolve_iterations': 1},
+    'randomized': {'randomize_search': True},
+}
+
+
+@dataclass
+class PortfolioMember:
+    """Configuration d'un processus du portefeuille"""
+    name: str
+    seed: int
+    workers: int
+    parameters: Dict = field(default_factory=dict)
+
+    def to_dict(self) -> dict:
+        return {'name': self.name, 'seed': self.seed, 'workers': self.workers, 'parameters': dict(self.parameters)}
+
+
+def portfolio_members(size: int, cores: int, seed: int = 0, profiles: Optional[List[str]] = None) -> List[PortfolioMember]:
+    """
+    Membres du portefeuille: un profil chacun, cœurs répartis sans dépasser cores
+
+    Args:
+        size: Nombre de processus souhaité (réduit au nombre de cœurs)
+        cores: Nombre total de workers CP-SAT
+        seed: Graine de base (membre i: seed + i)
+        profiles: Noms de profils (PROFILES), réutilisés en boucle si size les dépasse
+    """
+    names = list(profiles or PROFILES)
+    unknown = [name for name in names if name not in PROFILES]
+    if unknown:
+        raise ValueError(f"Profils de portefeuille inconnus: {', '.join(unknown)} (attendu: {', '.join(PROFILES)})")
+    size = max(1, min(size, cores))
+    members = []
+    for i in range(size):
+        name = names[i % len(names)]
+        if i >= len(names):
+            name = f"{name}#{i // len(names) + 1}"
+        workers = cores // size + (1 if i < cores % size else 0)
+        members.append(PortfolioMember(name, seed + i, workers, PROFILES[names[i % len(names)]]))
+    return members
+
+
+class _ProgressCallback(cp_model.CpSolverSolutionCallback):
+    """Publie les améliorations d'un membre sur la file commune (objectif seul, limité en fréquence)"""
+
+    def __init__(self, name: str, round_idx: int, outbox, interval: float = 2.0):
+        cp_model.CpSolverSolutionCallback.__init__(self)
+        self.name = name
+        self.round_idx = round_idx
+        self.outbox = outbox
+        self.interval = interval
+        self._last = 0.0
+
+    def on_solution_callback(self):
+        now = time.time()
+        if now - self._last >= self.interval:
+            self._last = now
+            self.outbox.put(('solution', self.name, self.round_idx, self.ObjectiveValue(), self.WallTime()))
+
+
+def _member_process(member: PortfolioMember, model_path: str, inbox, outbox):
+    """Processus d'un membre: charge le modèle une fois, puis résout un tour par tâche reçue"""
+    model = cp_model.CpModel()
+    model.Proto().parse_text_format(Path(model_path).read_text(encoding="utf-8"))
+    n_vars = len(model.Proto().variables)
+
+    while True:
+        task = inbox.get()
+        if task is None:
+            break
+        round_idx, hint, time_limit = task
+        if hint is not None:
+            model.ClearHints()
+            model.Proto().solution_hint.vars.extend(range(n_vars))
+            model.Proto().solution_hint.values.extend(hint.tolist())
+
+        solver = cp_model.CpSolver()
+        solver.parameters.max_time_in_seconds = time_limit
+        solver.parameters.num_workers = member.workers
+        solver.parameters.random_seed = member.seed + round_idx
+        apply_cpsat_parameters(solver.parameters, member.parameters)
+        status = solver.Solve(model, _ProgressCallback(member.name, round_idx, outbox))
+
+        values = objective = None
+        if status in (cp_model.OPTIMAL, cp_model.FEASIBLE):
+            values = np.asarray(solver.ResponseProto().solution, dtype=np.int64)
+            objective = solver.ObjectiveValue()
+        outbox.put(('done', member.name, round_idx, status.name, objective, solver.BestObjectiveBound(), values))
+
+
+@dataclass
+class PortfolioResult:
+    """Résultat du portefeuille"""
+    status: str
+    values: Optional[np.ndarray] = field(default=None, repr=False)
+    objective: Optional[float] = None
+    upper_bound: Optional[float] = None  # Meilleure borne CP-SAT des membres
+    winner: Optional[str] = None  # Membre ayant trouvé la meilleure solution
+    members: List[PortfolioMember] = field(default_factory=list)
+    rounds: List[Dict] = field(default_factory=list)
+
+    def to_dict(self) -> dict:
+        wins = {}
+        for round_info in self.rounds:
+            if round_info.get('improved_by'):
+                wins[round_info['improved_by']] = wins.get(round_info['improved_by'], 0) + 1
+        return {
+            'status': self.status,
+            'objective': self.objective,
+            'upper_bound': self.upper_bound,
+            'winner': self.winner,
+            'wins': wins,
+            'members': [m.to_dict() for m in self.members],
+            'rounds': self.rounds,
+        }
+
+
+class Portfolio:
+    """
+    Portefeuille de résolutions CP-SAT concurrentes
+
+    Usage:
+        portfolio = Portfolio(optimizer, size=4, cores=8)
+        result = portfolio.run(time_limit=3600, round_seconds=600)
+    """
+
+    def __init__(self, optimizer, size: int = 4, cores: int = 0, seed: int = 0, profiles: Optional[List[str]] = None,
+                 on_improvement=None):
+        if optimizer.model is None:
+            raise RuntimeError("Modèle non construit: appeler prepare_and_build() avant le portefeuille")
+        self.optimizer = optimizer
+        self.cores = cores or os.cpu_count() or 1
+        self.members = portfolio_members(size, self.cores, seed, profiles)
+        self.on_improvement = on_improvement  # Function(values, objective, elapsed) à chaque nouvelle meilleure solution
+
+    def run(self, time_limit: float, round_seconds: float = 600.0) -> PortfolioResult:
+        """
+        Résout par tours; la meilleure solution d'un tour sert de hint au suivant
+
+        Un tour se termine quand tous les membres ont rendu leur solution. Si un
+        membre prouve l'optimalité, les tours suivants sont annulés.
+        """
+        start = time.perf_counter()
+        result = PortfolioResult(status='UNKNOWN', members=self.members)
+        n_rounds = max(1, math.ceil(time_limit / round_seconds))
+        logger.info(
+            f"Portefeuille: {len(self.members)} processus sur {self.cores} cœurs, {n_rounds} tour(s): "
+            + ", ".join(f"{m.name} ({m.workers}w)" for m in self.members)
+        )
+
+        context = multiprocessing.get_context("spawn")
+        outbox = context.Queue()
+        with tempfile.TemporaryDirectory() as tmp:
+            model_path = Path(tmp) / "model.txt"
+            model_path.write_text(str(self.optimizer.model.Proto()), encoding="utf-8")
+            inboxes, processes = [], []
+            for member in self.members:
+                inbox = context.Queue()
+                process = context.Process(target=_member_process, args=(member, str(model_path), inbox, outbox), daemon=True)
+                process.start()
+                inboxes.append(inbox)
+                processes.append(process)
+
+            try:
+                for round_idx in range(n_rounds):
+                    # Temps restant réparti sur les tours restants (pas de dernier tour tronqué)
+                    remaining = time_limit - (time.perf_counter() - start)
+                    if remaining < 1.0:
+                        break
+                    budget = remaining / (n_rounds - round_idx)
+                    for inbox in inboxes:
+                        inbox.put((round_idx, result.values, budget))
+                    round_info = self._collect(round_idx, budget, result, start, processes, outbox)
+                    result.rounds.append(round_info)
+                    if result.status == 'OPTIMAL':
+                        break
+            finally:
+                for inbox in inboxes:
+                    inbox.put(None)
+                for process in processes:
+                    process.join(timeout=10)
+                    if process.is_alive():
+                        process.terminate()
+        return result
+
+    def _collect(self, round_idx: int, budget: float, result: PortfolioResult, start: float, processes, outbox) -> Dict:
+        """Attend la fin du tour: progression des membres, puis meilleure solution et borne"""
+        round_info = {'round': round_idx, 'seconds': round(budget, 1), 'members': {}, 'improved_by': None}
+        pending = {m.name for m in self.members}
+        deadline = time.perf_counter() + budget + 120  # Marge: presolve et écriture de la réponse
+        while pending:
+            try:
+                message = outbox.get(timeout=max(1.0, deadline - time.perf_counter()))
+            except queue.Empty:
+                raise RuntimeError(f"Portefeuille: membres sans réponse ({', '.join(sorted(pending))})")
+            if message[0] == 'solution':
+                _, name, _, objective, wall = message
+                logger.info(f"  [{name}] tour {round_idx + 1}: {objective:,.0f} ({wall:.0f}s)")
+                continue
+
+            _, name, _, status, objective, bound, values = message
+            pending.discard(name)
+            round_info['members'][name] = {'status': status, 'objective': objective, 'bound': bound}
+            if status in ('OPTIMAL', 'FEASIBLE'):
+                result.upper_bound = bound if result.upper_bound is None else min(result.upper_bound, bound)
+            if values is not None and (result.objective is None or objective > result.objective):
+                result.values, result.objective, result.winner = values, objective, name
+                round_info['improved_by'] = name
+                if result.status != 'OPTIMAL':
+                    result.status = status
+                if self.on_improvement is not None:
+                    self.on_improvement(values, objective, time.perf_counter() - start)
+            if status == 'OPTIMAL':
+                result.status = 'OPTIMAL'
+
+            if not any(p.is_alive() for p in processes) and pending:
+                raise RuntimeError("Portefeuille: processus membres arrêtés prématurément")
+
+        logger.info(
+            f"✓ Tour {round_idx + 1}: meilleur {result.objective:,.0f} ({result.winner})"
+            if result.objective is not None else f"Tour {round_idx + 1}: aucune solution"
+        )
+        return round_info
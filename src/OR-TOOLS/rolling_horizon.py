@@ -0,0 +1,244 @@
+"""
+ROLLING HORIZON - Résolution période par période (ou semestre par semestre)
+
+L'année est découpée selon periodes.csv (les stages y sont alignés), ou en deux
+semestres. Chaque étape résout une copie (Clone) du modèle complet où:
+ - les variables de décision des étapes précédentes sont fixées à leur valeur
+ - les variables des étapes suivantes sont fixées à 0, et les contraintes de
+   couverture de leurs vacations (remplissage, mixité, remplacement de niveau,
+   cf. ScheduleOptimizer.coverage_constraints) désactivées
+Le presolve élimine les variables fixées: chaque sous-problème ne porte que sur
+les semaines de l'étape. Les contraintes à fenêtre (fréquence, continuité,
+semestre, max par semaine) restent celles du modèle complet: aux frontières,
+elles voient les affectations déjà fixées.
+
+Dette de quota: l'objectif complet compte les affectations déjà fixées, chaque
+étape ne complète donc que ce qui manque. Pour éviter qu'une étape consomme tout
+le quota (et les capacités) au détriment des suivantes, l'avancement cumulé de
+chaque (élève, discipline) est borné au prorata de ses semaines disponibles
+(+ marge). Si cette borne rend une étape infaisable (vacations à remplir,
+mixité), l'étape est relancée sans elle. La dernière étape n'est pas bornée.
+
+Les semaines hors de toute période forment une dernière étape. Une passe de
+polissage sur le modèle complet, avec la solution assemblée en hint, peut suivre
+(cf. ScheduleOptimizer._solve_rolling_horizon).
+"""
+import logging
+import math
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+from ortools.sat.python import cp_model
+
+from scoring import N_WEEKS, quota_of
+from warm_start import objective_value
+
+logger = logging.getLogger(__name__)
+
+@dataclass
+class HorizonResult:
+    """Résultat de la résolution par horizon glissant"""
+    status: str
+    values: Optional[np.ndarray] = field(default=None, repr=False)
+    objective: Optional[float] = None
+    steps: List[Dict] = field(default_factory=list)
+
+
+def horizon_steps(periodes, unit: str = "periode") -> List[Tuple[str, List[int]]]:
+    """
+    Découpage de l'année en étapes (nom, semaines 1..52)
+
+    Args:
+        periodes: Périodes de ModelConfig (ordre de l'année universitaire)
+        unit: "periode" (periodes.csv) ou "semestre" (semaines 1-26 / 27-52)
+    """
+    if unit == "semestre":
+        semesters = [("semestre 1", list(range(1, 27))), ("semestre 2", list(range(27, N_WEEKS + 1)))]
+        # L'année universitaire commence avec la première période (semaine 34 en général)
+        if periodes and periodes[0].semaine_debut > 26:
+            semesters.reverse()
+        return semesters
+
+    steps = []
+    covered = set()
+    for periode in periodes:
+        if periode.semaine_debut <= periode.semaine_fin:
+            weeks = list(range(periode.semaine_debut, periode.semaine_fin + 1))
+        else:  # Période à cheval sur la fin de l'année civile
+            weeks = list(range(periode.semaine_debut, N_WEEKS + 1)) + list(range(1, periode.semaine_fin + 1))
+        weeks = [w for w in weeks if w not in covered and 1 <= w <= N_WEEKS]
+        if weeks:
+            steps.append((f"période {periode.id}", weeks))
+            covered.update(weeks)
+
+    remaining = [w for w in range(1, N_WEEKS + 1) if w not in covered]
+    if remaining:
+        steps.append(("hors période", remaining))
+    return steps
+
+
+class RollingHorizon:
+    """
+    Résolution séquentielle par étapes de l'année
+
+    Usage:
+        horizon = RollingHorizon(optimizer, unit="periode")
+        result = horizon.run(time_limit=3600)
+    """
+
+    def __init__(self, optimizer, unit: str = "periode", pacing: bool = True, pacing_slack: int = 1,
+                 callback_factory=None):
+        if optimizer.model is None:
+            raise RuntimeError("Modèle non construit: appeler prepare_and_build() avant RollingHorizon")
+        self.optimizer = optimizer
+        self.model = optimizer.model
+        self.steps = horizon_steps(optimizer.config.periodes, unit)
+        self.pacing = pacing
+        self.pacing_slack = pacing_slack
+        self.callback_factory = callback_factory
+        self._prepare_structures()
+
+    def _prepare_structures(self):
+        """Étape de chaque variable de décision et groupes de l'avancement des quotas"""
+        store = self.optimizer.store
+        var_index = store.var_index
+        week_step = np.full(N_WEEKS + 1, len(self.steps), dtype=np.int32)
+        for k, (_, weeks) in enumerate(self.steps):
+            week_step[weeks] = k
+        row_step = week_step[store.semaine]
+
+        # Une variable partagée (binôme) est toujours sur une seule vacation: une seule étape
+        self.var_ids, first = np.unique(var_index, return_index=True)
+        self.var_step = row_step[first]
+
+        coverage = np.asarray(self.optimizer.coverage_constraints, dtype=np.int64).reshape(-1, 2)
+        if len(coverage) == 0:
+            logger.warning("Contraintes de couverture inconnues: reconstruire le modèle si une étape est infaisable")
+        self.coverage_ids = coverage[:, 0]
+        self.coverage_step = week_step[coverage[:, 1]]
+
+        # Avancement: lignes de chaque (élève, discipline) à quota > 0, avec l'étape de chaque ligne
+        self.pacing_groups = []
+        if not self.pacing:
+            return
+        disciplines = self.optimizer.config.disciplines
+        for (s_pos, d_pos), rows in store.group_by('student', 'discipline'):
+            quota = quota_of(disciplines[d_pos], int(store.niveau[rows[0]]))
+            if quota <= 0:
+                continue
+            weeks = np.unique(store.semaine[rows])
+            steps_of_weeks = week_step[weeks]
+            self.pacing_groups.append((quota, var_index[rows], row_step[rows], steps_of_weeks))
+
+    def _pacing_bounds(self, sub: cp_model.CpModel, k: int) -> int:
+        """Borne l'avancement cumulé (étapes 0..k) de chaque (élève, discipline)"""
+        count = 0
+        for quota, var_idx, steps, steps_of_weeks in self.pacing_groups:
+            done = steps <= k
+            n_rows = int(done.sum())
+            if n_rows == 0:
+                continue
+            share = np.count_nonzero(steps_of_weeks <= k) / len(steps_of_weeks)
+            target = math.ceil(quota * share) + self.pacing_slack
+            if target >= n_rows:
+                continue
+            variables = [sub.GetIntVarFromProtoIndex(i) for i in var_idx[done].tolist()]
+            sub.Add(cp_model.LinearExpr.sum(variables) <= target)
+            count += 1
+        return count
+
+    def _sub_model(self, k: int, values: np.ndarray, pacing: bool) -> Tuple[cp_model.CpModel, int]:
+        """Copie du modèle: étapes < k fixées à leur valeur, étapes > k fixées à 0 sans couverture"""
+        sub = self.model.Clone()
+        proto = sub.Proto()
+        fixed = self.var_step != k
+        for idx, value in zip(self.var_ids[fixed].tolist(), values[self.var_ids[fixed]].tolist()):
+            domain = proto.variables[idx].domain
+            domain[0] = value
+            domain[1] = value
+
+        # Littéral toujours faux en condition: la contrainte n'est plus imposée
+        disabled = sub.NewConstant(0).Index()
+        for idx in self.coverage_ids[self.coverage_step > k].tolist():
+            proto.constraints[idx].enforcement_literal.append(disabled)
+        bounds = self._pacing_bounds(sub, k) if pacing and k < len(self.steps) - 1 else 0
+
+        sub.ClearHints()
+        hint = proto.solution_hint
+        hint.vars.extend(self.var_ids.tolist())
+        hint.values.extend(values[self.var_ids].tolist())
+        return sub, bounds
+
+    def _solve(self, model: cp_model.CpModel, time_limit: float):
+        solver = cp_model.CpSolver()
+        solver.parameters.max_time_in_seconds = max(1.0, time_limit)
+        solver.parameters.num_workers = self.optimizer.config.solver_params.num_workers
+        callback = self.callback_factory(time_limit) if self.callback_factory is not None else None
+        status = solver.Solve(model, callback) if callback is not None else solver.Solve(model)
+        values = None
+        if status in (cp_model.OPTIMAL, cp_model.FEASIBLE):
+            values = np.asarray(solver.ResponseProto().solution, dtype=np.int64)
+        return status, values
+
+    def run(self, time_limit: float) -> HorizonResult:
+        """
+        Résout les étapes dans l'ordre de l'année
+
+        Le temps est réparti au prorata du nombre de variables libres de chaque
+        étape; le temps non consommé par une étape est reporté sur les suivantes.
+        Une étape sans variable (aucune disponibilité sur ses semaines) est sautée.
+        """
+        start = time.perf_counter()
+        deadline = start + time_limit
+        result = HorizonResult(status='UNKNOWN')
+        values = np.zeros(len(self.model.Proto().variables), dtype=np.int64)
+        free_left = len(self.var_ids)
+
+        for k, (name, weeks) in enumerate(self.steps):
+            free = int(np.count_nonzero(self.var_step == k))
+            step = {
+                'step': name,
+                'weeks': [weeks[0], weeks[-1]] if weeks == list(range(weeks[0], weeks[-1] + 1)) else weeks,
+                'free_vars': free,
+                'pacing_bounds': 0,
+                'status': 'SKIPPED',
+                'objective': None,
+                'seconds': 0.0,
+            }
+            result.steps.append(step)
+            if free == 0:
+                continue
+
+            budget = (deadline - time.perf_counter()) * free / free_left
+            free_left -= free
+            step_start = time.perf_counter()
+            sub, bounds = self._sub_model(k, values, self.pacing)
+            status, step_values = self._solve(sub, budget)
+            paced = bounds > 0
+            if status == cp_model.INFEASIBLE and paced:
+                logger.warning(f"Étape {name}: infaisable avec l'avancement borné, relance sans borne")
+                sub, _ = self._sub_model(k, values, pacing=False)
+                status, step_values = self._solve(sub, budget - (time.perf_counter() - step_start))
+                paced = False
+
+            seconds = time.perf_counter() - step_start
+            step.update({'pacing_bounds': bounds if paced else 0, 'status': status.name, 'seconds': round(seconds, 2)})
+
+            if step_values is None:
+                logger.warning(f"Étape {name}: aucune solution ({status.name})")
+                result.status = 'TIMEOUT' if status == cp_model.UNKNOWN else status.name
+                return result
+
+            values = step_values[:len(values)]  # Sans les variables propres à la copie (littéral, bornes)
+            step['objective'] = objective_value(self.model, values)
+            logger.info(
+                f"✓ Étape {k + 1}/{len(self.steps)} ({name}, {free:,} variables libres): "
+                f"{status.name}, score cumulé {step['objective']:,.0f} en {seconds:.1f}s"
+            )
+
+        result.status = 'FEASIBLE'
+        result.values = values
+        result.objective = objective_value(self.model, values)
+        return result
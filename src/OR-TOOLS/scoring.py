@@ -0,0 +1,278 @@
+"""
+SCORING - Évaluation d'un planning hors CP-SAT
+
+Calcule, à partir des seules affectations (élève, discipline, vacation) et des
+données préparées d'un ScheduleOptimizer (prepare_data), la valeur de
+l'objectif V5_03_C, le score max théorique et les violations des contraintes
+dures du modèle. Sert à la construction gloutonne (greedy.py) et à la
+vérification de plannings produits par ailleurs.
+
+Les formules reprennent celles de ScheduleOptimizer (_set_objective,
+_add_*_constraints): un planning accepté par CP-SAT n'a ici aucune violation.
+Le score est celui de la meilleure valeur des variables auxiliaires (bonus de
+paires activés dès que possible): il peut dépasser de quelques bonus l'objectif
+rapporté par CP-SAT pour une solution non optimale.
+"""
+import collections
+import logging
+import os
+import sys
+from typing import Dict, Iterable, Tuple
+
+import numpy as np
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from classes.enum.niveaux import niveau
+
+logger = logging.getLogger(__name__)
+
+# Poids de l'objectif V5_03_C (partagés avec ScheduleOptimizer._set_objective)
+W_FILL = 600  # Points par affectation dans le quota
+W_EXCESS = -900  # Pénalité par affectation au-delà du quota
+W_SUCCESS = 30000  # Bonus si élève atteint son quota pour une discipline
+W_PREFERENCE = 50  # Bonus préférence jour
+W_PRIORITY = (30, 15, 5)  # Bonus priorité niveau 1, 2, 3
+W_PAIR = 50  # Bonus paire de jours
+W_SAME_DAY = 30  # Bonus même jour
+
+N_WEEKS = 52
+SLOTS_PER_WEEK = 10
+
+
+def quota_of(disc, annee_value: int) -> int:
+    """Quota de la discipline pour un niveau (0 si non défini)"""
+    try:
+        idx_annee = disc.annee.index(annee_value)
+        return disc.quota[idx_annee] if len(disc.quota) > idx_annee else 0
+    except (ValueError, IndexError):
+        return 0
+
+
+def capacity_of(disc, slot: int) -> int:
+    """Capacité de la discipline sur un créneau de la semaine (0 = non bornée)"""
+    return disc.nb_eleve[slot] if len(disc.nb_eleve) > slot else 0
+
+
+class PlanningScorer:
+    """
+    Score et contraintes d'un planning sur les données préparées d'un ScheduleOptimizer
+
+    Usage:
+        optimizer.prepare_data()
+        scorer = PlanningScorer(optimizer)
+        X = scorer.tensor_from_assignments(result.assignments)
+        scorer.score(X)       # {'total': ..., 'quotas': ..., ...}
+        scorer.violations(X)  # {'capacite': 0, ...}
+    """
+
+    def __init__(self, optimizer):
+        if optimizer.availability is None:
+            optimizer.prepare_data()
+        self.config = optimizer.config
+        self.disciplines = optimizer.config.disciplines
+        self.eleves = optimizer.config.eleves
+        self.availability = optimizer.availability
+        self.partner = optimizer.binome_partner
+        self.student_ids = list(optimizer.student_ids)
+        self.discipline_ids = list(optimizer.discipline_ids)
+        self.vac_jour = np.asarray(optimizer.vac_jour)
+        self.vac_slot = np.asarray(optimizer.vac_slot)
+        self.vac_semaine = np.asarray(optimizer.vac_semaine)
+
+        n_s, n_d, _ = self.availability.shape
+        self.level = np.array([el.annee.value for el in self.eleves], dtype=np.int32)
+        self.levels = [n.value for n in niveau]
+        self.quota = np.array(
+            [[quota_of(disc, el.annee.value) for disc in self.disciplines] for el in self.eleves],
+            dtype=np.int32
+        ).reshape(n_s, n_d)
+        # Capacité [discipline, vacation] (0 = pas de contrainte de capacité)
+        self.capacity = np.array(
+            [[capacity_of(disc, slot) for slot in range(SLOTS_PER_WEEK)] for disc in self.disciplines],
+            dtype=np.int32
+        )[:, self.vac_slot]
+
+    # Conversions
+
+    def tensor_from_assignments(self, assignments: Iterable[Tuple[int, int, int]]) -> np.ndarray:
+        """Tenseur booléen [élève, discipline, vacation] depuis des clés (id_eleve, id_discipline, v_idx)"""
+        student_pos = {e_id: pos for pos, e_id in enumerate(self.student_ids)}
+        discipline_pos = {d_id: pos for pos, d_id in enumerate(self.discipline_ids)}
+        X = np.zeros(self.availability.shape, dtype=bool)
+        for e_id, d_id, v_idx in assignments:
+            s_pos, d_pos = student_pos.get(e_id), discipline_pos.get(d_id)
+            if s_pos is not None and d_pos is not None and 0 <= v_idx < X.shape[2]:
+                X[s_pos, d_pos, v_idx] = True
+        return X
+
+    def assignments_from_tensor(self, X: np.ndarray) -> Dict:
+        """Affectations {(id_eleve, id_discipline, v_idx): 1}"""
+        return {
+            (self.student_ids[s], self.discipline_ids[d], v): 1
+            for s, d, v in zip(*(axis.tolist() for axis in np.nonzero(X)))
+        }
+
+    def weekly(self, X: np.ndarray) -> np.ndarray:
+        """Nombre d'affectations par semaine [élève, discipline, semaine]"""
+        n_s, n_d, _ = X.shape
+        return X.reshape(n_s, n_d, N_WEEKS, SLOTS_PER_WEEK).sum(axis=3)
+
+    # Objectif
+
+    def max_theoretical_score(self) -> float:
+        """Score max théorique (mêmes conventions que ScheduleOptimizer.build_model)"""
+        total = 0
+        has_rows = self.availability.any(axis=2)
+        for d_pos, disc in enumerate(self.disciplines):
+            eligible = [el for el in self.eleves if el.annee.value in disc.annee]
+            if disc.paire_jours:
+                total += len(eligible) * N_WEEKS * len(disc.paire_jours) * W_PAIR
+            if disc.meme_jour:
+                for el in eligible:
+                    q = quota_of(disc, el.annee.value)
+                    if q > 1:
+                        total += q * (q - 1) // 2 * W_SAME_DAY
+            quotas = self.quota[:, d_pos]
+            selected = has_rows[:, d_pos] & (quotas > 0)
+            total += int((W_FILL * quotas[selected] + W_SUCCESS).sum())
+            if disc.id_discipline == 1 and disc.take_jour_pref:
+                total += sum(quota_of(disc, el.annee.value) for el in eligible) * W_PREFERENCE
+            for priority_idx, niv_val in enumerate(disc.priorite_niveau or []):
+                if niv_val not in self.levels or priority_idx >= len(W_PRIORITY):
+                    continue
+                count_niv = sum(1 for el in self.eleves if el.annee.value == niv_val)
+                total += count_niv * quota_of(disc, niv_val) * W_PRIORITY[priority_idx]
+        return float(total)
+
+    def score(self, X: np.ndarray) -> Dict[str, float]:
+        """Valeur de l'objectif V5_03_C du planning, détaillée par famille de termes"""
+        counts = X.sum(axis=2)
+        has_rows = self.availability.any(axis=2)
+        quota_mask = has_rows & (self.quota > 0)
+        sat = np.minimum(counts, self.quota)
+        excess = counts - sat
+        parts = {
+            'quotas': float(
+                (W_FILL * sat + W_EXCESS * excess)[quota_mask].sum()
+                + W_SUCCESS * (quota_mask & (counts >= self.quota)).sum()
+            ),
+            'preferences': 0.0,
+            'priorites': 0.0,
+            'paires_jours': 0.0,
+            'meme_jour': 0.0,
+        }
+
+        # Un élève par ligne: une variable partagée par un binôme compte pour chacun
+        for d_pos, disc in enumerate(self.disciplines):
+            Xd = X[:, d_pos, :]
+            if disc.id_discipline == 1 and disc.take_jour_pref:
+                preferred = np.array([el.jour_preference.value - 1 for el in self.eleves])
+                parts['preferences'] += W_PREFERENCE * int((Xd & (self.vac_jour[None, :] == preferred[:, None])).sum())
+
+            for priority_idx, niv_val in enumerate(disc.priorite_niveau or []):
+                if niv_val not in self.levels or priority_idx >= len(W_PRIORITY):
+                    continue
+                parts['priorites'] += W_PRIORITY[priority_idx] * int(Xd[self.level == niv_val].sum())
+
+            if disc.paire_jours or disc.meme_jour:
+                # Affectations et disponibilités par (élève, semaine, jour)
+                n_s = Xd.shape[0]
+                by_day = Xd.reshape(n_s, N_WEEKS, 5, 2).any(axis=3)
+                avail_day = self.availability[:, d_pos, :].reshape(n_s, N_WEEKS, 5, 2).any(axis=3)
+                for day1, day2 in disc.paire_jours or []:
+                    both = avail_day[:, :, day1] & avail_day[:, :, day2] & by_day[:, :, day1] & by_day[:, :, day2]
+                    parts['paires_jours'] += W_PAIR * int(both.sum())
+                if disc.meme_jour:
+                    n_day = Xd.reshape(n_s, N_WEEKS, 5, 2).sum(axis=(1, 3)).astype(np.int64)  # [élève, jour]
+                    eligible = self.availability[:, d_pos, :].sum(axis=1) >= 2
+                    pairs = (n_day * (n_day - 1) // 2).sum(axis=1) + (n_day[:, :-1] * n_day[:, 1:]).sum(axis=1)
+                    parts['meme_jour'] += W_SAME_DAY * int(pairs[eligible].sum())
+
+        parts['total'] = sum(parts.values())
+        return parts
+
+    # Contraintes dures
+
+    def violations(self, X: np.ndarray) -> Dict[str, int]:
+        """Nombre de violations de chaque famille de contraintes dures du modèle"""
+        A = self.availability
+        result = collections.Counter()
+        result['disponibilite'] = int((X & ~A).sum())
+
+        # Binômes: les deux membres ensemble
+        s_idx, d_idx = np.nonzero(self.partner >= 0)
+        p_idx = self.partner[s_idx, d_idx]
+        result['binome'] = int((X[s_idx, d_idx] != X[p_idx, d_idx]).sum()) // 2
+
+        load = X.sum(axis=0)  # [discipline, vacation]
+        result['capacite'] = int(((self.capacity > 0) & (load > self.capacity)).sum())
+        result['unicite'] = int((X.sum(axis=1) > 1).sum())
+
+        weekly = self.weekly(X)
+        weekly_avail = self.weekly(A)
+        for d_pos, disc in enumerate(self.disciplines):
+            Wd = weekly[:, d_pos, :]
+            if disc.nb_vacations_par_semaine > 0:
+                result['max_par_semaine'] += int((Wd > disc.nb_vacations_par_semaine).sum())
+
+            if disc.frequence_vacations > 1:
+                present = Wd > 0
+                for offset in range(1, disc.frequence_vacations):
+                    result['frequence'] += int((present[:, :-offset] & present[:, offset:]).sum())
+
+            if disc.repartition_semestrielle:
+                has = weekly_avail[:, d_pos, :]
+                both = (has[:, :26].sum(axis=1) > 0) & (has[:, 26:].sum(axis=1) > 0)
+                q1, q2 = disc.repartition_semestrielle[0], disc.repartition_semestrielle[1]
+                result['semestre'] += int((both & (Wd[:, :26].sum(axis=1) > q1)).sum())
+                result['semestre'] += int((both & (Wd[:, 26:].sum(axis=1) > q2)).sum())
+
+            cont = disc.repetition_continuite
+            if isinstance(cont, (list, tuple)) and cont[0] > 0 and cont[1] > 0:
+                limit, distance = cont[0], cont[1]
+                cum = np.concatenate([np.zeros((Wd.shape[0], 1), dtype=np.int64), np.cumsum(Wd, axis=1)], axis=1)
+                starts = np.arange(N_WEEKS)
+                ends = np.minimum(starts + distance, N_WEEKS)
+                result['continuite'] += int((cum[:, ends] - cum[:, starts] > limit).sum())
+
+            result.update(self._slot_violations(X, d_pos, disc, load[d_pos]))
+
+        return {name: count for name, count in sorted(result.items())}
+
+    def _slot_violations(self, X: np.ndarray, d_pos: int, disc, load: np.ndarray) -> Dict[str, int]:
+        """Remplissage, mixité et remplacement de niveau sur les vacations d'une discipline"""
+        result = collections.Counter()
+        A = self.availability[:, d_pos, :]
+        Xd = X[:, d_pos, :]
+        has_rows = A.any(axis=0)
+        cap = self.capacity[d_pos]
+
+        if disc.be_filled:
+            presence = np.array([bool(p) for p in disc.presence[:SLOTS_PER_WEEK]] + [False] * (SLOTS_PER_WEEK - len(disc.presence)))
+            required = has_rows & presence[self.vac_slot] & (cap > 0)
+            result['remplissage'] = int((required & (load != cap)).sum())
+
+        if disc.mixite_groupes or disc.remplacement_niveau:
+            level_avail = np.stack([A[self.level == lv].any(axis=0) for lv in self.levels])  # [niveau, vacation]
+            level_count = np.stack([Xd[self.level == lv].sum(axis=0) for lv in self.levels])
+            present = level_count > 0
+            n_avail = level_avail.sum(axis=0)
+
+            if disc.mixite_groupes == 1:
+                result['mixite'] += int((level_avail & (level_count != 1)).sum())
+            elif disc.mixite_groupes == 2:
+                result['mixite'] += int(((n_avail >= 2) & ((present & level_avail).sum(axis=0) < 2)).sum())
+            elif disc.mixite_groupes == 3:
+                result['mixite'] += int((present.sum(axis=0) > 1).sum())
+
+            level_pos = {lv: i for i, lv in enumerate(self.levels)}
+            for niv_from, niv_to, percentage in disc.remplacement_niveau or []:
+                if niv_from not in level_pos or niv_to not in level_pos:
+                    continue
+                required = (percentage / 100.0 * cap).astype(np.int64)
+                enforced = level_avail[level_pos[niv_to]] & (required > 0) & ~present[level_pos[niv_from]]
+                short = level_count[level_pos[niv_to]] < required
+                result['remplacement_niveau'] += int((enforced & short).sum())
+
+        return result
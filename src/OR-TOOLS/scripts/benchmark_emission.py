@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark: contraintes construites par expressions Python (sum) ou par
+écriture directe dans le proto (emission.LinearEmitter), sur les données de data/.
+
+Trois motifs des familles de contraintes, chacun construit sur un modèle ne
+contenant que les variables de décision:
+ - unicite: sum(vars) <= 1 par (élève, vacation)
+ - capacite: sum(vars) <= n par (discipline, vacation), variables de binômes en double
+ - objectif: max sum(w * x) sur toutes les variables de décision
+
+Chaque mesure (BuildProfiler) est faite dans un processus neuf: durée, hausse
+du pic de mémoire résidente (les arbres d'expression sont alloués côté C++,
+invisibles pour tracemalloc) et empreinte du modèle obtenu (identique attendue).
+
+Usage:
+    python benchmark_emission.py [--data-dir data] [--repeat 3] [--json resultat/bench_emission.json]
+"""
+
+import argparse
+import json
+import logging
+import multiprocessing
+import statistics
+import sys
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent.parent
+sys.path.insert(0, str(PROJECT_ROOT / "src" / "OR-TOOLS"))
+sys.path.insert(0, str(PROJECT_ROOT / "src"))
+
+from ortools.sat.python import cp_model
+
+from build_profiler import BuildProfiler
+from config_manager import ModelConfig
+from emission import LinearEmitter
+from optimizer import ScheduleOptimizer
+from parallel_build import proto_hash
+
+PATTERNS = {
+    "unicite": ("student", "vacation"),
+    "capacite": ("discipline", "vacation"),
+    "objectif": None,
+}
+
+
+def _measure(data_dir: str, pattern: str, variant: str) -> dict:
+    """Construit un motif dans un modèle neuf (processus fils)"""
+    logging.disable(logging.INFO)
+    optimizer = ScheduleOptimizer(ModelConfig.from_csv_directory(Path(data_dir)))
+    optimizer.prepare_data()
+    optimizer.model = cp_model.CpModel()
+    optimizer._create_variables()
+    optimizer._build_indexes()
+    store, model = optimizer.store, optimizer.model
+    emit = LinearEmitter(model)
+    groups = [rows for _, rows in store.group_by(*PATTERNS[pattern])] if PATTERNS[pattern] else []
+
+    profiler = BuildProfiler()
+    with profiler.phase(pattern, model):
+        if PATTERNS[pattern] is None:
+            weights = (store.vacation + 1).tolist()
+            if variant == "expressions":
+                model.Maximize(sum(var * w for var, w in zip(store.vars, weights)))
+            else:
+                emit.maximize(store.var_index, weights)
+        else:
+            for rows in groups:
+                if variant == "expressions":
+                    model.Add(sum(store.vars_of(rows)) <= len(rows))
+                else:
+                    emit.linear(store.var_index[rows], ub=len(rows))
+    phase = profiler.phases[0]
+    return {"seconds": phase["seconds"], "rss_peak_delta_kb": phase["rss_peak_delta_kb"] or 0, "hash": proto_hash(model)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Micro-benchmark de l'écriture des contraintes linéaires.")
+    parser.add_argument("--data-dir", type=Path, default=PROJECT_ROOT / "data", help="Répertoire des CSV d'entrée.")
+    parser.add_argument("--repeat", type=int, default=3, help="Mesures par motif et variante (médiane).")
+    parser.add_argument("--json", type=Path, default=None, help="Fichier JSON de sortie (optionnel).")
+    args = parser.parse_args()
+
+    context = multiprocessing.get_context("spawn")
+    report = {}
+    with context.Pool(1, maxtasksperchild=1) as pool:
+        for pattern in PATTERNS:
+            report[pattern] = {}
+            for variant in ("expressions", "emission"):
+                runs = [pool.apply(_measure, (str(args.data_dir), pattern, variant)) for _ in range(args.repeat)]
+                report[pattern][variant] = {
+                    "seconds": round(statistics.median(r["seconds"] for r in runs), 4),
+                    "rss_peak_delta_kb": statistics.median(r["rss_peak_delta_kb"] for r in runs),
+                    "hash": runs[0]["hash"],
+                }
+            report[pattern]["identical"] = report[pattern]["expressions"]["hash"] == report[pattern]["emission"]["hash"]
+
+    print("=" * 72)
+    print("ÉCRITURE DES CONTRAINTES: EXPRESSIONS PYTHON vs PROTO DIRECT")
+    print("=" * 72)
+    for pattern, result in report.items():
+        before, after = result["expressions"], result["emission"]
+        print(f"{pattern:<10}: {before['seconds']:>6.3f}s -> {after['seconds']:>6.3f}s "
+              f"(x{before['seconds'] / after['seconds']:.1f})  "
+              f"RSS +{before['rss_peak_delta_kb'] / 1024:.1f} Mo -> +{after['rss_peak_delta_kb'] / 1024:.1f} Mo  "
+              f"{'modèle identique' if result['identical'] else 'MODÈLE DIFFÉRENT'}")
+
+    if args.json:
+        args.json.parent.mkdir(parents=True, exist_ok=True)
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+        print(f"Rapport sauvegardé: {args.json}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+Benchmark de construction du modèle CP-SAT sur les données de data/.
+
+Mesure le temps de prepare_data() / build_model() et la taille du modèle
+(variables, contraintes, termes de l'objectif), les classes d'élèves
+interchangeables, le profil par phase de construction, puis compare la formulation
+"même jour" par compteurs journaliers à l'ancienne formulation par paires
+(une BoolVar + 2 contraintes réifiées par paire de variables).
+
+Avec --processes, le modèle est aussi construit en parallèle (parallel_build.py)
+pour chaque nombre de processus: durée, accélération par rapport à la
+construction séquentielle et empreinte du modèle (identique attendue).
+
+Usage:
+    python benchmark_model_build.py [--data-dir data] [--json resultat/bench.json] [--symmetry-breaking]
+                                    [--processes 2,4,8]
+"""
+
+import argparse
+import collections
+import json
+import logging
+import sys
+import time
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent.parent
+sys.path.insert(0, str(PROJECT_ROOT / "src" / "OR-TOOLS"))
+sys.path.insert(0, str(PROJECT_ROOT / "src"))
+
+from config_manager import ModelConfig
+from optimizer import ScheduleOptimizer
+from parallel_build import proto_hash
+
+
+def model_size(optimizer) -> dict:
+    """Taille du modèle CP-SAT construit"""
+    proto = optimizer.model.Proto()
+    return {
+        "decision_variables": optimizer.store.n_distinct_vars(),
+        "student_rows": len(optimizer.store),
+        "variables": len(proto.variables),
+        "constraints": len(proto.constraints),
+        "objective_terms": len(proto.objective.vars),
+    }
+
+
+def same_day_sizes(optimizer) -> dict:
+    """
+    Taille du bloc "même jour" dans les deux formulations.
+
+    - paires: une BoolVar + (AddBoolAnd, AddBoolOr) par paire de variables
+      d'un même (élève, discipline) dont les jours diffèrent d'au plus 1
+    - compteurs: un compteur par jour utilisé, un carré par jour ayant au moins
+      2 variables et un produit par paire de jours adjacents
+    """
+    store = optimizer.store
+    grouping = store.group_by('student', 'discipline')
+    pairs = 0
+    counters = {"variables": 0, "constraints": 0}
+
+    for (_, d_pos), rows in grouping:
+        if not optimizer.config.disciplines[d_pos].meme_jour or len(rows) < 2:
+            continue
+        per_day = collections.Counter(store.jour[rows].tolist())
+        for day, n in per_day.items():
+            pairs += n * (n - 1) // 2 + n * per_day.get(day + 1, 0)
+            counters["variables"] += 1 + (n >= 2) + (day + 1 in per_day)
+            counters["constraints"] += 1 + (n >= 2) + (day + 1 in per_day)
+
+    return {
+        "pairwise": {"variables": pairs, "constraints": 2 * pairs},
+        "daily_counts": counters,
+    }
+
+
+def parallel_builds(data_dir: Path, symmetry_breaking: bool, counts, reference: dict) -> list:
+    """Construction parallèle pour chaque nombre de processus, comparée à la construction séquentielle"""
+    runs = []
+    for processes in counts:
+        config = ModelConfig.from_csv_directory(
+            data_dir, symmetry_breaking=symmetry_breaking, build_processes=processes, model_cache=False
+        )
+        optimizer = ScheduleOptimizer(config)
+        optimizer.prepare_data()
+        start = time.perf_counter()
+        optimizer.build_model()
+        seconds = time.perf_counter() - start
+        report = optimizer.parallel_build_report or {}
+        runs.append({
+            "processes": processes,
+            "build_seconds": round(seconds, 3),
+            "speedup": round(reference["build_seconds"] / seconds, 2),
+            "merge_seconds": report.get("merge_seconds"),
+            "identical": proto_hash(optimizer.model) == reference["hash"],
+        })
+    return runs
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de construction du modèle.")
+    parser.add_argument("--data-dir", type=Path, default=PROJECT_ROOT / "data", help="Répertoire des CSV d'entrée.")
+    parser.add_argument("--json", type=Path, default=None, help="Fichier JSON de sortie (optionnel).")
+    parser.add_argument("--symmetry-breaking", action="store_true", help="Active le bris de symétrie entre élèves interchangeables.")
+    parser.add_argument("--processes", default=None,
+                        help="Nombres de processus de construction parallèle à comparer (ex: 2,4,8).")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+
+    config = ModelConfig.from_csv_directory(args.data_dir, symmetry_breaking=args.symmetry_breaking)
+    optimizer = ScheduleOptimizer(config)
+
+    start = time.perf_counter()
+    optimizer.prepare_data()
+    prepare_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    optimizer.build_model()
+    build_time = time.perf_counter() - start
+
+    report = {
+        "prepare_seconds": round(prepare_time, 3),
+        "build_seconds": round(build_time, 3),
+        "model": model_size(optimizer),
+        "student_classes": {
+            "profiles": len(optimizer.student_classes),
+            "units": len(optimizer.student_classes.units),
+            "interchangeable_classes": len(optimizer.student_classes.unit_classes),
+        },
+        "same_day": same_day_sizes(optimizer),
+        "max_theoretical_score": optimizer.max_theoretical_score,
+        "phases": optimizer.profiler.report() if optimizer.profiler is not None else None,
+        "hash": proto_hash(optimizer.model),
+    }
+    if args.processes:
+        counts = [int(n) for n in args.processes.split(",")]
+        report["parallel"] = parallel_builds(args.data_dir, args.symmetry_breaking, counts, report)
+
+    print("=" * 60)
+    print("BENCHMARK CONSTRUCTION DU MODÈLE")
+    print("=" * 60)
+    print(f"prepare_data : {report['prepare_seconds']:.2f}s")
+    print(f"build_model  : {report['build_seconds']:.2f}s")
+    for key, value in report["model"].items():
+        print(f"{key:<20}: {value:,}")
+    classes = report["student_classes"]
+    print(f"Profils élèves: {classes['profiles']}, unités: {classes['units']}, "
+          f"classes interchangeables: {classes['interchangeable_classes']}")
+    print("-" * 60)
+    print("Même jour (paires -> compteurs journaliers)")
+    pairwise = report["same_day"]["pairwise"]
+    daily = report["same_day"]["daily_counts"]
+    print(f"  variables   : {pairwise['variables']:,} -> {daily['variables']:,}")
+    print(f"  contraintes : {pairwise['constraints']:,} -> {daily['constraints']:,}")
+    print(f"Score max théorique: {report['max_theoretical_score']:,.0f}")
+    if report["phases"]:
+        print("-" * 60)
+        print("Phases de construction (par durée décroissante)")
+        for phase in sorted(report["phases"]["phases"], key=lambda p: p["seconds"], reverse=True):
+            print(f"  {phase['name']:<22}: {phase['seconds']:>6.3f}s  "
+                  f"cons={phase['constraints']:>7,}  termes={phase['linear_terms']:>8,}")
+
+    if report.get("parallel"):
+        print("-" * 60)
+        print(f"Construction parallèle (séquentielle: {report['build_seconds']:.2f}s)")
+        for run in report["parallel"]:
+            print(f"  {run['processes']:>2} processus: {run['build_seconds']:>6.2f}s  x{run['speedup']:.2f}  "
+                  f"fusion {run['merge_seconds'] or 0:.2f}s  "
+                  f"{'modèle identique' if run['identical'] else 'MODÈLE DIFFÉRENT'}")
+
+    if args.json:
+        args.json.parent.mkdir(parents=True, exist_ok=True)
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+        print(f"Rapport sauvegardé: {args.json}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Benchmark: consolidation des termes de l'objectif et durée du presolve CP-SAT,
+sur les données de data/.
+
+Le modèle est construit une fois, puis son objectif est réécrit selon trois
+variantes (même fonction objectif):
+ - brut: termes tels qu'ajoutés par _set_objective (une variable par bonus)
+ - fusionne: un terme par variable, poids cumulés
+ - pgcd: un terme par variable, poids divisés par leur PGCD (modèle construit)
+
+Pour chacune: nombre de termes, durée et temps déterministe du presolve
+(stop_after_presolve, un worker, médiane sur --repeat résolutions). Le temps
+déterministe, insensible à la charge de la machine, départage les variantes.
+
+Usage:
+    python benchmark_objective.py [--data-dir data] [--repeat 1] [--json resultat/bench_objective.json]
+"""
+
+import argparse
+import json
+import logging
+import statistics
+import sys
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent.parent
+sys.path.insert(0, str(PROJECT_ROOT / "src" / "OR-TOOLS"))
+sys.path.insert(0, str(PROJECT_ROOT / "src"))
+
+from ortools.sat.python import cp_model
+
+from config_manager import ModelConfig
+from emission import canonical_terms
+from optimizer import ScheduleOptimizer
+
+
+def _set_objective(model: cp_model.CpModel, var_indices, coeffs, scale: int = 1):
+    """Réécrit l'objectif sans canonicalisation (doublons conservés)"""
+    proto = model.Proto()
+    proto.clear_objective()
+    proto.objective.vars.extend(var_indices)
+    proto.objective.coeffs.extend([-c for c in coeffs])
+    proto.objective.scaling_factor = -scale
+
+
+def _presolve(model: cp_model.CpModel) -> tuple:
+    """(durée, temps déterministe) du presolve"""
+    solver = cp_model.CpSolver()
+    solver.parameters.stop_after_presolve = True
+    solver.parameters.num_workers = 1
+    solver.Solve(model)
+    return solver.WallTime(), solver.ResponseProto().deterministic_time
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de la consolidation de l'objectif.")
+    parser.add_argument("--data-dir", type=Path, default=PROJECT_ROOT / "data", help="Répertoire des CSV d'entrée.")
+    parser.add_argument("--repeat", type=int, default=1, help="Presolves par variante (médiane).")
+    parser.add_argument("--json", type=Path, default=None, help="Fichier JSON de sortie (optionnel).")
+    args = parser.parse_args()
+
+    logging.disable(logging.INFO)
+    config = ModelConfig.from_csv_directory(args.data_dir, log_progress=False, model_cache=False)
+    optimizer = ScheduleOptimizer(config)
+    optimizer.prepare_data()
+    optimizer.build_model()
+    model = optimizer.model
+
+    raw_vars, raw_coeffs = optimizer.objective.raw_terms()
+    merged_vars, merged_coeffs = canonical_terms(raw_vars, raw_coeffs)
+    vars_, coeffs, scale = optimizer.objective.consolidate()
+    variants = {
+        "brut": (raw_vars.tolist(), raw_coeffs.tolist(), 1),
+        "fusionne": (merged_vars, merged_coeffs, 1),
+        "pgcd": (vars_, coeffs, scale),
+    }
+
+    report = {}
+    for name, (var_indices, weights, factor) in variants.items():
+        _set_objective(model, var_indices, weights, factor)
+        runs = [_presolve(model) for _ in range(args.repeat)]
+        report[name] = {
+            "terms": len(var_indices),
+            "scale": factor,
+            "presolve_seconds": round(statistics.median(r[0] for r in runs), 3),
+            "deterministic_time": round(statistics.median(r[1] for r in runs), 3),
+        }
+
+    print("=" * 72)
+    print("OBJECTIF: TERMES ET DURÉE DU PRESOLVE")
+    print("=" * 72)
+    for name, result in report.items():
+        print(f"{name:<10}: {result['terms']:>8} termes  poids / {result['scale']:<3}  "
+              f"presolve {result['presolve_seconds']:>7.2f}s (déterministe {result['deterministic_time']:.2f})")
+
+    if args.json:
+        args.json.parent.mkdir(parents=True, exist_ok=True)
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+        print(f"Rapport sauvegardé: {args.json}")
+
+
+if __name__ == "__main__":
+    main()
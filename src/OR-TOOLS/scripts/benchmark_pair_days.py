@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Benchmark A/B des formulations du bonus "paires de jours" sur les données de data/.
+
+ - indicateurs: une BoolVar par paire présente, liée aux indicateurs de jour
+   partagés (has_jour = max des affectations du jour, AddMaxEquality)
+ - motifs: une BoolVar par motif de jours liée directement aux affectations
+   (clauses), au plus un motif par (élève, discipline, semaine) quand la
+   discipline limite la semaine à deux vacations
+
+Pour chaque formulation: durée de construction et taille du modèle
+(variables, contraintes, termes de l'objectif), puis avec --time-limit > 0
+une résolution CP-SAT (statut, objectif, score normalisé, borne).
+
+Usage:
+    python benchmark_pair_days.py [--data-dir data] [--time-limit 300] [--workers 8]
+                                  [--json resultat/bench_paires.json]
+"""
+
+import argparse
+import json
+import logging
+import sys
+import time
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent.parent
+sys.path.insert(0, str(PROJECT_ROOT / "src" / "OR-TOOLS"))
+sys.path.insert(0, str(PROJECT_ROOT / "src"))
+
+from config_manager import ModelConfig
+from optimizer import ScheduleOptimizer
+
+FORMULATIONS = ("indicateurs", "motifs")
+
+
+def run(data_dir: Path, formulation: str, time_limit: int, workers: int) -> dict:
+    config = ModelConfig.from_csv_directory(
+        data_dir, log_progress=False, model_cache=False, profiling=False, lp_bound=False,
+        checkpoint_interval_seconds=0, pair_days_formulation=formulation,
+        max_time_seconds=time_limit, num_workers=workers,
+    )
+    optimizer = ScheduleOptimizer(config)
+    optimizer.prepare_data()
+
+    start = time.perf_counter()
+    optimizer.build_model()
+    proto = optimizer.model.Proto()
+    entry = {
+        "build_seconds": round(time.perf_counter() - start, 3),
+        "variables": len(proto.variables),
+        "constraints": len(proto.constraints),
+        "objective_terms": len(proto.objective.vars),
+        "indicators": len(optimizer.indicators),
+        "max_theoretical_score": optimizer.max_theoretical_score,
+    }
+    if time_limit > 0:
+        result = optimizer.solve()
+        entry.update({
+            "status": result.status,
+            "objective": result.objective_value,
+            "normalized_score": result.normalized_score,
+            "best_bound": result.upper_bound,
+            "solve_seconds": round(result.solve_time, 1),
+        })
+    return entry
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark des formulations des paires de jours.")
+    parser.add_argument("--data-dir", type=Path, default=PROJECT_ROOT / "data", help="Répertoire des CSV d'entrée.")
+    parser.add_argument("--time-limit", type=int, default=0, help="Temps de résolution par formulation (0 = taille seule).")
+    parser.add_argument("--workers", type=int, default=8, help="Workers CP-SAT.")
+    parser.add_argument("--json", type=Path, default=None, help="Fichier JSON de sortie (optionnel).")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+    report = {name: run(args.data_dir, name, args.time_limit, args.workers) for name in FORMULATIONS}
+
+    print("=" * 72)
+    print("PAIRES DE JOURS: INDICATEURS vs MOTIFS")
+    print("=" * 72)
+    for name, entry in report.items():
+        print(f"{name:<12}: {entry['variables']:>7} vars  {entry['constraints']:>7} contraintes  "
+              f"{entry['objective_terms']:>7} termes  {entry['indicators']:>6} indicateurs  "
+              f"construction {entry['build_seconds']:.2f}s")
+    if args.time_limit > 0:
+        print("-" * 72)
+        for name, entry in report.items():
+            objective = f"{entry['objective']:,.0f}" if entry['objective'] is not None else "-"
+            score = f"{entry['normalized_score']:.2f}/100" if entry['normalized_score'] is not None else "-"
+            bound = f"{entry['best_bound']:,.0f}" if entry['best_bound'] is not None else "-"
+            print(f"{name:<12}: {entry['status']:<9} objectif {objective:>12}  score {score:>10}  borne {bound:>12}")
+
+    if args.json:
+        args.json.parent.mkdir(parents=True, exist_ok=True)
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+        print(f"Rapport sauvegardé: {args.json}")
+
+
+if __name__ == "__main__":
+    main()
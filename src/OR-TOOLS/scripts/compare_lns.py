@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Compare une résolution CP-SAT simple et la recherche LNS à temps égal.
+
+Le modèle est construit une fois (ou rechargé depuis le cache), puis:
+ - résolution simple: trajectoire (temps, score) relevée à chaque solution
+ - LNS: historique des itérations (lns.py)
+Les deux partent du même point (aucun, ou le même planning de démarrage à chaud).
+
+Usage:
+    python compare_lns.py --seconds 600 [--time-slice 20] [--warm-start resultat/planning_solution.csv]
+                          [--json resultat/compare_lns.json]
+"""
+
+import argparse
+import json
+import logging
+import sys
+import time
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent.parent
+sys.path.insert(0, str(PROJECT_ROOT / "src" / "OR-TOOLS"))
+sys.path.insert(0, str(PROJECT_ROOT / "src"))
+
+from ortools.sat.python import cp_model
+
+from config_manager import ModelConfig
+from lns import LNSDriver
+from optimizer import ScheduleOptimizer
+
+
+class TrajectoryCallback(cp_model.CpSolverSolutionCallback):
+    """Relève (temps, score) de chaque solution"""
+
+    def __init__(self):
+        cp_model.CpSolverSolutionCallback.__init__(self)
+        self.trajectory = []
+
+    def on_solution_callback(self):
+        self.trajectory.append({"elapsed": round(self.WallTime(), 2), "best": self.ObjectiveValue()})
+
+
+def best_at(trajectory, seconds):
+    """Meilleur score atteint à un instant donné (None si aucune solution)"""
+    best = None
+    for point in trajectory:
+        if point["elapsed"] <= seconds and point["best"] is not None:
+            best = point["best"]
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare CP-SAT simple et LNS à temps égal.")
+    parser.add_argument("--data-dir", type=Path, default=PROJECT_ROOT / "data", help="Répertoire des CSV d'entrée.")
+    parser.add_argument("--seconds", type=float, default=600, help="Temps accordé à chaque méthode.")
+    parser.add_argument("--time-slice", type=float, default=20.0, help="Temps de chaque sous-problème LNS.")
+    parser.add_argument("--seed", type=int, default=0, help="Graine du tirage des voisinages.")
+    parser.add_argument("--warm-start", type=Path, default=None, help="Planning CSV de départ commun (optionnel).")
+    parser.add_argument("--json", type=Path, default=None, help="Fichier JSON de sortie (optionnel).")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+    logging.getLogger("lns").setLevel(logging.INFO)
+
+    config = ModelConfig.from_csv_directory(args.data_dir, log_progress=False)
+    optimizer = ScheduleOptimizer(config)
+    optimizer.prepare_and_build()
+
+    initial, initial_objective = None, None
+    if args.warm_start:
+        report = optimizer.apply_warm_start(args.warm_start)
+        initial, initial_objective = report.solution, report.hint_objective
+
+    # Résolution simple
+    solver = cp_model.CpSolver()
+    solver.parameters.max_time_in_seconds = args.seconds
+    solver.parameters.num_workers = config.solver_params.num_workers
+    callback = TrajectoryCallback()
+    plain_status = solver.Solve(optimizer.model, callback)
+    plain = callback.trajectory
+
+    # LNS
+    driver = LNSDriver(optimizer, time_slice=args.time_slice, seed=args.seed)
+    start = time.perf_counter()
+    lns = driver.run(args.seconds, initial, initial_objective)
+    lns_seconds = time.perf_counter() - start
+
+    print("=" * 60)
+    print(f"CP-SAT SIMPLE vs LNS ({args.seconds:.0f}s chacun)")
+    print("=" * 60)
+    print(f"{'Temps':>8}  {'CP-SAT':>14}  {'LNS':>14}")
+    for fraction in (0.25, 0.5, 0.75, 1.0):
+        t = args.seconds * fraction
+        scores = [best_at(plain, t), best_at(lns.history, t)]
+        print(f"{t:>7.0f}s  " + "  ".join(f"{s:>14,.0f}" if s is not None else f"{'-':>14}" for s in scores))
+    print(f"LNS: {len(lns.history) - 1} itérations en {lns_seconds:.0f}s")
+    for kind, stats in lns.to_dict()["neighborhoods"].items():
+        print(f"  {kind:<10}: essais={stats['tries']:>4}  améliorations={stats['improvements']:>4}  "
+              f"gain={stats['gain']:>12,.0f}  taille={stats['size']}")
+
+    if args.json:
+        args.json.parent.mkdir(parents=True, exist_ok=True)
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({
+                "seconds": args.seconds,
+                "time_slice": args.time_slice,
+                "warm_start": str(args.warm_start) if args.warm_start else None,
+                "cpsat": {"status": plain_status.name, "objective": best_at(plain, args.seconds), "trajectory": plain},
+                "lns": lns.to_dict(),
+            }, f, indent=2, ensure_ascii=False)
+        print(f"Rapport sauvegardé: {args.json}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Compare une résolution CP-SAT monolithique et l'horizon glissant à temps égal.
+
+Le modèle est construit une fois (ou rechargé depuis le cache), puis:
+ - résolution monolithique: trajectoire (temps, score) relevée à chaque solution
+ - horizon glissant: étapes par période (ou semestre), puis polissage optionnel
+   sur le modèle complet (rolling_horizon.py)
+
+Usage:
+    python compare_rolling_horizon.py --seconds 600 [--unit periode|semestre] [--polish 0.2]
+                                      [--json resultat/compare_rolling_horizon.json]
+"""
+
+import argparse
+import json
+import logging
+import sys
+import time
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent.parent
+sys.path.insert(0, str(PROJECT_ROOT / "src" / "OR-TOOLS"))
+sys.path.insert(0, str(PROJECT_ROOT / "src"))
+
+from ortools.sat.python import cp_model
+
+from compare_lns import TrajectoryCallback, best_at
+from config_manager import ModelConfig
+from optimizer import ScheduleOptimizer
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare CP-SAT monolithique et horizon glissant à temps égal.")
+    parser.add_argument("--data-dir", type=Path, default=PROJECT_ROOT / "data", help="Répertoire des CSV d'entrée.")
+    parser.add_argument("--seconds", type=float, default=600, help="Temps accordé à chaque méthode.")
+    parser.add_argument("--unit", choices=["periode", "semestre"], default="periode", help="Découpage de l'année.")
+    parser.add_argument("--polish", type=float, default=0.2, help="Part du temps pour le polissage (0 = aucun).")
+    parser.add_argument("--no-pacing", action="store_true", help="Ne borne pas l'avancement des quotas.")
+    parser.add_argument("--json", type=Path, default=None, help="Fichier JSON de sortie (optionnel).")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+    logging.getLogger("rolling_horizon").setLevel(logging.INFO)
+
+    config = ModelConfig.from_csv_directory(args.data_dir, log_progress=False)
+    params = config.solver_params
+    params.log_progress = False
+    params.profiling = False
+    params.checkpoint_interval_seconds = 0
+    params.max_time_seconds = args.seconds
+    params.strategy = "rolling_horizon"
+    params.rolling_unit = args.unit
+    params.rolling_pacing = not args.no_pacing
+    params.rolling_polish_fraction = args.polish
+    optimizer = ScheduleOptimizer(config)
+    optimizer.prepare_and_build()
+
+    # Résolution monolithique
+    solver = cp_model.CpSolver()
+    solver.parameters.max_time_in_seconds = args.seconds
+    solver.parameters.num_workers = params.num_workers
+    callback = TrajectoryCallback()
+    start = time.perf_counter()
+    mono_status = solver.Solve(optimizer.model, callback)
+    mono_seconds = time.perf_counter() - start
+    mono = best_at(callback.trajectory, args.seconds)
+
+    # Horizon glissant (+ polissage)
+    start = time.perf_counter()
+    result = optimizer.solve()
+    rolling_seconds = time.perf_counter() - start
+    summary = result.statistics.get("rolling_horizon", {})
+
+    def fmt(score):
+        return f"{score:>14,.0f}" if score is not None else f"{'-':>14}"
+
+    print("=" * 60)
+    print(f"CP-SAT MONOLITHIQUE vs HORIZON GLISSANT ({args.seconds:.0f}s chacun, par {args.unit})")
+    print("=" * 60)
+    print(f"{'Méthode':<22}  {'Score':>14}  {'Temps':>8}")
+    print(f"{'Monolithique':<22}  {fmt(mono)}  {mono_seconds:>7.0f}s")
+    print(f"{'Horizon glissant':<22}  {fmt(summary.get('horizon_objective'))}  {summary.get('horizon_seconds', 0):>7.0f}s")
+    if args.polish > 0:
+        print(f"{'+ polissage':<22}  {fmt(result.objective_value)}  {rolling_seconds:>7.0f}s")
+    print(f"Variables de décision: {len(set(optimizer.store.var_index.tolist())):,}")
+    for step in result.stages:
+        print(f"  {step['step']:<14}: {step.get('free_vars', '-'):>8} variables libres  "
+              f"{step['status']:<9} {fmt(step['objective'])}  {step['seconds']:>6.1f}s")
+
+    if args.json:
+        args.json.parent.mkdir(parents=True, exist_ok=True)
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({
+                "seconds": args.seconds,
+                "unit": args.unit,
+                "polish_fraction": args.polish,
+                "monolithic": {"status": mono_status.name, "objective": mono, "trajectory": callback.trajectory},
+                "rolling_horizon": {
+                    "status": result.status,
+                    "objective": result.objective_value,
+                    "seconds": round(rolling_seconds, 2),
+                    "steps": result.stages,
+                },
+            }, f, indent=2, ensure_ascii=False)
+        print(f"Rapport sauvegardé: {args.json}")
+
+
+if __name__ == "__main__":
+    main()
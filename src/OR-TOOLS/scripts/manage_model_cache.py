@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""
+Gestion du cache disque des modèles CP-SAT (resultat/model_cache).
+
+Usage:
+    python manage_model_cache.py            # liste les entrées
+    python manage_model_cache.py --clear    # vide le cache
+    python manage_model_cache.py --max-mb 200   # applique une limite de taille
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent.parent
+sys.path.insert(0, str(PROJECT_ROOT / "src" / "OR-TOOLS"))
+
+from model_cache import ModelCache
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Gestion du cache des modèles CP-SAT.")
+    parser.add_argument("--cache-dir", type=Path, default=PROJECT_ROOT / "resultat" / "model_cache", help="Répertoire du cache.")
+    parser.add_argument("--clear", action="store_true", help="Supprime toutes les entrées.")
+    parser.add_argument("--max-mb", type=int, default=None, help="Évince les entrées les plus anciennes au-delà de cette taille.")
+    args = parser.parse_args()
+
+    cache = ModelCache(args.cache_dir)
+
+    if args.clear:
+        print(f"{cache.clear()} entrée(s) supprimée(s)")
+        return
+
+    if args.max_mb is not None:
+        cache.max_bytes = args.max_mb * 2**20
+        cache.evict()
+
+    entries = cache.entries()
+    if not entries:
+        print(f"Cache vide: {args.cache_dir}")
+        return
+
+    print(f"{'Clé':<34} {'Taille':>10}  Dernière utilisation")
+    for entry in entries:
+        last_used = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(entry["last_used"]))
+        print(f"{entry['key']:<34} {entry['bytes'] / 1e6:>8.1f}Mo  {last_used}")
+    print(f"Total: {sum(e['bytes'] for e in entries) / 1e6:.1f} Mo")
+
+
+if __name__ == "__main__":
+    main()
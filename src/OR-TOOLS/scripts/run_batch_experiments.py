@@ -5,6 +5,9 @@ import time
 from datetime import datetime
 from pathlib import Path
 
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from events import EventBus, JsonlSink, PHASE_STARTED, PHASE_FINISHED
+
 # ================= Configuration =================
 # Define the models to test (filename without .py)
 MODELS = [
@@ -47,12 +50,23 @@ def run_experiment():
     date_folder = OUTPUT_BASE_DIR / experiment_date
     date_folder.mkdir(parents=True, exist_ok=True)
 
+    # Événements par exécution (début / fin, statut, durée) en JSONL dans le dossier du jour
+    events = EventBus()
+    events_sink = events.subscribe(JsonlSink(date_folder / "events.jsonl"))
+
     total_runs = len(MODELS) * len(TIME_LIMITS) * ITERATIONS
     current_run = 0
     
     # Track results
     results_summary = []
 
+    def finish_run(entry):
+        results_summary.append(entry)
+        events.emit(
+            PHASE_FINISHED, phase="run", elapsed=round(entry["duration"], 2),
+            data={k: entry[k] for k in ("model", "time_limit", "iteration", "status", "log_file")}
+        )
+
     for model_name in MODELS:
         model_script = MODEL_DIR / f"{model_name}.py"
         
@@ -98,6 +112,10 @@ def run_experiment():
                 # 1. Run Solver
                 print(f"  → Launching solver...")
                 start_time = time.time()
+                events.emit(
+                    PHASE_STARTED, phase="run", remaining=time_limit,
+                    data={"model": model_name, "time_limit": time_limit, "iteration": iteration, "run": current_run, "total_runs": total_runs}
+                )
                 
                 # Run the model script as a subprocess
                 with open(log_file, "w", encoding="utf-8") as log:
@@ -132,7 +150,7 @@ def run_experiment():
                         status = "FAILED"
                         print(f"  ✗ ERROR: Solver failed after {duration:.2f}s")
                         print(f"    Check log: {log_file.name}")
-                        results_summary.append({
+                        finish_run({
                             "model": model_name,
                             "time_limit": time_limit,
                             "iteration": iteration,
@@ -147,7 +165,7 @@ def run_experiment():
                         status = "ERROR"
                         print(f"  ✗ UNEXPECTED ERROR: {str(e)}")
                         log.write(f"\n\nUNEXPECTED ERROR: {str(e)}\n")
-                        results_summary.append({
+                        finish_run({
                             "model": model_name,
                             "time_limit": time_limit,
                             "iteration": iteration,
@@ -165,7 +183,7 @@ def run_experiment():
                 if sol_file.exists():
                     # Stats will be generated in batch after all iterations
                     print(f"  ✓ Solution saved: {sol_file.name}")
-                    results_summary.append({
+                    finish_run({
                         "model": model_name,
                         "time_limit": time_limit,
                         "iteration": iteration,
@@ -176,7 +194,7 @@ def run_experiment():
                     })
                 else:
                     print(f"  ⚠ WARNING: Solution file was not created.")
-                    results_summary.append({
+                    finish_run({
                         "model": model_name,
                         "time_limit": time_limit,
                         "iteration": iteration,
@@ -213,6 +231,8 @@ def run_experiment():
             # Reset for next configuration
             config_results = []
 
+    events_sink.close()
+
     # Print summary
     print("\n" + "=" * 70)
     print("Batch Experiment Complete!")
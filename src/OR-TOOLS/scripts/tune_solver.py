@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Réglage des paramètres CP-SAT par successive halving sur le modèle construit.
+
+Le modèle est construit une fois (ou rechargé depuis le cache) à partir des CSV
+locaux (data/ ou des données générées par src/data/generate_mock_*.py), puis
+les configurations tirées dans tuning.SEARCH_SPACE sont mises en course sur des
+budgets croissants (tuning.py). Le budget maximal par défaut est tiré des logs
+CP-SAT de batch_experiments/.
+
+Le profil gagnant est écrit en JSON; pour l'utiliser:
+    config.solver_params.load_profile("resultat/cpsat_profile.json")
+
+Usage:
+    python tune_solver.py [--configs 8] [--min-budget 60] [--max-budget 960] [--eta 2]
+                          [--cores 8] [--output resultat/cpsat_profile.json]
+                          [--json resultat/tuning_report.json]
+"""
+
+import argparse
+import json
+import logging
+import os
+import sys
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent.parent
+sys.path.insert(0, str(PROJECT_ROOT / "src" / "OR-TOOLS"))
+sys.path.insert(0, str(PROJECT_ROOT / "src"))
+
+from config_manager import ModelConfig
+from optimizer import ScheduleOptimizer
+from tuning import SuccessiveHalving, batch_budget, batch_trajectories, sample_configurations, write_profile
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Réglage des paramètres CP-SAT par successive halving.")
+    parser.add_argument("--data-dir", type=Path, default=PROJECT_ROOT / "data", help="Répertoire des CSV d'entrée.")
+    parser.add_argument("--batch-dir", type=Path, default=PROJECT_ROOT / "batch_experiments",
+                        help="Résultats batch (logs CP-SAT) servant à fixer le budget maximal.")
+    parser.add_argument("--configs", type=int, default=8, help="Nombre de configurations mises en course.")
+    parser.add_argument("--min-budget", type=float, default=60, help="Budget du premier tour (secondes).")
+    parser.add_argument("--max-budget", type=float, default=None,
+                        help="Budget maximal d'un tour (défaut: temps médian du batch pour 90%% du score final).")
+    parser.add_argument("--eta", type=int, default=2, help="Facteur de réduction entre deux tours.")
+    parser.add_argument("--cores", type=int, default=os.cpu_count() or 1, help="Cœurs disponibles (borne num_workers).")
+    parser.add_argument("--seed", type=int, default=0, help="Graine du tirage et de CP-SAT.")
+    parser.add_argument("--output", type=Path, default=PROJECT_ROOT / "resultat" / "cpsat_profile.json",
+                        help="Profil gagnant (SolverParams.load_profile).")
+    parser.add_argument("--json", type=Path, default=None, help="Rapport détaillé JSON (optionnel).")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+    logging.getLogger("tuning").setLevel(logging.INFO)
+
+    curves = batch_trajectories(args.batch_dir) if args.batch_dir.exists() else []
+    reference_budget = batch_budget(curves)
+    max_budget = args.max_budget or reference_budget or args.min_budget * args.eta ** 3
+    if reference_budget is not None:
+        print(f"Batch: {len(curves)} trajectoires, 90% du score final atteint en {reference_budget:.0f}s (médiane)")
+
+    config = ModelConfig.from_csv_directory(args.data_dir, log_progress=False)
+    config.solver_params.log_progress = False
+    optimizer = ScheduleOptimizer(config)
+    optimizer.prepare_and_build()
+    optimizer.model.ClearHints()  # Même point de départ pour toutes les configurations
+
+    configurations = sample_configurations(args.configs, args.cores, args.seed)
+    tuner = SuccessiveHalving(optimizer.model, configurations, seed=args.seed)
+    result = tuner.run(min_budget=args.min_budget, max_budget=max_budget, eta=args.eta)
+    result.batch_budget = reference_budget
+
+    print("=" * 60)
+    print(f"RÉGLAGE CP-SAT ({len(configurations)} configurations, budgets {args.min_budget:.0f}s → {max_budget:.0f}s)")
+    print("=" * 60)
+    for round_info in result.rounds:
+        print(f"Tour {round_info['round'] + 1} ({round_info['budget']:.0f}s):")
+        for trial in round_info["trials"]:
+            objective = f"{trial['objective']:>14,.0f}" if trial["objective"] is not None else f"{'-':>14}"
+            print(f"  config {trial['config_id']:>2}  {trial['status']:<9} {objective}  score {trial['score']:.3f}")
+    print(f"Configuration retenue ({result.best_id}): {result.best}")
+
+    write_profile(args.output, result, {"data_dir": str(args.data_dir), "eta": args.eta, "cores": args.cores})
+    print(f"Profil sauvegardé: {args.output}")
+
+    if args.json:
+        args.json.parent.mkdir(parents=True, exist_ok=True)
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(result.to_dict(), f, indent=2, ensure_ascii=False)
+        print(f"Rapport sauvegardé: {args.json}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+"""
+Validation des formulations par fenêtres (fréquence et continuité) sur des
+plannings existants (sorties des batchs: batch_experiments/**/iters/*.csv).
+
+Pour chaque planning, les affectations des disciplines concernées sont
+imposées (domaines fixés) à un modèle ne contenant que les variables de
+décision et les contraintes de fréquence et de continuité, construit dans
+chaque formulation ("fenetres", "prefixes"). Le verdict du modèle (planning
+admissible ou non) est comparé à la sémantique de référence des fenêtres
+glissantes: PlanningScorer.violations (toutes les fenêtres de 52 semaines,
+toutes les paires de semaines trop proches).
+
+Les plannings des batchs, produits sur des données antérieures, violent en
+général ces contraintes: chacun est aussi validé réduit à un planning
+admissible (affectations retirées dans l'ordre chronologique dès qu'elles
+violeraient une fenêtre), puis avec --mutations N, N variantes de ce planning
+réduit (une affectation ajoutée au hasard dans une discipline concernée).
+
+Usage:
+    python validate_windows.py [plannings.csv ...] [--data-dir data] [--mutations 3] [--seed 0]
+"""
+
+import argparse
+import collections
+import logging
+import sys
+from pathlib import Path
+
+import numpy as np
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent.parent
+sys.path.insert(0, str(PROJECT_ROOT / "src" / "OR-TOOLS"))
+sys.path.insert(0, str(PROJECT_ROOT / "src"))
+
+from ortools.sat.python import cp_model
+
+from config_manager import ModelConfig
+from emission import LinearEmitter
+from loaders import DataLoadError
+from optimizer import ScheduleOptimizer
+from scoring import PlanningScorer
+from warm_start import read_planning_csv
+
+FORMULATIONS = ("fenetres", "prefixes")
+
+
+def window_model(data_dir: Path, formulation: str) -> ScheduleOptimizer:
+    """Variables de décision et contraintes de fréquence et de continuité seules"""
+    config = ModelConfig.from_csv_directory(
+        data_dir, log_progress=False, model_cache=False, profiling=False, window_formulation=formulation
+    )
+    optimizer = ScheduleOptimizer(config)
+    optimizer.prepare_data()
+    optimizer.model = cp_model.CpModel()
+    optimizer.emit = LinearEmitter(optimizer.model)
+    optimizer._create_variables()
+    optimizer._build_indexes()
+    optimizer._add_frequency_constraints()
+    optimizer._add_continuity_constraints()
+    return optimizer
+
+
+def is_feasible(optimizer: ScheduleOptimizer, var_indices: np.ndarray, values: np.ndarray) -> bool:
+    """Le modèle admet-il les valeurs imposées ?"""
+    model = optimizer.model.Clone()
+    variables = model.Proto().variables
+    for index, value in zip(var_indices.tolist(), values.tolist()):
+        variables[index].domain[0] = value
+        variables[index].domain[1] = value
+    solver = cp_model.CpSolver()
+    solver.parameters.num_workers = 1
+    solver.parameters.max_time_in_seconds = 60.0
+    status = solver.Solve(model)
+    if status == cp_model.UNKNOWN:
+        raise RuntimeError("Validation interrompue: délai dépassé")
+    return status in (cp_model.OPTIMAL, cp_model.FEASIBLE)
+
+
+def thinned(optimizer: ScheduleOptimizer, rows: np.ndarray, assigned: np.ndarray) -> np.ndarray:
+    """
+    Affectations (par ligne) réduites dans l'ordre chronologique aux fenêtres admissibles
+
+    Par (élève, discipline), une affectation est retirée si sa semaine suit de
+    moins de frequence_vacations semaines une semaine conservée, ou si la
+    fenêtre de continuité qui se termine sur sa semaine est déjà pleine.
+    """
+    store = optimizer.store
+    keep = assigned.copy()
+    kept = collections.defaultdict(list)  # (élève, discipline) -> semaines des affectations conservées
+    for k in np.lexsort((store.vacation[rows], store.discipline[rows], store.student[rows])).tolist():
+        if not keep[k]:
+            continue
+        row = rows[k]
+        disc = optimizer.config.disciplines[store.discipline[row]]
+        weeks = kept[store.student[row], store.discipline[row]]
+        week = int(store.semaine[row])
+        if disc.frequence_vacations > 1 and any(0 < week - w < disc.frequence_vacations for w in weeks):
+            keep[k] = False
+            continue
+        cont = disc.repetition_continuite
+        if isinstance(cont, (list, tuple)) and cont[0] > 0 and cont[1] > 0:
+            if sum(1 for w in weeks if week - cont[1] < w <= week) >= cont[0]:
+                keep[k] = False
+                continue
+        weeks.append(week)
+    return keep
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Valide les formulations par fenêtres sur des plannings existants.")
+    parser.add_argument("plannings", nargs="*", type=Path, help="Plannings CSV (défaut: batch_experiments/**/iters/*.csv).")
+    parser.add_argument("--data-dir", type=Path, default=PROJECT_ROOT / "data", help="Répertoire des CSV d'entrée.")
+    parser.add_argument("--mutations", type=int, default=3, help="Variantes du planning réduit (une affectation ajoutée).")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+    paths = args.plannings or sorted((PROJECT_ROOT / "batch_experiments").glob("**/iters/*.csv"))
+    if not paths:
+        print("Aucun planning à valider")
+        return 1
+
+    models = {name: window_model(args.data_dir, name) for name in FORMULATIONS}
+    reference = models[FORMULATIONS[0]]
+    store = reference.store
+    scorer = PlanningScorer(reference)
+    rng = np.random.default_rng(args.seed)
+
+    # Lignes des disciplines concernées et variable (partagée par les binômes) de chacune
+    window_disciplines = [
+        d_pos for d_pos, disc in enumerate(reference.config.disciplines)
+        if disc.frequence_vacations > 1 or (
+            isinstance(disc.repetition_continuite, (list, tuple))
+            and disc.repetition_continuite[0] > 0 and disc.repetition_continuite[1] > 0
+        )
+    ]
+    rows = np.flatnonzero(np.isin(store.discipline, window_disciplines))
+    var_indices, row_var = np.unique(store.var_index[rows], return_inverse=True)
+
+    counts = collections.Counter()
+    disagreements = []
+    for path in paths:
+        try:
+            X = scorer.tensor_from_assignments(read_planning_csv(path))
+        except DataLoadError as e:
+            print(f"  ignoré: {e}")
+            counts["ignores"] += 1
+            continue
+
+        # Valeur de chaque variable (un binôme incohérent compte comme affecté)
+        values = np.zeros(len(var_indices), dtype=np.int64)
+        np.maximum.at(values, row_var, X[store.student[rows], store.discipline[rows], store.vacation[rows]].astype(np.int64))
+
+        # Planning réduit: une variable de binôme n'est conservée que si les deux membres la conservent
+        reduced = np.ones(len(var_indices), dtype=np.int64)
+        np.minimum.at(reduced, row_var, thinned(reference, rows, values[row_var] == 1).astype(np.int64))
+
+        variants = [("", values), (" réduit", reduced)]
+        free = np.flatnonzero(reduced == 0)
+        for k in range(min(args.mutations, len(free))):
+            mutated = reduced.copy()
+            mutated[rng.choice(free)] = 1
+            variants.append((f" réduit +{k + 1}", mutated))
+
+        for suffix, variant in variants:
+            planning = np.zeros_like(X)
+            planning[store.student[rows], store.discipline[rows], store.vacation[rows]] = variant[row_var] == 1
+            violations = scorer.violations(planning)
+            expected = violations.get("frequence", 0) + violations.get("continuite", 0) == 0
+            verdicts = {name: is_feasible(optimizer, var_indices, variant) for name, optimizer in models.items()}
+
+            counts["admissibles" if expected else "non admissibles"] += 1
+            if any(verdict != expected for verdict in verdicts.values()):
+                disagreements.append(f"{path.name}{suffix}: référence {expected}, {verdicts}")
+
+    print("=" * 72)
+    print("VALIDATION DES FENÊTRES (FRÉQUENCE, CONTINUITÉ)")
+    print("=" * 72)
+    print(f"Plannings: {len(paths)} (original, réduit et {args.mutations} variantes du réduit)")
+    for name, count in sorted(counts.items()):
+        print(f"  {name}: {count}")
+    for name, optimizer in models.items():
+        proto = optimizer.model.Proto()
+        print(f"  modèle {name}: {len(proto.variables)} variables, {len(proto.constraints)} contraintes")
+    if disagreements:
+        print(f"✗ {len(disagreements)} désaccords avec la référence:")
+        for line in disagreements:
+            print(f"  - {line}")
+        return 1
+    print("✓ Verdicts identiques à la référence pour toutes les formulations")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,87 @@
+"""
+STOPPING - Règles d'arrêt anticipé de la résolution CP-SAT
+
+L'essentiel du score est atteint tôt (cf. batch_experiments/): plutôt que
+d'attendre max_time_seconds, la recherche s'arrête dès qu'une règle est
+satisfaite:
+ - 'gap': écart relatif à la meilleure borne (relaxation linéaire, CP-SAT)
+   inférieur à la cible
+ - 'plateau': amélioration relative de moins de X% sur les N dernières minutes
+ - 'target_score': score normalisé /100 (cf. max_theoretical_score) atteint
+
+Les règles sont évaluées à chaque solution (SolutionCallback) et, pour le
+plateau, périodiquement (aucune nouvelle solution = aucun appel du callback).
+L'arrêt passe par StopSearch: CP-SAT retourne FEASIBLE avec la meilleure
+solution trouvée.
+"""
+import bisect
+from dataclasses import dataclass, field
+from typing import List, Optional, Tuple
+
+
+@dataclass
+class StoppingRules:
+    """
+    Règles d'arrêt (0 = règle désactivée)
+
+    Usage:
+        rules = StoppingRules.from_params(params, max_theoretical_score, upper_bound)
+        reason = rules.on_solution(objective, cpsat_bound, elapsed)  # None: continuer
+    """
+    gap: float = 0.0  # Écart relatif cible (ex: 0.05 = 5%)
+    plateau_percent: float = 0.0  # Amélioration relative minimale (%) ...
+    plateau_minutes: float = 30.0  # ... sur cette fenêtre glissante
+    target_score: float = 0.0  # Score normalisé cible (/100)
+    max_theoretical_score: float = 0.0
+    upper_bound: Optional[float] = None  # Borne calculée avant la résolution (relaxation linéaire)
+    trajectory: List[Tuple[float, float]] = field(default_factory=list)  # (temps, objectif) des solutions
+
+    @classmethod
+    def from_params(cls, params, max_theoretical_score: float, upper_bound: Optional[float] = None) -> "StoppingRules":
+        return cls(
+            gap=params.stop_gap,
+            plateau_percent=params.stop_plateau_percent,
+            plateau_minutes=params.stop_plateau_minutes,
+            target_score=params.stop_target_score,
+            max_theoretical_score=max_theoretical_score,
+            upper_bound=upper_bound,
+        )
+
+    @property
+    def active(self) -> bool:
+        return self.gap > 0 or self.plateau_percent > 0 or self.target_score > 0
+
+    def on_solution(self, objective: float, bound: Optional[float], elapsed: float) -> Optional[str]:
+        """Enregistre une solution et retourne la règle satisfaite (None: continuer)"""
+        self.trajectory.append((elapsed, objective))
+
+        if self.target_score > 0 and self.max_theoretical_score > 0:
+            if 100 * objective / self.max_theoretical_score >= self.target_score:
+                return 'target_score'
+
+        if self.gap > 0:
+            bounds = [b for b in (self.upper_bound, bound) if b is not None]
+            best = min(bounds) if bounds else None
+            if best is not None and best > 0 and (best - objective) / best <= self.gap:
+                return 'gap'
+
+        return self.check_plateau(elapsed)
+
+    def check_plateau(self, elapsed: float) -> Optional[str]:
+        """Amélioration sur les plateau_minutes dernières minutes inférieure à plateau_percent"""
+        if self.plateau_percent <= 0 or not self.trajectory:
+            return None
+        window = 60 * self.plateau_minutes
+        if elapsed < window:
+            return None
+        # Meilleur objectif au début de la fenêtre (aucune solution avant: pas de plateau)
+        times = [t for t, _ in self.trajectory]
+        before = bisect.bisect_right(times, elapsed - window)
+        if before == 0:
+            return None
+        reference = self.trajectory[before - 1][1]
+        current = self.trajectory[-1][1]
+        improvement = (current - reference) / abs(reference) if reference else float('inf')
+        if improvement < self.plateau_percent / 100:
+            return 'plateau'
+        return None
@@ -0,0 +1,88 @@
+"""
+STUDENT CLASSES - Classes d'équivalence d'élèves
+
+Deux élèves de même profil (niveau, semaines de stage, jour préféré) produisent
+exactement les mêmes lignes de variables. On s'en sert pour:
+ - calculer une seule fois par profil les données dérivées (éligibilité,
+   indisponibilités), puis les diffuser aux élèves
+ - regrouper les "unités" (élève seul ou binôme) interchangeables pour ajouter
+   des contraintes de bris de symétrie
+"""
+import collections
+import logging
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+def student_profile(el, stages: List) -> tuple:
+    """Signature d'un élève: tout ce qui différencie ses variables et ses termes d'objectif"""
+    stage_weeks = tuple(sorted((st.debut_stage, st.fin_stage) for st in stages))
+    return (el.annee.value, stage_weeks, el.jour_preference.value)
+
+
+class StudentClasses:
+    """
+    Profils d'élèves et classes d'unités interchangeables
+
+    Usage:
+        classes = StudentClasses(eleves, stages_eleves)
+        eligible = per_profile[classes.profile_of]       # diffusion profil -> élève
+        classes.build_units(binome_partner, student_ids)  # après calcul des binômes
+        for units in classes.unit_classes: ...
+    """
+
+    def __init__(self, eleves: List, stages_eleves: Dict[int, List]):
+        index: Dict[tuple, int] = {}
+        profile_of = []
+        for el in eleves:
+            key = student_profile(el, stages_eleves.get(el.id_eleve, []))
+            profile_of.append(index.setdefault(key, len(index)))
+
+        self.profiles: List[tuple] = list(index)
+        self.profile_of = np.asarray(profile_of, dtype=np.int32)
+        # Premier élève de chaque profil: sert à calculer les données du profil
+        _, first = np.unique(self.profile_of, return_index=True)
+        self.representatives = first.astype(np.int32)
+
+        self.units: List[Tuple[int, ...]] = []
+        self.unit_classes: List[List[int]] = []
+
+    def __len__(self) -> int:
+        return len(self.profiles)
+
+    def build_units(self, binome_partner: np.ndarray, student_ids: List[int]):
+        """
+        Construit les unités (élève seul ou binôme) et leurs classes d'équivalence
+
+        Les membres d'un binôme sont ordonnés par (profil, id): deux binômes sont
+        interchangeables si leurs membres ont deux à deux le même profil et le
+        même motif de disciplines partagées. Seules les classes d'au moins deux
+        unités sont conservées.
+        """
+        profile_of = self.profile_of.tolist()
+        seen = set()
+        classes = collections.defaultdict(list)
+        self.units = []
+
+        for s_pos in range(len(profile_of)):
+            if s_pos in seen:
+                continue
+            partners = set(binome_partner[s_pos][binome_partner[s_pos] >= 0].tolist())
+            members = sorted({s_pos} | partners, key=lambda pos: (profile_of[pos], student_ids[pos]))
+            seen.update(members)
+
+            key = (
+                tuple(profile_of[m] for m in members),
+                tuple((binome_partner[members[0]] >= 0).tolist()),
+            )
+            classes[key].append(len(self.units))
+            self.units.append(tuple(members))
+
+        self.unit_classes = [units for units in classes.values() if len(units) > 1]
+        logger.info(
+            f"✓ {len(self.profiles)} profils d'élèves, {len(self.units)} unités, "
+            f"{len(self.unit_classes)} classes d'unités interchangeables"
+        )
@@ -0,0 +1,268 @@
+"""
+TUNING - Réglage automatique des paramètres CP-SAT par successive halving
+
+Jusqu'ici, seuls TIME_LIMITS et MODELS de run_batch_experiments.py étaient
+ajustés à la main. Le réglage tire des configurations dans SEARCH_SPACE
+(linéarisation, branchement, workers, presolve, symétries, options LNS), puis
+les met en course sur le modèle construit:
+ - tour r: chaque configuration restante est résolue budget_r secondes
+   (budget_0 = min_budget, budget_{r+1} = eta * budget_r)
+ - score: aire sous la courbe objectif/temps, l'objectif étant ramené entre
+   la pire et la meilleure solution du tour (1 = meilleure solution dès le
+   départ); récompense les configurations qui montent vite, pas seulement le
+   score final
+ - seule la meilleure fraction 1/eta passe au tour suivant
+
+Les logs CP-SAT de batch_experiments/ (lignes "#n  t s best:x") donnent la
+forme des trajectoires passées: le temps médian pour atteindre 90% du score
+final sert de budget maximal par défaut.
+
+Le profil gagnant est écrit en JSON et rechargé par SolverParams.load_profile().
+"""
+import json
+import logging
+import random
+import re
+import statistics
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from ortools.sat.python import cp_model
+
+logger = logging.getLogger(__name__)
+
+# Valeurs explorées par paramètre CP-SAT (num_workers borné par les cœurs disponibles)
+SEARCH_SPACE: Dict[str, List] = {
+    'linearization_level': [0, 1, 2],
+    'search_branching': ['AUTOMATIC_SEARCH', 'PORTFOLIO_WITH_QUICK_RESTART_SEARCH', 'LP_SEARCH', 'PSEUDO_COST_SEARCH'],
+    'num_workers': [1, 2, 4, 8, 16],
+    'cp_model_presolve': [True, False],
+    'max_presolve_iterations': [1, 3],
+    'symmetry_level': [0, 1, 2],
+    'use_lns_only': [False, True],
+    'diversify_lns_params': [False, True],
+}
+
+PROGRESS_LINE = re.compile(r"^#(\d+)\s+([\d.]+)s\s+best:(-?[\d.e+]+)")
+
+
+def apply_cpsat_parameters(parameters, values: Dict):
+    """
+    Applique des paramètres CP-SAT nommés (enums par leur nom, ex: 'LP_SEARCH')
+
+    Args:
+        parameters: solver.parameters
+        values: {nom du paramètre: valeur} (format JSON des profils)
+    """
+    for name, value in values.items():
+        if isinstance(value, str):
+            value = type(getattr(parameters, name)).__members__[value]
+        setattr(parameters, name, value)
+
+
+@dataclass
+class Trial:
+    """Résolution d'une configuration pendant un tour"""
+    config_id: int
+    budget: float
+    status: str
+    objective: Optional[float]
+    trajectory: List[Tuple[float, float]] = field(default_factory=list)  # (temps, objectif)
+    score: float = 0.0
+
+
+@dataclass
+class TuningResult:
+    """Résultat du réglage"""
+    configurations: List[Dict]
+    rounds: List[Dict] = field(default_factory=list)
+    best_id: Optional[int] = None
+    batch_budget: Optional[float] = None
+
+    @property
+    def best(self) -> Optional[Dict]:
+        return self.configurations[self.best_id] if self.best_id is not None else None
+
+    def to_dict(self) -> dict:
+        return {
+            'best_id': self.best_id,
+            'best': self.best,
+            'batch_budget': self.batch_budget,
+            'configurations': self.configurations,
+            'rounds': self.rounds,
+        }
+
+
+class _TrajectoryCallback(cp_model.CpSolverSolutionCallback):
+    """Relève (temps, objectif) de chaque solution"""
+
+    def __init__(self):
+        cp_model.CpSolverSolutionCallback.__init__(self)
+        self.trajectory = []
+
+    def on_solution_callback(self):
+        self.trajectory.append((self.WallTime(), self.ObjectiveValue()))
+
+
+def sample_configurations(n: int, cores: int, seed: int = 0) -> List[Dict]:
+    """
+    n configurations distinctes: la configuration par défaut, puis des tirages dans SEARCH_SPACE
+
+    Args:
+        n: Nombre de configurations
+        cores: Cœurs disponibles (borne num_workers)
+        seed: Graine du tirage
+    """
+    rng = random.Random(seed)
+    space = dict(SEARCH_SPACE)
+    space['num_workers'] = sorted({min(w, cores) for w in space['num_workers']})
+    configurations = [{'num_workers': cores}]
+    seen = {json.dumps(configurations[0], sort_keys=True)}
+    attempts = 0
+    while len(configurations) < n and attempts < 100 * n:
+        attempts += 1
+        config = {name: rng.choice(values) for name, values in space.items()}
+        key = json.dumps(config, sort_keys=True)
+        if key not in seen:
+            seen.add(key)
+            configurations.append(config)
+    return configurations
+
+
+def curve_score(trajectory: List[Tuple[float, float]], budget: float, reference: float, floor: float) -> float:
+    """
+    Aire sous la courbe du meilleur objectif sur [0, budget], divisée par budget
+
+    L'objectif est ramené dans [0, 1] entre floor (pire solution du tour) et
+    reference (meilleure); avant la première solution, la courbe vaut 0. Vaut 1
+    si la meilleure solution du tour est trouvée immédiatement.
+    """
+    points = [(t, obj) for t, obj in trajectory if t <= budget]
+    if not points:
+        return 0.0
+    span = reference - floor
+    area = 0.0
+    for (t, obj), (t_next, _) in zip(points, points[1:] + [(budget, None)]):
+        # Une seule valeur d'objectif dans le tour: seul compte le temps avec solution
+        level = (obj - floor) / span if span > 0 else 1.0
+        area += (t_next - t) * level
+    return area / budget
+
+
+def batch_trajectories(batch_dir: Path) -> List[List[Tuple[float, float]]]:
+    """Trajectoires (temps, score / score final) des logs CP-SAT de batch_experiments/"""
+    curves = []
+    for log in sorted(Path(batch_dir).glob("*/T*/*/logs/*.txt")):
+        points = []
+        with open(log, "r", encoding="utf-8", errors="replace") as f:
+            for line in f:
+                match = PROGRESS_LINE.match(line)
+                if match:
+                    points.append((float(match.group(2)), float(match.group(3))))
+        if points and points[-1][1] > 0:
+            final = points[-1][1]
+            curves.append([(t, obj / final) for t, obj in points])
+    return curves
+
+
+def batch_budget(curves: List[List[Tuple[float, float]]], fraction: float = 0.9) -> Optional[float]:
+    """Temps médian pour atteindre fraction du score final dans les trajectoires du batch"""
+    times = [next(t for t, ratio in curve if ratio >= fraction) for curve in curves]
+    return statistics.median(times) if times else None
+
+
+class SuccessiveHalving:
+    """
+    Course des configurations sur un modèle construit
+
+    Usage:
+        tuner = SuccessiveHalving(optimizer.model, sample_configurations(16, cores=8))
+        result = tuner.run(min_budget=60, max_budget=960, eta=2)
+    """
+
+    def __init__(self, model: cp_model.CpModel, configurations: List[Dict], seed: int = 0):
+        self.model = model
+        self.configurations = configurations
+        self.seed = seed
+
+    def _trial(self, config_id: int, budget: float) -> Trial:
+        solver = cp_model.CpSolver()
+        solver.parameters.max_time_in_seconds = budget
+        solver.parameters.random_seed = self.seed
+        apply_cpsat_parameters(solver.parameters, self.configurations[config_id])
+        callback = _TrajectoryCallback()
+        status = solver.Solve(self.model, callback)
+        found = status in (cp_model.OPTIMAL, cp_model.FEASIBLE)
+        return Trial(config_id, budget, status.name, solver.ObjectiveValue() if found else None, callback.trajectory)
+
+    def run(self, min_budget: float = 60.0, max_budget: float = 960.0, eta: int = 2) -> TuningResult:
+        """
+        Tours de budget croissant jusqu'à une seule configuration (ou max_budget atteint)
+
+        Returns:
+            TuningResult: best_id désigne la configuration gagnante
+        """
+        result = TuningResult(configurations=self.configurations)
+        alive = list(range(len(self.configurations)))
+        budget = min_budget
+        round_idx = 0
+        while True:
+            start = time.perf_counter()
+            trials = []
+            for config_id in alive:
+                trial = self._trial(config_id, budget)
+                trials.append(trial)
+                logger.info(
+                    f"  Tour {round_idx + 1}, config {config_id}: {trial.status} "
+                    f"{trial.objective if trial.objective is not None else '-'} ({budget:.0f}s)"
+                )
+
+            objectives = [obj for t in trials for _, obj in t.trajectory]
+            reference = max(objectives, default=0.0)
+            floor = min(objectives, default=0.0)
+            for trial in trials:
+                trial.score = curve_score(trial.trajectory, budget, reference, floor)
+            trials.sort(key=lambda t: (t.score, t.objective is not None, t.objective or 0.0), reverse=True)
+            result.rounds.append({
+                'round': round_idx,
+                'budget': budget,
+                'seconds': round(time.perf_counter() - start, 1),
+                'reference': reference,
+                'trials': [
+                    {'config_id': t.config_id, 'status': t.status, 'objective': t.objective, 'score': round(t.score, 4)}
+                    for t in trials
+                ],
+            })
+            logger.info(
+                f"✓ Tour {round_idx + 1} ({budget:.0f}s, {len(trials)} configurations): "
+                f"meilleure config {trials[0].config_id} (score {trials[0].score:.3f})"
+            )
+
+            keep = max(1, len(trials) // eta)
+            alive = [t.config_id for t in trials[:keep]]
+            if len(alive) == 1 or budget * eta > max_budget:
+                result.best_id = alive[0]
+                return result
+            budget *= eta
+            round_idx += 1
+
+
+def write_profile(path: Path, result: TuningResult, metadata: Optional[Dict] = None):
+    """Écrit le profil gagnant (lu par SolverParams.load_profile)"""
+    best = dict(result.best)
+    workers = best.pop('num_workers', None)
+    profile = {
+        'num_workers': workers,
+        'cpsat_parameters': best,
+        'tuning': {
+            'date': time.strftime("%Y-%m-%d %H:%M:%S"),
+            'score': result.rounds[-1]['trials'][0]['score'] if result.rounds else None,
+            'batch_budget': result.batch_budget,
+            **(metadata or {}),
+        },
+    }
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(profile, f, indent=2, ensure_ascii=False)
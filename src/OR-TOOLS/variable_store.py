@@ -0,0 +1,245 @@
+"""
+VARIABLE STORE - Registre colonnaire des variables de décision
+
+Remplace les dictionnaires indexés par tuples (eleve_id, disc_id, v_idx) et
+les index defaultdict(list) de l'optimizer par:
+ - des colonnes d'entiers parallèles (élève, discipline, vacation, semaine, niveau, jour)
+   + l'index CP-SAT de la variable
+ - des vues group-by au format CSR (clés uniques, ordre des lignes, offsets)
+ - une table dense [élève, discipline, vacation] -> ligne pour les accès directs
+"""
+import logging
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+class Grouping:
+    """
+    Vue group-by au format CSR sur un VariableStore
+
+    Les lignes du groupe i sont order[offsets[i]:offsets[i + 1]], sa clé est keys[i].
+    Seuls les groupes non vides existent.
+    """
+
+    def __init__(self, columns: Tuple[str, ...], keys: np.ndarray, order: np.ndarray, offsets: np.ndarray):
+        self.columns = columns
+        self.keys = keys
+        self.order = order
+        self.offsets = offsets
+        self._lookup = None
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def __iter__(self) -> Iterator[Tuple[tuple, np.ndarray]]:
+        """Itère sur (clé, lignes) pour chaque groupe non vide"""
+        keys = self.keys.tolist()
+        offsets = self.offsets.tolist()
+        for i, key in enumerate(keys):
+            yield tuple(key), self.order[offsets[i]:offsets[i + 1]]
+
+    def iter(self, mask: Optional[np.ndarray] = None) -> Iterator[Tuple[tuple, np.ndarray]]:
+        """Comme __iter__, restreint aux groupes où mask (booléen, un par groupe) est vrai"""
+        if mask is None:
+            yield from self
+            return
+        offsets = self.offsets
+        for i in np.flatnonzero(mask).tolist():
+            yield tuple(self.keys[i].tolist()), self.order[offsets[i]:offsets[i + 1]]
+
+    def iter_runs(self, prefix_len: int, mask: Optional[np.ndarray] = None) -> Iterator[Tuple[tuple, List[Tuple[int, np.ndarray]]]]:
+        """
+        Regroupe les groupes consécutifs partageant les prefix_len premières colonnes
+
+        Ex: sur group_by('student', 'discipline', 'semaine'), iter_runs(2) produit
+        ((s_pos, d_pos), [(semaine, lignes), ...]) avec les semaines triées.
+        """
+        current_prefix = None
+        run = []
+        for key, rows in self.iter(mask):
+            prefix = key[:prefix_len]
+            if prefix != current_prefix:
+                if run:
+                    yield current_prefix, run
+                current_prefix = prefix
+                run = []
+            run.append((key[prefix_len] if len(key) == prefix_len + 1 else key[prefix_len:], rows))
+        if run:
+            yield current_prefix, run
+
+    def sizes(self) -> np.ndarray:
+        """Taille de chaque groupe"""
+        return np.diff(self.offsets)
+
+    def rows(self, key: tuple) -> Optional[np.ndarray]:
+        """Lignes du groupe de clé donnée (None si le groupe est vide)"""
+        if self._lookup is None:
+            self._lookup = {tuple(k): i for i, k in enumerate(self.keys.tolist())}
+        i = self._lookup.get(tuple(key))
+        if i is None:
+            return None
+        return self.order[self.offsets[i]:self.offsets[i + 1]]
+
+
+class VariableStore:
+    """
+    Registre colonnaire des variables x_{e,d,v}
+
+    Chaque ligne correspond à un couple (élève, discipline, vacation). Plusieurs lignes
+    peuvent pointer vers la même variable CP-SAT (binômes): les sommes sur les lignes
+    comptent alors cette variable autant de fois qu'elle y apparaît.
+    Les élèves et disciplines sont stockés par position (index dans config.eleves /
+    config.disciplines), les niveaux par leur valeur (4, 5, 6).
+
+    Usage:
+        store = VariableStore(n_students, n_disciplines, n_vacations)
+        store.add(var, s_pos, d_pos, v_idx, semaine, niveau, jour)
+        store.freeze()
+        for (d_pos, v_idx), rows in store.group_by('discipline', 'vacation'):
+            model.Add(sum(store.vars_of(rows)) <= cap)
+    """
+
+    COLUMNS = ('student', 'discipline', 'vacation', 'semaine', 'niveau', 'jour')
+
+    def __init__(self, n_students: int, n_disciplines: int, n_vacations: int):
+        self.shape = (n_students, n_disciplines, n_vacations)
+        self.vars: List = []
+        self._pending: Dict[str, List[int]] = {c: [] for c in self.COLUMNS + ('var_index',)}
+        self._columns: Dict[str, np.ndarray] = {}
+        self._groupings: Dict[Tuple[str, ...], Grouping] = {}
+        self.row_lookup: Optional[np.ndarray] = None
+
+    def __len__(self) -> int:
+        return len(self.vars)
+
+    def n_distinct_vars(self) -> int:
+        """Nombre de variables CP-SAT distinctes (les binômes partagent une variable sur deux lignes)"""
+        if self._columns:
+            return len(np.unique(self.var_index))
+        return len(set(self._pending['var_index']))
+
+    def add(self, var, student: int, discipline: int, vacation: int, semaine: int, niveau: int, jour: int) -> int:
+        """Enregistre une variable et retourne son numéro de ligne"""
+        if self._columns:
+            raise RuntimeError("VariableStore figé: ajout impossible après freeze()")
+        row = len(self.vars)
+        self.vars.append(var)
+        pending = self._pending
+        pending['student'].append(student)
+        pending['discipline'].append(discipline)
+        pending['vacation'].append(vacation)
+        pending['semaine'].append(semaine)
+        pending['niveau'].append(niveau)
+        pending['jour'].append(jour)
+        pending['var_index'].append(var.Index())
+        return row
+
+    @classmethod
+    def from_columns(cls, shape: Tuple[int, int, int], columns: Dict[str, np.ndarray], vars_: List) -> 'VariableStore':
+        """Reconstruit un registre figé à partir de colonnes exportées (cf. export_columns)"""
+        store = cls(*shape)
+        store.vars = list(vars_)
+        store._pending = {}
+        store._columns = {name: np.asarray(columns[name], dtype=np.int32) for name in cls.COLUMNS + ('var_index',)}
+        store._build_lookup()
+        return store
+
+    def export_columns(self) -> Dict[str, np.ndarray]:
+        """Colonnes du registre figé (sérialisables, ex: np.savez)"""
+        return dict(self._columns)
+
+    def freeze(self):
+        """Convertit les colonnes en tableaux NumPy et construit la table de lookup dense"""
+        for name, values in self._pending.items():
+            self._columns[name] = np.asarray(values, dtype=np.int32)
+        self._pending = {}
+        self._build_lookup()
+
+    def _build_lookup(self):
+        self.row_lookup = np.full(self.shape, -1, dtype=np.int32)
+        self.row_lookup[self.student, self.discipline, self.vacation] = np.arange(len(self.vars), dtype=np.int32)
+
+    # Accès colonnes
+
+    def column(self, name: str) -> np.ndarray:
+        return self._columns[name]
+
+    @property
+    def student(self) -> np.ndarray:
+        return self._columns['student']
+
+    @property
+    def discipline(self) -> np.ndarray:
+        return self._columns['discipline']
+
+    @property
+    def vacation(self) -> np.ndarray:
+        return self._columns['vacation']
+
+    @property
+    def semaine(self) -> np.ndarray:
+        return self._columns['semaine']
+
+    @property
+    def niveau(self) -> np.ndarray:
+        return self._columns['niveau']
+
+    @property
+    def jour(self) -> np.ndarray:
+        return self._columns['jour']
+
+    @property
+    def var_index(self) -> np.ndarray:
+        return self._columns['var_index']
+
+    # Vues
+
+    def vars_of(self, rows) -> List:
+        """Objets variables CP-SAT des lignes données"""
+        vars_ = self.vars
+        return [vars_[r] for r in rows.tolist()] if isinstance(rows, np.ndarray) else [vars_[r] for r in rows]
+
+    def row(self, student: int, discipline: int, vacation: int) -> int:
+        """Ligne de la variable (élève, discipline, vacation), -1 si inexistante"""
+        return int(self.row_lookup[student, discipline, vacation])
+
+    def group_by(self, *columns: str) -> Grouping:
+        """
+        Vue CSR groupée par les colonnes données (mise en cache)
+
+        Les groupes sont triés lexicographiquement par clé; à l'intérieur d'un
+        groupe, les lignes gardent leur ordre de création.
+        """
+        if columns in self._groupings:
+            return self._groupings[columns]
+
+        n = len(self.vars)
+        if n == 0:
+            grouping = Grouping(columns, np.empty((0, len(columns)), dtype=np.int32),
+                                np.empty(0, dtype=np.int64), np.zeros(1, dtype=np.int64))
+            self._groupings[columns] = grouping
+            return grouping
+
+        key_cols = [self._columns[c] for c in columns]
+        # np.lexsort trie par la dernière clé en premier: on inverse l'ordre
+        order = np.lexsort(key_cols[::-1])
+        sorted_keys = np.stack([col[order] for col in key_cols], axis=1)
+
+        boundaries = np.ones(n, dtype=bool)
+        boundaries[1:] = np.any(sorted_keys[1:] != sorted_keys[:-1], axis=1)
+        starts = np.flatnonzero(boundaries)
+
+        offsets = np.append(starts, n).astype(np.int64)
+        grouping = Grouping(columns, sorted_keys[starts], order, offsets)
+        self._groupings[columns] = grouping
+        return grouping
+
+    def memory_bytes(self) -> int:
+        """Mémoire occupée par les colonnes NumPy (hors objets CP-SAT)"""
+        total = sum(col.nbytes for col in self._columns.values())
+        if self.row_lookup is not None:
+            total += self.row_lookup.nbytes
+        return total
@@ -0,0 +1,301 @@
+"""
+WARM START - Démarrage à chaud depuis un planning existant
+
+Lit un planning CSV (export_planning ou sorties batch model_V5_*, même format:
+Semaine, Jour, Apres-Midi, Discipline, Id_Discipline, Id_Eleve, Id_Binome, Annee),
+le projette sur les variables x_{e,d,v} du modèle et ajoute des hints CP-SAT:
+
+1. Correspondance lignes -> variables: les affectations sans variable (élève ou
+   discipline inconnus, vacation devenue indisponible) sont signalées.
+2. Réparation locale: binôme incomplet, double affectation d'un élève sur une
+   vacation et dépassement de capacité sont retirés du hint.
+3. Complétion: résolution courte avec les x fixés à leur hint
+   (fix_variables_to_their_hinted_value). Si le planning est faisable, on
+   obtient la valeur de toutes les variables dérivées (sat/excess/success,
+   indicateurs, compteurs même jour...) et le score du planning.
+4. Réparation (optionnelle) si la complétion échoue: recherche de la solution
+   faisable la plus proche du hint (distance de Hamming), puis complétion.
+
+Le modèle reçoit ensuite un hint complet (toutes les variables) ou, à défaut,
+le hint des seules variables de décision.
+"""
+import collections
+import csv
+import logging
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+from ortools.sat.python import cp_model
+
+from loaders import DataLoadError
+
+logger = logging.getLogger(__name__)
+
+JOURS = {"lundi": 0, "mardi": 1, "mercredi": 2, "jeudi": 3, "vendredi": 4}
+MAX_SAMPLES = 10
+
+
+@dataclass
+class WarmStartReport:
+    """Bilan du démarrage à chaud (sérialisable via to_dict)"""
+    source: str
+    rows: int = 0
+    hinted_assignments: int = 0
+    unknown_ids: int = 0
+    unavailable: int = 0
+    conflicts: Dict[str, int] = field(default_factory=dict)
+    completion_status: str = "SKIPPED"
+    repaired: bool = False
+    repaired_changes: int = 0
+    hinted_variables: int = 0
+    hint_objective: Optional[float] = None
+    samples: List[str] = field(default_factory=list)
+    solution: Optional[np.ndarray] = field(default=None, repr=False)  # Affectation complète faisable
+
+    def note(self, message: str):
+        if len(self.samples) < MAX_SAMPLES:
+            self.samples.append(message)
+
+    def to_dict(self) -> dict:
+        return {
+            'source': self.source,
+            'rows': self.rows,
+            'hinted_assignments': self.hinted_assignments,
+            'unknown_ids': self.unknown_ids,
+            'unavailable': self.unavailable,
+            'conflicts': dict(self.conflicts),
+            'completion_status': self.completion_status,
+            'repaired': self.repaired,
+            'repaired_changes': self.repaired_changes,
+            'hinted_variables': self.hinted_variables,
+            'hint_objective': self.hint_objective,
+            'samples': list(self.samples),
+        }
+
+
+def read_planning_csv(path: Path) -> List[Tuple[int, int, int]]:
+    """
+    Lit un planning CSV et retourne les clés (id_eleve, id_discipline, v_idx)
+
+    v_idx = (semaine - 1) * 10 + jour * 2 + apres_midi, comme l'ordre des
+    vacations de ScheduleOptimizer.prepare_data().
+
+    Raises:
+        DataLoadError: Si le fichier est manquant ou ne contient pas les colonnes attendues
+    """
+    path = Path(path)
+    if not path.exists():
+        raise DataLoadError(f"Planning introuvable: {path}")
+
+    keys = []
+    with open(path, mode='r', encoding='utf-8-sig', newline='') as f:
+        reader = csv.DictReader(f)
+        required = {"Semaine", "Jour", "Apres-Midi", "Id_Discipline", "Id_Eleve"}
+        missing = required - set(reader.fieldnames or [])
+        if missing:
+            raise DataLoadError(f"Planning {path.name}: colonnes manquantes {sorted(missing)}")
+
+        for line, row in enumerate(reader, start=2):
+            try:
+                semaine = int(row["Semaine"])
+                jour = JOURS[row["Jour"].strip().lower()]
+                apres_midi = int(row["Apres-Midi"])
+                keys.append((
+                    int(row["Id_Eleve"]),
+                    int(row["Id_Discipline"]),
+                    (semaine - 1) * 10 + jour * 2 + apres_midi,
+                ))
+            except (KeyError, ValueError) as e:
+                raise DataLoadError(f"Planning {path.name}, ligne {line}: valeur invalide ({e})")
+    return keys
+
+
+def apply_warm_start(optimizer, path: Path, repair: bool = True, time_limit: float = 120.0) -> WarmStartReport:
+    """
+    Ajoute au modèle de l'optimizer les hints issus du planning CSV
+
+    Args:
+        optimizer: ScheduleOptimizer dont le modèle est construit
+        path: Planning CSV
+        repair: Cherche la solution faisable la plus proche si le planning ne l'est pas
+        time_limit: Temps maximum de chaque résolution auxiliaire (complétion, réparation)
+
+    Returns:
+        WarmStartReport: Bilan (affectations reprises, rejetées, statut de complétion)
+    """
+    return apply_hint_keys(optimizer, read_planning_csv(path), str(path), repair=repair, time_limit=time_limit)
+
+
+def apply_hint_keys(optimizer, keys: List[Tuple[int, int, int]], source: str,
+                    repair: bool = True, time_limit: float = 120.0) -> WarmStartReport:
+    """
+    Ajoute au modèle les hints d'une liste d'affectations (id_eleve, id_discipline, v_idx)
+
+    Utilisé pour les plannings CSV et les checkpoints (cf. checkpoint.py).
+    """
+    report = WarmStartReport(source=source)
+    report.rows = len(keys)
+
+    var_hints = _decision_hints(optimizer, keys, report)
+    report.hinted_assignments = sum(var_hints.values())
+
+    model = optimizer.model
+    workers = optimizer.config.solver_params.num_workers
+
+    status, values = _complete(model, var_hints, time_limit, workers)
+    report.completion_status = status
+
+    if values is None and repair:
+        logger.info("Hint infaisable: recherche du planning faisable le plus proche...")
+        repaired = _repair(model, var_hints, time_limit, workers)
+        if repaired is not None:
+            report.repaired_changes = sum(1 for idx, val in var_hints.items() if repaired[idx] != val)
+            var_hints = {idx: int(repaired[idx]) for idx in var_hints}
+            status, values = _complete(model, var_hints, time_limit, workers)
+            report.repaired = values is not None
+            report.completion_status = status
+
+    model.ClearHints()
+    if values is not None:
+        for idx, value in enumerate(values.tolist()):
+            model.AddHint(model.GetIntVarFromProtoIndex(idx), value)
+        report.hinted_variables = len(values)
+        report.hint_objective = objective_value(model, values)
+        report.solution = values
+    else:
+        for idx, value in var_hints.items():
+            model.AddHint(model.GetBoolVarFromProtoIndex(idx), value)
+        report.hinted_variables = len(var_hints)
+
+    _log_report(report)
+    return report
+
+
+def _decision_hints(optimizer, keys: List[Tuple[int, int, int]], report: WarmStartReport) -> Dict[int, int]:
+    """Valeur de hint (0/1) de chaque variable de décision, après réparation locale"""
+    store = optimizer.store
+    student_pos = {e_id: pos for pos, e_id in enumerate(optimizer.student_ids)}
+    discipline_pos = {d_id: pos for pos, d_id in enumerate(optimizer.discipline_ids)}
+    var_index = store.var_index
+
+    # 1. Correspondance planning -> lignes du registre
+    selected = collections.Counter()  # var_index -> nombre de lignes sélectionnées
+    for e_id, d_id, v_idx in keys:
+        s_pos = student_pos.get(e_id)
+        d_pos = discipline_pos.get(d_id)
+        if s_pos is None or d_pos is None or not 0 <= v_idx < store.shape[2]:
+            report.unknown_ids += 1
+            report.note(f"Inconnu: élève {e_id}, discipline {d_id}, vacation {v_idx}")
+            continue
+        row = store.row(s_pos, d_pos, v_idx)
+        if row < 0:
+            report.unavailable += 1
+            report.note(f"Indisponible: élève {e_id}, discipline {d_id}, vacation {v_idx}")
+            continue
+        selected[int(var_index[row])] += 1
+
+    # 2a. Binômes: une variable partagée n'est retenue que si les deux membres y sont
+    rows_per_var = collections.Counter(var_index.tolist())
+    conflicts = collections.Counter()
+    chosen = set()
+    for idx, n in selected.items():
+        if n < rows_per_var[idx]:
+            conflicts['binome'] += 1
+        else:
+            chosen.add(idx)
+
+    rows_of_var = collections.defaultdict(list)
+    for row in np.flatnonzero(np.isin(var_index, list(chosen))).tolist():
+        rows_of_var[int(var_index[row])].append(row)
+
+    # 2b. Unicité: un élève au plus une fois par vacation (on garde la première)
+    busy = set()
+    for idx in sorted(chosen):
+        slots = [(int(store.student[r]), int(store.vacation[r])) for r in rows_of_var[idx]]
+        if any(slot in busy for slot in slots):
+            chosen.discard(idx)
+            conflicts['unicite'] += 1
+        else:
+            busy.update(slots)
+
+    # 2c. Capacité par (discipline, vacation), une variable partagée compte double
+    load = collections.Counter()
+    disciplines = optimizer.config.disciplines
+    for idx in sorted(chosen):
+        rows = rows_of_var[idx]
+        d_pos, v_idx = int(store.discipline[rows[0]]), int(store.vacation[rows[0]])
+        disc = disciplines[d_pos]
+        slot = v_idx % 10
+        cap = disc.nb_eleve[slot] if len(disc.nb_eleve) > slot else 0
+        if cap > 0 and load[(d_pos, v_idx)] + len(rows) > cap:
+            chosen.discard(idx)
+            conflicts['capacite'] += 1
+        else:
+            load[(d_pos, v_idx)] += len(rows)
+
+    report.conflicts = dict(conflicts)
+    return {idx: int(idx in chosen) for idx in np.unique(var_index).tolist()}
+
+
+def _complete(model: cp_model.CpModel, var_hints: Dict[int, int], time_limit: float, workers: int):
+    """Résout avec les variables de décision fixées: (statut, valeurs de toutes les variables ou None)"""
+    model.ClearHints()
+    for idx, value in var_hints.items():
+        model.AddHint(model.GetBoolVarFromProtoIndex(idx), value)
+
+    solver = cp_model.CpSolver()
+    solver.parameters.max_time_in_seconds = time_limit
+    solver.parameters.num_workers = workers
+    solver.parameters.fix_variables_to_their_hinted_value = True
+    status = solver.Solve(model)
+
+    name = solver.StatusName(status)
+    if status in (cp_model.OPTIMAL, cp_model.FEASIBLE):
+        return name, np.asarray(solver.ResponseProto().solution, dtype=np.int64)
+    return name, None
+
+
+def _repair(model: cp_model.CpModel, var_hints: Dict[int, int], time_limit: float, workers: int) -> Optional[np.ndarray]:
+    """Solution faisable la plus proche du hint (distance de Hamming sur les variables de décision)"""
+    clone = model.Clone()
+    clone.ClearHints()
+    agreement = []
+    for idx, value in var_hints.items():
+        var = clone.GetBoolVarFromProtoIndex(idx)
+        clone.AddHint(var, value)
+        agreement.append(var if value else var.Not())
+    clone.Maximize(cp_model.LinearExpr.sum(agreement))
+
+    solver = cp_model.CpSolver()
+    solver.parameters.max_time_in_seconds = time_limit
+    solver.parameters.num_workers = workers
+    status = solver.Solve(clone)
+    if status in (cp_model.OPTIMAL, cp_model.FEASIBLE):
+        return np.asarray(solver.ResponseProto().solution, dtype=np.int64)
+    return None
+
+
+def objective_value(model: cp_model.CpModel, values: np.ndarray) -> float:
+    """Valeur de l'objectif du modèle pour une affectation complète"""
+    objective = model.Proto().objective
+    raw = sum(coeff * int(values[var]) for var, coeff in zip(objective.vars, objective.coeffs)) + objective.offset
+    # CP-SAT stocke un objectif à maximiser sous forme négée (scaling_factor = -1)
+    return float(raw * (objective.scaling_factor or 1))
+
+
+def _log_report(report: WarmStartReport):
+    logger.info(f"✓ Démarrage à chaud depuis {report.source}")
+    logger.info(f"  Affectations lues: {report.rows}, reprises: {report.hinted_assignments}")
+    if report.unknown_ids or report.unavailable or report.conflicts:
+        logger.warning(
+            f"  Hints rejetés: {report.unknown_ids} inconnus, {report.unavailable} indisponibles, "
+            f"conflits {report.conflicts}"
+        )
+        for sample in report.samples:
+            logger.warning(f"    - {sample}")
+    logger.info(f"  Complétion: {report.completion_status}"
+                + (f" (réparé, {report.repaired_changes} changements)" if report.repaired else ""))
+    if report.hint_objective is not None:
+        logger.info(f"  Score du planning repris: {report.hint_objective:,.0f}")
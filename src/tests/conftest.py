@@ -0,0 +1,152 @@
+import os
+import sys
+
+import pytest
+
+# Modules du solveur (src/OR-TOOLS) et paquets partagés (src/classes...)
+SRC_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, os.path.join(SRC_DIR, 'OR-TOOLS'))
+sys.path.insert(0, SRC_DIR)
+
+
+# Petite instance CSV (même format que data/): 3 disciplines, 7 élèves dont 2 binômes,
+# semaines ouvertes 50-52 et 1-2 (à cheval sur la fin de l'année civile)
+
+OPEN_WEEKS = (50, 51, 52, 1, 2)
+
+SMALL_DATASET = {
+    "disciplines.csv": [
+        "id_discipline,nom_discipline,nb_eleve,en_binome,quota,presence,annee,frequence_vacations,"
+        "nb_vacations_par_semaine,repartition_semestrielle,paire_jours,mixite_groupes,repartition_continuite,"
+        "priorite_niveau,remplacement_niveau,take_jour_pref,be_filled,meme_jour_semaine",
+        '1,Polyclinique,"{1: 2, 2: 2, 3: 2, 4: 2, 5: 2, 6: 2, 7: 2, 8: 2, 9: 2, 10: 2}",True,'
+        '"{\'DFAS01\': 4, \'DFAS02\': 4, \'DFTCC\': 4}",'
+        '"{1: True, 2: True, 3: True, 4: True, 5: True, 6: True, 7: True, 8: True, 9: True, 10: True}",'
+        '"[\'DFAS01\', \'DFAS02\', \'DFTCC\']",0,2,"{1: 0, 2: 0}","[(0, 1), (2, 3)]",0,"(0, 0)",'
+        '"[\'DFTCC\', \'DFAS02\']","{}",True,False,False',
+        '2,Parodontologie,"{1: 1, 2: 1, 3: 0, 4: 0, 5: 1, 6: 1, 7: 0, 8: 0, 9: 1, 10: 1}",False,'
+        '"{\'DFAS01\': 2, \'DFAS02\': 2, \'DFTCC\': 2}",'
+        '"{1: True, 2: True, 3: False, 4: False, 5: True, 6: True, 7: False, 8: False, 9: True, 10: True}",'
+        '"[\'DFAS01\', \'DFAS02\', \'DFTCC\']",2,0,"{1: 0, 2: 0}",[],0,"(0, 0)",'
+        '"[\'DFAS01\', \'DFAS02\', \'DFTCC\']","{}",False,False,False',
+        '3,Comodulation,"{1: 2, 2: 2, 3: 2, 4: 2, 5: 0, 6: 0, 7: 2, 8: 2, 9: 0, 10: 0}",False,'
+        '"{\'DFAS01\': 0, \'DFAS02\': 3, \'DFTCC\': 3}",'
+        '"{1: True, 2: True, 3: True, 4: True, 5: False, 6: False, 7: True, 8: True, 9: False, 10: False}",'
+        '"[\'DFAS02\', \'DFTCC\']",0,0,"{1: 0, 2: 0}",[],0,"(2, 3)",'
+        '"[\'DFAS02\', \'DFTCC\']","{}",True,False,False',
+    ],
+    "eleves_with_code.csv": [
+        "id_eleve,id_binome,jour_preference,jour_similaire,annee,periode_stage,periode_stage_ext",
+        "101,102,lundi,0,DFAS01,0,0",
+        "102,101,lundi,0,DFAS01,0,0",
+        "103,0,mardi,0,DFAS01,0,0",
+        "201,202,mercredi,0,DFAS02,0,0",
+        "202,201,mercredi,0,DFAS02,0,0",
+        "301,0,jeudi,0,DFTCC,1,0",
+        "302,0,vendredi,0,DFTCC,2,0",
+    ],
+    "stages.csv": [
+        "id_stage,nom_stage,deb_semaine,fin_semaine,pour_niveau,periode",
+        "1,Stage Actif,51,51,DFTCC,1",
+        "2,Stage Actif,1,1,DFTCC,2",
+    ],
+    "periodes.csv": [
+        "id_periode,deb_semaine,fin_semaine,periode",
+        "1,50,51,0",
+        "2,52,2,1",
+    ],
+}
+
+
+def _calendar_rows():
+    """Toutes les semaines listées, fermées hors OPEN_WEEKS (lundi matin de la semaine 52 férié)"""
+    rows = ["Semaine,1,2,3,4,5,6,7,8,9,10"]
+    for week in range(1, 53):
+        if week not in OPEN_WEEKS:
+            slots = [""] * 10
+        elif week == 52:
+            slots = ["F"] + ["C"] * 9
+        else:
+            slots = ["C"] * 10
+        rows.append(f"S{week}," + ",".join(slots))
+    return rows
+
+
+def write_small_dataset(data_dir):
+    """Écrit la petite instance dans data_dir (créé si besoin)"""
+    data_dir.mkdir(parents=True, exist_ok=True)
+    files = dict(SMALL_DATASET)
+    for name in ("DFAS01", "DFAS02", "DFTCC"):
+        files[f"calendrier_{name}.csv"] = _calendar_rows()
+    for name, rows in files.items():
+        (data_dir / name).write_text("\n".join(rows) + "\n", encoding="utf-8")
+    return data_dir
+
+
+# Paramètres des tests: résolution courte, sans cache, profil ni checkpoint
+# (8 workers: le portfolio CP-SAT prouve l'optimum en moins d'une seconde, un seul worker non)
+SMALL_PARAMS = dict(
+    max_time_seconds=30,
+    num_workers=8,
+    log_progress=False,
+    profiling=False,
+    model_cache=False,
+    checkpoint_interval_seconds=0,
+)
+
+
+@pytest.fixture
+def small_data_dir(tmp_path):
+    """Petite instance CSV (résultats dans tmp_path/resultat)"""
+    return write_small_dataset(tmp_path / "data")
+
+
+@pytest.fixture
+def small_optimizer(small_data_dir):
+    """Fabrique d'optimizers construits sur la petite instance (paramètres surchargeables)"""
+    from config_manager import ModelConfig
+    from optimizer import ScheduleOptimizer
+
+    def make(**params):
+        config = ModelConfig.from_csv_directory(small_data_dir, **{**SMALL_PARAMS, **params})
+        optimizer = ScheduleOptimizer(config)
+        optimizer.prepare_and_build()
+        return optimizer
+
+    return make
+
+
+def solve_fixed(optimizer, keys, time_limit: float = 10.0):
+    """
+    Résout une copie du modèle complet où chaque affectation est fixée (1 si dans keys, 0 sinon)
+
+    Returns:
+        (statut CP-SAT, objectif ou None): un planning faisable donne OPTIMAL et son score
+    """
+    from ortools.sat.python import cp_model
+
+    keys = set(keys)
+    store = optimizer.store
+    model = optimizer.model.Clone()
+    proto = model.Proto()
+    for s_pos, d_pos, v_idx, var_idx in zip(
+        store.student.tolist(), store.discipline.tolist(), store.vacation.tolist(), store.var_index.tolist()
+    ):
+        value = int((optimizer.student_ids[s_pos], optimizer.discipline_ids[d_pos], v_idx) in keys)
+        domain = proto.variables[var_idx].domain
+        domain[0] = value
+        domain[1] = value
+    model.ClearHints()
+    solver = cp_model.CpSolver()
+    solver.parameters.max_time_in_seconds = time_limit
+    solver.parameters.num_workers = optimizer.config.solver_params.num_workers
+    status = solver.Solve(model)
+    found = status in (cp_model.OPTIMAL, cp_model.FEASIBLE)
+    # Objectif entier: ObjectiveValue() peut différer de l'entier d'un arrondi flottant
+    return status, float(round(solver.ObjectiveValue())) if found else None
+
+
+@pytest.fixture
+def fixed_solve():
+    """Statut et objectif CP-SAT d'un planning fixé (cf. solve_fixed)"""
+    return solve_fixed
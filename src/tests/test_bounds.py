@@ -0,0 +1,65 @@
+"""
+Borne supérieure par relaxation linéaire (bounds) et écart d'optimalité
+
+ - sur la petite instance: la borne GLOP majore l'optimum CP-SAT et reste sous
+   le score max théorique
+ - écart (borne - score) / borne de OptimizationResult, et bornes reportées dans
+   les statistiques d'une résolution avec lp_bound
+"""
+import pytest
+
+from bounds import lp_upper_bound
+from optimizer import OptimizationResult
+
+
+def test_lp_bound_is_above_cpsat_optimum(small_optimizer):
+    optimizer = small_optimizer()
+    report = lp_upper_bound(optimizer, time_limit=30)
+    assert report.status == 'OPTIMAL'
+    assert report.variables > 0 and report.constraints > 0
+
+    result = optimizer.solve()
+    assert result.status == 'OPTIMAL'
+    assert result.objective_value <= report.bound + 1e-6
+    assert report.bound < optimizer.max_theoretical_score
+
+
+@pytest.mark.parametrize("params", [{"pair_days_formulation": "motifs"}, {"symmetry_breaking": True}])
+def test_lp_bound_does_not_depend_on_formulation(small_optimizer, params):
+    """Relaxation construite depuis le registre des variables: même borne quelle que soit la formulation"""
+    default = lp_upper_bound(small_optimizer(), time_limit=30).bound
+    assert lp_upper_bound(small_optimizer(**params), time_limit=30).bound == pytest.approx(default)
+
+
+@pytest.mark.parametrize("objective, bound, gap", [
+    (90.0, 100.0, 0.1),
+    (100.0, 100.0, 0.0),
+    (105.0, 100.0, 0.0),  # Borne dépassée (arrondis): écart nul
+    (90.0, None, None),
+    (None, 100.0, None),
+    (90.0, 0.0, None),
+])
+def test_result_gap(objective, bound, gap):
+    result = OptimizationResult(status='FEASIBLE', objective_value=objective, upper_bound=bound)
+    assert result.gap == (pytest.approx(gap) if gap is not None else None)
+
+
+def test_solve_reports_lp_bound_and_gap(small_optimizer):
+    optimizer = small_optimizer(lp_bound=True)
+    result = optimizer.solve()
+    bounds = result.statistics['bounds']
+
+    assert optimizer.bound_report.status == 'OPTIMAL'
+    assert bounds['lp'] == optimizer.bound_report.bound
+    assert bounds['lp_report']['bound'] == bounds['lp']
+    assert result.status == 'OPTIMAL'
+    # Optimum prouvé: la borne CP-SAT égale le score, meilleure que la borne LP
+    assert bounds['cpsat'] == result.objective_value <= bounds['lp']
+    assert result.upper_bound == bounds['best'] == min(bounds['lp'], bounds['cpsat'])
+    assert result.gap == bounds['gap'] == 0.0
+    assert bounds['theoretical'] == result.max_theoretical_score
+
+    # Écart à la seule borne LP
+    lp_only = OptimizationResult(status='FEASIBLE', objective_value=result.objective_value, upper_bound=bounds['lp'])
+    assert lp_only.gap == pytest.approx((bounds['lp'] - result.objective_value) / bounds['lp'])
+    assert 0 <= lp_only.gap < 1
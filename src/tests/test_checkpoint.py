@@ -0,0 +1,130 @@
+"""
+Checkpoints de la solution courante (checkpoint) et reprise (--resume)
+
+ - écriture atomique et relecture: affectations et métadonnées identiques
+ - fichier absent, corrompu ou incomplet: rejeté (None)
+ - Checkpointer sur une solution CP-SAT puis resume_from_checkpoint: le hint
+   reproduit la solution et le temps consommé est reporté
+"""
+import io
+import json
+
+import numpy as np
+import pytest
+
+import checkpoint as checkpoint_module
+from checkpoint import Checkpoint, Checkpointer, load_checkpoint, write_checkpoint
+from warm_start import apply_hint_keys
+
+
+def _checkpoint(**overrides):
+    values = dict(
+        assignments=np.array([[101, 1, 490], [102, 1, 490], [301, 3, 2]], dtype=np.int32),
+        objective=12345.0,
+        elapsed=42.5,
+        best_bound=13000.0,
+        solution_count=7,
+        model_key="abc123",
+        created="2026-01-02 03:04:05",
+    )
+    values.update(overrides)
+    return Checkpoint(**values)
+
+
+def test_write_and_load_round_trip(tmp_path):
+    path = tmp_path / "checkpoints" / "incumbent.npz"
+    write_checkpoint(path, _checkpoint())
+    loaded = load_checkpoint(path)
+
+    assert loaded is not None
+    np.testing.assert_array_equal(loaded.assignments, _checkpoint().assignments)
+    assert loaded.keys() == [(101, 1, 490), (102, 1, 490), (301, 3, 2)]
+    assert (loaded.objective, loaded.elapsed, loaded.best_bound) == (12345.0, 42.5, 13000.0)
+    assert (loaded.solution_count, loaded.model_key, loaded.created) == (7, "abc123", "2026-01-02 03:04:05")
+    # Aucun fichier temporaire laissé après le renommage
+    assert [p.name for p in path.parent.iterdir()] == ["incumbent.npz"]
+
+
+def test_empty_checkpoint_and_default_date(tmp_path):
+    path = tmp_path / "incumbent.npz"
+    write_checkpoint(path, _checkpoint(assignments=np.zeros((0, 3)), best_bound=None, created=""))
+    loaded = load_checkpoint(path)
+    assert loaded.keys() == [] and loaded.best_bound is None
+    assert loaded.created  # Date d'écriture
+
+
+def test_failed_write_keeps_previous_checkpoint(tmp_path, monkeypatch):
+    path = tmp_path / "incumbent.npz"
+    write_checkpoint(path, _checkpoint())
+
+    def interrupted(src, dst):
+        raise OSError("disque plein")
+
+    monkeypatch.setattr(checkpoint_module.os, "replace", interrupted)
+    with pytest.raises(OSError):
+        write_checkpoint(path, _checkpoint(objective=99999.0))
+    assert load_checkpoint(path).objective == 12345.0
+
+
+def test_missing_checkpoint(tmp_path):
+    assert load_checkpoint(tmp_path / "absent.npz") is None
+
+
+def _write_npz(path, **arrays):
+    buffer = io.BytesIO()
+    np.savez_compressed(buffer, **arrays)
+    path.write_bytes(buffer.getvalue())
+
+
+@pytest.mark.parametrize("corruption", ["bytes", "truncated", "no_metadata", "no_objective", "shape"])
+def test_corrupt_checkpoint_is_rejected(tmp_path, corruption):
+    path = tmp_path / "incumbent.npz"
+    write_checkpoint(path, _checkpoint())
+    if corruption == "bytes":
+        path.write_bytes(b"pas un fichier npz")
+    elif corruption == "truncated":
+        path.write_bytes(path.read_bytes()[:40])
+    elif corruption == "no_metadata":
+        _write_npz(path, assignments=np.zeros((1, 3), dtype=np.int32))
+    elif corruption == "no_objective":
+        _write_npz(path, assignments=np.zeros((1, 3), dtype=np.int32), metadata=np.array(json.dumps({'elapsed': 1.0})))
+    else:
+        _write_npz(path, assignments=np.zeros((4,), dtype=np.int32),
+                   metadata=np.array(json.dumps({'objective': 1.0, 'elapsed': 1.0})))
+    assert load_checkpoint(path) is None
+
+
+def test_checkpointer_and_resume(small_optimizer, tmp_path):
+    """Solution optimale sauvegardée par le Checkpointer, reprise sur un modèle reconstruit"""
+    optimizer = small_optimizer()
+    result = optimizer.solve()
+    assert result.status == 'OPTIMAL'
+    path = tmp_path / "incumbent.npz"
+    checkpointer = Checkpointer(path, interval=60, optimizer=optimizer, elapsed_offset=100.0, model_key="cle")
+    assert checkpointer.due()
+
+    # Valeurs de toutes les variables du modèle pour ce planning
+    values = apply_hint_keys(optimizer, list(result.assignments), "solution", repair=False, time_limit=10).solution
+    checkpointer.save(values, result.objective_value, None, wall_time=20.0, solution_count=3)
+    assert not checkpointer.due()
+
+    saved = load_checkpoint(path)
+    assert set(saved.keys()) == set(result.assignments)
+    assert (saved.objective, saved.elapsed, saved.solution_count, saved.model_key) == (
+        result.objective_value, 120.0, 3, "cle"
+    )
+
+    resumed = small_optimizer()
+    report = resumed.resume_from_checkpoint(path)
+    assert report.hint_objective == result.objective_value
+    assert resumed.elapsed_offset == 120.0
+    assert resumed.resume_from_checkpoint(tmp_path / "absent.npz") is None
+
+
+def test_solve_writes_final_checkpoint(small_optimizer):
+    optimizer = small_optimizer(checkpoint_interval_seconds=3600)
+    result = optimizer.solve()
+    saved = load_checkpoint(optimizer._checkpoint_path())
+    assert saved is not None
+    assert set(saved.keys()) == set(result.assignments)
+    assert saved.objective == result.objective_value
@@ -0,0 +1,61 @@
+"""
+Formulation des paires de jours par motifs (pair_days_formulation="motifs")
+
+Sur la petite instance (Polyclinique: paires lundi/mardi et mercredi/jeudi, au
+plus 2 vacations par semaine), la formulation par motifs doit être équivalente
+à la formulation par indicateurs de jour: même objectif pour un planning fixé,
+même optimum, et solution optimale faisable sur le modèle par indicateurs.
+"""
+import pytest
+from ortools.sat.python import cp_model
+
+
+# Paires lundi + mardi en binôme (semaine 50) et seul (semaine 51), hors paires (Comodulation, Parodontologie)
+PAIR_KEYS = [
+    (101, 1, 490), (102, 1, 490), (101, 1, 492), (102, 1, 492),
+    (103, 1, 501), (103, 1, 503),
+    (301, 3, 2), (301, 2, 10),
+]
+
+
+def _names(optimizer, prefix):
+    return [v.name for v in optimizer.model.Proto().variables if v.name.startswith(prefix)]
+
+
+def _at_most_one(optimizer):
+    return sum(c.has_at_most_one() for c in optimizer.model.Proto().constraints)
+
+
+@pytest.fixture
+def formulations(small_optimizer):
+    return small_optimizer(), small_optimizer(pair_days_formulation="motifs")
+
+
+def test_one_pattern_per_pair_bonus(formulations):
+    default, patterns = formulations
+    pairs = _names(default, "pair_")
+    assert pairs and not _names(default, "motif_")
+    assert sorted(name.replace("motif_", "pair_") for name in _names(patterns, "motif_")) == sorted(pairs)
+    assert not _names(patterns, "pair_")
+    # Motifs liés directement aux affectations (sans indicateurs de jour), au plus un par semaine
+    assert len(patterns.indicators) < len(default.indicators)
+    assert _at_most_one(patterns) > _at_most_one(default)
+    assert patterns.max_theoretical_score == default.max_theoretical_score
+
+
+def test_same_objective_for_fixed_plan(formulations, fixed_solve):
+    default, patterns = formulations
+    expected = fixed_solve(default, PAIR_KEYS)
+    assert expected[0] == cp_model.OPTIMAL
+    assert fixed_solve(patterns, PAIR_KEYS) == expected
+
+
+def test_same_optimum(formulations, fixed_solve):
+    default, patterns = formulations
+    expected = default.solve()
+    result = patterns.solve()
+    assert expected.status == result.status == 'OPTIMAL'
+    assert result.objective_value == expected.objective_value
+
+    status, objective = fixed_solve(default, result.assignments)
+    assert status == cp_model.OPTIMAL and objective == expected.objective_value
@@ -0,0 +1,162 @@
+"""
+LinearEmitter / ObjectiveAccumulator: même modèle que model.Add / model.Maximize
+
+Un petit planning (élèves x vacations, binômes partageant leur variable) est
+construit deux fois: avec l'API cp_model, et par écriture directe du proto avec
+un objectif consolidé et réduit par son PGCD. Les contraintes écrites doivent
+être identiques et les deux modèles doivent avoir le même optimum, exprimé dans
+l'unité des poids d'origine.
+"""
+import random
+
+import pytest
+from ortools.sat.python import cp_model
+
+from emission import LinearEmitter, ObjectiveAccumulator, canonical_terms
+from warm_start import objective_value
+
+N_STUDENTS = 6
+N_VACATIONS = 8
+CAPACITY = 3
+QUOTA = 3
+BINOMES = [(0, 1), (2, 3)]  # Élèves partageant une variable
+
+W_FILL = 600
+W_EXCESS = -900
+W_SUCCESS = 3000
+W_PREFERENCE = 50
+
+
+def _instance(seed: int):
+    """Variables par (élève, vacation): indice de variable, un même indice pour les deux membres d'un binôme"""
+    rng = random.Random(seed)
+    owner = list(range(N_STUDENTS))
+    for a, b in BINOMES:
+        owner[b] = a
+    preferences = {(s, v) for s in range(N_STUDENTS) for v in range(N_VACATIONS) if rng.random() < 0.3}
+    forbidden = {(s, v) for s in range(N_STUDENTS) for v in range(N_VACATIONS) if rng.random() < 0.1}
+    return owner, preferences, forbidden
+
+
+def _build(seed: int, emitted: bool):
+    """Modèle construit avec l'API cp_model (emitted=False) ou LinearEmitter + ObjectiveAccumulator"""
+    owner, preferences, forbidden = _instance(seed)
+    model = cp_model.CpModel()
+    x = {}
+    for s in range(N_STUDENTS):
+        for v in range(N_VACATIONS):
+            key = (owner[s], v)
+            if key not in x:
+                x[key] = model.NewBoolVar(f"x_e{owner[s]}_v{v}")
+    rows = [(s, v, x[owner[s], v]) for s in range(N_STUDENTS) for v in range(N_VACATIONS)]
+
+    sat = [model.NewIntVar(0, QUOTA, f"sat_e{s}") for s in range(N_STUDENTS)]
+    excess = [model.NewIntVar(0, N_VACATIONS, f"excess_e{s}") for s in range(N_STUDENTS)]
+    success = [model.NewBoolVar(f"success_e{s}") for s in range(N_STUDENTS)]
+
+    emit = LinearEmitter(model)
+    objective = ObjectiveAccumulator()
+    terms = []  # (variable, poids) pour l'API cp_model
+
+    # Capacité par vacation (une variable de binôme compte deux fois)
+    for v in range(N_VACATIONS):
+        vars_ = [var for _, rv, var in rows if rv == v]
+        if emitted:
+            emit.linear([var.Index() for var in vars_], ub=CAPACITY)
+        else:
+            model.Add(sum(vars_) <= CAPACITY)
+
+    for s in range(N_STUDENTS):
+        vars_ = [var for rs, _, var in rows if rs == s]
+        indices = [var.Index() for var in vars_]
+        if emitted:
+            # Quota: sum = sat + excess, succès seulement si sat = quota
+            emit.linear(indices + [sat[s].Index(), excess[s].Index()], lb=0, ub=0,
+                        coeffs=[1] * len(indices) + [-1, -1])
+            index = emit.linear([sat[s].Index()], lb=QUOTA, ub=QUOTA)
+            emit.only_enforce_if(index, [success[s].Index()])
+            # Au moins une vacation parmi les deux premières, au plus une parmi les deux dernières
+            emit.bool_or(indices[:2])
+            emit.at_most_one(indices[-2:])
+            objective.add([sat[s].Index(), excess[s].Index(), success[s].Index()], [W_FILL, W_EXCESS, W_SUCCESS])
+        else:
+            model.Add(sum(vars_) == sat[s] + excess[s])
+            model.Add(sat[s] == QUOTA).OnlyEnforceIf(success[s])
+            model.AddBoolOr(vars_[:2])
+            model.AddAtMostOne(vars_[-2:])
+            terms += [(sat[s], W_FILL), (excess[s], W_EXCESS), (success[s], W_SUCCESS)]
+
+    # Vacations interdites: un succès les exclut
+    for s, v in sorted(forbidden):
+        var = x[owner[s], v]
+        if emitted:
+            emit.bool_and([var.Not().Index()], enforcement=[success[s].Index()])
+        else:
+            model.AddBoolAnd([var.Not()]).OnlyEnforceIf(success[s])
+
+    # Préférences: une variable de binôme reçoit le bonus de chaque membre (termes en double)
+    for s, v in sorted(preferences):
+        var = x[owner[s], v]
+        if emitted:
+            objective.add([var.Index()], W_PREFERENCE)
+        else:
+            terms.append((var, W_PREFERENCE))
+
+    if emitted:
+        emit.maximize(*objective.consolidate())
+    else:
+        model.Maximize(sum(weight * var for var, weight in terms))
+    return model, objective
+
+
+def _solve(model: cp_model.CpModel):
+    solver = cp_model.CpSolver()
+    solver.parameters.num_workers = 1
+    solver.parameters.max_time_in_seconds = 60.0
+    status = solver.Solve(model)
+    assert status == cp_model.OPTIMAL
+    return solver
+
+
+def test_canonical_terms_merges_duplicates_and_drops_zeros():
+    assert canonical_terms([5, 2, 5, 7]) == ([2, 5, 7], [1, 2, 1])
+    assert canonical_terms([3, 1, 2]) == ([1, 2, 3], [1, 1, 1])
+    assert canonical_terms([4, 1, 4, 9], [2, 3, -2, 6]) == ([1, 9], [3, 6])
+
+
+def test_consolidate_reduces_by_gcd():
+    objective = ObjectiveAccumulator()
+    objective.add([3, 1], [600, -900])
+    objective.add([1, 2], 300)
+    objective.add([4], 0)
+    vars_, coeffs, scale = objective.consolidate()
+    assert (vars_, coeffs, scale) == ([1, 2, 3], [-2, 1, 2], 300)
+    assert objective.report == {'terms': 5, 'distinct_vars': 3, 'scale': 300}
+    assert len(objective) == 5
+
+
+@pytest.mark.parametrize("seed", [0, 1, 2])
+def test_emitted_constraints_match_cp_model(seed):
+    reference, _ = _build(seed, emitted=False)
+    emitted, _ = _build(seed, emitted=True)
+    assert [str(v) for v in emitted.Proto().variables] == [str(v) for v in reference.Proto().variables]
+    assert [str(c) for c in emitted.Proto().constraints] == [str(c) for c in reference.Proto().constraints]
+
+
+@pytest.mark.parametrize("seed", [0, 1, 2])
+def test_emitted_model_has_same_optimum(seed):
+    reference, _ = _build(seed, emitted=False)
+    emitted, objective = _build(seed, emitted=True)
+    assert objective.report['scale'] == 50  # PGCD de 600, -900, 3000, 50 et de leurs cumuls
+
+    expected = _solve(reference)
+    solver = _solve(emitted)
+    assert solver.ObjectiveValue() == expected.ObjectiveValue()
+    assert solver.BestObjectiveBound() == expected.BestObjectiveBound()
+
+    # Objectif non réduit: somme des termes tels qu'ajoutés, recalculée sur la solution
+    values = solver.ResponseProto().solution
+    raw_vars, raw_coeffs = objective.raw_terms()
+    raw = sum(int(c) * values[int(v)] for v, c in zip(raw_vars, raw_coeffs))
+    assert raw == solver.ObjectiveValue()
+    assert objective_value(emitted, values) == raw
@@ -0,0 +1,92 @@
+"""
+Flux d'événements de progression (EventBus, JsonlSink, LogSink)
+
+ - diffusion aux abonnés, files et itération, abonné défaillant isolé
+ - sur la petite instance: fichier JSONL d'une résolution (phases, solutions
+   améliorantes, événement final cohérent avec le résultat)
+"""
+import json
+import logging
+import queue
+
+from events import (BOUND, FINISHED, INCUMBENT, PHASE_FINISHED, PHASE_STARTED, PROGRESS, EventBus, JsonlSink,
+                    LogSink, ProgressEvent, iter_events)
+
+
+def test_to_dict_drops_empty_fields():
+    event = ProgressEvent(INCUMBENT, objective=10.0, gap=0.0)
+    assert set(event.to_dict()) == {'kind', 'objective', 'gap', 'timestamp'}
+
+
+def test_bus_subscribers_and_queue():
+    bus = EventBus()
+    received = []
+
+    def failing(event):
+        raise RuntimeError("abonné en panne")
+
+    bus.subscribe(failing)
+    callback = bus.subscribe(received.append)
+    events = bus.subscribe_queue(maxsize=1)
+
+    first = bus.emit(PROGRESS, message="a", percent=10)
+    bus.emit(PROGRESS, message="b", percent=20)  # File pleine: perdu pour elle seule
+    bus.unsubscribe(callback)
+    bus.emit(BOUND, bound=5.0)
+
+    assert [e.message for e in received] == ["a", "b"]
+    assert events.get_nowait() is first
+    assert events.empty()
+
+
+def test_iter_events_drains_queue_then_stops():
+    events = queue.Queue()
+    for percent in (10, 20):
+        events.put(ProgressEvent(PROGRESS, percent=percent))
+    assert [e.percent for e in iter_events(events, until=lambda: True, timeout=0.01)] == [10, 20]
+
+
+def test_jsonl_sink(tmp_path):
+    path = tmp_path / "events" / "run.jsonl"
+    sink = JsonlSink(path)
+    sink(ProgressEvent(PHASE_STARTED, phase='build'))
+    sink(ProgressEvent(INCUMBENT, objective=12.5, data={'solution': 1}))
+    sink.close()
+    lines = [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines()]
+    assert [line['kind'] for line in lines] == [PHASE_STARTED, INCUMBENT]
+    assert lines[1]['objective'] == 12.5 and lines[1]['data'] == {'solution': 1}
+
+
+def test_log_sink(caplog):
+    sink = LogSink(logging.getLogger("test_events"))
+    with caplog.at_level(logging.INFO, logger="test_events"):
+        sink(ProgressEvent(INCUMBENT, objective=1234.0, elapsed=3.0, gap=0.1, data={'solution': 2}))
+        sink(ProgressEvent(PHASE_FINISHED, phase='build'))
+        sink(ProgressEvent(BOUND, bound=1.0))  # Non journalisé
+    assert [r.getMessage() for r in caplog.records] == [
+        "Solution 2: 1,234 à 3s, écart 10.00%",
+        "Fin de phase: build",
+    ]
+
+
+def test_solve_writes_event_stream(small_optimizer, tmp_path):
+    path = tmp_path / "events.jsonl"
+    optimizer = small_optimizer(events_path=str(path))
+    events = optimizer.events.subscribe_queue()
+    result = optimizer.solve()
+
+    lines = [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines()]
+    assert [e.to_dict() for e in iter_events(events, until=lambda: True, timeout=0.01)] == lines
+    assert lines[0]['kind'] == PHASE_STARTED and lines[0]['phase'] == 'solve'
+    assert {'phase': 'search'}.items() <= [e for e in lines if e['kind'] == PHASE_STARTED][-1].items()
+
+    incumbents = [e['objective'] for e in lines if e['kind'] == INCUMBENT]
+    assert incumbents and incumbents == sorted(incumbents)
+    finished = lines[-1]
+    assert finished['kind'] == FINISHED
+    assert finished['data']['status'] == result.status == 'OPTIMAL'
+    assert finished['objective'] == result.objective_value == incumbents[-1]
+
+    # Le fichier est fermé et l'abonné retiré après la résolution
+    optimizer.events.emit(PROGRESS, message="après")
+    assert len(path.read_text(encoding="utf-8").splitlines()) == len(lines)
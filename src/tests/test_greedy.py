@@ -0,0 +1,107 @@
+"""
+Planning glouton (greedy.GreedyScheduler) et score NumPy (scoring.PlanningScorer)
+
+ - sur la petite instance: le planning glouton respecte capacités, binômes et
+   une seule affectation par vacation, et reste faisable sur le modèle CP-SAT
+ - PlanningScorer.score donne l'objectif CP-SAT d'un planning fixé
+"""
+import collections
+
+import pytest
+from ortools.sat.python import cp_model
+
+from greedy import GreedyScheduler
+from scoring import PlanningScorer, capacity_of
+
+SLOTS_PER_WEEK = 10
+
+
+@pytest.fixture
+def optimizer(small_optimizer):
+    return small_optimizer()
+
+
+@pytest.fixture
+def greedy_keys(optimizer):
+    greedy = GreedyScheduler(optimizer, seed=0)
+    report = greedy.run()
+    assert not any(report['violations'].values()), report['violations']
+    return greedy.assignment_keys()
+
+
+def test_greedy_respects_capacity(optimizer, greedy_keys):
+    disciplines = {disc.id_discipline: disc for disc in optimizer.config.disciplines}
+    load = collections.Counter((d_id, v_idx) for _, d_id, v_idx in greedy_keys)
+    assert load
+    for (d_id, v_idx), count in load.items():
+        capacity = capacity_of(disciplines[d_id], v_idx % SLOTS_PER_WEEK)
+        assert capacity == 0 or count <= capacity, (d_id, v_idx, count)
+
+
+def test_greedy_keeps_binomes_together(optimizer, greedy_keys):
+    binomes = {el.id_eleve: el.id_binome for el in optimizer.config.eleves}
+    pairs = [(a, b) for a, b in binomes.items() if b and b != a]
+    assert pairs
+    en_binome = {disc.id_discipline for disc in optimizer.config.disciplines if disc.en_binome}
+    chosen = set(greedy_keys)
+    shared = 0
+    for e_id, d_id, v_idx in chosen:
+        if d_id in en_binome and e_id in dict(pairs):
+            partner = next(b for a, b in pairs if a == e_id)
+            assert (partner, d_id, v_idx) in chosen, (e_id, d_id, v_idx)
+            shared += 1
+    assert shared > 0
+
+
+def test_greedy_one_assignment_per_slot(greedy_keys):
+    per_slot = collections.Counter((e_id, v_idx) for e_id, _, v_idx in greedy_keys)
+    assert max(per_slot.values()) == 1
+
+
+def test_greedy_plan_is_feasible_on_cpsat_model(optimizer, greedy_keys, fixed_solve):
+    status, objective = fixed_solve(optimizer, greedy_keys)
+    assert status == cp_model.OPTIMAL
+    assert objective == PlanningScorer(optimizer).score(
+        PlanningScorer(optimizer).tensor_from_assignments(greedy_keys)
+    )['total']
+
+
+def test_greedy_solve_result(optimizer):
+    result = GreedyScheduler(optimizer).solve()
+    assert result.status == 'FEASIBLE'
+    assert result.objective_value > 0
+    assert 0 < result.normalized_score <= 100
+
+
+def test_score_matches_cpsat_objective(optimizer, fixed_solve):
+    """Score NumPy du planning optimal = objectif CP-SAT, y compris une fois ce planning fixé"""
+    result = optimizer.solve()
+    assert result.status == 'OPTIMAL'
+    scorer = PlanningScorer(optimizer)
+    parts = scorer.score(scorer.tensor_from_assignments(result.assignments))
+    assert parts['total'] == result.objective_value
+    assert parts['preferences'] > 0 and parts['priorites'] > 0
+
+    status, objective = fixed_solve(optimizer, result.assignments)
+    assert status == cp_model.OPTIMAL
+    assert objective == result.objective_value
+
+
+def test_max_theoretical_score_matches_model(optimizer):
+    assert PlanningScorer(optimizer).max_theoretical_score() == optimizer.max_theoretical_score
+
+
+def test_score_matches_cpsat_objective_with_day_pairs(optimizer, fixed_solve):
+    """Planning fixé à la main: paires de jours (lundi + mardi) en binôme et seul, quotas non atteints"""
+    keys = [
+        (101, 1, 490), (102, 1, 490), (101, 1, 492), (102, 1, 492),  # Semaine 50: lundi et mardi matin
+        (103, 1, 501), (103, 1, 503),  # Semaine 51: lundi et mardi après-midi
+        (301, 3, 2), (301, 2, 10),  # Semaine 1: mardi matin, semaine 2: lundi matin
+    ]
+    scorer = PlanningScorer(optimizer)
+    parts = scorer.score(scorer.tensor_from_assignments(keys))
+    assert parts['paires_jours'] == 3 * 50
+
+    status, objective = fixed_solve(optimizer, keys)
+    assert status == cp_model.OPTIMAL
+    assert objective == parts['total']
@@ -0,0 +1,31 @@
+"""
+Décomposition lagrangienne par élève (lagrangian)
+
+Sur la petite instance: chaque itération du sous-gradient donne une borne
+supérieure valide (au moins l'optimum CP-SAT), et le planning réparé est
+faisable sur le modèle complet.
+"""
+from ortools.sat.python import cp_model
+
+from lagrangian import LagrangianDecomposition
+
+
+def test_subgradient_bound_is_above_cpsat_optimum(small_optimizer, fixed_solve):
+    optimizer = small_optimizer()
+    optimum = optimizer.solve()
+    assert optimum.status == 'OPTIMAL'
+
+    lagrangian = LagrangianDecomposition(optimizer, processes=1, subproblem_seconds=2.0)
+    assert lagrangian.decomposition
+    result = lagrangian.run(time_limit=60, max_iterations=3, repair_seconds=10)
+
+    assert result.history
+    assert all(entry['bound'] >= optimum.objective_value - 1e-6 for entry in result.history)
+    assert result.upper_bound == min(entry['bound'] for entry in result.history)
+    assert result.upper_bound <= optimizer.max_theoretical_score
+
+    assert result.status == 'FEASIBLE'
+    assert result.objective <= optimum.objective_value
+    assert 0 <= result.gap < 1
+    status, objective = fixed_solve(optimizer, optimizer._assignments_from_values(result.values))
+    assert status == cp_model.OPTIMAL and objective == result.objective
@@ -0,0 +1,75 @@
+"""
+Résolution lexicographique (lexicographic)
+
+Sur la petite instance: l'objectif complet se sépare en quotas + préférences,
+l'étape 2 conserve le niveau de quotas optimal de l'étape 1 (au plus la perte
+tolérée), et le planning est au moins aussi bon que le planning glouton.
+"""
+import math
+
+import numpy as np
+import pytest
+from ortools.sat.python import cp_model
+
+from greedy import GreedyScheduler
+from lexicographic import solve_lexicographic, split_objective
+from warm_start import objective_value
+
+
+def _part_value(part, values):
+    indices, weights = part
+    return int(np.dot(weights, values[indices]))
+
+
+def test_split_objective_covers_full_objective(small_optimizer):
+    optimizer = small_optimizer()
+    parts = split_objective(optimizer.model, optimizer.quota_objective_vars)
+    assert len(parts['quotas'][0]) > 0 and len(parts['preferences'][0]) > 0
+    assert not set(parts['quotas'][0].tolist()) & set(parts['preferences'][0].tolist())
+
+    result = optimizer.solve()
+    solver = cp_model.CpSolver()
+    solver.parameters.num_workers = 8
+    assert solver.Solve(optimizer.model) == cp_model.OPTIMAL
+    values = np.asarray(solver.ResponseProto().solution, dtype=np.int64)
+    total = _part_value(parts['quotas'], values) + _part_value(parts['preferences'], values)
+    assert total == objective_value(optimizer.model, values) == result.objective_value
+
+
+@pytest.mark.parametrize("tolerance", [0.0, 0.01])
+def test_stage_two_keeps_stage_one_optimum(small_optimizer, fixed_solve, tolerance):
+    optimizer = small_optimizer()
+    parts = split_objective(optimizer.model, optimizer.quota_objective_vars)
+    staged = solve_lexicographic(optimizer, [10, 10], tolerance=tolerance)
+
+    assert staged.status == 'FEASIBLE'
+    quotas, preferences = staged.stages
+    assert (quotas['stage'], preferences['stage']) == ('quotas', 'preferences')
+    assert quotas['status'] == preferences['status'] == 'OPTIMAL'
+    assert quotas['floor'] is None
+    level = quotas['objective']
+    assert preferences['floor'] == math.floor(level - tolerance * abs(level))
+
+    kept = _part_value(parts['quotas'], staged.values)
+    assert kept >= preferences['floor']
+    if tolerance == 0:
+        assert kept == level
+    assert _part_value(parts['preferences'], staged.values) == preferences['objective']
+    assert staged.objective == kept + preferences['objective']
+
+    # Planning faisable, au plus l'optimum pondéré; sans perte tolérée, au moins aussi bon que le glouton
+    # (une perte tolérée sur les quotas peut coûter plus que le gain en préférences)
+    status, objective = fixed_solve(optimizer, optimizer._assignments_from_values(staged.values))
+    assert status == cp_model.OPTIMAL and objective == staged.objective
+    assert staged.objective <= optimizer.solve().objective_value
+    if tolerance == 0:
+        assert staged.objective >= GreedyScheduler(optimizer).solve().objective_value
+
+
+def test_lexicographic_strategy(small_optimizer):
+    optimizer = small_optimizer(strategy="lexicographic", max_time_seconds=20)
+    result = optimizer.solve()
+    assert result.status == 'FEASIBLE'
+    assert [stage['stage'] for stage in result.stages] == ['quotas', 'preferences']
+    # Budgets réduits au prorata de max_time_seconds
+    assert sum(stage['seconds'] for stage in result.stages) <= 20
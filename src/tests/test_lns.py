@@ -0,0 +1,59 @@
+"""
+Recherche à grand voisinage (lns)
+
+Sur la petite instance, à partir du planning glouton: la solution LNS est au
+moins aussi bonne que l'incumbent initial, faisable sur le modèle complet, et
+les itérations sont numérotées sans trou (les voisinages vides ne comptent pas).
+"""
+from ortools.sat.python import cp_model
+
+from greedy import GreedyScheduler
+from lns import LNSDriver
+from warm_start import apply_hint_keys
+
+
+def _greedy_seed(optimizer):
+    greedy = GreedyScheduler(optimizer)
+    greedy.run()
+    report = apply_hint_keys(optimizer, greedy.assignment_keys(), "glouton", repair=True, time_limit=10)
+    assert report.solution is not None
+    return report.solution, report.hint_objective
+
+
+def test_lns_improves_on_greedy_seed(small_optimizer, fixed_solve):
+    optimizer = small_optimizer()
+    values, objective = _greedy_seed(optimizer)
+    improvements = []
+    driver = LNSDriver(optimizer, time_slice=2.0, seed=1,
+                       on_improvement=lambda v, obj, elapsed: improvements.append(obj))
+    result = driver.run(time_limit=6, initial=values, initial_objective=objective)
+
+    assert result.status == 'FEASIBLE'
+    assert result.objective >= objective
+    assert result.objective <= optimizer.solve().objective_value
+    assert improvements == sorted(improvements) and all(obj > objective for obj in improvements)
+    if improvements:
+        assert improvements[-1] == result.objective
+
+    history = result.history
+    assert history[0]['neighborhood'] == 'initial' and history[0]['objective'] == objective
+    assert [entry['iteration'] for entry in history] == list(range(len(history)))
+    assert result.to_dict()['iterations'] == len(history) - 1 > 0
+    best = [entry['best'] for entry in history]
+    assert best == sorted(best) and best[-1] == result.objective
+    assert sum(stats['tries'] for stats in result.neighborhoods.values()) >= len(history) - 1
+
+    status, fixed = fixed_solve(optimizer, optimizer._assignments_from_values(result.values))
+    assert status == cp_model.OPTIMAL and fixed == result.objective
+
+
+def test_lns_strategy_starts_from_greedy(small_optimizer):
+    optimizer = small_optimizer(strategy="lns", max_time_seconds=6, lns_time_slice=2.0)
+    result = optimizer.solve()
+
+    assert result.status == 'FEASIBLE'
+    seed = result.statistics['warm_start']
+    assert seed['source'] == "glouton"
+    assert result.objective_value >= seed['hint_objective']
+    assert result.statistics['lns']['iterations'] > 0
+    assert (optimizer.config.output_dir / "lns_history.json").exists()
@@ -0,0 +1,140 @@
+"""
+Cache disque des modèles construits (model_cache)
+
+ - la clé change avec le contenu des CSV d'entrée, le code de construction
+   (MODEL_CODE_FILES) et les options du modèle, pas avec la mise en forme des CSV
+ - un rechargement depuis le cache donne le même proto et le même registre de
+   variables que la construction, et le même optimum
+"""
+import shutil
+
+import numpy as np
+import pytest
+
+import optimizer as optimizer_module
+from config_manager import ModelConfig
+from conftest import SMALL_PARAMS
+from model_cache import ModelCache
+from optimizer import MODEL_CODE_FILES, MODEL_VERSION, ScheduleOptimizer
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return ModelCache(tmp_path / "model_cache")
+
+
+def _key(cache, data_dir, code_files=(), options=None):
+    return cache.key_for(data_dir, version=MODEL_VERSION, code_files=code_files, options=options)
+
+
+def _edit(path, old, new):
+    text = path.read_text(encoding="utf-8")
+    assert old in text
+    path.write_text(text.replace(old, new, 1), encoding="utf-8")
+
+
+@pytest.mark.parametrize("name, old, new", [
+    ("disciplines.csv", "Comodulation,\"{1: 2", "Comodulation,\"{1: 3"),  # Capacité
+    ("eleves_with_code.csv", "103,0,mardi", "103,0,jeudi"),  # Préférence de jour
+    ("calendrier_DFAS02.csv", "S50,C,", "S50,F,"),  # Créneau férié
+    ("periodes.csv", "1,50,51,0", "1,50,50,0"),
+    ("stages.csv", "2,Stage Actif,1,1", "2,Stage Actif,1,2"),
+])
+def test_key_changes_with_input_csv(cache, small_data_dir, name, old, new):
+    before = _key(cache, small_data_dir)
+    assert _key(cache, small_data_dir) == before
+    _edit(small_data_dir / name, old, new)
+    assert _key(cache, small_data_dir) != before
+
+
+def test_key_ignores_csv_formatting(cache, small_data_dir):
+    before = _key(cache, small_data_dir)
+    path = small_data_dir / "disciplines.csv"
+    lines = path.read_text(encoding="utf-8").splitlines()
+    path.write_bytes(("\r\n".join(line + "  " for line in lines) + "\r\n\r\n").encode("utf-8"))
+    assert _key(cache, small_data_dir) == before
+
+
+def test_key_changes_with_missing_csv(cache, small_data_dir):
+    before = _key(cache, small_data_dir)
+    (small_data_dir / "stages.csv").unlink()
+    assert _key(cache, small_data_dir) != before
+
+
+def test_key_changes_with_model_code(cache, small_data_dir, tmp_path):
+    code_dir = tmp_path / "code"
+    code_dir.mkdir()
+    code_files = [shutil.copy(path, code_dir) for path in MODEL_CODE_FILES]
+    before = _key(cache, small_data_dir, code_files)
+    for path in code_files:
+        original = open(path, encoding="utf-8").read()
+        with open(path, "a", encoding="utf-8") as f:
+            f.write("\n# modification\n")
+        assert _key(cache, small_data_dir, code_files) != before, path
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(original)
+    assert _key(cache, small_data_dir, code_files) == before
+
+
+def test_key_changes_with_version_and_options(cache, small_data_dir):
+    before = _key(cache, small_data_dir, options={'symmetry_breaking': False})
+    assert cache.key_for(small_data_dir, version=MODEL_VERSION + "x") != _key(cache, small_data_dir)
+    assert _key(cache, small_data_dir, options={'symmetry_breaking': True}) != before
+
+
+def test_optimizer_key_uses_code_files_and_options(small_data_dir, tmp_path, monkeypatch):
+    """La clé de l'optimizer suit MODEL_CODE_FILES et les options qui changent le modèle"""
+    code_file = tmp_path / "optimizer.py"
+    code_file.write_text("# version 1\n", encoding="utf-8")
+    monkeypatch.setattr(optimizer_module, "MODEL_CODE_FILES", [code_file])
+
+    def key(**params):
+        optimizer = ScheduleOptimizer(ModelConfig.from_csv_directory(small_data_dir, **{**SMALL_PARAMS, **params}))
+        return optimizer._model_cache_key(ModelCache(tmp_path / "model_cache"))
+
+    before = key()
+    assert key(max_time_seconds=5, num_workers=2) == before  # Paramètres de résolution: même modèle
+    assert key(pair_days_formulation="motifs") != before
+    assert key(window_formulation="prefixes") != before
+    code_file.write_text("# version 2\n", encoding="utf-8")
+    assert key() != before
+
+
+def _build(data_dir, **params):
+    config = ModelConfig.from_csv_directory(data_dir, **{**SMALL_PARAMS, 'model_cache': True, **params})
+    optimizer = ScheduleOptimizer(config)
+    cached = optimizer.prepare_and_build()
+    return optimizer, cached
+
+
+def test_cache_hit_returns_same_model(small_data_dir):
+    built, cached = _build(small_data_dir)
+    assert not cached
+    entries = ModelCache(small_data_dir.parent / "resultat" / "model_cache").entries()
+    assert len(entries) == 1
+
+    reloaded, cached = _build(small_data_dir)
+    assert cached
+    assert reloaded.model_key == built.model_key
+    assert str(reloaded.model.Proto()) == str(built.model.Proto())
+    for name, column in built.store.export_columns().items():
+        np.testing.assert_array_equal(reloaded.store.export_columns()[name], column)
+    assert reloaded.max_theoretical_score == built.max_theoretical_score
+    assert reloaded.quota_objective_vars == list(built.quota_objective_vars)
+    assert reloaded.coverage_constraints == list(built.coverage_constraints)
+
+    first, second = built.solve(), reloaded.solve()
+    assert first.status == second.status == 'OPTIMAL'
+    assert first.objective_value == second.objective_value
+
+
+def test_cache_miss_after_data_change(small_data_dir):
+    built, _ = _build(small_data_dir)
+    _edit(small_data_dir / "disciplines.csv", "Comodulation,\"{1: 2", "Comodulation,\"{1: 3")
+    rebuilt, cached = _build(small_data_dir)
+    assert not cached
+    assert rebuilt.model_key != built.model_key
+    assert str(rebuilt.model.Proto()) != str(built.model.Proto())
+    # Construction normale: identique à un modèle construit sans cache
+    fresh, _ = _build(small_data_dir, model_cache=False)
+    assert str(rebuilt.model.Proto()) == str(fresh.model.Proto())
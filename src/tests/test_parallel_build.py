@@ -0,0 +1,44 @@
+"""
+Construction parallèle du modèle (processus fils par famille de contraintes)
+
+Le modèle fusionné doit être identique au modèle séquentiel: même proto
+canonique (proto_hash), même score max théorique, mêmes contraintes de
+couverture, termes de quotas et indicateurs partagés.
+"""
+import pytest
+
+import parallel_build
+from parallel_build import fork_available, proto_hash
+
+pytestmark = pytest.mark.skipif(not fork_available(), reason="fork non supporté")
+
+
+@pytest.mark.parametrize("params", [
+    {},
+    {'symmetry_breaking': True},
+    {'pair_days_formulation': "motifs"},
+    {'window_formulation': "prefixes"},
+])
+def test_parallel_build_matches_sequential(small_optimizer, params):
+    sequential = small_optimizer(build_processes=1, **params)
+    parallel = small_optimizer(build_processes=2, **params)
+
+    assert parallel.parallel_build_report['processes'] == 2
+    assert set(parallel.parallel_build_report['steps']) == {name for name, _, _, _ in parallel._build_steps()}
+    assert proto_hash(parallel.model) == proto_hash(sequential.model)
+    assert parallel.max_theoretical_score == pytest.approx(sequential.max_theoretical_score)
+    assert [list(c) for c in parallel.coverage_constraints] == [list(c) for c in sequential.coverage_constraints]
+    assert list(parallel.quota_objective_vars) == list(sequential.quota_objective_vars)
+    assert parallel.objective_report == sequential.objective_report
+    assert parallel.indicator_requests == sequential.indicator_requests
+    assert {k: v.Index() for k, v in parallel.indicators.items()} == {k: v.Index() for k, v in sequential.indicators.items()}
+
+
+def test_same_optimum(small_optimizer):
+    assert small_optimizer(build_processes=2).solve().objective_value == small_optimizer().solve().objective_value
+
+
+def test_variable_creating_step_must_be_replayed(small_optimizer, monkeypatch):
+    monkeypatch.setattr(parallel_build, "VARIABLE_STEPS", ("objectif",))
+    with pytest.raises(RuntimeError, match="VARIABLE_STEPS"):
+        small_optimizer(build_processes=2)
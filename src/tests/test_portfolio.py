@@ -0,0 +1,69 @@
+"""
+Portefeuille de résolutions CP-SAT concurrentes (portfolio)
+
+ - répartition des cœurs et des profils entre les membres
+ - sur la petite instance: deux processus, deux tours; la solution retenue est
+   faisable sur le modèle complet, au plus l'optimum, et ne se dégrade pas
+   d'un tour à l'autre (meilleure solution renvoyée en hint)
+"""
+import pytest
+from ortools.sat.python import cp_model
+
+from portfolio import PROFILES, Portfolio, portfolio_members
+
+
+def test_members_share_cores():
+    members = portfolio_members(size=3, cores=7, seed=10)
+    assert [m.workers for m in members] == [3, 2, 2]
+    assert [m.seed for m in members] == [10, 11, 12]
+    assert [m.name for m in members] == list(PROFILES)[:3]
+    assert members[1].parameters == PROFILES[members[1].name]
+
+
+def test_members_limited_by_cores_and_cycle_profiles():
+    assert len(portfolio_members(size=8, cores=2)) == 2
+    members = portfolio_members(size=5, cores=10, profiles=['core', 'no_lp'])
+    assert [m.name for m in members] == ['core', 'no_lp', 'core#2', 'no_lp#2', 'core#3']
+    assert members[4].parameters == PROFILES['core']
+    assert sum(m.workers for m in members) == 10
+
+
+def test_unknown_profile():
+    with pytest.raises(ValueError, match="inconnus: turbo"):
+        portfolio_members(size=2, cores=2, profiles=['default', 'turbo'])
+
+
+def test_portfolio_solution_is_feasible(small_optimizer, fixed_solve):
+    optimizer = small_optimizer()
+    improvements = []
+    portfolio = Portfolio(optimizer, size=2, cores=8, seed=3, profiles=['default', 'randomized'],
+                          on_improvement=lambda values, objective, elapsed: improvements.append(objective))
+    result = portfolio.run(time_limit=8, round_seconds=4)
+
+    assert result.status in ('OPTIMAL', 'FEASIBLE')
+    assert result.winner in ('default', 'randomized')
+    assert improvements and improvements == sorted(improvements) and improvements[-1] == result.objective
+    assert result.objective <= result.upper_bound + 1e-6
+
+    first = result.rounds[0]
+    assert set(first['members']) == {'default', 'randomized'}
+    best_first = max(m['objective'] for m in first['members'].values() if m['objective'] is not None)
+    assert result.objective >= best_first
+    if result.status != 'OPTIMAL':
+        assert len(result.rounds) == 2
+
+    summary = result.to_dict()
+    assert sum(summary['wins'].values()) == sum(1 for r in result.rounds if r['improved_by'])
+
+    status, objective = fixed_solve(optimizer, optimizer._assignments_from_values(result.values))
+    assert status == cp_model.OPTIMAL and objective == result.objective
+    assert result.objective <= optimizer.solve().objective_value
+
+
+def test_portfolio_strategy(small_optimizer):
+    optimizer = small_optimizer(strategy="portfolio", max_time_seconds=6, portfolio_size=2, portfolio_cores=8,
+                                portfolio_round_seconds=6)
+    result = optimizer.solve()
+    assert result.is_success()
+    assert result.statistics['portfolio']['winner'] is not None
+    assert result.stop_reason == ('optimal' if result.status == 'OPTIMAL' else 'time_limit')
@@ -0,0 +1,84 @@
+"""
+Horizon glissant (rolling_horizon)
+
+ - découpage de l'année: période à cheval sur la fin de l'année civile,
+   semaines hors période, recouvrements, semestres
+ - sur la petite instance (deux périodes, dont une de la semaine 52 à la
+   semaine 2): résolution en deux étapes, planning faisable sur le modèle complet
+"""
+from ortools.sat.python import cp_model
+
+from classes.periode import Periode
+from rolling_horizon import RollingHorizon, horizon_steps
+
+
+def test_steps_follow_periodes_with_year_end_wrap():
+    periodes = [Periode(0, 34, 44), Periode(1, 45, 3), Periode(2, 4, 20)]
+    steps = horizon_steps(periodes)
+
+    assert [name for name, _ in steps] == ["période 0", "période 1", "période 2", "hors période"]
+    assert steps[0][1] == list(range(34, 45))
+    assert steps[1][1] == list(range(45, 53)) + [1, 2, 3]
+    assert steps[2][1] == list(range(4, 21))
+    assert steps[3][1] == list(range(21, 34))
+
+
+def test_steps_cover_each_week_once():
+    # Période 1 recouvre la fin de la période 0; période 2 entièrement couverte
+    periodes = [Periode(0, 40, 50), Periode(1, 48, 2), Periode(2, 49, 51)]
+    steps = horizon_steps(periodes)
+
+    assert [name for name, _ in steps] == ["période 0", "période 1", "hors période"]
+    assert steps[1][1] == [51, 52, 1, 2]
+    weeks = [w for _, step_weeks in steps for w in step_weeks]
+    assert sorted(weeks) == list(range(1, 53))
+
+
+def test_steps_without_leftover_weeks():
+    steps = horizon_steps([Periode(0, 27, 52), Periode(1, 1, 26)])
+    assert [name for name, _ in steps] == ["période 0", "période 1"]
+
+
+def test_semester_steps():
+    assert horizon_steps([Periode(0, 34, 44)], unit="semestre") == [
+        ("semestre 2", list(range(27, 53))), ("semestre 1", list(range(1, 27)))
+    ]
+    assert [name for name, _ in horizon_steps([Periode(0, 1, 10)], unit="semestre")] == ["semestre 1", "semestre 2"]
+
+
+def test_small_instance_steps(small_optimizer):
+    optimizer = small_optimizer()
+    horizon = RollingHorizon(optimizer)
+    assert [(name, weeks) for name, weeks in horizon.steps[:2]] == [("période 0", [50, 51]), ("période 1", [52, 1, 2])]
+    assert horizon.steps[2] == ("hors période", list(range(3, 50)))
+    # Chaque variable de décision dans l'étape de sa semaine, aucune hors période (semaines fermées)
+    assert set(horizon.var_step.tolist()) == {0, 1}
+
+
+def test_two_step_solve_is_feasible_on_full_model(small_optimizer, fixed_solve):
+    optimizer = small_optimizer()
+    result = RollingHorizon(optimizer).run(time_limit=20)
+
+    assert result.status == 'FEASIBLE'
+    solved = [step for step in result.steps if step['status'] != 'SKIPPED']
+    assert [step['step'] for step in solved] == ["période 0", "période 1"]
+    assert all(step['status'] in ('OPTIMAL', 'FEASIBLE') for step in solved)
+    last = result.steps[-1]
+    assert (last['step'], last['status'], last['free_vars']) == ("hors période", 'SKIPPED', 0)
+    # Score cumulé croissant d'une étape à l'autre
+    assert solved[0]['objective'] <= solved[1]['objective'] == result.objective
+
+    keys = optimizer._assignments_from_values(result.values)
+    status, objective = fixed_solve(optimizer, keys)
+    assert status == cp_model.OPTIMAL
+    assert objective == result.objective
+    assert result.objective <= optimizer.solve().objective_value
+
+
+def test_rolling_horizon_strategy(small_optimizer, fixed_solve):
+    optimizer = small_optimizer(strategy="rolling_horizon", max_time_seconds=20)
+    result = optimizer.solve()
+    assert result.status in ('OPTIMAL', 'FEASIBLE')
+    assert [stage['step'] for stage in result.stages if stage.get('status') != 'SKIPPED'][:2] == ["période 0", "période 1"]
+    status, objective = fixed_solve(optimizer, result.assignments)
+    assert status == cp_model.OPTIMAL and objective == result.objective_value
@@ -0,0 +1,118 @@
+"""
+Règles d'arrêt anticipé (stopping)
+
+Suites synthétiques (temps, objectif, borne) données à chaque règle: règle
+retournée et moment où elle se déclenche.
+"""
+import pytest
+
+from config_manager import SolverParams
+from stopping import StoppingRules
+
+
+def _feed(rules, sequence):
+    """Première règle déclenchée sur la suite [(temps, objectif, borne)]: (règle, indice) ou (None, None)"""
+    for index, (elapsed, objective, bound) in enumerate(sequence):
+        reason = rules.on_solution(objective, bound, elapsed)
+        if reason is not None:
+            return reason, index
+    return None, None
+
+
+def test_no_rule_is_inactive():
+    rules = StoppingRules()
+    assert not rules.active
+    assert _feed(rules, [(t, 100.0 + t, 1000.0) for t in range(0, 7200, 60)]) == (None, None)
+
+
+def test_gap_rule():
+    rules = StoppingRules(gap=0.05)
+    assert rules.active
+    sequence = [(1, 800.0, 1000.0), (2, 940.0, 1000.0), (3, 950.0, 1000.0), (4, 990.0, 1000.0)]
+    assert _feed(rules, sequence) == ('gap', 2)  # (1000 - 950) / 1000 = 5%
+
+
+def test_gap_rule_uses_best_of_lp_and_cpsat_bounds():
+    # Borne LP (980) plus serrée que la borne CP-SAT (1000): 940 est à moins de 5% de 980
+    rules = StoppingRules(gap=0.05, upper_bound=980.0)
+    assert _feed(rules, [(1, 900.0, 1000.0), (2, 940.0, 1000.0)]) == ('gap', 1)
+    # Borne CP-SAT plus serrée que la borne LP
+    rules = StoppingRules(gap=0.05, upper_bound=5000.0)
+    assert _feed(rules, [(1, 915.0, 960.0)]) == ('gap', 0)
+
+
+def test_gap_rule_without_usable_bound():
+    assert _feed(StoppingRules(gap=0.05), [(1, 100.0, None), (2, 200.0, None)]) == (None, None)
+    assert _feed(StoppingRules(gap=0.05), [(1, 0.0, 0.0)]) == (None, None)
+
+
+def test_target_score_rule():
+    rules = StoppingRules(target_score=80.0, max_theoretical_score=2000.0)
+    sequence = [(1, 1000.0, 3000.0), (2, 1590.0, 3000.0), (3, 1600.0, 3000.0)]
+    assert _feed(rules, sequence) == ('target_score', 2)  # 100 * 1600 / 2000 = 80
+
+
+def test_target_score_without_theoretical_score():
+    assert _feed(StoppingRules(target_score=80.0), [(1, 1e9, None)]) == (None, None)
+
+
+def test_target_score_checked_before_gap():
+    rules = StoppingRules(gap=0.05, target_score=50.0, max_theoretical_score=2000.0)
+    assert _feed(rules, [(1, 990.0, 1000.0), (2, 1000.0, 1000.0)]) == ('gap', 0)
+    rules = StoppingRules(gap=0.05, target_score=40.0, max_theoretical_score=2000.0)
+    assert _feed(rules, [(1, 990.0, 1000.0)]) == ('target_score', 0)
+
+
+def test_plateau_rule():
+    # Fenêtre de 10 minutes, au moins 1% de progrès exigé
+    rules = StoppingRules(plateau_percent=1.0, plateau_minutes=10)
+    sequence = [
+        (30, 1000.0, None),
+        (300, 1100.0, None),
+        (590, 1105.0, None),  # Fenêtre incomplète: pas de plateau avant 600s
+        (700, 1110.0, None),  # Référence (100s): 1000 -> +11%
+        (950, 1112.0, None),  # Référence (350s): 1100 -> +1.1%
+        (1000, 1113.0, None),  # Référence (400s): 1100 -> +1.18%
+        (1200, 1114.0, None),  # Référence (600s): 1105 -> +0.81%
+    ]
+    assert _feed(rules, sequence) == ('plateau', 6)
+
+
+def test_plateau_without_solution_before_window():
+    rules = StoppingRules(plateau_percent=5.0, plateau_minutes=1)
+    assert _feed(rules, [(61, 1000.0, None), (100, 1000.0, None)]) == (None, None)
+    assert rules.check_plateau(122) == 'plateau'  # Aucune progression depuis 61s
+
+
+def test_periodic_plateau_check_without_new_solution():
+    rules = StoppingRules(plateau_percent=1.0, plateau_minutes=10)
+    assert _feed(rules, [(10, 500.0, None), (100, 1000.0, None)]) == (None, None)
+    assert rules.check_plateau(650) is None  # Référence (50s): 500 -> +100%
+    assert rules.check_plateau(699) is None
+    assert rules.check_plateau(700) == 'plateau'  # Référence (100s): 1000 -> +0%
+
+
+def test_plateau_with_negative_reference():
+    rules = StoppingRules(plateau_percent=10.0, plateau_minutes=1)
+    assert _feed(rules, [(1, -1000.0, None), (70, -950.0, None)]) == ('plateau', 1)  # +5% seulement
+    rules = StoppingRules(plateau_percent=10.0, plateau_minutes=1)
+    assert _feed(rules, [(1, -1000.0, None), (70, -800.0, None)]) == (None, None)
+
+
+def test_from_params():
+    params = SolverParams(stop_gap=0.02, stop_plateau_percent=0.5, stop_plateau_minutes=15, stop_target_score=90)
+    rules = StoppingRules.from_params(params, max_theoretical_score=1e6, upper_bound=9e5)
+    assert (rules.gap, rules.plateau_percent, rules.plateau_minutes, rules.target_score) == (0.02, 0.5, 15, 90)
+    assert (rules.max_theoretical_score, rules.upper_bound) == (1e6, 9e5)
+    assert rules.active
+    assert not StoppingRules.from_params(SolverParams(), 1e6).active
+
+
+@pytest.mark.parametrize("params, reason", [
+    ({"stop_target_score": 1.0}, 'target_score'),
+    ({"stop_gap": 0.99, "lp_bound": True}, 'gap'),
+])
+def test_solve_reports_stop_reason(small_optimizer, params, reason):
+    result = small_optimizer(**params).solve()
+    assert result.is_success()
+    assert result.stop_reason == reason
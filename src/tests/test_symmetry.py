@@ -0,0 +1,87 @@
+"""
+Classes d'équivalence d'élèves et bris de symétrie (student_classes)
+
+ - profils et unités interchangeables (élève seul ou binôme)
+ - sur la petite instance complétée d'un élève et d'un binôme interchangeables:
+   le bris de symétrie ajoute des contraintes sans changer l'optimum, et sa
+   solution optimale est faisable sur le modèle sans bris de symétrie
+"""
+import numpy as np
+import pytest
+from ortools.sat.python import cp_model
+
+from student_classes import StudentClasses
+
+# Copies de profils existants: 104 comme 103 (DFAS01, mardi), binôme 203/204 comme 201/202
+TWIN_ROWS = [
+    "104,0,mardi,0,DFAS01,0,0",
+    "203,204,mercredi,0,DFAS02,0,0",
+    "204,203,mercredi,0,DFAS02,0,0",
+]
+
+
+@pytest.fixture
+def twin_optimizer(small_data_dir, small_optimizer):
+    with open(small_data_dir / "eleves_with_code.csv", "a", encoding="utf-8") as f:
+        f.write("\n".join(TWIN_ROWS) + "\n")
+    return small_optimizer
+
+
+def _units_by_id(optimizer):
+    classes = optimizer.student_classes
+    ids = optimizer.student_ids
+    return [sorted(tuple(ids[s] for s in classes.units[u]) for u in unit_ids) for unit_ids in classes.unit_classes]
+
+
+def test_small_instance_has_no_interchangeable_units(small_optimizer):
+    optimizer = small_optimizer(symmetry_breaking=True)
+    classes = optimizer.student_classes
+    # 7 élèves, 5 profils (les membres des binômes 101/102 et 201/202 ont le même profil), 5 unités
+    assert len(classes) == 5
+    assert len(classes.units) == 5
+    assert classes.unit_classes == []
+
+
+def test_profiles_and_unit_classes(twin_optimizer):
+    optimizer = twin_optimizer()
+    classes = optimizer.student_classes
+    profile = dict(zip(optimizer.student_ids, classes.profile_of.tolist()))
+    assert profile[104] == profile[103] and profile[203] == profile[201]
+    assert profile[301] != profile[302]  # Stages et jours préférés différents
+    # Chaque profil est calculé sur son premier élève
+    assert sorted(classes.profile_of[classes.representatives].tolist()) == list(range(len(classes)))
+
+    assert sorted(_units_by_id(optimizer)) == [[(103,), (104,)], [(201, 202), (203, 204)]]
+
+
+def test_profiles_split_by_stage():
+    class Stage:
+        def __init__(self, debut, fin):
+            self.debut_stage, self.fin_stage = debut, fin
+
+    class Eleve:
+        def __init__(self, id_eleve):
+            from classes.enum.niveaux import niveau
+            from classes.jour_preference import jour_pref
+            self.id_eleve, self.annee, self.jour_preference = id_eleve, niveau.DFTCC, jour_pref.lundi
+
+    classes = StudentClasses([Eleve(1), Eleve(2), Eleve(3)], {2: [Stage(10, 12)], 3: [Stage(10, 12)]})
+    assert classes.profile_of.tolist() == [0, 1, 1]
+    classes.build_units(np.full((3, 1), -1), [1, 2, 3])
+    assert classes.units == [(0,), (1,), (2,)]
+    assert classes.unit_classes == [[1, 2]]
+
+
+def test_symmetry_breaking_keeps_optimum(twin_optimizer, fixed_solve):
+    default = twin_optimizer()
+    symmetric = twin_optimizer(symmetry_breaking=True)
+    added = len(symmetric.model.Proto().constraints) - len(default.model.Proto().constraints)
+    assert added == 2  # Une contrainte d'ordre par classe de deux unités
+
+    expected = default.solve()
+    result = symmetric.solve()
+    assert expected.status == result.status == 'OPTIMAL'
+    assert result.objective_value == expected.objective_value
+
+    status, objective = fixed_solve(default, result.assignments)
+    assert status == cp_model.OPTIMAL and objective == expected.objective_value
@@ -0,0 +1,106 @@
+"""
+Réglage des paramètres CP-SAT (tuning)
+
+ - application des paramètres nommés, tirage des configurations, score des
+   trajectoires, budget tiré des logs de batch_experiments/
+ - sur la petite instance: successive halving jusqu'à une configuration, profil
+   écrit puis rechargé par SolverParams.load_profile et appliqué à la résolution
+"""
+import json
+
+import pytest
+from ortools.sat.python import cp_model
+
+from config_manager import SolverParams
+from tuning import (SEARCH_SPACE, SuccessiveHalving, apply_cpsat_parameters, batch_budget, batch_trajectories,
+                    curve_score, sample_configurations, write_profile)
+
+
+def test_apply_named_parameters():
+    parameters = cp_model.CpSolver().parameters
+    apply_cpsat_parameters(parameters, {
+        'search_branching': 'LP_SEARCH', 'linearization_level': 2, 'use_lns_only': True,
+    })
+    assert parameters.search_branching.name == 'LP_SEARCH'
+    assert parameters.linearization_level == 2
+    assert parameters.use_lns_only
+    with pytest.raises(KeyError):
+        apply_cpsat_parameters(parameters, {'search_branching': 'TURBO_SEARCH'})
+
+
+def test_every_search_space_value_is_a_valid_parameter():
+    for name, values in SEARCH_SPACE.items():
+        for value in values:
+            parameters = cp_model.CpSolver().parameters
+            apply_cpsat_parameters(parameters, {name: value})
+            applied = getattr(parameters, name)
+            assert (applied.name if isinstance(value, str) else applied) == value
+
+
+def test_sample_configurations():
+    configurations = sample_configurations(8, cores=4, seed=5)
+    assert configurations[0] == {'num_workers': 4}
+    assert len({json.dumps(c, sort_keys=True) for c in configurations}) == 8
+    for config in configurations[1:]:
+        assert set(config) == set(SEARCH_SPACE)
+        assert config['num_workers'] <= 4
+        assert all(config[name] in SEARCH_SPACE[name] or name == 'num_workers' for name in config)
+    assert sample_configurations(8, cores=4, seed=5) == configurations
+    assert sample_configurations(8, cores=4, seed=6) != configurations
+
+
+@pytest.mark.parametrize("trajectory, score", [
+    ([], 0.0),
+    ([(0.0, 100.0)], 1.0),  # Meilleure solution dès le départ
+    ([(5.0, 100.0)], 0.5),  # Meilleure solution à mi-parcours
+    ([(0.0, 50.0), (5.0, 100.0)], 0.5),  # Pire solution (0) puis meilleure (1) à mi-parcours
+    ([(0.0, 75.0), (20.0, 100.0)], 0.5),  # Solution après le budget ignorée
+])
+def test_curve_score(trajectory, score):
+    assert curve_score(trajectory, budget=10.0, reference=100.0, floor=50.0) == pytest.approx(score)
+
+
+def test_curve_score_single_objective():
+    assert curve_score([(2.0, 80.0)], budget=10.0, reference=80.0, floor=80.0) == pytest.approx(0.8)
+
+
+def test_batch_trajectories_and_budget(tmp_path):
+    logs = tmp_path / "V5" / "T600" / "run1" / "logs"
+    logs.mkdir(parents=True)
+    (logs / "a.txt").write_text("#1  1.0s best:50\n#2  4.0s best:95\n#3  9.0s best:100\nautre ligne\n", encoding="utf-8")
+    (logs / "b.txt").write_text("#1  2.0s best:200\n#5  3.0s best:-5\n#9  8.0s best:400\n", encoding="utf-8")
+    (logs / "vide.txt").write_text("aucune solution\n", encoding="utf-8")
+
+    curves = batch_trajectories(tmp_path)
+    assert curves == [[(1.0, 0.5), (4.0, 0.95), (9.0, 1.0)], [(2.0, 0.5), (3.0, -5 / 400), (8.0, 1.0)]]
+    assert batch_budget(curves) == pytest.approx((4.0 + 8.0) / 2)
+    assert batch_budget([]) is None
+
+
+def test_successive_halving_profile_round_trip(small_optimizer, tmp_path):
+    optimizer = small_optimizer()
+    configurations = sample_configurations(4, cores=2, seed=1)
+    result = SuccessiveHalving(optimizer.model, configurations).run(min_budget=1, max_budget=4, eta=2)
+
+    assert [len(r['trials']) for r in result.rounds] == [4, 2]
+    assert [r['budget'] for r in result.rounds] == [1, 2]
+    assert result.best_id == result.rounds[-1]['trials'][0]['config_id']
+    survivors = {t['config_id'] for t in result.rounds[0]['trials'][:2]}
+    assert {t['config_id'] for t in result.rounds[1]['trials']} == survivors
+
+    path = tmp_path / "profil.json"
+    write_profile(path, result, {'instance': 'petite'})
+    params = SolverParams()
+    tuning = params.load_profile(path)
+    assert tuning['instance'] == 'petite'
+    best = dict(result.best)
+    assert params.num_workers == best.pop('num_workers')
+    assert params.cpsat_parameters == best
+
+
+def test_solve_applies_cpsat_parameters(small_optimizer):
+    optimizer = small_optimizer(cpsat_parameters={'linearization_level': 2, 'search_branching': 'PORTFOLIO_SEARCH'})
+    result = optimizer.solve()
+    assert result.status == 'OPTIMAL'
+    assert optimizer.solver.parameters.linearization_level == 2
+    assert optimizer.solver.parameters.search_branching.name == 'PORTFOLIO_SEARCH'
@@ -0,0 +1,136 @@
+"""
+VariableStore.group_by: vues CSR comparées à un regroupement naïf par dictionnaire
+
+Registre aléatoire où les deux membres d'un binôme partagent la même variable
+CP-SAT sur des lignes distinctes.
+"""
+import collections
+import random
+
+import numpy as np
+import pytest
+from ortools.sat.python import cp_model
+
+from variable_store import VariableStore
+
+N_STUDENTS, N_DISCIPLINES, N_VACATIONS = 6, 3, 40
+BINOMES = {1: 2, 2: 1, 4: 5, 5: 4}  # Élève -> partenaire (disciplines en binôme: 0 et 2)
+
+GROUPINGS = [
+    ('discipline', 'vacation'),
+    ('student', 'discipline'),
+    ('student', 'discipline', 'semaine'),
+    ('student', 'discipline', 'semaine', 'jour'),
+    ('discipline', 'vacation', 'niveau'),
+    ('niveau',),
+]
+
+
+def _store(seed: int) -> VariableStore:
+    rng = random.Random(seed)
+    model = cp_model.CpModel()
+    store = VariableStore(N_STUDENTS, N_DISCIPLINES, N_VACATIONS)
+    shared = {}
+    # Ordre de création (vacation, discipline, élève), comme _create_variables
+    for v in range(N_VACATIONS):
+        for d in range(N_DISCIPLINES):
+            for s in range(N_STUDENTS):
+                if rng.random() < 0.4:
+                    continue
+                p = BINOMES.get(s) if d != 1 else None
+                if p is not None and (v, d, p) in shared:
+                    var = shared.pop((v, d, p))
+                else:
+                    var = model.NewBoolVar(f"x_e{s}_d{d}_v{v}")
+                    if p is not None:
+                        shared[(v, d, s)] = var
+                store.add(var, s, d, v, 1 + v // 10, 4 + s % 3, (v // 2) % 5)
+    store.freeze()
+    return store
+
+
+def _naive(store: VariableStore, columns) -> dict:
+    groups = collections.defaultdict(list)
+    for row in range(len(store)):
+        groups[tuple(int(store.column(c)[row]) for c in columns)].append(row)
+    return groups
+
+
+@pytest.fixture(scope="module", params=[0, 1, 2])
+def store(request):
+    return _store(request.param)
+
+
+def test_store_has_shared_binome_variables(store):
+    assert store.n_distinct_vars() < len(store)
+    counts = collections.Counter(store.var_index.tolist())
+    shared = [index for index, n in counts.items() if n == 2]
+    assert shared and max(counts.values()) == 2
+
+
+@pytest.mark.parametrize("columns", GROUPINGS)
+def test_group_by_matches_dict_grouping(store, columns):
+    grouping = store.group_by(*columns)
+    naive = _naive(store, columns)
+
+    groups = [(key, rows.tolist()) for key, rows in grouping]
+    assert [key for key, _ in groups] == sorted(naive)
+    assert dict(groups) == naive  # Lignes dans l'ordre de création
+    assert grouping.sizes().tolist() == [len(naive[key]) for key, _ in groups]
+    assert sorted(grouping.order.tolist()) == list(range(len(store)))
+    for key, rows in naive.items():
+        assert grouping.rows(key).tolist() == rows
+    assert grouping.rows((99,) * len(columns)) is None
+    assert store.group_by(*columns) is grouping
+
+
+@pytest.mark.parametrize("columns", GROUPINGS)
+def test_group_sums_count_shared_variables_per_row(store, columns):
+    """Une variable de binôme compte autant de fois qu'elle a de lignes dans le groupe"""
+    grouping = store.group_by(*columns)
+    for key, rows in _naive(store, columns).items():
+        expected = collections.Counter(int(store.var_index[row]) for row in rows)
+        assert collections.Counter(store.var_index[grouping.rows(key)].tolist()) == expected
+        assert [v.Index() for v in store.vars_of(grouping.rows(key))] == [int(store.var_index[row]) for row in rows]
+
+
+def test_iter_mask_and_runs(store):
+    grouping = store.group_by('student', 'discipline', 'semaine')
+    naive = _naive(store, ('student', 'discipline', 'semaine'))
+
+    mask = grouping.keys[:, 1] == 2
+    assert dict((key, rows.tolist()) for key, rows in grouping.iter(mask)) == {
+        key: rows for key, rows in naive.items() if key[1] == 2
+    }
+
+    runs = {prefix: [(week, rows.tolist()) for week, rows in run] for prefix, run in grouping.iter_runs(2)}
+    expected = collections.defaultdict(list)
+    for (s, d, week), rows in sorted(naive.items()):
+        expected[(s, d)].append((week, rows))
+    assert runs == expected
+
+    # Préfixe d'une colonne: le reste de la clé est un tuple
+    for (s,), run in grouping.iter_runs(1):
+        assert [key for key, _ in run] == sorted(key[1:] for key in naive if key[0] == s)
+
+
+def test_row_lookup_and_round_trip(store):
+    for row in range(len(store)):
+        assert store.row(int(store.student[row]), int(store.discipline[row]), int(store.vacation[row])) == row
+
+    copy = VariableStore.from_columns(store.shape, store.export_columns(), store.vars)
+    for columns in GROUPINGS:
+        original = store.group_by(*columns)
+        rebuilt = copy.group_by(*columns)
+        assert np.array_equal(original.keys, rebuilt.keys)
+        assert np.array_equal(original.order, rebuilt.order)
+        assert np.array_equal(original.offsets, rebuilt.offsets)
+
+
+def test_empty_store():
+    store = VariableStore(1, 1, 1)
+    store.freeze()
+    grouping = store.group_by('student', 'discipline')
+    assert len(grouping) == 0
+    assert list(grouping) == []
+    assert grouping.sizes().tolist() == []
@@ -0,0 +1,112 @@
+"""
+Démarrage à chaud depuis un planning CSV (warm_start)
+
+ - aller-retour export_planning -> apply_warm_start: le hint reproduit le planning
+   et son objectif, les lignes non reconnues sont comptées
+ - réparation: un planning infaisable est ramené au planning faisable le plus proche
+ - lecture: fichier ou colonnes manquants, valeurs invalides
+"""
+import csv
+
+import pytest
+
+from exporter import export_planning
+from loaders import DataLoadError
+from warm_start import apply_hint_keys, apply_warm_start, read_planning_csv
+
+HEADER = ["Semaine", "Jour", "Apres-Midi", "Discipline", "Id_Discipline", "Id_Eleve", "Id_Binome", "Annee"]
+
+
+@pytest.fixture
+def exported(small_optimizer, tmp_path):
+    """Planning optimal de la petite instance exporté en CSV"""
+    optimizer = small_optimizer()
+    result = optimizer.solve()
+    assert result.status == 'OPTIMAL'
+    path = tmp_path / "planning.csv"
+    assert export_planning(result, path, optimizer.config, optimizer)
+    return result, path
+
+
+def _append_rows(path, rows):
+    with open(path, "a", newline="", encoding="utf-8") as f:
+        csv.writer(f).writerows(rows)
+
+
+def test_read_planning_csv_round_trip(exported):
+    result, path = exported
+    keys = read_planning_csv(path)
+    assert len(keys) == len(result.assignments)
+    assert set(keys) == set(result.assignments)
+
+
+def test_warm_start_reproduces_objective(exported, small_optimizer):
+    result, path = exported
+    optimizer = small_optimizer()
+    report = optimizer.apply_warm_start(path)
+
+    assert report.rows == len(result.assignments)
+    assert report.unknown_ids == 0 and report.unavailable == 0 and report.conflicts == {}
+    assert report.completion_status == 'OPTIMAL' and not report.repaired
+    assert report.hint_objective == result.objective_value
+    assert set(optimizer._assignments_from_values(report.solution)) == set(result.assignments)
+    # Hint complet: une valeur par variable du modèle
+    assert report.hinted_variables == len(optimizer.model.Proto().variables)
+    assert len(optimizer.model.Proto().solution_hint.vars) == report.hinted_variables
+
+
+def test_warm_start_counts_unmatched_rows(exported, small_optimizer):
+    result, path = exported
+    _append_rows(path, [
+        [50, "Lundi", 0, "Inconnu", 1, 999, 0, "DFAS01"],  # Élève inconnu
+        [50, "Lundi", 0, "Inconnu", 42, 103, 0, "DFAS01"],  # Discipline inconnue
+        [10, "Mardi", 1, "Polyclinique", 1, 103, 0, "DFAS01"],  # Semaine fermée au calendrier
+        [50, "Mardi", 0, "Comodulation", 3, 103, 0, "DFAS01"],  # Discipline hors du niveau de l'élève
+    ])
+    report = apply_warm_start(small_optimizer(), path, repair=False, time_limit=10)
+
+    assert report.rows == len(result.assignments) + 4
+    assert report.unknown_ids == 2
+    assert report.unavailable == 2
+    assert len(report.samples) == 4
+    assert report.hint_objective == result.objective_value
+
+
+def test_warm_start_rejects_half_binome(small_optimizer):
+    """Une affectation de binôme sans le second membre n'est pas reprise"""
+    optimizer = small_optimizer()
+    report = apply_hint_keys(optimizer, [(101, 1, 490), (103, 1, 492)], "test", repair=False, time_limit=10)
+    assert report.conflicts == {'binome': 1}
+    assert report.hinted_assignments == 1
+    assert report.completion_status == 'OPTIMAL'
+
+
+def test_warm_start_repairs_infeasible_hint(small_optimizer):
+    """3 vacations de Polyclinique la même semaine (max 2): le hint est réparé"""
+    keys = [(103, 1, 490), (103, 1, 492), (103, 1, 494)]
+    report = apply_hint_keys(small_optimizer(), keys, "test", repair=False, time_limit=10)
+    assert report.completion_status == 'INFEASIBLE'
+    assert report.hint_objective is None and report.solution is None
+
+    optimizer = small_optimizer()
+    report = apply_hint_keys(optimizer, keys, "test", repair=True, time_limit=10)
+    assert report.repaired and report.repaired_changes == 1
+    assert report.hint_objective is not None
+    kept = set(optimizer._assignments_from_values(report.solution))
+    assert len(kept & set(keys)) == 2
+
+
+def test_read_planning_csv_errors(tmp_path):
+    with pytest.raises(DataLoadError, match="introuvable"):
+        read_planning_csv(tmp_path / "absent.csv")
+
+    path = tmp_path / "colonnes.csv"
+    path.write_text("Semaine,Jour\n50,Lundi\n", encoding="utf-8")
+    with pytest.raises(DataLoadError, match="colonnes manquantes"):
+        read_planning_csv(path)
+
+    path = tmp_path / "jour.csv"
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        csv.writer(f).writerows([HEADER, [50, "Samedi", 0, "Polyclinique", 1, 101, 102, "DFAS01"]])
+    with pytest.raises(DataLoadError, match="ligne 2"):
+        read_planning_csv(path)
@@ -0,0 +1,182 @@
+"""
+Fenêtres de fréquence et de continuité (ScheduleOptimizer._maximal_windows)
+
+ - cas limites des fenêtres maximales: première et dernière semaine, semaines
+   manquantes, fenêtre plus longue que l'horizon, comparaison avec toutes les
+   fenêtres glissantes
+ - sur une petite instance: les formulations "fenetres" et "prefixes" admettent
+   exactement les mêmes plannings, ceux qui respectent les fenêtres glissantes
+"""
+import random
+
+import numpy as np
+import pytest
+from ortools.sat.python import cp_model
+
+from classes.discipline import discipline
+from classes.eleve import eleve
+from classes.enum.niveaux import niveau
+from classes.jour_preference import jour_pref
+from config_manager import ModelConfig, SolverParams
+from emission import LinearEmitter
+from optimizer import ScheduleOptimizer
+
+maximal_windows = ScheduleOptimizer._maximal_windows
+
+
+def _naive_windows(weeks, length, sizes, limit):
+    """Fenêtres glissantes [s, s + length - 1] (s = 1..52) pouvant dépasser limit, en intervalles d'indices"""
+    windows = set()
+    for start in range(1, 53):
+        inside = [k for k, w in enumerate(weeks) if start <= w < start + length]
+        if inside and sum(sizes[k] for k in inside) > limit:
+            windows.add((inside[0], inside[-1]))
+    return windows
+
+
+def test_contiguous_weeks_cover_first_and_last_week():
+    weeks = list(range(1, 53))
+    windows = maximal_windows(weeks, 3, [1] * 52, 1)
+    assert windows == [(i, i + 2) for i in range(50)]
+    assert windows[0] == (0, 2) and windows[-1] == (49, 51)
+
+
+def test_missing_weeks():
+    weeks = [1, 2, 5, 6, 7, 20]
+    # w1-w2, puis w5-w7; w20 est seule dans sa fenêtre
+    assert maximal_windows(weeks, 3, [1] * len(weeks), 1) == [(0, 1), (2, 4)]
+    # Un écart égal à la fréquence est admis: aucune fenêtre
+    assert maximal_windows([1, 4, 7], 3, [1, 1, 1], 1) == []
+
+
+def test_length_larger_than_span():
+    assert maximal_windows([10, 11, 12], 60, [1, 1, 1], 1) == [(0, 2)]
+    assert maximal_windows([1, 52], 60, [1, 1], 1) == [(0, 1)]
+    assert maximal_windows([5], 60, [1], 1) == []
+
+
+def test_window_sizes_below_limit_are_omitted():
+    # Continuité 2 vacations sur 2 semaines: seules les fenêtres de plus de 2 variables
+    assert maximal_windows([1, 2, 3, 4], 2, [1, 2, 1, 1], 2) == [(0, 1), (1, 2)]
+    assert maximal_windows([1, 2, 3, 4], 2, [1, 1, 1, 1], 2) == []
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_maximal_windows_match_sliding_windows(seed):
+    """Chaque fenêtre glissante violable est incluse dans une fenêtre retenue, qui est elle-même glissante"""
+    rng = random.Random(seed)
+    weeks = sorted(rng.sample(range(1, 53), rng.randint(1, 30)))
+    sizes = [rng.randint(1, 4) for _ in weeks]
+    length = rng.randint(1, 60)
+    limit = rng.randint(1, 6)
+
+    windows = maximal_windows(weeks, length, sizes, limit)
+    naive = _naive_windows(weeks, length, sizes, limit)
+    assert set(windows) <= naive
+    assert all(any(i <= a and b <= j for i, j in windows) for a, b in naive)
+    assert windows == sorted(set(windows))
+
+
+# Petite instance: deux disciplines à fenêtres, dont une en binôme
+
+FREQUENCE = 3
+CONTINUITE = (2, 4)  # Au plus 2 vacations sur 4 semaines
+
+
+def _config(formulation: str) -> ModelConfig:
+    frequency = discipline(
+        1, "Frequence", [2] * 10, False, [10, 10, 10], presence=[True, False, False, False, False, True] + [False] * 4,
+        annee=[4, 5], frequence_vacations=FREQUENCE
+    )
+    continuity = discipline(
+        2, "Continuite", [2] * 10, True, [10, 10, 10], presence=[True, True] + [False] * 8,
+        annee=[4, 5], repetition_continuite=CONTINUITE
+    )
+    eleves = [
+        eleve(1, 1, jour_pref.lundi, niveau.DFAS01),
+        eleve(2, 2, jour_pref.mardi, niveau.DFAS01),
+        eleve(3, 2, jour_pref.mardi, niveau.DFAS01),
+        eleve(4, 4, jour_pref.jeudi, niveau.DFAS02),
+    ]
+    # Semaines manquantes (début, milieu et fin d'année) selon le niveau
+    calendar = {
+        niveau.DFAS01: {(s, slot) for s in (1, 2, 20, 21, 22, 52) for slot in range(10)},
+        niveau.DFAS02: {(s, slot) for s in (3, 30, 51) for slot in range(10)},
+    }
+    return ModelConfig(
+        disciplines=[frequency, continuity],
+        eleves=eleves,
+        calendar_unavailability=calendar,
+        solver_params=SolverParams(window_formulation=formulation, model_cache=False, profiling=False),
+    )
+
+
+def _window_model(formulation: str) -> ScheduleOptimizer:
+    """Variables de décision et contraintes de fréquence et de continuité seules"""
+    optimizer = ScheduleOptimizer(_config(formulation))
+    optimizer.prepare_data()
+    optimizer.model = cp_model.CpModel()
+    optimizer.emit = LinearEmitter(optimizer.model)
+    optimizer._create_variables()
+    optimizer._build_indexes()
+    optimizer._add_frequency_constraints()
+    optimizer._add_continuity_constraints()
+    return optimizer
+
+
+def _is_feasible(optimizer: ScheduleOptimizer, values: dict) -> bool:
+    """Le modèle admet-il les valeurs imposées ({indice de variable: valeur}) ?"""
+    model = optimizer.model.Clone()
+    variables = model.Proto().variables
+    for index, value in values.items():
+        variables[index].domain[0] = value
+        variables[index].domain[1] = value
+    solver = cp_model.CpSolver()
+    solver.parameters.num_workers = 1
+    status = solver.Solve(model)
+    assert status != cp_model.UNKNOWN
+    return status in (cp_model.OPTIMAL, cp_model.FEASIBLE)
+
+
+def _respects_sliding_windows(optimizer: ScheduleOptimizer, values: dict) -> bool:
+    """Sémantique de référence: semaines espacées d'au moins FREQUENCE, au plus CONTINUITE[0] vacations sur CONTINUITE[1] semaines"""
+    store = optimizer.store
+    for (s_pos, d_pos), rows in store.group_by('student', 'discipline'):
+        counts = np.zeros(53 + 60, dtype=np.int64)
+        for row in rows.tolist():
+            counts[store.semaine[row]] += values[int(store.var_index[row])]
+        length, limit = (FREQUENCE, 1) if d_pos == 0 else (CONTINUITE[1], CONTINUITE[0])
+        per_week = np.minimum(counts, 1) if d_pos == 0 else counts
+        if any(per_week[s:s + length].sum() > limit for s in range(1, 53)):
+            return False
+    return True
+
+
+@pytest.fixture(scope="module")
+def models():
+    return {name: _window_model(name) for name in ("fenetres", "prefixes")}
+
+
+def test_instance_has_missing_and_boundary_weeks(models):
+    store = models["fenetres"].store
+    weeks = set(store.semaine[store.student == 0].tolist())
+    assert {1, 2, 20, 52}.isdisjoint(weeks) and {3, 51} <= weeks
+    assert 52 in set(store.semaine[store.student == 3].tolist())
+    # Binôme: les élèves 2 et 3 partagent leurs variables de continuité
+    assert store.n_distinct_vars() < len(store)
+
+
+def test_formulations_admit_the_same_plannings(models):
+    reference = models["fenetres"]
+    var_indices = sorted(set(reference.store.var_index.tolist()))
+    assert var_indices == sorted(set(models["prefixes"].store.var_index.tolist()))
+
+    rng = random.Random(0)
+    verdicts = []
+    for density in (0.01, 0.02, 0.04, 0.08) * 10:
+        values = {index: int(rng.random() < density) for index in var_indices}
+        expected = _respects_sliding_windows(reference, values)
+        for name, optimizer in models.items():
+            assert _is_feasible(optimizer, values) == expected, name
+        verdicts.append(expected)
+    assert any(verdicts) and not all(verdicts)
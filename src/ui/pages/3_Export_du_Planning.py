@@ -154,6 +154,26 @@ if 'optimization_result' not in st.session_state:
     st.session_state['optimization_result'] = None
 
 
+# Démarrage à chaud depuis le dernier planning généré
+previous_planning = RESULTAT_DIR / "planning_solution.csv"
+if previous_planning.exists():
+    st.checkbox(
+        "Démarrer à partir du dernier planning généré",
+        value=False,
+        key='warm_start',
+        disabled=st.session_state['model_running'],
+        help="Le planning précédent sert de point de départ au solveur (les affectations devenues impossibles sont réparées)."
+    )
+
+# Aperçu rapide: heuristique gloutonne sans construction du modèle CP-SAT
+st.checkbox(
+    "Aperçu rapide (planning glouton en quelques secondes)",
+    value=False,
+    key='greedy_preview',
+    disabled=st.session_state['model_running'],
+    help="Construit un planning approché sans solveur, pour vérifier les données avant une résolution complète."
+)
+
 # Button to launch optimization
 col1, col2 = st.columns([3, 1])
 
@@ -184,13 +204,16 @@ if st.session_state.get('model_running', False):
     status_text = st.empty()
     
     # Time display
-    col1, col2 = st.columns(2)
+    col1, col2, col3 = st.columns(3)
     with col1:
         elapsed_display = st.empty()
         elapsed_display.metric("Temps écoulé", "0s")
     with col2:
         remaining_display = st.empty()
         remaining_display.metric("Temps restant", "Calcul...")
+    with col3:
+        score_display = st.empty()
+        score_display.metric("Meilleur score", "-")
     
     log_expander = st.expander("Logs détaillés", expanded=False)
     log_container = log_expander.empty()
@@ -203,11 +226,8 @@ if st.session_state.get('model_running', False):
         from config_manager import ModelConfig
         from optimizer import ScheduleOptimizer
         from exporter import export_planning, export_statistics
-        import io
-        import contextlib
-        
-        # Capture stdout to show logs
-        logs = []
+        from events import iter_events, INCUMBENT, HEARTBEAT, BOUND, PHASE_STARTED
+        import threading
         
         # Helper to format time
         def format_time(seconds):
@@ -231,6 +251,10 @@ if st.session_state.get('model_running', False):
         config = ModelConfig.from_csv_directory(data_dir)
         config.output_dir = output_dir
         
+        warm_start_planning = output_dir / "planning_solution.csv"
+        if st.session_state.get('warm_start') and warm_start_planning.exists():
+            config.solver_params.warm_start_path = str(warm_start_planning)
+        
         # Validate configuration
         progress_bar.progress(0.15)
         status_text.text("Validation de la configuration...")
@@ -255,52 +279,77 @@ if st.session_state.get('model_running', False):
         optimizer = ScheduleOptimizer(config)
         log_container.text("✓ Configuration chargée\n✓ Configuration validée\n✓ Optimizer créé")
         
-        # Prepare data
-        progress_bar.progress(0.25)
-        status_text.text("Chargement des données...")
-        optimizer.prepare_data()
-        log_container.text("✓ Configuration chargée\n✓ Configuration validée\n✓ Optimizer créé\n✓ Données chargées")
+        if st.session_state.get('greedy_preview'):
+            config.solver_params.strategy = "greedy"
         
-        # Build model
-        progress_bar.progress(0.5)
-        status_text.text("Construction du modèle...")
-        optimizer.build_model()
-        log_container.text("✓ Configuration chargée\n✓ Configuration validée\n✓ Optimizer créé\n✓ Données chargées\n✓ Modèle construit")
+        # Prepare data + build model (ou rechargement depuis le cache disque)
+        progress_bar.progress(0.25)
+        status_text.text("Chargement des données et construction du modèle...")
+        if config.solver_params.strategy == "greedy":
+            optimizer.prepare_data()
+            model_step = "✓ Données chargées"
+        else:
+            from_cache = optimizer.prepare_and_build()
+            model_step = "✓ Modèle rechargé depuis le cache" if from_cache else "✓ Données chargées\n✓ Modèle construit"
+        log_container.text(f"✓ Configuration chargée\n✓ Configuration validée\n✓ Optimizer créé\n{model_step}")
         
         # Solve
         progress_bar.progress(0.75)
         status_text.text("Résolution en cours...")
         
-        # Track progress with a custom approach
-        import time as time_module
-        start_time = time_module.time()
-        max_time = config.solver_params.max_time_seconds
-        
-        # Show initial time
+        start_time = time.time()
+        max_time = int(config.solver_params.max_time_seconds)
         remaining_display.metric("Temps restant", format_time(max_time))
         
-        # Start solving (this will block)
-        result = optimizer.solve()
+        # Résolution dans un thread: la page suit les événements de l'optimizer (events.py)
+        events = optimizer.events.subscribe_queue()
+        outcome = {}
         
-        # Calculate elapsed time
-        elapsed_time = int(time_module.time() - start_time)
-        elapsed_display.metric("Temps écoulé", format_time(elapsed_time))
-        remaining_display.metric("Temps restant", "0s")
-        elapsed_display.metric("Temps écoulé", format_time(elapsed_time))
+        def run_solver():
+            try:
+                outcome['result'] = optimizer.solve()
+            except Exception as e:
+                outcome['error'] = e
+        
+        worker = threading.Thread(target=run_solver, daemon=True)
+        worker.start()
+        
+        for event in iter_events(events, lambda: not worker.is_alive()):
+            if event.kind == PHASE_STARTED and event.phase == 'search':
+                status_text.text("Recherche de solutions...")
+            elif event.kind == INCUMBENT:
+                gap = f"écart {100 * event.gap:.1f}%" if event.gap is not None else None
+                score_display.metric("Meilleur score", f"{event.objective:,.0f}", gap, delta_color="off")
+            if event.kind in (INCUMBENT, HEARTBEAT, BOUND) and event.elapsed is not None:
+                elapsed_display.metric("Temps écoulé", format_time(int(event.elapsed)))
+                remaining_display.metric("Temps restant", format_time(int(event.remaining)))
+                progress_bar.progress(0.75 + 0.15 * min(1.0, event.elapsed / max(1, max_time)))
+        worker.join()
+        if 'error' in outcome:
+            raise outcome['error']
+        result = outcome['result']
+        
+        elapsed_display.metric("Temps écoulé", format_time(int(time.time() - start_time)))
         remaining_display.metric("Temps restant", "0s")
         
-        # Export results
-        if result.is_success():
+        # Export results (un aperçu glouton incomplet est exporté avec un avertissement)
+        if result.status == 'HEURISTIC':
+            violated = {k: v for k, v in result.statistics['greedy']['violations'].items() if v}
+            st.warning(f"Aperçu glouton: contraintes de couverture non satisfaites {violated}")
+        if result.is_success() or result.status == 'HEURISTIC':
             progress_bar.progress(0.9)
             status_text.text("Export des résultats...")
             
             # Export planning
-            export_planning(
+            exported = export_planning(
                 result,
                 config.output_dir / "planning_solution.csv",
                 config,
-                optimizer
+                optimizer,
+                allow_heuristic=True
             )
+            if not exported:
+                raise RuntimeError(f"Échec de l'export du planning (statut {result.status})")
             
             # Export statistics
             export_statistics(